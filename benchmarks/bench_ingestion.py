@@ -0,0 +1,330 @@
+"""
+Ingestion Path Benchmark
+Throughput, latency and peak memory of every step between the source CSV and
+the train/test artifacts, on synthetic phishing data (synthetic_phishing.py)
+with a chosen duplicate and missing-value rate:
+  * write_artifact:<format>    - the dataset artifact, one entry per --formats;
+  * cv_to_json                 - CSV -> schema-cast documents;
+  * push_data_to_mongo         - insert_many of those documents (empty collection each run);
+  * read_collection_from_mongo - collection -> typed frame and raw/X/y artifacts
+                                 (read settings from the environment, like the pipeline);
+  * train_test_split_data      - the configured split method;
+  * save_train_test_data       - the train/test artifacts.
+Mongo is a local mongod when one answers at --mongo-uri, else the in-process
+stand-in (mongo_standin.py); the backend is recorded with the results. The
+frame read back is checked against the CSV, so a fast but wrong read fails.
+
+Every step runs --repeat times (best, median and worst seconds; rows/s from
+the median), then once more under tracemalloc for its peak memory, so tracing
+does not slow the timed runs. Traced runs are slow (the CSV writers about
+15x), so sizes above --memory-max-rows get no memory figure. The document
+steps hold every row as a dict (about 1.5 KB a row) and are skipped above
+--max-document-rows.
+
+Baselines:
+    --save-baseline [PATH]  writes this run (default benchmarks/baselines/ingestion.json);
+    --baseline [PATH]       compares with a saved run and exits with status 1 when a
+                            step's best time or peak memory exceeds the baseline by
+                            more than --max-regression, ignoring differences below
+                            --min-seconds / --min-mb. The best of --repeat runs is
+                            compared because it is the least disturbed by other load.
+Baselines are machine-specific; save one per machine from a quiet run.
+
+Usage:
+    python benchmarks/bench_ingestion.py [--rows 10k,1m] [--duplicate-rate 0.3] [--missing-rate 0.01]
+        [--repeat 3] [--formats csv,parquet] [--baseline] [--save-baseline] [--json]
+    python benchmarks/bench_ingestion.py --rows 10m --repeat 1
+
+Run it from the project root so the .env file is found. Generated datasets are
+cached under --work-dir and reused.
+"""
+import gc
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import tracemalloc
+from pathlib import Path
+from dataclasses import fields
+#----------------------------------------------------------
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+import numpy as np  # noqa: E402
+import pymongo  # noqa: E402
+import networksecurity.components.constants as constants  # noqa: E402
+from networksecurity.components import utils  # noqa: E402
+from networksecurity.components.push_data import NetworkDataExtractor, _read_csv_typed  # noqa: E402
+from networksecurity.components.row_codec import RowCodec  # noqa: E402
+from networksecurity.components.row_collapse import collapse_duplicates  # noqa: E402
+from networksecurity.components.schema import phishing_schema  # noqa: E402
+from networksecurity.entity.config_app import DataIngestionConfig, MongoDBAtlasConfig  # noqa: E402
+from mongo_standin import StandInClient  # noqa: E402
+from synthetic_phishing import ensure_dataset  # noqa: E402
+#----------------------------------------------------------
+DEFAULT_WORK_DIR = ROOT_DIR / "artifact" / "benchmarks" / "ingestion"
+DEFAULT_BASELINE = ROOT_DIR / "benchmarks" / "baselines" / "ingestion.json"
+BENCHMARK_DB = "ns_benchmark"
+_SIZE_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+#----------------------------------------------------------
+def parse_rows(value: str) -> list:
+    """'10k,1m,10m' -> [10000, 1000000, 10000000]."""
+    sizes = []
+    for part in value.split(","):
+        part = part.strip().lower()
+        if part:
+            scale = _SIZE_SUFFIXES.get(part[-1], 1)
+            sizes.append(int(float(part.rstrip("km")) * scale))
+    return sizes
+#----------------------------------------------------------
+def connect(backend: str, uri: str, timeout_ms: int = 500):
+    """(client, backend name): a local mongod if it answers a ping (for "auto" / "mongod"), else the stand-in."""
+    if backend in ("auto", "mongod"):
+        client = pymongo.MongoClient(uri, serverSelectionTimeoutMS=timeout_ms)
+        try:
+            client.admin.command("ping")
+            return client, "mongod"
+        except pymongo.errors.PyMongoError:
+            client.close()
+            if backend == "mongod":
+                raise
+    return StandInClient(), "standin"
+#----------------------------------------------------------
+def measure(func, repeat: int, memory: bool = True, setup=None):
+    """
+    (result of the last run, stats): `func` timed `repeat` times, then run once
+    more under tracemalloc when `memory` is set. `setup` runs untimed before
+    each run; the previous result is released first so runs do not overlap.
+    """
+    seconds, result, peak = [], None, None
+    for _ in range(repeat):
+        result = None
+        if setup is not None:
+            setup()
+        gc.collect()
+        started = time.perf_counter()
+        result = func()
+        seconds.append(time.perf_counter() - started)
+    if memory:
+        result = None
+        if setup is not None:
+            setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    stats = {"runs": len(seconds), "best_seconds": min(seconds), "median_seconds": statistics.median(seconds),
+             "max_seconds": max(seconds), "peak_mb": None if peak is None else peak / 2 ** 20}
+    return result, stats
+#----------------------------------------------------------
+def ingest_config_in(directory: Path, collapse: bool = None, read_partitions: int = None) -> DataIngestionConfig:
+    """A DataIngestionConfig whose artifact paths all point into `directory`."""
+    config = DataIngestionConfig()
+    for f in fields(config):
+        value = getattr(config, f.name)
+        if f.name.endswith("_and_path") and isinstance(value, (str, Path)):
+            setattr(config, f.name, directory / Path(value).name)
+    config.mongo_storage_mode = "document"
+    if collapse is not None:
+        config.collapse_duplicates = collapse
+    if read_partitions:
+        config.mongo_read_partitions = read_partitions
+    directory.mkdir(parents=True, exist_ok=True)
+    return config
+#----------------------------------------------------------
+def _check_read(frame, expected) -> None:
+    """The frame read back must hold the rows of `expected` in order (missing values included)."""
+    codec = RowCodec()
+    if len(frame) != len(expected) or not np.array_equal(codec.pack_frame(frame), codec.pack_frame(expected)):
+        raise AssertionError("read_collection_from_mongo returned different rows than were pushed")
+#----------------------------------------------------------
+def run_size(rows: int, args, client) -> dict:
+    """Stats of every step for one dataset size ({step: stats}); skipped steps carry a `skipped` reason."""
+    source = ensure_dataset(args.work_dir / "datasets", rows, args.duplicate_rate, args.missing_rate, args.seed)
+    output_dir = args.work_dir / f"run_{rows}"
+    ingest_config = ingest_config_in(output_dir, args.collapse, args.read_partitions)
+    frame = phishing_schema().cast_frame(_read_csv_typed(source))
+    memory = args.memory and rows <= args.memory_max_rows
+    results = {}
+
+    def record(step, stats, step_rows=rows):
+        stats["rows"] = step_rows
+        stats["rows_per_second"] = step_rows / stats["median_seconds"] if stats["median_seconds"] else None
+        results[step] = stats
+    #----------------------------------------------------------
+    for artifact_format in args.formats:
+        target = output_dir / f"dataset{constants.ARTIFACT_FORMAT_SUFFIXES[artifact_format]}"
+        _, stats = measure(lambda: utils.write_artifact(frame, target), args.repeat, memory)
+        stats["bytes"] = target.stat().st_size
+        record(f"write_artifact:{artifact_format}", stats)
+    #----------------------------------------------------------
+    dataset = None
+    if rows <= args.max_document_rows:
+        collection_name = f"ingest_{rows}"
+        extractor = NetworkDataExtractor(MongoDBAtlasConfig(
+            mongo_db_uri=args.mongo_uri, mongo_db_name=BENCHMARK_DB,
+            mongo_db_collection_name=collection_name, mongo_storage_mode="document"))
+        extractor.client = client
+        collection = client[BENCHMARK_DB][collection_name]
+        documents, stats = measure(lambda: extractor.cv_to_json(str(source)), args.repeat, memory)
+        record("cv_to_json", stats)
+
+        def empty_collection():
+            collection.drop()
+            for document in documents:
+                document.pop("_id", None)
+        _, stats = measure(lambda: extractor.push_data_to_mongo(documents), args.repeat, memory,
+                           setup=empty_collection)
+        record("push_data_to_mongo", stats)
+        del documents
+        #----------------------------------------------------------
+        (dataset, _, _), stats = measure(
+            lambda: utils.read_collection_from_mongo(None, None, ingest_config, client, BENCHMARK_DB,
+                                                     collection_name), args.repeat, memory)
+        record("read_collection_from_mongo", stats)
+        expected = collapse_duplicates(frame, phishing_schema(), ingest_config.row_count_column) \
+            if ingest_config.collapse_duplicates else frame
+        _check_read(dataset, expected)
+        client[BENCHMARK_DB].drop_collection(collection_name)
+    else:
+        reason = f"{rows} rows > --max-document-rows {args.max_document_rows}"
+        for step in ("cv_to_json", "push_data_to_mongo", "read_collection_from_mongo"):
+            results[step] = {"skipped": reason}
+    if dataset is None:
+        dataset = collapse_duplicates(frame, phishing_schema(), ingest_config.row_count_column) \
+            if ingest_config.collapse_duplicates else frame
+    del frame
+    #----------------------------------------------------------
+    (train, test), stats = measure(
+        lambda: utils.train_test_split_data(dataset, method=args.split_method), args.repeat, memory)
+    record("train_test_split_data", stats, len(dataset))
+    _, stats = measure(lambda: utils.save_train_test_data(ingest_config, train, test), args.repeat, memory)
+    record("save_train_test_data", stats, len(dataset))
+    return results
+#----------------------------------------------------------
+# Baselines
+#----------------------------------------------------------
+def compare(report: dict, baseline: dict, max_regression: float, min_seconds: float, min_mb: float) -> list:
+    """
+    Regressions of `report` against `baseline`: steps (present in both) whose
+    best seconds or peak MB grew by more than `max_regression` and by more
+    than the absolute floor. Ratios are also stored on the report's stats.
+    """
+    regressions = []
+    for rows, steps in report["results"].items():
+        for step, stats in steps.items():
+            before = baseline.get("results", {}).get(rows, {}).get(step)
+            if before is None or "skipped" in stats or "skipped" in before:
+                continue
+            for metric, floor in (("best_seconds", min_seconds), ("peak_mb", min_mb)):
+                now, then = stats.get(metric), before.get(metric)
+                if now is None or then is None:
+                    continue
+                ratio = now / then if then else float("inf")
+                stats.setdefault("vs_baseline", {})[metric] = ratio
+                if now > then * (1.0 + max_regression) and now - then > floor:
+                    regressions.append({"rows": int(rows), "step": step, "metric": metric,
+                                        "baseline": then, "current": now, "ratio": ratio})
+    return regressions
+#----------------------------------------------------------
+def settings_mismatch(report: dict, baseline: dict) -> list:
+    """Settings that differ between the run and the baseline (their timings are not comparable)."""
+    now, then = report["settings"], baseline.get("settings", {})
+    return [f"{key}: baseline {then.get(key)!r}, now {now[key]!r}"
+            for key in now if key != "rows" and then.get(key) != now[key]]
+#----------------------------------------------------------
+def print_table(report: dict) -> None:
+    settings = report["settings"]
+    print(f"backend={settings['backend']} duplicate_rate={settings['duplicate_rate']} "
+          f"missing_rate={settings['missing_rate']} split={settings['split_method']} repeat={settings['repeat']}")
+    print(f"{'rows':>10}  {'step':<28}{'best s':>10}{'median s':>10}{'max s':>10}{'rows/s':>12}{'peak MB':>10}"
+          f"{'vs base':>16}")
+    for rows, steps in report["results"].items():
+        for step, stats in steps.items():
+            if "skipped" in stats:
+                print(f"{rows:>10}  {step:<28}  skipped ({stats['skipped']})")
+                continue
+            peak = f"{stats['peak_mb']:.1f}" if stats["peak_mb"] is not None else "-"
+            ratios = stats.get("vs_baseline", {})
+            versus = " ".join(f"{ratios[m]:.2f}x" if m in ratios else "-" for m in ("best_seconds", "peak_mb"))
+            print(f"{rows:>10}  {step:<28}{stats['best_seconds']:>10.3f}{stats['median_seconds']:>10.3f}"
+                  f"{stats['max_seconds']:>10.3f}"
+                  f"{stats['rows_per_second']:>12.0f}{peak:>10}{versus if ratios else '':>16}")
+    for regression in report.get("regressions", []):
+        print(f"REGRESSION {regression['rows']} rows {regression['step']} {regression['metric']}: "
+              f"{regression['baseline']:.3f} -> {regression['current']:.3f} ({regression['ratio']:.2f}x)")
+#----------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingestion path benchmark")
+    parser.add_argument("--rows", type=parse_rows, default=parse_rows("10k,1m"),
+                        help="Comma-separated dataset sizes; k/m suffixes allowed (e.g. 10k,1m,10m).")
+    parser.add_argument("--duplicate-rate", type=float, default=0.3, help="Share of rows repeating an earlier row.")
+    parser.add_argument("--missing-rate", type=float, default=0.01, help="Share of feature values left empty.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per step.")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="Skip the tracemalloc run.")
+    parser.add_argument("--memory-max-rows", type=int, default=1_000_000,
+                        help="Largest size given a tracemalloc run.")
+    parser.add_argument("--formats", type=lambda v: [f.strip() for f in v.split(",") if f.strip()], default=["csv"],
+                        help=f"Artifact formats to write: {','.join(constants.ARTIFACT_FORMAT_SUFFIXES)}.")
+    parser.add_argument("--split-method", default=None, help="hash or random (default: SPLIT_METHOD).")
+    parser.add_argument("--collapse", action=argparse.BooleanOptionalAction, default=None,
+                        help="Collapse duplicate rows at read time (default: COLLAPSE_DUPLICATES).")
+    parser.add_argument("--read-partitions", type=int, default=None, help="Default: MONGO_READ_PARTITIONS.")
+    parser.add_argument("--max-document-rows", type=int, default=1_000_000,
+                        help="Largest size run through the document (Mongo) steps.")
+    parser.add_argument("--mongo", choices=("auto", "mongod", "standin"), default="auto")
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017")
+    parser.add_argument("--work-dir", type=Path, default=DEFAULT_WORK_DIR)
+    parser.add_argument("--baseline", type=Path, nargs="?", const=DEFAULT_BASELINE, default=None,
+                        help="Compare with this saved run and exit 1 on a regression.")
+    parser.add_argument("--save-baseline", type=Path, nargs="?", const=DEFAULT_BASELINE, default=None)
+    parser.add_argument("--max-regression", type=float, default=0.20, help="Allowed growth (0.20 = 20%%).")
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="Time differences below this are noise.")
+    parser.add_argument("--min-mb", type=float, default=8.0, help="Memory differences below this are noise.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args(argv)
+    unknown = set(args.formats) - set(constants.ARTIFACT_FORMAT_SUFFIXES)
+    if unknown:
+        parser.error(f"Unknown artifact formats {sorted(unknown)}")
+    #----------------------------------------------------------
+    client, backend = connect(args.mongo, args.mongo_uri)
+    report = {
+        "settings": {"rows": args.rows, "duplicate_rate": args.duplicate_rate, "missing_rate": args.missing_rate,
+                     "seed": args.seed, "repeat": args.repeat, "formats": args.formats, "backend": backend,
+                     "split_method": args.split_method or constants.SPLIT_METHOD,
+                     "collapse": constants.COLLAPSE_DUPLICATES if args.collapse is None else args.collapse,
+                     "read_partitions": args.read_partitions or constants.MONGO_READ_PARTITIONS},
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "machine": platform.machine(), "pymongo": pymongo.version,
+                        "numpy": np.__version__},
+        "results": {},
+    }
+    try:
+        for rows in args.rows:
+            report["results"][str(rows)] = run_size(rows, args, client)
+    finally:
+        client.close()
+    #----------------------------------------------------------
+    report["regressions"] = []
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())
+        for mismatch in settings_mismatch(report, baseline):
+            print(f"warning: settings differ from the baseline ({mismatch})", file=sys.stderr)
+        report["regressions"] = compare(report, baseline, args.max_regression, args.min_seconds, args.min_mb)
+    if args.save_baseline is not None:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        saved = {key: value for key, value in report.items() if key != "regressions"}
+        args.save_baseline.write_text(json.dumps(saved, indent=2))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_table(report)
+    return report
+#----------------------------------------------------------
+if __name__ == "__main__":
+    sys.exit(1 if main()["regressions"] else 0)
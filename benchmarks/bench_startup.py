@@ -0,0 +1,99 @@
+"""
+Startup Benchmark
+Measures cold-start cost in fresh interpreters: importing the package, importing
+the push-only path and the full pipeline, and a push-only run up to the first
+batch (config, client, CSV read and fingerprinting, no network round trip).
+Each scenario runs in its own subprocess `--repeat` times; the median is shown.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 7] [--compare /path/to/other/checkout]
+
+`--compare` runs the same scenarios against another checkout (for example a
+`git worktree` of an older commit) and prints the speed-up. Run it from the
+project root so the .env file is found.
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+#----------------------------------------------------------
+ROOT_DIR = Path(__file__).resolve().parents[1]
+#----------------------------------------------------------
+# Every scenario prints one JSON line: elapsed seconds plus what was loaded
+#----------------------------------------------------------
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "sklearn_loaded": "sklearn" in sys.modules,
+                  "modules": len(sys.modules)}}))
+"""
+SCENARIOS = {
+    "import networksecurity": "import networksecurity",
+    "import push path": "import networksecurity.components.push_data",
+    "import full pipeline": "import main",
+    "push-only run (first batch)": """
+from networksecurity.entity.config_app import MongoDBAtlasConfig
+from networksecurity.components.push_data import NetworkDataExtractor
+config = MongoDBAtlasConfig()
+extractor = NetworkDataExtractor(config=config)
+next(iter(extractor.iter_csv_blocks(config.file_path)))
+""",
+}
+#----------------------------------------------------------
+def run_scenario(source_dir: Path, body: str, repeat: int) -> dict:
+    env = dict(os.environ, PYTHONPATH=str(source_dir))
+    runs = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(body=body)],
+            cwd=source_dir, env=env, capture_output=True, text=True)
+        if completed.returncode != 0:
+            return {"error": completed.stderr.strip().splitlines()[-1] if completed.stderr else "failed"}
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    return {
+        "median_ms": statistics.median(run["seconds"] for run in runs) * 1000,
+        "sklearn_loaded": runs[-1]["sklearn_loaded"],
+        "modules": runs[-1]["modules"],
+    }
+#----------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start benchmark")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--compare", type=Path, default=None,
+                        help="Another checkout to run the same scenarios against.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args(argv)
+    #----------------------------------------------------------
+    results = {}
+    for name, body in SCENARIOS.items():
+        results[name] = {"current": run_scenario(ROOT_DIR, body, args.repeat)}
+        if args.compare is not None:
+            results[name]["compare"] = run_scenario(args.compare.resolve(), body, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return results
+    #----------------------------------------------------------
+    print(f"{'scenario':<30}{'current ms':>12}{'sklearn':>9}{'modules':>9}", end="")
+    print(f"{'compare ms':>12}{'speed-up':>10}" if args.compare else "")
+    for name, result in results.items():
+        current = result["current"]
+        if "error" in current:
+            print(f"{name:<30}  error: {current['error']}")
+            continue
+        line = (f"{name:<30}{current['median_ms']:>12.1f}{str(current['sklearn_loaded']):>9}"
+                f"{current['modules']:>9}")
+        other = result.get("compare")
+        if other and "error" not in other:
+            line += f"{other['median_ms']:>12.1f}{other['median_ms'] / current['median_ms']:>9.1f}x"
+        elif other:
+            line += f"  compare error: {other['error']}"
+        print(line)
+    return results
+#----------------------------------------------------------
+if __name__ == "__main__":
+    main()
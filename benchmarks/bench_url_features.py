@@ -0,0 +1,142 @@
+"""
+URL Feature Extraction Benchmark
+Measures URLs/second of the lexical feature extractor on synthetic URLs whose
+hosts repeat with a Zipf-like popularity, as in proxy traffic:
+  * naive      - per-URL urlsplit + host parsing, no memo and no batching (baseline);
+  * cold       - a fresh UrlFeatureExtractor (empty host memo);
+  * warm       - the same extractor over the same URLs again (every host memoized);
+  * pool xN    - `iter_extract_blocks` on a process pool of N workers (includes
+                 pool start-up and pickling the batches and blocks).
+Every scenario's output is checked against the naive baseline.
+
+Usage:
+    python benchmarks/bench_url_features.py [--urls 1000000] [--hosts 50000] [--workers 2,4] [--json]
+"""
+import sys
+import json
+import time
+import argparse
+import numpy as np
+from pathlib import Path
+from urllib.parse import urlsplit
+#----------------------------------------------------------
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+from networksecurity.components import url_features  # noqa: E402
+from networksecurity.components.url_features import UrlFeatureExtractor, iter_extract_blocks  # noqa: E402
+#----------------------------------------------------------
+_WORDS = ("paypal", "secure", "login", "account", "bank", "mail", "shop", "news", "update", "verify",
+          "cloud", "portal", "service", "media", "store", "support", "online", "web", "app", "data")
+_TLDS = ("com", "net", "org", "info", "co.uk", "de", "in", "io", "xyz", "ru")
+#----------------------------------------------------------
+def synthetic_hosts(n_hosts: int, rng: np.random.Generator) -> list:
+    """Host pool mixing plain, sub-domained, dashed, IP, shortener and explicit-port authorities."""
+    shorteners = sorted(url_features.SHORTENER_DOMAINS)
+    hosts = []
+    for i in range(n_hosts):
+        kind = rng.random()
+        word = _WORDS[rng.integers(len(_WORDS))]
+        tld = _TLDS[rng.integers(len(_TLDS))]
+        if kind < 0.05:
+            host = ".".join(str(part) for part in rng.integers(1, 255, size=4))
+        elif kind < 0.10:
+            host = shorteners[rng.integers(len(shorteners))]
+        elif kind < 0.25:
+            host = f"{word}-{_WORDS[rng.integers(len(_WORDS))]}{i}.{tld}"
+        elif kind < 0.40:
+            host = ".".join(_WORDS[j] for j in rng.integers(len(_WORDS), size=rng.integers(2, 5))) + f"{i}.{tld}"
+        else:
+            host = f"www.{word}{i}.{tld}"
+        if rng.random() < 0.03:
+            host += f":{rng.choice([80, 443, 8080, 8443])}"
+        hosts.append(host)
+    return hosts
+#----------------------------------------------------------
+def synthetic_urls(n_urls: int, n_hosts: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    hosts = synthetic_hosts(n_hosts, rng)
+    # Zipf-like popularity: a few hosts carry most of the traffic
+    picks = (rng.zipf(1.3, size=n_urls) - 1) % n_hosts
+    path_lengths = rng.integers(0, 80, size=n_urls)
+    oddities = rng.random(n_urls)
+    urls = []
+    for host_index, length, odd in zip(picks, path_lengths, oddities):
+        scheme = "https://" if odd < 0.6 else ("http://" if odd < 0.97 else "")
+        path = "/" + "a/b-c_d.e" * (int(length) // 9)
+        if odd > 0.99:
+            path += "//redirect.example.com/"
+        elif 0.985 < odd <= 0.99:
+            path += "@evil.example.com"
+        urls.append(f"{scheme}{hosts[host_index]}{path}")
+    return urls
+#----------------------------------------------------------
+def naive_block(urls: list) -> np.ndarray:
+    """Baseline: every URL parsed on its own with urllib, no memo, no batch-level NumPy."""
+    features = list(url_features.PHISHING_FEATURE_COLUMNS)
+    host_index = [features.index(name) for name in url_features.HOST_COLUMNS]
+    length_index, at_index, slash_index = (features.index(name) for name in url_features.URL_COLUMNS)
+    block = np.full((len(urls), len(features)), np.nan)
+    for i, url in enumerate(urls):
+        netloc = urlsplit(url if "://" in url or url.startswith("//") else "//" + url).netloc
+        _, values = url_features.host_features(netloc)
+        block[i, host_index] = values
+        length = len(url)
+        block[i, length_index] = 1 if length < 54 else (0 if length <= 75 else -1)
+        block[i, at_index] = -1 if "@" in url else 1
+        block[i, slash_index] = -1 if url.rfind("//") > 6 else 1
+    return block
+#----------------------------------------------------------
+def _timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+#----------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="URL feature extraction benchmark")
+    parser.add_argument("--urls", type=int, default=1_000_000)
+    parser.add_argument("--hosts", type=int, default=50_000, help="Distinct hosts in the synthetic traffic.")
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--workers", default="2", help="Comma-separated pool sizes (> 1); empty to skip the pool.")
+    parser.add_argument("--naive-urls", type=int, default=200_000, help="URLs for the (slow) naive baseline.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args(argv)
+    #----------------------------------------------------------
+    urls = synthetic_urls(args.urls, args.hosts)
+    batches = [urls[start:start + args.batch_size] for start in range(0, len(urls), args.batch_size)]
+    results = {}
+    #----------------------------------------------------------
+    sample = urls[:args.naive_urls]
+    expected, seconds = _timed(lambda: naive_block(sample))
+    results["naive"] = {"urls": len(sample), "seconds": seconds}
+    #----------------------------------------------------------
+    extractor = UrlFeatureExtractor()
+    lexical = [list(url_features.PHISHING_FEATURE_COLUMNS).index(name) for name in url_features.LEXICAL_COLUMNS]
+    for name in ("cold", "warm"):
+        blocks, seconds = _timed(lambda: [extractor.extract_block(batch) for batch in batches])
+        block = np.concatenate(blocks)
+        if not np.array_equal(block[:len(sample), lexical], expected[:, lexical]):
+            raise AssertionError(f"{name}: features differ from the naive baseline")
+        results[name] = {"urls": len(urls), "seconds": seconds, **extractor.cache_info()}
+    #----------------------------------------------------------
+    for workers in [int(value) for value in args.workers.split(",") if value.strip() and int(value) > 1]:
+        blocks, seconds = _timed(lambda: list(iter_extract_blocks(batches, workers=workers)))
+        if not np.array_equal(np.concatenate(blocks)[:len(sample), lexical], expected[:, lexical]):
+            raise AssertionError(f"pool x{workers}: features differ from the naive baseline")
+        results[f"pool x{workers}"] = {"urls": len(urls), "seconds": seconds}
+    for result in results.values():
+        result["urls_per_second"] = result["urls"] / result["seconds"]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return results
+    #----------------------------------------------------------
+    baseline = results["naive"]["urls_per_second"]
+    print(f"{args.urls} URLs over {args.hosts} hosts, batches of {args.batch_size}")
+    print(f"{'scenario':<12}{'URLs':>10}{'seconds':>10}{'URLs/s':>12}{'vs naive':>10}{'memo hit rate':>15}")
+    for name, result in results.items():
+        hit_rate = f"{result['hit_rate']:.3f}" if "hit_rate" in result else ""
+        print(f"{name:<12}{result['urls']:>10}{result['seconds']:>10.2f}{result['urls_per_second']:>12.0f}"
+              f"{result['urls_per_second'] / baseline:>9.1f}x{hit_rate:>15}")
+    return results
+#----------------------------------------------------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+Scoring Service Load Test
+Drives the local scoring service (serve.py) from localhost over keep-alive
+HTTP connections, with feature rows sampled from the project CSV, and reports
+client-side latency percentiles, throughput, response codes and the server's
+own /metrics (batch sizes, queue wait, predict time).
+
+Two modes:
+  * closed loop (default): each of `--connections` connections sends its next
+    request as soon as the previous one is answered;
+  * open loop (`--rate N`): requests are issued at N per second regardless of
+    how fast they are answered, and latency is measured from the scheduled send
+    time, so a stalled server shows up in the tail (no coordinated omission).
+
+Usage:
+    python benchmarks/load_test_scoring.py --spawn [--requests 20000] [--connections 32] [--rate 0]
+    python benchmarks/load_test_scoring.py --url http://127.0.0.1:8080 --duration 30 --rate 2000
+
+`--spawn` starts serve.py on a free port (with `--max-wait-ms` / `--max-batch-size`
+passed through) and stops it afterwards. Run from the project root after the
+pipeline has trained a model.
+"""
+import os
+import sys
+import csv
+import json
+import time
+import socket
+import random
+import asyncio
+import argparse
+import subprocess
+from pathlib import Path
+from collections import Counter
+from urllib.parse import urlsplit
+#----------------------------------------------------------
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+from networksecurity.components.instrumentation import LatencyHistogram  # noqa: E402
+#----------------------------------------------------------
+TARGET_COLUMN = "Result"
+#----------------------------------------------------------
+def load_bodies(data_file: Path, samples: int, rows_per_request: int, seed: int = 0) -> list:
+    """Pre-encoded request bodies built from up to `samples` rows of `data_file` (target dropped)."""
+    with open(data_file, newline="") as handle:
+        rows = []
+        for row in csv.DictReader(handle):
+            row.pop(TARGET_COLUMN, None)
+            rows.append({name: int(value) if value.lstrip("-").isdigit() else value for name, value in row.items()})
+            if len(rows) >= samples:
+                break
+    if not rows:
+        raise ValueError(f"No rows in {data_file}")
+    rng = random.Random(seed)
+    bodies = []
+    for _ in range(min(samples, len(rows))):
+        picked = rng.choice(rows) if rows_per_request == 1 else [rng.choice(rows) for _ in range(rows_per_request)]
+        bodies.append(json.dumps(picked, separators=(",", ":")).encode())
+    return bodies
+#----------------------------------------------------------
+class Connection:
+    """One keep-alive HTTP/1.1 connection with Content-Length framing."""
+    def __init__(self, host: str, port: int):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+    #----------------------------------------------------------
+    async def open(self) -> "Connection":
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        sock = self.writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return self
+    #----------------------------------------------------------
+    async def request(self, method: str, path: str, body: bytes = b""):
+        if self.writer is None:
+            await self.open()
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1")
+        self.writer.write(head + body)
+        response = await self.reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = response[:-4].decode("latin-1").split("\r\n")
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        payload = await self.reader.readexactly(int(headers.get("content-length") or 0))
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return int(status_line.split(" ", 2)[1]), payload
+    #----------------------------------------------------------
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+        self.reader = self.writer = None
+#----------------------------------------------------------
+class LoadTest:
+    def __init__(self, host: str, port: int, bodies: list, connections: int, requests: int,
+                 duration: float, rate: float):
+        self.host, self.port = host, port
+        self.bodies = bodies
+        self.connections = max(1, connections)
+        self.requests = requests
+        self.duration = duration
+        self.rate = rate
+        self.latency = LatencyHistogram()
+        self.statuses = Counter()
+        self.errors = Counter()
+        self.sent = 0
+    #----------------------------------------------------------
+    def _next_body(self):
+        """Body of the next request, or None once the request count or duration is used up."""
+        if (self.requests and self.sent >= self.requests) or time.perf_counter() >= self._deadline:
+            return None
+        body = self.bodies[self.sent % len(self.bodies)]
+        self.sent += 1
+        return body
+    #----------------------------------------------------------
+    async def _send(self, connection: Connection, body: bytes, since: float) -> None:
+        try:
+            status, _ = await connection.request("POST", "/score", body)
+            self.statuses[status] += 1
+            if status == 200:
+                self.latency.record(time.perf_counter() - since)
+        except (OSError, asyncio.IncompleteReadError) as e:
+            self.errors[type(e).__name__] += 1
+            await connection.close()
+    #----------------------------------------------------------
+    async def _closed_loop_worker(self) -> None:
+        connection = await Connection(self.host, self.port).open()
+        try:
+            while (body := self._next_body()) is not None:
+                await self._send(connection, body, time.perf_counter())
+        finally:
+            await connection.close()
+    #----------------------------------------------------------
+    async def _open_loop(self) -> None:
+        idle = asyncio.Queue()
+        for _ in range(self.connections):
+            idle.put_nowait(await Connection(self.host, self.port).open())
+        #----------------------------------------------------------
+        async def issue(body: bytes, scheduled: float) -> None:
+            connection = await idle.get()
+            try:
+                await self._send(connection, body, scheduled)
+            finally:
+                idle.put_nowait(connection)
+        #----------------------------------------------------------
+        tasks, interval, start = [], 1.0 / self.rate, time.perf_counter()
+        while (body := self._next_body()) is not None:
+            scheduled = start + (self.sent - 1) * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.ensure_future(issue(body, scheduled)))
+        await asyncio.gather(*tasks)
+        while not idle.empty():
+            await idle.get_nowait().close()
+    #----------------------------------------------------------
+    async def run(self) -> dict:
+        self._deadline = time.perf_counter() + (self.duration if self.duration else float("inf"))
+        started = time.perf_counter()
+        if self.rate > 0:
+            await self._open_loop()
+        else:
+            await asyncio.gather(*(self._closed_loop_worker() for _ in range(self.connections)))
+        seconds = time.perf_counter() - started
+        connection = Connection(self.host, self.port)
+        status, payload = await connection.request("GET", "/metrics")
+        await connection.close()
+        return {
+            "mode": f"open loop at {self.rate:g}/s" if self.rate > 0 else "closed loop",
+            "connections": self.connections,
+            "requests": self.sent,
+            "seconds": round(seconds, 3),
+            "requests_per_second": round(sum(self.statuses.values()) / seconds, 1) if seconds else 0.0,
+            "statuses": {str(code): count for code, count in sorted(self.statuses.items())},
+            "errors": dict(self.errors),
+            "latency": self.latency.snapshot(),
+            "server": json.loads(payload) if status == 200 else {"status": status},
+        }
+#----------------------------------------------------------
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+#----------------------------------------------------------
+def spawn_server(port: int, extra_args: list, timeout: float) -> subprocess.Popen:
+    """Starts serve.py on `port` and waits until /health answers."""
+    process = subprocess.Popen([sys.executable, str(ROOT_DIR / "serve.py"), "--port", str(port), *extra_args],
+                               cwd=ROOT_DIR, env=dict(os.environ, PYTHONPATH=str(ROOT_DIR)))
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"serve.py exited with code {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1) as sock:
+                sock.sendall(b"GET /health HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+                if sock.recv(64).startswith(b"HTTP/1.1 200"):
+                    return process
+        except OSError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"serve.py did not answer /health within {timeout:.0f}s")
+#----------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test for the scoring service")
+    parser.add_argument("--url", default="http://127.0.0.1:8080", help="Service URL (ignored with --spawn).")
+    parser.add_argument("--spawn", action="store_true", help="Start serve.py on a free port for the test.")
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=20000, help="Total requests; 0 = until --duration.")
+    parser.add_argument("--duration", type=float, default=0.0, help="Stop after this many seconds (0 = no limit).")
+    parser.add_argument("--rate", type=float, default=0.0, help="Open-loop requests per second (0 = closed loop).")
+    parser.add_argument("--rows-per-request", type=int, default=1)
+    parser.add_argument("--samples", type=int, default=2000, help="Distinct request bodies to cycle through.")
+    parser.add_argument("--data", type=Path, default=ROOT_DIR / "network_data" / "phisingData.csv")
+    parser.add_argument("--max-batch-size", type=int, default=None, help="Passed to serve.py with --spawn.")
+    parser.add_argument("--max-wait-ms", type=float, default=None, help="Passed to serve.py with --spawn.")
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    parser.add_argument("--json", action="store_true", help="Print the full result, histogram buckets included.")
+    args = parser.parse_args(argv)
+    if not args.requests and not args.duration:
+        parser.error("set --requests or --duration")
+    #----------------------------------------------------------
+    bodies = load_bodies(args.data, args.samples, max(1, args.rows_per_request))
+    process = None
+    if args.spawn:
+        host, port = "127.0.0.1", _free_port()
+        extra = []
+        if args.max_batch_size is not None:
+            extra += ["--max-batch-size", str(args.max_batch_size)]
+        if args.max_wait_ms is not None:
+            extra += ["--max-wait-ms", str(args.max_wait_ms)]
+        process = spawn_server(port, extra, args.startup_timeout)
+    else:
+        url = urlsplit(args.url)
+        host, port = url.hostname or "127.0.0.1", url.port or 80
+    try:
+        test = LoadTest(host, port, bodies, args.connections, args.requests, args.duration, args.rate)
+        result = asyncio.run(test.run())
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return result
+    #----------------------------------------------------------
+    latency, server = result["latency"], result["server"]
+    print(f"{result['mode']}, {result['connections']} connections, {args.rows_per_request} row(s) per request")
+    print(f"requests {result['requests']} in {result['seconds']}s: {result['requests_per_second']} req/s, "
+          f"statuses {result['statuses']}, errors {result['errors']}")
+    print(f"{'':<18}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'p99.9 ms':>10}{'max ms':>9}")
+    rows = [("client", latency)]
+    rows += [(f"server {name}", snapshot) for name, snapshot in server.get("latency", {}).items()]
+    for name, snapshot in rows:
+        print(f"{name:<18}{snapshot['p50_ms']:>9.3f}{snapshot['p90_ms']:>9.3f}{snapshot['p99_ms']:>9.3f}"
+              f"{snapshot['p999_ms']:>10.3f}{snapshot['max_ms']:>9.3f}")
+    if "batches" in server:
+        print(f"server batches {server['batches']} (mean {server['mean_batch_rows']} rows): {server['batch_rows']}, "
+              f"rejected {server['rejected']}")
+    return result
+#----------------------------------------------------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""
+In-Process MongoDB Stand-In
+A single-process substitute for a pymongo client that covers the collection
+calls of the ingestion path (push_data, the utils readers, the stage cache),
+for benchmarks on machines without a mongod:
+  * documents are stored BSON-encoded and decoded one cursor batch at a time
+    with the driver's C codec, so inserts and reads pay the client-side
+    encode/decode work of a real round trip; network and server time are not
+    modelled, so absolute numbers are a lower bound of a real deployment;
+  * insert_many assigns missing `_id`s in place, as pymongo does;
+  * filters are {} and `_id` ranges ($gt/$gte/$lt/$lte, optionally under
+    $and), sorts are on `_id`, and aggregate knows $match/$sample/$project and
+    a single-group $group with $sum: everything the readers issue. Anything
+    else raises NotImplementedError rather than returning a wrong answer;
+  * no indexes: `_id` uniqueness is not enforced.
+Mongomock covers far more of the API, but is some 100x slower per document,
+which would make the client side invisible in the timings.
+"""
+import bisect
+import random
+import operator
+import threading
+import bson
+from bson.objectid import ObjectId
+from pymongo.results import InsertManyResult, DeleteResult
+#----------------------------------------------------------
+DEFAULT_BATCH_SIZE = 1000
+_RANGE_OPERATORS = ("$gt", "$gte", "$lt", "$lte")
+#----------------------------------------------------------
+def _projector(projection):
+    """Function applying a Mongo projection to a list of decoded documents in place (None = keep all)."""
+    if not projection:
+        return None
+    projection = dict(projection) if isinstance(projection, dict) else {name: 1 for name in projection}
+    id_flag = projection.pop("_id", None)
+    included = [name for name, flag in projection.items() if flag]
+    excluded = [name for name, flag in projection.items() if not flag]
+    if included and excluded:
+        raise ValueError("Projection cannot mix inclusion and exclusion")
+    #----------------------------------------------------------
+    if included or (id_flag and not excluded):
+        keep_id = id_flag is None or bool(id_flag)
+        wanted = frozenset(included) | {"_id"}
+
+        def project(documents):
+            for i, document in enumerate(documents):
+                # Documents that hold only wanted fields (the readers' case) are kept as decoded
+                if not document.keys() <= wanted:
+                    document = {name: document[name] for name in ("_id", *included) if name in document}
+                    documents[i] = document
+                if not keep_id:
+                    document.pop("_id", None)
+            return documents
+        return project
+    #----------------------------------------------------------
+    dropped = excluded + (["_id"] if id_flag is not None and not id_flag else [])
+
+    def project(documents):
+        for document in documents:
+            for name in dropped:
+                document.pop(name, None)
+        return documents
+    return project
+#----------------------------------------------------------
+class StandInCursor:
+    """Lazily decoded cursor over a slice of a collection, in `_id` order."""
+    def __init__(self, collection, lower: int, upper: int, projection=None, batch_size: int = 0):
+        self._collection = collection
+        self._lower, self._upper = lower, upper
+        self._project = _projector(projection)
+        self._batch_size = batch_size or DEFAULT_BATCH_SIZE
+        self._descending = False
+        self._limit = 0
+    #----------------------------------------------------------
+    def sort(self, key, direction: int = 1):
+        if isinstance(key, list):
+            (key, direction), = key
+        if key != "_id":
+            raise NotImplementedError(f"Stand-in cursors sort on _id only, not '{key}'")
+        self._descending = direction < 0
+        return self
+
+    def limit(self, count: int):
+        self._limit = count
+        return self
+
+    def batch_size(self, count: int):
+        self._batch_size = count or DEFAULT_BATCH_SIZE
+        return self
+    #----------------------------------------------------------
+    def __iter__(self):
+        bodies = self._collection._sorted_bodies()
+        lower, upper = self._lower, self._upper
+        if self._limit:
+            if self._descending:
+                lower = max(lower, upper - self._limit)
+            else:
+                upper = min(upper, lower + self._limit)
+        starts = range(lower, upper, self._batch_size)
+        for start in (reversed(starts) if self._descending else starts):
+            documents = bson.decode_all(b"".join(bodies[start:min(start + self._batch_size, upper)]))
+            if self._descending:
+                documents.reverse()
+            if self._project is not None:
+                documents = self._project(documents)
+            yield from documents
+#----------------------------------------------------------
+class StandInCollection:
+    def __init__(self, database, name: str):
+        self.database = database
+        self.name = name
+        self.full_name = f"{database.name}.{name}"
+        self._ids = []
+        self._bodies = []
+        self._size = 0
+        self._sorted = True
+        self._lock = threading.Lock()
+    #----------------------------------------------------------
+    def _sorted_bodies(self) -> list:
+        """Bodies in `_id` order; documents inserted with explicit, out-of-order `_id`s are sorted on demand."""
+        with self._lock:
+            if not self._sorted:
+                order = sorted(range(len(self._ids)), key=self._ids.__getitem__)
+                self._ids = [self._ids[i] for i in order]
+                self._bodies = [self._bodies[i] for i in order]
+                self._sorted = True
+        return self._bodies
+
+    def _bounds(self, query) -> tuple:
+        """[lower, upper) positions of the documents matching an `_id` range filter."""
+        self._sorted_bodies()
+        query = query or {}
+        conditions = query["$and"] if set(query) == {"$and"} else [query]
+        lower, upper = 0, len(self._ids)
+        for condition in conditions:
+            if not condition:
+                continue
+            if set(condition) != {"_id"}:
+                raise NotImplementedError(f"Stand-in filters are _id ranges only, not {condition}")
+            spec = condition["_id"]
+            if not isinstance(spec, dict):
+                spec = {"$gte": spec, "$lte": spec}
+            for name, value in spec.items():
+                if name not in _RANGE_OPERATORS:
+                    raise NotImplementedError(f"Stand-in filters do not support {name}")
+                if name == "$gt":
+                    lower = max(lower, bisect.bisect_right(self._ids, value))
+                elif name == "$gte":
+                    lower = max(lower, bisect.bisect_left(self._ids, value))
+                elif name == "$lt":
+                    upper = min(upper, bisect.bisect_left(self._ids, value))
+                else:
+                    upper = min(upper, bisect.bisect_right(self._ids, value))
+        return lower, max(lower, upper)
+    #----------------------------------------------------------
+    # Writes
+    #----------------------------------------------------------
+    def insert_many(self, documents, ordered: bool = True, **kwargs) -> InsertManyResult:
+        documents = list(documents)
+        ids = []
+        for document in documents:
+            if "_id" not in document:
+                document["_id"] = ObjectId()
+            ids.append(document["_id"])
+        bodies = [bson.encode(document) for document in documents]
+        # Generated ObjectIds normally ascend; explicit ids or a counter wrap-around need a sort
+        ascending = all(map(operator.le, ids[:-1], ids[1:]))
+        with self._lock:
+            if not ascending or (self._ids and ids and ids[0] < self._ids[-1]):
+                self._sorted = False
+            self._ids.extend(ids)
+            self._bodies.extend(bodies)
+            self._size += sum(map(len, bodies))
+        return InsertManyResult(ids, True)
+
+    def insert_one(self, document, **kwargs):
+        return self.insert_many([document]).inserted_ids[0]
+
+    def delete_many(self, query, **kwargs) -> DeleteResult:
+        if query:
+            raise NotImplementedError("Stand-in delete_many only empties the collection")
+        deleted = len(self._ids)
+        self.drop()
+        return DeleteResult({"n": deleted, "ok": 1.0}, True)
+
+    def drop(self) -> None:
+        with self._lock:
+            self._ids, self._bodies, self._size, self._sorted = [], [], 0, True
+    #----------------------------------------------------------
+    # Reads
+    #----------------------------------------------------------
+    def find(self, filter=None, projection=None, batch_size: int = 0, **kwargs) -> StandInCursor:
+        lower, upper = self._bounds(filter)
+        return StandInCursor(self, lower, upper, projection, batch_size)
+
+    def find_one(self, filter=None, projection=None, **kwargs):
+        return next(iter(self.find(filter, projection).limit(1)), None)
+
+    def count_documents(self, filter, **kwargs) -> int:
+        lower, upper = self._bounds(filter)
+        return upper - lower
+
+    def estimated_document_count(self, **kwargs) -> int:
+        return len(self._ids)
+
+    def aggregate(self, pipeline, **kwargs):
+        """$match (first stage), $sample, $project and a whole-collection $group of $sum accumulators."""
+        stages = list(pipeline)
+        lower, upper = 0, len(self._ids)
+        if stages and "$match" in stages[0]:
+            lower, upper = self._bounds(stages.pop(0)["$match"])
+        positions = range(lower, upper)
+        if stages and "$sample" in stages[0]:
+            size = stages.pop(0)["$sample"]["size"]
+            positions = sorted(random.sample(positions, min(size, len(positions))))
+        # `_id` alone never needs decoding
+        if stages and stages[0].get("$project") in ({"_id": 1}, {"_id": True}):
+            stages.pop(0)
+            ids = self._ids
+            documents = [{"_id": ids[i]} for i in positions]
+        else:
+            bodies = self._sorted_bodies()
+            documents = bson.decode_all(b"".join(bodies[i] for i in positions))
+        for stage in stages:
+            (operator, spec), = stage.items()
+            if operator == "$project":
+                documents = _projector(spec)(documents)
+            elif operator == "$group" and spec.get("_id") is None:
+                totals = {"_id": None}
+                for name, accumulator in spec.items():
+                    if name == "_id":
+                        continue
+                    if set(accumulator) != {"$sum"}:
+                        raise NotImplementedError(f"Stand-in $group supports $sum only, not {accumulator}")
+                    value = accumulator["$sum"]
+                    if isinstance(value, str) and value.startswith("$"):
+                        totals[name] = sum(document.get(value[1:], 0) or 0 for document in documents)
+                    else:
+                        totals[name] = value * len(documents)
+                documents = [totals] if documents else []
+            else:
+                raise NotImplementedError(f"Stand-in aggregate does not support {stage}")
+        return iter(documents)
+#----------------------------------------------------------
+class StandInDatabase:
+    def __init__(self, client, name: str):
+        self.client = client
+        self.name = name
+        self._collections = {}
+
+    def __getitem__(self, name: str) -> StandInCollection:
+        if name not in self._collections:
+            self._collections[name] = StandInCollection(self, name)
+        return self._collections[name]
+
+    def __getattr__(self, name: str) -> StandInCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def get_collection(self, name: str, **kwargs) -> StandInCollection:
+        return self[name]
+
+    def list_collection_names(self) -> list:
+        return list(self._collections)
+
+    def drop_collection(self, name) -> None:
+        collection = self._collections.pop(getattr(name, "name", name), None)
+        if collection is not None:
+            collection.drop()
+
+    def command(self, command, value=None, **kwargs) -> dict:
+        name = command if isinstance(command, str) else next(iter(command))
+        if name.lower() == "ping":
+            return {"ok": 1.0}
+        if name.lower() == "collstats":
+            collection = self[value]
+            count = collection.estimated_document_count()
+            return {"ns": collection.full_name, "count": count, "size": collection._size,
+                    "avgObjSize": collection._size // count if count else 0, "ok": 1.0}
+        raise NotImplementedError(f"Stand-in databases do not support the '{name}' command")
+#----------------------------------------------------------
+class StandInClient:
+    """Drop-in for the parts of pymongo.MongoClient the ingestion path uses."""
+    def __init__(self, *args, **kwargs):
+        self._databases = {}
+
+    def __getitem__(self, name: str) -> StandInDatabase:
+        if name not in self._databases:
+            self._databases[name] = StandInDatabase(self, name)
+        return self._databases[name]
+
+    def get_database(self, name: str, **kwargs) -> StandInDatabase:
+        return self[name]
+
+    @property
+    def admin(self) -> StandInDatabase:
+        return self["admin"]
+
+    def drop_database(self, name) -> None:
+        database = self._databases.pop(getattr(name, "name", name), None)
+        for collection in list(getattr(database, "_collections", {})):
+            database.drop_collection(collection)
+
+    def server_info(self) -> dict:
+        return {"version": "in-process stand-in", "ok": 1.0}
+
+    def close(self) -> None:
+        pass
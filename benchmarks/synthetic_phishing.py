@@ -0,0 +1,176 @@
+"""
+Synthetic Phishing Dataset Generator
+Builds phishing-schema datasets (30 ternary features and the binary label) of
+any size, with a controllable share of duplicate rows and of missing values:
+  * features are drawn from label-conditional -1/0/1 frequencies, taken from the
+    reference CSV when it exists (network_data/phisingData.csv) and seeded
+    random frequencies otherwise, so value mix and label signal look like the
+    real data;
+  * `duplicate_rate` is the exact share of rows repeating an earlier row: a
+    pool of rows * (1 - duplicate_rate) distinct rows is drawn, the remaining
+    rows are copies of pool rows, and the order is shuffled;
+  * `missing_rate` is the share of feature values left empty; the label is
+    never missing. Values are blanked in the pool, so copies stay exact.
+The same arguments always produce the same rows.
+
+Usage:
+    python benchmarks/synthetic_phishing.py OUTPUT.csv [--rows 1000000] [--duplicate-rate 0.3]
+        [--missing-rate 0.01] [--seed 0]
+"""
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+#----------------------------------------------------------
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+from networksecurity.components.schema import phishing_schema, TERNARY_VALUES  # noqa: E402
+from networksecurity.components.row_codec import RowCodec  # noqa: E402
+#----------------------------------------------------------
+REFERENCE_CSV = ROOT_DIR / "network_data" / "phisingData.csv"
+POSITIVE_SHARE = 0.56           # share of label 1 in the reference data
+CSV_CHUNK_ROWS = 250_000
+#----------------------------------------------------------
+def value_frequencies(reference: Path = REFERENCE_CSV, seed: int = 0) -> dict:
+    """
+    {feature: (2, 3) array}: frequencies of -1/0/1 given label -1 (row 0) and
+    label 1 (row 1), from `reference` when readable, else seeded Dirichlet draws.
+    """
+    schema = phishing_schema()
+    features = [name for name in schema.names if name != schema.target_column]
+    if reference is not None and Path(reference).is_file():
+        frame = pd.read_csv(reference)
+        labels = frame[schema.target_column].to_numpy()
+        frequencies = {}
+        for name in features:
+            counts = np.array([[np.sum((labels == label) & (frame[name].to_numpy() == value))
+                                for value in TERNARY_VALUES] for label in (-1, 1)], dtype=np.float64)
+            frequencies[name] = counts / counts.sum(axis=1, keepdims=True)
+        return frequencies
+    rng = np.random.default_rng(seed)
+    return {name: rng.dirichlet(np.ones(len(TERNARY_VALUES)), size=2) for name in features}
+#----------------------------------------------------------
+def _draw_rows(rows: int, frequencies: dict, flatten: float, rng, schema) -> np.ndarray:
+    """(rows, columns) int8 values in schema order; `flatten` blends the frequencies toward uniform."""
+    values = np.empty((rows, len(schema.names)), dtype=np.int8)
+    positive = rng.random(rows) < POSITIVE_SHARE
+    choices = np.asarray(TERNARY_VALUES, dtype=np.int8)
+    for j, name in enumerate(schema.names):
+        if name == schema.target_column:
+            values[:, j] = np.where(positive, 1, -1)
+            continue
+        table = frequencies[name]
+        # Uniform over the values the column takes at all, so binary features stay binary
+        support = (table > 0).astype(np.float64)
+        table = (1.0 - flatten) * table + flatten * support / support.sum(axis=1, keepdims=True)
+        cumulative = np.cumsum(table, axis=1)
+        cumulative[:, -1] = 1.0
+        draws = rng.random(rows)
+        picks = np.where(positive, np.searchsorted(cumulative[1], draws, side="right"),
+                         np.searchsorted(cumulative[0], draws, side="right"))
+        values[:, j] = choices[np.minimum(picks, len(choices) - 1)]
+    return values
+#----------------------------------------------------------
+def _distinct_pool(pool_rows: int, frequencies: dict, missing_rate: float, rng, schema):
+    """
+    (values, missing mask) of `pool_rows` pairwise distinct rows. Value rows are
+    drawn in rounds and repeats rejected; the reference frequencies hold only a
+    few million likely rows, so when a round adds little the frequencies are
+    flattened step by step toward uniform. Values are blanked afterwards, so
+    rejection does not favour rows with missing values; the rare rows that
+    blanking makes equal to another keep all their values.
+    """
+    codec = RowCodec(schema)
+    blocks, seen, flatten = [], np.zeros(0, dtype=np.uint64), 0.0
+    while len(seen) < pool_rows:
+        need = pool_rows - len(seen)
+        values = _draw_rows(int(need * 1.05) + 64, frequencies, flatten, rng, schema)
+        codes = codec.pack(values)
+        _, first = np.unique(codes, return_index=True)
+        first = np.sort(first)
+        first = first[~np.isin(codes[first], seen)][:need]
+        blocks.append(values[first])
+        seen = np.concatenate([seen, codes[first]])
+        if len(first) < need / 2:
+            flatten = min(1.0, flatten + 0.25)
+    values = np.concatenate(blocks)
+    missing = rng.random(values.shape) < missing_rate
+    missing[:, schema.names.index(schema.target_column)] = False
+    if missing.any():
+        codes = codec.pack(values, missing)
+        _, first = np.unique(codes, return_index=True)
+        repeated = np.ones(len(codes), dtype=bool)
+        repeated[first] = False
+        missing[repeated] = False
+    return values, missing
+#----------------------------------------------------------
+def synthetic_frame(rows: int, duplicate_rate: float = 0.0, missing_rate: float = 0.0,
+                    seed: int = 0, frequencies: dict = None) -> pd.DataFrame:
+    """Schema-typed frame (int8, nullable Int8 where values are missing) of `rows` synthetic rows."""
+    if not 0.0 <= duplicate_rate < 1.0 or not 0.0 <= missing_rate < 1.0:
+        raise ValueError("duplicate_rate and missing_rate must be in [0, 1)")
+    schema = phishing_schema()
+    frequencies = frequencies or value_frequencies(seed=seed)
+    rng = np.random.default_rng(seed)
+    pool_rows = max(1, min(rows, int(round(rows * (1.0 - duplicate_rate)))))
+    values, missing = _distinct_pool(pool_rows, frequencies, missing_rate, rng, schema)
+    #----------------------------------------------------------
+    # Every pool row once, the rest copies of random pool rows, shuffled
+    #----------------------------------------------------------
+    index = np.concatenate([np.arange(pool_rows), rng.integers(0, pool_rows, size=rows - pool_rows)])
+    rng.shuffle(index)
+    columns = {}
+    for j, name in enumerate(schema.names):
+        column = values[index, j]
+        mask = missing[index, j]
+        columns[name] = pd.arrays.IntegerArray(column, mask) if mask.any() else column
+    return pd.DataFrame(columns)
+#----------------------------------------------------------
+def duplicate_share(frame: pd.DataFrame) -> float:
+    """Actual share of rows repeating an earlier row (missing values part of the key)."""
+    if len(frame) == 0:
+        return 0.0
+    codes = RowCodec().pack_frame(frame)
+    return 1.0 - len(pd.unique(codes)) / len(frame)
+#----------------------------------------------------------
+def write_csv(frame: pd.DataFrame, path: Path, chunk_rows: int = CSV_CHUNK_ROWS) -> Path:
+    """Writes `frame` in the reference CSV layout (missing values empty), atomically, in chunks."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".partial")
+    with open(partial, "w", newline="") as file:
+        for start in range(0, len(frame), chunk_rows):
+            frame.iloc[start:start + chunk_rows].to_csv(file, index=False, header=start == 0, na_rep="")
+    os.replace(partial, path)
+    return path
+#----------------------------------------------------------
+def dataset_path(directory: Path, rows: int, duplicate_rate: float, missing_rate: float, seed: int = 0) -> Path:
+    return Path(directory) / f"phishing_{rows}_dup{duplicate_rate:g}_miss{missing_rate:g}_seed{seed}.csv"
+#----------------------------------------------------------
+def ensure_dataset(directory: Path, rows: int, duplicate_rate: float = 0.0, missing_rate: float = 0.0,
+                   seed: int = 0) -> Path:
+    """Path of the cached CSV for these arguments, generating it first if it does not exist."""
+    path = dataset_path(directory, rows, duplicate_rate, missing_rate, seed)
+    if not path.exists():
+        write_csv(synthetic_frame(rows, duplicate_rate, missing_rate, seed), path)
+    return path
+#----------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Synthetic phishing dataset generator")
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--duplicate-rate", type=float, default=0.0, help="Share of rows repeating an earlier row.")
+    parser.add_argument("--missing-rate", type=float, default=0.0, help="Share of feature values left empty.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    #----------------------------------------------------------
+    frame = synthetic_frame(args.rows, args.duplicate_rate, args.missing_rate, args.seed)
+    write_csv(frame, args.output)
+    print(f"{args.output}: {len(frame)} rows, duplicate share {duplicate_share(frame):.4f}, "
+          f"missing share {frame.drop(columns=[phishing_schema().target_column]).isna().to_numpy().mean():.4f}")
+    return args.output
+#----------------------------------------------------------
+if __name__ == "__main__":
+    main()
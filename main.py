@@ -1,39 +1,76 @@
 import sys
+import argparse
 from networksecurity.components.logger import ns_logger
 import networksecurity.components.exception as ns_exception
-from networksecurity.components.push_data import NetworkDataExtractor
-from networksecurity.components.data_ingestion import DataIngestion
+from networksecurity.components.stage_cache import StageCache
+from networksecurity.components.instrumentation import ns_metrics, PROFILE_MODES
+from networksecurity.components.mongo_client import mongo_registry
+import networksecurity.components.constants as constants
+from networksecurity.pipeline.pipeline_runner import PipelineRunner
 #----------------------------------------------------------
 # Assuming MasterConfig is imported from your entity configuration
 from networksecurity.entity.config_app import MasterPipelineConfig
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Network security data pipeline")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-run every selected stage even if its outputs are up to date.")
+    parser.add_argument("--invalidate-cache", action="store_true",
+                        help="Drop the ingestion stage cache before running.")
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument("--stage", default=None,
+                           help="Run only this stage (e.g. push, ingest, validate, drift, transform, train).")
+    selection.add_argument("--from-stage", default=None,
+                           help="Run this stage and every stage downstream of it.")
+    parser.add_argument("--accept-drift", action="store_true",
+                        help="Merge rows held back by the drift check into the reference before running.")
+    parser.add_argument("--profile", default=None, choices=[mode for mode in PROFILE_MODES if mode],
+                        help="Profile the run with cProfile or tracemalloc (overrides RUN_PROFILE_MODE).")
+    return parser.parse_args(argv)
+
+def main(force: bool = False, invalidate_cache: bool = False, stage: str = None, from_stage: str = None,
+         profile: str = None, accept_drift: bool = False):
+    training = None
     try:
         # 1. Initialize Master Configuration
         # This single object contains mongodb, ingestion, and training configurations
         master_config = MasterPipelineConfig()
         ns_logger.log_info("Master Configuration initialized.")
-        # 2. Data Extraction and MongoDB Push
-        ns_logger.log_info("Starting to push network security data to MongoDB - Atlas.")
-        # Accessing mongo_config through the master object
-        extractor = NetworkDataExtractor(config=master_config.mongodb)
-        json_data = extractor.cv_to_json(master_config.mongodb.file_path)
-        extractor.push_data_to_mongo(json_data)
-        ns_logger.log_info("Data push to MongoDB - Atlas completed successfully.")
-        # 3. Data Ingestion
-        ns_logger.log_info("Starting data ingestion process.")
-        # Passing sub-configs directly from the master_config object
-        data_ingestion = DataIngestion(
-            mongodb_config=master_config.mongodb,
-            ingestion_config=master_config.ingestion,
-            train_config=master_config.training_pipeline,
-            ingestion_artifact_config=master_config.ingestion_artifact
-        )
-        data_ingestion.initiate_data_ingestion()
-        ns_logger.log_info("Data ingestion and artifact generation completed successfully.")
+        training = master_config.training_pipeline
+        ns_metrics.start_run(profile_mode=profile if profile is not None else training.profile_mode)
+        if invalidate_cache:
+            StageCache(master_config.ingestion.stage_cache_file_and_path).invalidate()
+        if accept_drift:
+            from networksecurity.components.drift import DriftMonitor
+            from networksecurity.components.mongo_client import get_mongo_client
+            mongodb = master_config.mongodb
+            monitor = DriftMonitor(drift_config=master_config.drift)
+            # A failed drift check does not save its rows, so count them before accepting
+            monitor.add_new_documents(get_mongo_client(mongodb)[mongodb.mongo_db_name][mongodb.mongo_db_collection_name])
+            monitor.accept_pending()
+            monitor.save_state()
+            ns_logger.log_info("Pending drift rows accepted into the reference.")
+        # 2. Run the stage graph (push -> ingest -> validate -> drift -> transform -> train); independent stages run concurrently
+        runner = PipelineRunner.from_config(master_config, force=force)
+        results = runner.run(only=stage, from_stage=from_stage, force=force)
+        for result in results.values():
+            ns_logger.log_info("Stage '%s': %s (%.2fs)", result.name, result.status, result.seconds)
+        ns_logger.log_info("Pipeline completed successfully.")
 
     except Exception as e:
         raise ns_exception.CustomException(e, sys) from e
+    finally:
+        # 3. Run report: per-stage wall/CPU time, RSS growth, rows and bytes
+        if training is not None:
+            report_path = ns_metrics.write_report(
+                training.run_report_dir, training.timestamp,
+                latest_file_name=constants.RUN_REPORT_LATEST_FILE,
+                extra={"selected_stage": stage, "from_stage": from_stage, "force": force,
+                       "mongo_pool": mongo_registry.pool_stats()})
+            ns_logger.log_info("Run report written to: %s", report_path)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    main(force=args.force, invalidate_cache=args.invalidate_cache,
+         stage=args.stage, from_stage=args.from_stage, profile=args.profile,
+         accept_drift=args.accept_drift)
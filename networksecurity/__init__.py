@@ -1,4 +0,0 @@
-import os
-import sys
-import numpy as np
-import pandas as pd
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+Artifact Writer Module
+Serializes and writes ingestion artifacts on a thread pool. Each file is written
+to a temp path and atomically renamed into place (see utils.atomic_path), each
+target directory is created once, and byte counts / write times are recorded.
+"""
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+#----------------------------------------------------------
+import networksecurity.components.constants as constants
+from networksecurity.components import utils
+from networksecurity.components.logger import ns_logger
+from networksecurity.components.exception import CustomException
+from networksecurity.entity.config_app import ArtifactWriteStats
+#----------------------------------------------------------
+class ArtifactWriter:
+    """
+    Usage:
+        with ArtifactWriter() as writer:
+            writer.write("raw_data", df, path)
+        stats = writer.stats
+    Leaving the block waits for every write and raises if any of them failed.
+    """
+    def __init__(self, max_workers: int = None):
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers or constants.ARTIFACT_WRITER_MAX_WORKERS, thread_name_prefix="artifact-writer")
+        self._futures: Dict[str, Future] = {}
+        self._created_dirs = set()
+        self.stats: Dict[str, ArtifactWriteStats] = {}
+    #----------------------------------------------------------
+    def _ensure_dir(self, directory: Path) -> None:
+        # Called on the submitting thread only, so the set needs no lock
+        if directory not in self._created_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(directory)
+    #----------------------------------------------------------
+    def call(self, name: str, file_path, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Runs `fn(*args, **kwargs)`, which must produce `file_path`, on the pool.
+        Names key the stats and errors, so a name already queued is rejected.
+        """
+        if name in self._futures:
+            raise ValueError(f"Artifact '{name}' is already queued on this writer")
+        path = Path(file_path)
+        self._ensure_dir(path.parent)
+        def run() -> ArtifactWriteStats:
+            start = time.perf_counter()
+            fn(*args, **kwargs)
+            seconds = time.perf_counter() - start
+            return ArtifactWriteStats(name=name, path=str(path), bytes=_artifact_bytes(path), seconds=seconds)
+        future = self._pool.submit(run)
+        self._futures[name] = future
+        return future
+    #----------------------------------------------------------
+    def write(self, name: str, data, file_path) -> Future:
+        """Queues a DataFrame/Series for an atomic write via utils.write_artifact."""
+        return self.call(name, file_path, utils.write_artifact, data, file_path)
+    #----------------------------------------------------------
+    def wait(self) -> Dict[str, ArtifactWriteStats]:
+        """Blocks until all queued writes finish; raises on the first failure."""
+        try:
+            wait(list(self._futures.values()))
+            errors = []
+            for name, future in self._futures.items():
+                if future.exception() is not None:
+                    errors.append(f"{name}: {future.exception()}")
+                elif name not in self.stats:
+                    record = future.result()
+                    self.stats[name] = record
+                    ns_logger.log_info(
+                        "Artifact '%s' written: %d bytes in %.3fs -> %s",
+                        name, record.bytes, record.seconds, record.path)
+            if errors:
+                raise RuntimeError(f"{len(errors)} artifact write(s) failed: {'; '.join(errors)}")
+            return self.stats
+        except Exception as e:
+            raise CustomException(e, sys) from e
+    #----------------------------------------------------------
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+    #----------------------------------------------------------
+    def finish(self) -> Dict[str, ArtifactWriteStats]:
+        """wait() and then shut the pool down, even if a write failed."""
+        try:
+            return self.wait()
+        finally:
+            self.close()
+    #----------------------------------------------------------
+    def __enter__(self) -> "ArtifactWriter":
+        return self
+    #----------------------------------------------------------
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.finish()
+        else:
+            self.close()
+#----------------------------------------------------------
+def _artifact_bytes(path: Path) -> int:
+    """Size of the artifact plus its .npy sidecars, if any."""
+    total = path.stat().st_size if path.exists() else 0
+    for sidecar in (path.with_name(f"{path.stem}.meta.json"), path.with_name(f"{path.stem}.mask.npy")):
+        if path.suffix == ".npy" and sidecar.exists():
+            total += sidecar.stat().st_size
+    return total
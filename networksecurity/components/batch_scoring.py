@@ -0,0 +1,221 @@
+"""
+Batch Scoring Module
+Scores feature files offline with the saved preprocessor and model.
+  * The model and preprocessor are loaded once, or once per worker process.
+  * The input is CSV or NDJSON, with the columns of
+    network_data/phisingData.csv. The target column is optional, and
+    compression is inferred from the suffix. It is read in chunks.
+  * Each chunk is checked against the schema, transformed and predicted as
+    whole arrays.
+  * With more than one worker, chunks are scored on a process pool with a
+    bounded number in flight. They are written to the output in input order.
+The chunk size is derived from the memory budget, so peak memory does not
+depend on the size of the input.
+"""
+import sys
+import time
+import multiprocessing
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from collections import deque
+from typing import Iterator, List
+from concurrent.futures import ProcessPoolExecutor
+#----------------------------------------------------------
+from networksecurity.components import utils
+import networksecurity.components.constants as constants
+from networksecurity.components.logger import ns_logger
+from networksecurity.components.exception import CustomException
+from networksecurity.components.instrumentation import ns_metrics
+from networksecurity.components.schema import DatasetSchema, phishing_schema
+from networksecurity.components.preprocessing import TernaryStandardizer
+from networksecurity.components.data_validation import DataValidation, frame_to_block, REASON_COLUMN
+from networksecurity.entity.config_app import BatchScoringConfig, BatchScoringArtifact, DataValidationConfig
+from networksecurity.entity.data_validation import ValidationReason
+#----------------------------------------------------------
+ROW_COLUMN = "row"
+PREDICTION_COLUMN = "prediction"
+PROBABILITY_COLUMN = "probability"
+# Rough peak bytes per input value while a chunk is scored: parser buffers,
+# the float64 block, its transformed copy and the output frame
+_BYTES_PER_VALUE = 48
+_MIN_CHUNK_ROWS = 1_000
+_FEATURE_REASONS = np.uint8(ValidationReason.INVALID_FEATURE | ValidationReason.NULL_FEATURE)
+#----------------------------------------------------------
+def iter_input_chunks(file_path, chunk_size: int, columns: List[str]) -> Iterator[pd.DataFrame]:
+    """
+    Yields CSV or NDJSON input (by suffix, e.g. urls.ndjson.gz) in chunks of
+    `chunk_size` rows, keeping only `columns`, indexed by input row number.
+    """
+    path = Path(file_path)
+    wanted = set(columns)
+    if any(suffix in utils.NDJSON_SUFFIXES for suffix in path.suffixes):
+        reader = pd.read_json(path, lines=True, chunksize=chunk_size, dtype=False)
+    else:
+        # low_memory=False: each chunk is parsed in one pass, so mixed-type columns are not guessed per block
+        reader = pd.read_csv(path, chunksize=chunk_size, usecols=lambda column: column in wanted,
+                             na_values=list(constants.MISSING_VALUE_SENTINELS), low_memory=False)
+    start = 0
+    with reader:
+        for chunk in reader:
+            chunk = chunk[[column for column in chunk.columns if column in wanted]]
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            start += len(chunk)
+            yield chunk
+#----------------------------------------------------------
+class ChunkScorer:
+    """Holds the loaded model and preprocessor and scores one DataFrame chunk at a time."""
+    def __init__(self, model_file_path, preprocessor_file_path, schema: DatasetSchema = None,
+                 id_columns: List[str] = ()):
+        import joblib
+        model_payload = joblib.load(model_file_path)
+        preprocessor_payload = joblib.load(preprocessor_file_path)
+        expected = model_payload.get("preprocessor_fingerprint")
+        if expected and expected != preprocessor_payload.get("fingerprint"):
+            raise ValueError(
+                f"The preprocessor at {preprocessor_file_path} is not the one the model at "
+                f"{model_file_path} was trained with; re-run the transform and train stages.")
+        self.model = model_payload["model"]
+        self.preprocessor = preprocessor_payload["preprocessor"]
+        self.schema = schema or phishing_schema()
+        self.features = self.schema.feature_names
+        self.id_columns = list(id_columns)
+        self.validator = DataValidation(DataValidationConfig(), self.schema)
+        self._feature_index = np.array([self.schema.names.index(name) for name in self.features])
+        self.classes = np.asarray(self.model.classes_)
+        positive = self.classes == self.schema.positive_label
+        self._positive = int(np.flatnonzero(positive)[0]) if positive.any() else -1
+    #----------------------------------------------------------
+    def score_block(self, block: np.ndarray):
+        """
+        Scores a float64 block in schema column order (NaN = missing, inf =
+        non-numeric). Returns (prediction, probability of the schema's positive
+        label (phishing, -1), feature reason codes, rows without a prediction).
+        Rows with out-of-schema feature values get no prediction; missing values
+        are imputed as in training.
+        """
+        codes = self.validator.check_block(block)[0] & _FEATURE_REASONS
+        invalid = (codes & np.uint8(ValidationReason.INVALID_FEATURE)) != 0
+        features = block[:, self._feature_index]
+        features[invalid] = np.nan
+        if not isinstance(self.preprocessor, TernaryStandardizer):
+            features = pd.DataFrame(features, columns=self.features, copy=False)
+        transformed = self.preprocessor.transform(features)
+        if hasattr(self.model, "predict_proba"):
+            proba = self.model.predict_proba(transformed)
+            prediction = self.classes[proba.argmax(axis=1)]
+            probability = proba[:, self._positive] if self._positive >= 0 else np.full(len(block), np.nan)
+        else:
+            prediction = self.model.predict(transformed)
+            probability = np.full(len(block), np.nan)
+        return prediction, np.where(invalid, np.nan, probability), codes, invalid
+    #----------------------------------------------------------
+    def score(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Output frame of `frame`: id columns, input row number, prediction, probability and reason code."""
+        missing = [name for name in [*self.id_columns, *self.features] if name not in frame.columns]
+        if missing:
+            raise ValueError(f"Input is missing columns: {missing}")
+        # Target column, if absent, reads as missing; only feature reasons are reported
+        block = frame_to_block(frame.reindex(columns=self.schema.names), self.schema.names)
+        prediction, probability, codes, invalid = self.score_block(block)
+        scored = {column: frame[column].to_numpy() for column in self.id_columns}
+        scored[ROW_COLUMN] = frame.index.to_numpy()
+        scored[PREDICTION_COLUMN] = pd.arrays.IntegerArray(prediction.astype(np.int8), invalid)
+        scored[PROBABILITY_COLUMN] = probability.astype(np.float32)
+        scored[REASON_COLUMN] = codes
+        return pd.DataFrame(scored)
+#----------------------------------------------------------
+# Process-pool workers: one ChunkScorer per process
+#----------------------------------------------------------
+_WORKER_SCORER = None
+#----------------------------------------------------------
+def _init_worker(model_file_path, preprocessor_file_path, id_columns) -> None:
+    global _WORKER_SCORER
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(limits=1)     # parallelism comes from the pool
+    _WORKER_SCORER = ChunkScorer(model_file_path, preprocessor_file_path, id_columns=id_columns)
+#----------------------------------------------------------
+def _score_in_worker(frame: pd.DataFrame) -> pd.DataFrame:
+    return _WORKER_SCORER.score(frame)
+#----------------------------------------------------------
+class BatchScorer:
+    def __init__(self, scoring_config: BatchScoringConfig, schema: DatasetSchema = None):
+        self.scoring_config = scoring_config
+        self.schema = schema or phishing_schema()
+    #----------------------------------------------------------
+    @property
+    def workers(self) -> int:
+        return max(1, self.scoring_config.max_workers)
+    #----------------------------------------------------------
+    def plan_chunk_size(self, n_columns: int) -> int:
+        """Largest chunk (up to `chunk_size`) for which every chunk in flight fits the memory budget."""
+        config = self.scoring_config
+        in_flight = 2 * self.workers + 1 if self.workers > 1 else 1
+        budget_rows = config.memory_budget_mb * 2 ** 20 // (in_flight * max(n_columns, 1) * _BYTES_PER_VALUE)
+        return int(max(_MIN_CHUNK_ROWS, min(config.chunk_size, budget_rows)))
+    #----------------------------------------------------------
+    @ns_metrics.instrument("batch_scoring", rows=lambda artifact: artifact.rows)
+    def score_file(self, input_file_path, output_file_path) -> BatchScoringArtifact:
+        """
+        Scores `input_file_path` into `output_file_path` (.csv, .ndjson/.jsonl,
+        .parquet or .feather). The output appears atomically when scoring is done.
+        """
+        try:
+            config = self.scoring_config
+            columns = [*config.id_columns, *self.schema.names]
+            chunk_size = self.plan_chunk_size(len(columns))
+            started = time.perf_counter()
+            totals = {"rows": 0, "invalid_rows": 0, "chunks": 0}
+            output_path = Path(output_file_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            ns_logger.log_info("Scoring %s with %d worker(s), %d rows per chunk.",
+                               input_file_path, self.workers, chunk_size)
+            #----------------------------------------------------------
+            def emit(scored: pd.DataFrame) -> None:
+                sink.write(scored)
+                totals["rows"] += len(scored)
+                totals["invalid_rows"] += int(scored[PREDICTION_COLUMN].isna().sum())
+                totals["chunks"] += 1
+                ns_logger.log_debug("Scored chunk %d (%d rows total).", totals["chunks"], totals["rows"])
+            #----------------------------------------------------------
+            chunks = iter_input_chunks(input_file_path, chunk_size, columns)
+            with utils.atomic_path(output_path) as tmp_path:
+                sink = utils.FrameSink(tmp_path)
+                try:
+                    if self.workers == 1:
+                        scorer = ChunkScorer(config.model_file_and_path, config.preprocessor_file_and_path,
+                                             self.schema, config.id_columns)
+                        for chunk in chunks:
+                            emit(scorer.score(chunk))
+                    else:
+                        context = multiprocessing.get_context(config.start_method)
+                        with ProcessPoolExecutor(
+                                self.workers, mp_context=context, initializer=_init_worker,
+                                initargs=(config.model_file_and_path, config.preprocessor_file_and_path,
+                                          config.id_columns)) as executor:
+                            # Bounded read-ahead keeps memory flat; results are written in input order
+                            pending = deque()
+                            for chunk in chunks:
+                                pending.append(executor.submit(_score_in_worker, chunk))
+                                if len(pending) >= 2 * self.workers:
+                                    emit(pending.popleft().result())
+                            while pending:
+                                emit(pending.popleft().result())
+                finally:
+                    sink.close()
+            seconds = time.perf_counter() - started
+            artifact = BatchScoringArtifact(
+                input_file_path=Path(input_file_path),
+                output_file_path=output_path,
+                rows=totals["rows"],
+                invalid_rows=totals["invalid_rows"],
+                chunks=totals["chunks"],
+                chunk_size=chunk_size,
+                workers=self.workers,
+                seconds=round(seconds, 3),
+                rows_per_second=round(totals["rows"] / seconds, 1) if seconds > 0 else 0.0)
+            ns_logger.log_info("Scored %d rows (%d without prediction) in %.2fs: %.0f rows/s -> %s",
+                               artifact.rows, artifact.invalid_rows, seconds, artifact.rows_per_second, output_path)
+            return artifact
+        except Exception as e:
+            raise CustomException(e, sys) from e
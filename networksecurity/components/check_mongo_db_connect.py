@@ -1,17 +1,18 @@
 
-from pymongo.mongo_client import MongoClient
 from pymongo.server_api import ServerApi
 from networksecurity.components.constants import MONGO_DB_URI
+from networksecurity.components.mongo_client import mongo_registry
 
 # Replace the uri string with your MongoDB deployment's connection string.
 uri = MONGO_DB_URI
 
-# Create a new client and connect to the server
-client = MongoClient(uri, server_api=ServerApi('1'))
+# Get the shared client for this URI and connect to the server
+client = mongo_registry.get(uri, server_api=ServerApi('1'))
 
 # Send a ping to confirm a successful connection
 try:
     client.admin.command('ping')
     print("Pinged your deployment. You successfully connected to MongoDB!")
+    print(mongo_registry.pool_stats())
 except Exception as e:
-    print(e)
\ No newline at end of file
+    print(e)
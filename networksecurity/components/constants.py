@@ -1,6 +1,14 @@
-from pathlib import Path
-from dotenv import find_dotenv, load_dotenv
+"""
+Project constants.
+File names and other fixed values are plain module attributes. Everything that
+depends on the environment (.env / os.environ) or on the project root is
+resolved on first access through the module `__getattr__`, then cached as a
+regular attribute. Importing this module therefore neither touches the
+filesystem nor parses the environment; that happens once, on first use.
+"""
 import os
+import threading
+from pathlib import Path
 #----------------------------------------------------------------------------------------------------
 def get_project_root() -> Path:
     #------------------------------------------------------------------------------------------------
@@ -18,91 +26,261 @@ def get_project_root() -> Path:
 
     return Path(__file__).resolve().parent
 #----------------------------------------------------------------------------------------------------
-# 1. Establish the Anchor Paths for Root, Raw Data, and Processed Data
+# Static constants (no environment or filesystem access)
 #----------------------------------------------------------------------------------------------------
-ROOT_DIR = get_project_root()
-#----------------------------------------------------------
-load_dotenv(find_dotenv())
-#----------------------------------------------------------
-NETWORK_DATA_DIR: Path = ROOT_DIR / 'network_data'
-NETWORK_DATA_FILE_AND_PATH: Path = NETWORK_DATA_DIR / os.getenv("LOAD-DATA-FILE-TO-MONGO")
-MONGO_DB=os.getenv("MONGO-DB")
-MONGO_DB_COLLECTION=os.getenv("MONGO-DB-COLLECTION")
-MONGO_DB_SUFFIX = os.getenv("MONGO-DB-URI-SUFFIX")
-MONGO_DB_URI = os.getenv("MONGO-DB-URI")
-#----------------------------------------------------------
-DATA_INGESTION_DB_NAME = os.getenv("MONGO-DB")
-DATA_INGESTION_COLLECTION_NAME = os.getenv("MONGO-DB-COLLECTION")
-#----------------------------------------------------------
-ARTIFACT_DIR: Path = ROOT_DIR / 'artifact'
-#----------------------------------------------------------
-DATA_INGESTION_DIR: Path = ARTIFACT_DIR / 'data_ingestion'
-DATA_INGESTION_FEATURE_STORE_DIR: Path = DATA_INGESTION_DIR / 'feature_store'
-DATA_INGESTION_INGESTED_DIR: Path = DATA_INGESTION_DIR / 'ingested'
-DATA_INGESTION_TRAIN_TEST_SPLIT_RATION = float(os.getenv("TRAIN-TEST-SPLIT-RATION"))
-#----------------------------------------------------------
-FILE_NAME=os.getenv("LOAD-DATA-FILE-TO-MONGO", "phisingData.csv")
-RAW_FILE_NAME=os.getenv("RAW-FILE-NAME", "raw_data.csv")
-FEATURE_FILE_NAME_AND_PATH: Path = DATA_INGESTION_FEATURE_STORE_DIR / RAW_FILE_NAME
 TRAIN_FILE_NAME = "train.csv"
-TRAIN_FILE_NAME_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / TRAIN_FILE_NAME
 TEST_FILE_NAME = "test.csv"
-TEST_FILE_NAME_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / TEST_FILE_NAME
-#----------------------------------------------------------------------------------------------------
-# 3. Model Training Constants
-TARGET_COLUMN = os.getenv("TARGET-COLUMN", "Result")
 PIPELINE_NAME = "network_security_pipeline"
-FILE_NAME_AND_PATH: Path = DATA_INGESTION_FEATURE_STORE_DIR / FILE_NAME
-#----------------------------------------------------------------------------------------------------
-# 4. Other Constants
-#----------------------------------------------------------------------------------------------------
-TEST_SIZE = float(os.getenv("TEST_SIZE"))
-TEST_SIZE_VAL = float(os.getenv("TEST_SIZE_VAL"))
-RANDOM_STATE = int(os.getenv("RANDOM_STATE"))
-LOG_FILE_MAX_BYTES = int(os.getenv("LOG_FILE_MAX_BYTES")) # 10 MB
-LOG_FILE_BACKUP_COUNT = int(os.getenv("LOG_FILE_BACKUP_COUNT")) # 5 backups
-#----------------------------------------------------------------------------------------------------
+#----------------------------------------------------------
 DATA_PROCESSED_FILE = "data.csv"
 X_FILE = "X.csv"
-X_FILE_AND_PATH: Path = DATA_INGESTION_FEATURE_STORE_DIR / X_FILE 
 Y_FILE = "y.csv"
-Y_FILE_AND_PATH: Path = DATA_INGESTION_FEATURE_STORE_DIR / Y_FILE
-#------------------------------------------------------------------------------------
 X_TRAIN_FILE = "X_train.csv"
-X_TRAIN_FILE_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / X_TRAIN_FILE
 Y_TRAIN_FILE = "y_train.csv"
-Y_TRAIN_FILE_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / Y_TRAIN_FILE
-#------------------------------------------------------------------------------------
 X_VAL_FILE = "X_val.csv"
-X_VAL_FILE_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / X_VAL_FILE
 Y_VAL_FILE = "y_val.csv"
-Y_VAL_FILE_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / Y_VAL_FILE
-#------------------------------------------------------------------------------------
 X_TEST_FILE = "X_test.csv"
-X_TEST_FILE_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / X_TEST_FILE
 Y_TEST_FILE = "y_test.csv"
-Y_TEST_FILE_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / Y_TEST_FILE
-#--------------------------------------------------------------------------------
-DATA_VALIDATION_DIR = ARTIFACT_DIR / 'data_validation'
-#------------------------------------------------------------------------------------
 X_TRAIN_TRANSFORMED_FILE = "X_train_transformed.csv"
-X_TRAIN_TRANSFORMED_FILE_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / X_TRAIN_TRANSFORMED_FILE
 X_VAL_TRANSFORMED_FILE = "X_val_transformed.csv"
-X_VAL_TRANSFORMED_FILE_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / X_VAL_TRANSFORMED_FILE
 X_TEST_TRANSFORMED_FILE = "X_test_transformed.csv"
-X_TEST_TRANSFORMED_FILE_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / X_TEST_TRANSFORMED_FILE
 JOBLIB_FILE = "preprocessor.joblib"
-#------------------------------------------------------------------------------------
-DATA_VALIDATION_DIR: Path = ROOT_DIR / 'data_validation'
-DATA_VALIDATION_VALID_DIR: Path = DATA_VALIDATION_DIR / 'validated'
-DATA_VALIDATION_INVALID_DIR: Path = DATA_VALIDATION_DIR / 'invalided'
-DATA_VALIDATION_DRIFT_REPORT_DIR: Path = DATA_VALIDATION_DIR / 'drift_report'
+MODEL_FILE = "model.joblib"
 DATA_VALIDATION_DRIFT_REPORT_FILE_NAME: str = "drift_report.yaml"
+#----------------------------------------------------------
+ROW_FINGERPRINT_FIELD = "row_fingerprint"
+PUSH_GENERATION_FIELD = "push_generation"     # incremental push that last saw a row
+PUSH_SEQUENCE_FIELD = "push_seq"              # push batch that first inserted a row; only increases
+ROW_COUNT_COLUMN = "row_count"      # rows a collapsed (deduplicated) row stands for
+MISSING_VALUE_SENTINELS = ("na", "NA", "", "nan")
+ARTIFACT_FORMAT_SUFFIXES = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather", "npy": ".npy"}
+SPLIT_INDEX_FILE = "split_index.npz"
+SPLIT_METHODS = ("random", "hash")
+RUN_REPORT_LATEST_FILE = "run_report_latest.json"
+#----------------------------------------------------------------------------------------------------
+# Lazily resolved constants (environment and project paths)
+#----------------------------------------------------------------------------------------------------
+def _resolve_constants() -> dict:
+    """Loads .env once and computes every environment/path dependent constant."""
+    from dotenv import find_dotenv, load_dotenv
+    #------------------------------------------------------------------------------------------------
+    # 1. Establish the Anchor Paths for Root, Raw Data, and Processed Data
+    #------------------------------------------------------------------------------------------------
+    ROOT_DIR = get_project_root()
+    #----------------------------------------------------------
+    load_dotenv(find_dotenv())
+    #----------------------------------------------------------
+    NETWORK_DATA_DIR: Path = ROOT_DIR / 'network_data'
+    NETWORK_DATA_FILE_AND_PATH: Path = NETWORK_DATA_DIR / os.getenv("LOAD-DATA-FILE-TO-MONGO")
+    MONGO_DB=os.getenv("MONGO-DB")
+    MONGO_DB_COLLECTION=os.getenv("MONGO-DB-COLLECTION")
+    MONGO_DB_SUFFIX = os.getenv("MONGO-DB-URI-SUFFIX")
+    MONGO_DB_URI = os.getenv("MONGO-DB-URI")
+    #----------------------------------------------------------
+    DATA_INGESTION_DB_NAME = os.getenv("MONGO-DB")
+    DATA_INGESTION_COLLECTION_NAME = os.getenv("MONGO-DB-COLLECTION")
+    #----------------------------------------------------------
+    ARTIFACT_DIR: Path = ROOT_DIR / 'artifact'
+    #----------------------------------------------------------
+    DATA_INGESTION_DIR: Path = ARTIFACT_DIR / 'data_ingestion'
+    DATA_INGESTION_FEATURE_STORE_DIR: Path = DATA_INGESTION_DIR / 'feature_store'
+    DATA_INGESTION_INGESTED_DIR: Path = DATA_INGESTION_DIR / 'ingested'
+    DATA_INGESTION_TRAIN_TEST_SPLIT_RATION = float(os.getenv("TRAIN-TEST-SPLIT-RATION"))
+    #----------------------------------------------------------
+    FILE_NAME=os.getenv("LOAD-DATA-FILE-TO-MONGO", "phisingData.csv")
+    RAW_FILE_NAME=os.getenv("RAW-FILE-NAME", "raw_data.csv")
+    FEATURE_FILE_NAME_AND_PATH: Path = DATA_INGESTION_FEATURE_STORE_DIR / RAW_FILE_NAME
+    TRAIN_FILE_NAME_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / TRAIN_FILE_NAME
+    TEST_FILE_NAME_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / TEST_FILE_NAME
+    #------------------------------------------------------------------------------------------------
+    # 3. Model Training Constants
+    TARGET_COLUMN = os.getenv("TARGET-COLUMN", "Result")
+    FILE_NAME_AND_PATH: Path = DATA_INGESTION_FEATURE_STORE_DIR / FILE_NAME
+    #------------------------------------------------------------------------------------------------
+    # 4. Other Constants
+    #------------------------------------------------------------------------------------------------
+    TEST_SIZE = float(os.getenv("TEST_SIZE"))
+    TEST_SIZE_VAL = float(os.getenv("TEST_SIZE_VAL"))
+    RANDOM_STATE = int(os.getenv("RANDOM_STATE"))
+    SPLIT_METHOD = os.getenv("SPLIT_METHOD", "random")   # "random" (sklearn) or "hash" (stable, content-keyed)
+    LOG_FILE_MAX_BYTES = int(os.getenv("LOG_FILE_MAX_BYTES")) # 10 MB
+    LOG_FILE_BACKUP_COUNT = int(os.getenv("LOG_FILE_BACKUP_COUNT")) # 5 backups
+    LOG_ASYNC = os.getenv("LOG_ASYNC", "true").lower() in ("1", "true", "yes")   # queue + listener thread
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "text")     # "text" or "json" (JSON lines)
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    #------------------------------------------------------------------------------------------------
+    X_FILE_AND_PATH: Path = DATA_INGESTION_FEATURE_STORE_DIR / X_FILE
+    Y_FILE_AND_PATH: Path = DATA_INGESTION_FEATURE_STORE_DIR / Y_FILE
+    X_TRAIN_FILE_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / X_TRAIN_FILE
+    Y_TRAIN_FILE_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / Y_TRAIN_FILE
+    X_VAL_FILE_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / X_VAL_FILE
+    Y_VAL_FILE_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / Y_VAL_FILE
+    X_TEST_FILE_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / X_TEST_FILE
+    Y_TEST_FILE_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / Y_TEST_FILE
+    #------------------------------------------------------------------------------------
+    X_TRAIN_TRANSFORMED_FILE_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / X_TRAIN_TRANSFORMED_FILE
+    X_VAL_TRANSFORMED_FILE_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / X_VAL_TRANSFORMED_FILE
+    X_TEST_TRANSFORMED_FILE_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / X_TEST_TRANSFORMED_FILE
+    #------------------------------------------------------------------------------------
+    DATA_VALIDATION_DIR: Path = ROOT_DIR / 'data_validation'
+    DATA_VALIDATION_VALID_DIR: Path = DATA_VALIDATION_DIR / 'validated'
+    DATA_VALIDATION_INVALID_DIR: Path = DATA_VALIDATION_DIR / 'invalided'
+    DATA_VALIDATION_DRIFT_REPORT_DIR: Path = DATA_VALIDATION_DIR / 'drift_report'
+    #------------------------------------------------------------------------------------------------
+    # 5. MongoDB Streaming Push Constants
+    #------------------------------------------------------------------------------------------------
+    PUSH_CHUNK_SIZE = int(os.getenv("PUSH_CHUNK_SIZE", "50000"))     # CSV rows parsed per chunk
+    PUSH_BATCH_SIZE = int(os.getenv("PUSH_BATCH_SIZE", "5000"))      # documents per insert_many
+    PUSH_MAX_WORKERS = int(os.getenv("PUSH_MAX_WORKERS", "4"))       # concurrent insert threads
+    PUSH_MAX_IN_FLIGHT = int(os.getenv("PUSH_MAX_IN_FLIGHT", "8"))   # batches queued or running
+    # Document layout shared by push, ingestion and drift reads: document | packed_row | packed_batch
+    MONGO_STORAGE_MODE = os.getenv("MONGO_STORAGE_MODE", "document")
+    #----------------------------------------------------------
+    PUSH_MANIFEST_DIR: Path = ARTIFACT_DIR / 'data_push'
+    PUSH_MANIFEST_FILE_NAME_AND_PATH: Path = PUSH_MANIFEST_DIR / 'push_manifest.json'
+    #------------------------------------------------------------------------------------------------
+    # 6. MongoDB Read Constants
+    #------------------------------------------------------------------------------------------------
+    MONGO_READ_BATCH_SIZE = int(os.getenv("MONGO_READ_BATCH_SIZE", "10000"))  # documents per cursor batch
+    MONGO_READ_PARTITIONS = int(os.getenv("MONGO_READ_PARTITIONS", "1"))     # >1: parallel _id-range reads
+    MONGO_READ_WORKERS = int(os.getenv("MONGO_READ_WORKERS", "0"))           # 0 = one worker per partition
+    MONGO_READ_PARTITION_RETRIES = int(os.getenv("MONGO_READ_PARTITION_RETRIES", "2"))
+    #------------------------------------------------------------------------------------------------
+    # 7. Artifact Format Constants
+    #------------------------------------------------------------------------------------------------
+    ARTIFACT_FORMAT = os.getenv("ARTIFACT_FORMAT", "csv")
+    ARTIFACT_COMPRESSION = os.getenv("ARTIFACT_COMPRESSION", "zstd")   # parquet / feather codec
+    #----------------------------------------------------------
+    # "copy" writes X/y and every split as separate files; "index" writes the
+    # dataset once plus row-index arrays per split (see components/split_store.py)
+    SPLIT_STORAGE = os.getenv("SPLIT_STORAGE", "copy")
+    SPLIT_INDEX_FILE_AND_PATH: Path = DATA_INGESTION_INGESTED_DIR / SPLIT_INDEX_FILE
+    ARTIFACT_WRITER_MAX_WORKERS = int(os.getenv("ARTIFACT_WRITER_MAX_WORKERS", "4"))
+    #------------------------------------------------------------------------------------------------
+    # 8. Stage Cache Constants
+    #------------------------------------------------------------------------------------------------
+    DATA_INGESTION_STAGE_CACHE_FILE_AND_PATH: Path = DATA_INGESTION_DIR / 'stage_cache.json'
+    USE_STAGE_CACHE = os.getenv("USE_STAGE_CACHE", "true").lower() in ("1", "true", "yes")
+    PIPELINE_MAX_WORKERS = int(os.getenv("PIPELINE_MAX_WORKERS", "4"))   # stages run concurrently
+    #------------------------------------------------------------------------------------------------
+    # 9. Instrumentation Constants
+    #------------------------------------------------------------------------------------------------
+    RUN_REPORT_DIR: Path = ARTIFACT_DIR / 'run_reports'
+    RUN_PROFILE_MODE = os.getenv("RUN_PROFILE_MODE", "")   # "", "cprofile" or "tracemalloc"
+    #------------------------------------------------------------------------------------------------
+    # 10. MongoDB Client Pool Constants
+    #------------------------------------------------------------------------------------------------
+    MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+    MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "0")) or None   # 0 = no limit
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "30000"))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "20000"))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "0")) or None     # 0 = no limit
+    MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "")                # e.g. "zstd,snappy"
+    MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE", "primary")
+    #------------------------------------------------------------------------------------------------
+    # 11. Data Validation Constants
+    #------------------------------------------------------------------------------------------------
+    DATA_VALIDATION_VALID_FILE_AND_PATH: Path = DATA_VALIDATION_VALID_DIR / 'validated.csv'
+    DATA_VALIDATION_INVALID_FILE_AND_PATH: Path = DATA_VALIDATION_INVALID_DIR / 'invalid.csv'
+    DATA_VALIDATION_VALID_ROWS_FILE_AND_PATH: Path = DATA_VALIDATION_VALID_DIR / 'valid_rows.npy'   # row mask over the dataset
+    DATA_VALIDATION_REPORT_FILE_AND_PATH: Path = DATA_VALIDATION_DRIFT_REPORT_DIR / DATA_VALIDATION_DRIFT_REPORT_FILE_NAME
+    DATA_VALIDATION_CHUNK_SIZE = int(os.getenv("DATA_VALIDATION_CHUNK_SIZE", "100000"))   # rows per pass
+    DATA_VALIDATION_MAX_INVALID_FRACTION = float(os.getenv("DATA_VALIDATION_MAX_INVALID_FRACTION", "0.05"))
+    DATA_VALIDATION_MIN_CLASS_SHARE = float(os.getenv("DATA_VALIDATION_MIN_CLASS_SHARE", "0.1"))
+    DATA_VALIDATION_QUARANTINE_NULLS = os.getenv("DATA_VALIDATION_QUARANTINE_NULLS", "false").lower() in ("1", "true", "yes")
+    DATA_VALIDATION_FAIL_ON_ERROR = os.getenv("DATA_VALIDATION_FAIL_ON_ERROR", "true").lower() in ("1", "true", "yes")
+    #------------------------------------------------------------------------------------------------
+    # 12. Drift Statistics Constants
+    #------------------------------------------------------------------------------------------------
+    DRIFT_STATE_FILE_AND_PATH: Path = DATA_VALIDATION_DIR / 'drift_state.json'   # next to drift_report/
+    DRIFT_PSI_THRESHOLD = float(os.getenv("DRIFT_PSI_THRESHOLD", "0.2"))
+    DRIFT_JSD_THRESHOLD = float(os.getenv("DRIFT_JSD_THRESHOLD", "0.1"))
+    DRIFT_CHI2_ALPHA = float(os.getenv("DRIFT_CHI2_ALPHA", "0"))          # 0 = chi-square reported, not enforced
+    DRIFT_MIN_ROWS = int(os.getenv("DRIFT_MIN_ROWS", "500"))              # new rows needed before judging drift
+    DRIFT_MAX_DRIFTED_FEATURES = int(os.getenv("DRIFT_MAX_DRIFTED_FEATURES", "0"))
+    DRIFT_FAIL_ON_DRIFT = os.getenv("DRIFT_FAIL_ON_DRIFT", "true").lower() in ("1", "true", "yes")
+    #------------------------------------------------------------------------------------------------
+    # 13. Data Transformation Constants
+    #------------------------------------------------------------------------------------------------
+    DATA_TRANSFORMATION_DIR: Path = ARTIFACT_DIR / 'data_transformation'
+    PREPROCESSOR_FILE_AND_PATH: Path = DATA_TRANSFORMATION_DIR / JOBLIB_FILE
+    PREPROCESSOR_CACHE = os.getenv("PREPROCESSOR_CACHE", "true").lower() in ("1", "true", "yes")
+    PREPROCESSOR_FAST_PATH = os.getenv("PREPROCESSOR_FAST_PATH", "true").lower() in ("1", "true", "yes")
+    #------------------------------------------------------------------------------------------------
+    # 14. Model Training Constants
+    #------------------------------------------------------------------------------------------------
+    MODEL_TRAINER_DIR: Path = ARTIFACT_DIR / 'model_trainer'
+    MODEL_FILE_AND_PATH: Path = MODEL_TRAINER_DIR / MODEL_FILE
+    MODEL_REPORT_FILE_AND_PATH: Path = MODEL_TRAINER_DIR / 'training_report.yaml'
+    MODEL_SEARCH_WORK_DIR: Path = MODEL_TRAINER_DIR / 'search'          # memory-mapped matrices
+    MODEL_SEARCH_FAMILIES = os.getenv(
+        "MODEL_SEARCH_FAMILIES", "logistic_regression,random_forest,extra_trees,hist_gradient_boosting")
+    MODEL_SEARCH_CANDIDATES = int(os.getenv("MODEL_SEARCH_CANDIDATES", "24"))     # sampled configurations
+    MODEL_SEARCH_WORKERS = int(os.getenv("MODEL_SEARCH_WORKERS", "0"))            # 0 = one per CPU
+    MODEL_SEARCH_TIME_BUDGET_SECONDS = float(os.getenv("MODEL_SEARCH_TIME_BUDGET_SECONDS", "900"))
+    MODEL_SEARCH_HALVING_FACTOR = int(os.getenv("MODEL_SEARCH_HALVING_FACTOR", "3"))
+    MODEL_SEARCH_MIN_ROWS = int(os.getenv("MODEL_SEARCH_MIN_ROWS", "2000"))       # rows in the first rung
+    MODEL_SEARCH_VALIDATION_FRACTION = float(os.getenv("MODEL_SEARCH_VALIDATION_FRACTION", "0.2"))
+    MODEL_SEARCH_SCORING = os.getenv("MODEL_SEARCH_SCORING", "f1")                # any sklearn scorer name
+    MODEL_SEARCH_START_METHOD = os.getenv("MODEL_SEARCH_START_METHOD", "spawn")
+    #------------------------------------------------------------------------------------------------
+    # 15. Batch Scoring Constants
+    #------------------------------------------------------------------------------------------------
+    SCORING_CHUNK_SIZE = int(os.getenv("SCORING_CHUNK_SIZE", "200000"))          # upper bound on rows per chunk
+    SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", "1"))                     # 1 = score in-process
+    SCORING_MEMORY_BUDGET_MB = int(os.getenv("SCORING_MEMORY_BUDGET_MB", "512"))  # for all chunks in flight
+    #------------------------------------------------------------------------------------------------
+    # 16. Online Scoring Service Constants
+    #------------------------------------------------------------------------------------------------
+    SERVING_HOST = os.getenv("SERVING_HOST", "127.0.0.1")
+    SERVING_PORT = int(os.getenv("SERVING_PORT", "8080"))
+    SERVING_MAX_BATCH_SIZE = int(os.getenv("SERVING_MAX_BATCH_SIZE", "256"))     # rows per predict call
+    SERVING_MAX_WAIT_MS = float(os.getenv("SERVING_MAX_WAIT_MS", "0.0"))         # batching window; 0 = what is queued
+    SERVING_QUEUE_SIZE = int(os.getenv("SERVING_QUEUE_SIZE", "2048"))            # requests waiting; beyond -> 503
+    SERVING_MAX_BODY_BYTES = int(os.getenv("SERVING_MAX_BODY_BYTES", "1048576"))
+    #------------------------------------------------------------------------------------------------
+    # 17. URL Feature Extraction Constants
+    #------------------------------------------------------------------------------------------------
+    URL_FEATURE_BATCH_SIZE = int(os.getenv("URL_FEATURE_BATCH_SIZE", "50000"))            # URLs per batch
+    URL_FEATURE_WORKERS = int(os.getenv("URL_FEATURE_WORKERS", "1"))                      # 1 = in-process
+    URL_FEATURE_HOST_CACHE_SIZE = int(os.getenv("URL_FEATURE_HOST_CACHE_SIZE", "200000"))  # memoized hosts
+    URL_FEATURE_LOOKUP_FILE = os.getenv("URL_FEATURE_LOOKUP_FILE", "")    # StaticLookup JSON; empty = none
+    #------------------------------------------------------------------------------------------------
+    # 18. Duplicate Collapsing Constants
+    #------------------------------------------------------------------------------------------------
+    # Ingestion keeps one row per distinct (features, label) with a ROW_COUNT_COLUMN
+    # count, used as the sample weight downstream (see components/row_collapse.py)
+    COLLAPSE_DUPLICATES = os.getenv("COLLAPSE_DUPLICATES", "false").lower() in ("1", "true", "yes")
+    #----------------------------------------------------------
+    resolved = dict(locals())
+    del resolved["find_dotenv"], resolved["load_dotenv"]
+    return resolved
+#----------------------------------------------------------------------------------------------------
+_RESOLVE_LOCK = threading.Lock()
+_resolved = False
+#----------------------------------------------------------
+def resolve() -> None:
+    """Resolves the lazy constants once and caches them as module attributes."""
+    global _resolved
+    with _RESOLVE_LOCK:
+        if not _resolved:
+            globals().update(_resolve_constants())
+            _resolved = True
+#----------------------------------------------------------
+def __getattr__(name: str):
+    # Only called for names that are not module attributes yet
+    if not name.startswith("_") and not _resolved:
+        resolve()
+        if name in globals():
+            return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 #----------------------------------------------------------------------------------------------------
 # Example usage (for testing purposes)
 #----------------------------------------------------------------------------------------------------
 if __name__ == "__main__":
+    resolve()
     print(f"Project Root Directory: {ROOT_DIR}")
     print(f"Network Data Path: {NETWORK_DATA_FILE_AND_PATH}")
     print(f"MongoDB Suffix: {MONGO_DB_SUFFIX}")
-    print(f"MongoDB URI: {MONGO_DB_URI}")
\ No newline at end of file
+    print(f"MongoDB URI: {MONGO_DB_URI}")
@@ -1,12 +1,15 @@
 import sys
 import numpy as np
+from dataclasses import asdict
 import pandas as pd
-import certifi
-from pymongo import MongoClient
 #----------------------------------------------------------
-from networksecurity.components import utils
+from networksecurity.components import utils, row_collapse
 from networksecurity.components.logger import ns_logger
 from networksecurity.components.exception import CustomException
+from networksecurity.components.artifact_writer import ArtifactWriter
+from networksecurity.components.stage_cache import StageCache
+from networksecurity.components.instrumentation import ns_metrics
+from networksecurity.components.mongo_client import get_mongo_client
 #----------------------------------------------------------
 from networksecurity.entity.config_app import MongoDBAtlasConfig, \
     DataIngestionConfig, TrainingPipelineConfig, DataIngestionArtifact
@@ -30,43 +33,76 @@ class DataIngestion:
             self.db_name = self.mongodb_config.mongo_db_name
             self.collection_name = self.mongodb_config.mongo_db_collection_name
             
-            ca = certifi.where()
-            self.mongo_client = MongoClient(self.mongodb_config.mongo_db_uri, tlsCAFile=ca)
+            self.mongo_client = get_mongo_client(self.mongodb_config)
+            self.stage_cache = StageCache(self.ingestion_config.stage_cache_file_and_path)
         except Exception as e:
             raise CustomException(e, sys) from e
 
-    def initiate_data_ingestion(self) -> DataIngestionArtifact:
+    @ns_metrics.instrument("data_ingestion", rows=None)
+    def initiate_data_ingestion(self, force: bool = False) -> DataIngestionArtifact:
         """
         Initiates the data ingestion process from MongoDB.
+        If the collection fingerprint matches the last run and its artifacts are
+        intact, the cached artifact is returned without reading the collection;
+        `force=True` bypasses the cache.
         """
         try:
+            fingerprint = None
+            if self.ingestion_config.use_stage_cache:
+                collection = self.mongo_client[self.db_name][self.collection_name]
+                fingerprint = StageCache.source_fingerprint(collection, self.ingestion_config)
+                cached = None if force else self.stage_cache.lookup(fingerprint)
+                if cached is not None:
+                    ns_logger.log_info(
+                        "Source collection unchanged (fingerprint %s); reusing cached ingestion artifacts.",
+                        fingerprint['key'][:12])
+                    self.ingestion_artifact_config = cached
+                    return cached
             ns_logger.log_info("Starting data ingestion process from MongoDB.")
             #----------------------------------------------------------
-            read_collection_df,x,y = utils.read_collection_from_mongo(
-                self.mongodb_config,
-                self.train_config,
-                self.ingestion_config,
-                self.mongo_client, 
-                self.db_name, 
-                self.collection_name
-            )
-            ns_logger.log_info("Data read from MongoDB collection successfully.")
-            ns_logger.log_info(f"Data shape from MongoDB: {read_collection_df.shape}")
-            ns_logger.log_info(f"Features shape: {x.shape}, Target shape: {y.shape}")
-            #----------------------------------------------------------
-            train_data, test_data = utils.train_test_split_data(
-                read_collection_df, 
-                self.ingestion_config.test_size,
-                self.ingestion_config.random_state
-            )
-            ns_logger.log_info("Train-test split completed.")
-            ns_logger.log_info(f"Train data shape: {train_data.shape}, Test data shape: {test_data.shape}")
-            #----------------------------------------------------------
-            # Saving train and test data to respective file paths
+            # Artifacts are written in the background while the split runs;
+            # every write is atomic and its size/time lands in the artifact.
+            # The writer's pool is shut down even when the read or split fails.
             #----------------------------------------------------------
-            utils.save_train_test_data(self.ingestion_config,train_data,test_data)
-            ns_logger.log_info(f"Train data saved to : {self.ingestion_config.train_file_name_and_path}")
-            ns_logger.log_info(f"Test data saved to : {self.ingestion_config.test_file_name_and_path}")
+            with ArtifactWriter() as writer:
+                read_collection_df,x,y = utils.read_collection_from_mongo(
+                    self.mongodb_config,
+                    self.train_config,
+                    self.ingestion_config,
+                    self.mongo_client, 
+                    self.db_name, 
+                    self.collection_name,
+                    writer=writer
+                )
+                ns_logger.log_info("Data read from MongoDB collection successfully.")
+                ns_logger.log_info("Data shape from MongoDB: %s", read_collection_df.shape)
+                ns_logger.log_info("Features shape: %s, Target shape: %s", x.shape, y.shape)
+                collapse_stats = {}
+                if self.ingestion_config.collapse_duplicates:
+                    collapse_stats = row_collapse.collapse_stats(read_collection_df, self.ingestion_config.row_count_column)
+                    ns_logger.log_info(
+                        "Collapsed %d rows to %d unique rows (compression ratio %.2f); counts are sample weights.",
+                        collapse_stats["rows"], collapse_stats["unique_rows"], collapse_stats["compression_ratio"])
+                #----------------------------------------------------------
+                train_data, test_data = utils.train_test_split_data(
+                    read_collection_df, 
+                    self.ingestion_config.test_size,
+                    self.ingestion_config.random_state,
+                    method=self.ingestion_config.split_method
+                )
+                ns_logger.log_info("Train-test split completed.")
+                ns_logger.log_info("Train data shape: %s, Test data shape: %s", train_data.shape, test_data.shape)
+                #----------------------------------------------------------
+                # Saving train and test data to respective file paths
+                #----------------------------------------------------------
+                utils.save_train_test_data(self.ingestion_config,train_data,test_data, writer=writer)
+            # Leaving the block waits for every write and raises if one failed
+            write_stats = writer.stats
+            if utils.uses_split_index(self.ingestion_config):
+                ns_logger.log_info("Train/test row indices saved to : %s", self.ingestion_config.split_index_file_and_path)
+            else:
+                ns_logger.log_info("Train data saved to : %s", self.ingestion_config.train_file_name_and_path)
+                ns_logger.log_info("Test data saved to : %s", self.ingestion_config.test_file_name_and_path)
             #----------------------------------------------------------
             self.ingestion_artifact_config = DataIngestionArtifact(
                 train_file_path=self.ingestion_config.train_file_path,
@@ -78,8 +114,15 @@ class DataIngestion:
                 x_file_path=self.ingestion_config.x_file_path,
                 x_file_name_and_path=self.ingestion_config.x_file_name_and_path,
                 y_file_path=self.ingestion_config.y_file_path,
-                y_file_name_and_path=self.ingestion_config.y_file_name_and_path
+                y_file_name_and_path=self.ingestion_config.y_file_name_and_path,
+                artifact_format=self.ingestion_config.artifact_format,
+                split_storage=self.ingestion_config.split_storage,
+                split_index_file_and_path=self.ingestion_config.split_index_file_and_path,
+                write_stats={name: asdict(record) for name, record in write_stats.items()},
+                collapse_stats=collapse_stats
             )
+            if fingerprint is not None:
+                self.stage_cache.store(fingerprint, self.ingestion_artifact_config)
             ns_logger.log_info("Data ingestion process completed successfully.")
             return self.ingestion_artifact_config
         except Exception as e:
@@ -0,0 +1,68 @@
+"""
+Data Transformation Module
+Fits the feature preprocessor on the training split, or reuses the cached fit
+when the training data is unchanged. Then writes the transformed feature
+matrix of every split (X_<split>_transformed) in the artifact format. For a
+collapsed dataset the fit is weighted by the row counts. With a validation
+config, only the rows that passed validation are fitted and transformed.
+"""
+import sys
+import pandas as pd
+from pathlib import Path
+#----------------------------------------------------------
+from networksecurity.components import utils, preprocessing
+from networksecurity.components.logger import ns_logger
+from networksecurity.components.exception import CustomException
+from networksecurity.components.instrumentation import ns_metrics
+from networksecurity.components.split_store import SplitDataset
+from networksecurity.entity.config_app import DataIngestionConfig, DataTransformationConfig, \
+    DataTransformationArtifact, DataValidationConfig
+#----------------------------------------------------------
+class DataTransformation:
+    def __init__(self, transformation_config: DataTransformationConfig, ingestion_config: DataIngestionConfig,
+                 validation_config: DataValidationConfig = None):
+        self.transformation_config = transformation_config
+        self.ingestion_config = ingestion_config
+        self.validation_config = validation_config
+    #----------------------------------------------------------
+    def output_paths(self) -> dict:
+        config = self.transformation_config
+        return {"train": config.x_train_transformed_file_and_path,
+                "val": config.x_val_transformed_file_and_path,
+                "test": config.x_test_transformed_file_and_path}
+    #----------------------------------------------------------
+    @ns_metrics.instrument("data_transformation", rows=lambda artifact: artifact.rows)
+    def initiate_data_transformation(self) -> DataTransformationArtifact:
+        try:
+            config = self.transformation_config
+            # Works for both split storage modes (physical files or row indices)
+            valid_rows = self.validation_config.valid_rows_file_and_path if self.validation_config else None
+            splits = SplitDataset.from_artifact(self.ingestion_config, valid_rows)
+            x_train, _ = splits.xy("train")
+            preprocessor, info = preprocessing.fit_preprocessor(
+                x_train, config.preprocessor_file_and_path,
+                use_cache=config.use_preprocessor_cache, fast_path=config.fast_path,
+                sample_weight=splits.weights("train"))
+            columns = [str(name) for name in preprocessor.get_feature_names_out()]
+            ns_logger.log_info("Preprocessor (%s) %s; %d output features.", info["kind"],
+                               "loaded from cache" if info["cache_hit"] else "fitted", len(columns))
+            #----------------------------------------------------------
+            written, rows = {}, 0
+            for split, file_path in self.output_paths().items():
+                if split not in splits.splits:
+                    continue
+                x = x_train if split == "train" else splits.xy(split)[0]
+                transformed = pd.DataFrame(preprocessor.transform(x), columns=columns, copy=False)
+                utils.write_artifact(transformed, file_path)
+                written[split] = Path(file_path)
+                rows += len(transformed)
+                ns_logger.log_info("Transformed %s split %s saved to: %s", split, transformed.shape, file_path)
+            return DataTransformationArtifact(
+                preprocessor_file_path=Path(config.preprocessor_file_and_path),
+                transformed_file_paths=written,
+                preprocessor_kind=info["kind"],
+                cache_hit=info["cache_hit"],
+                fingerprint=info["fingerprint"],
+                rows=rows)
+        except Exception as e:
+            raise CustomException(e, sys) from e
@@ -0,0 +1,233 @@
+"""
+Data Validation Module
+Checks a dataset against the schema in chunks, with every check vectorized over
+a (rows, columns) float64 block (NaN = missing):
+  * column set    - every schema column present (extra columns are reported);
+  * values        - features and target within their allowed values;
+  * nulls         - missing values per column, required columns never missing;
+  * target balance - share of the smallest class; in collapsed data each row
+                     counts as the rows its row-count column stands for.
+Each row gets a ValidationReason bitmask. Rows that pass go to the validated
+file, cast to the schema dtypes; failing rows go to the invalid file unchanged,
+with a `reason_code` column. A boolean mask of the rows that passed, by
+position in the source dataset, is saved for the later stages, which read the
+splits through it. Only one chunk is held in memory, so files larger than RAM
+can be validated. A compact summary is written to the drift report.
+The outputs are written to temp files and only renamed into place when the
+run does not fail, so a failed run never leaves fresh-looking outputs behind.
+"""
+import sys
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from contextlib import ExitStack
+from datetime import datetime
+from typing import List, Tuple
+#----------------------------------------------------------
+from networksecurity.components import utils
+from networksecurity.components.logger import ns_logger
+from networksecurity.components.exception import CustomException
+from networksecurity.components.instrumentation import ns_metrics
+from networksecurity.components.schema import DatasetSchema, phishing_schema
+from networksecurity.entity.config_app import DataValidationConfig, DataValidationArtifact
+from networksecurity.entity.data_validation import ValidationReason
+#----------------------------------------------------------
+REASON_COLUMN = "reason_code"
+# Stands in for non-numeric entries so they fail the allowed-value check instead of reading as missing
+_NON_NUMERIC = np.inf
+#----------------------------------------------------------
+def frame_to_block(frame: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    """(rows, columns) float64 block of `columns`; missing -> NaN, non-numeric -> inf."""
+    frame = frame[columns]
+    if not (frame.dtypes == object).any():
+        return frame.to_numpy(dtype=np.float64, na_value=np.nan)
+    block = np.empty((len(frame), len(columns)), dtype=np.float64)
+    for j, column in enumerate(columns):
+        series = frame[column]
+        if series.dtype == object:
+            numeric = pd.to_numeric(series, errors="coerce")
+            block[:, j] = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+            block[(numeric.isna() & series.notna()).to_numpy(), j] = _NON_NUMERIC
+        else:
+            block[:, j] = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return block
+#----------------------------------------------------------
+class DataValidation:
+    def __init__(self, validation_config: DataValidationConfig, schema: DatasetSchema = None):
+        try:
+            self.validation_config = validation_config
+            self.schema = schema or phishing_schema()
+            #----------------------------------------------------------
+            # Columns grouped by allowed-value set, so each group is one np.isin call
+            #----------------------------------------------------------
+            self.columns = self.schema.names
+            target = self.schema.target_column
+            self._groups = {}
+            for j, spec in enumerate(self.schema.columns):
+                self._groups.setdefault(spec.allowed_values, []).append(j)
+            self._groups = {values: np.array(index) for values, index in self._groups.items()}
+            self._is_target = np.array([name == target for name in self.columns])
+            self._nullable = np.array([spec.nullable for spec in self.schema.columns])
+            self._target_index = self.columns.index(target)
+            self._quarantine = (ValidationReason.INVALID_FEATURE | ValidationReason.NULL_REQUIRED
+                                | ValidationReason.INVALID_TARGET)
+            if validation_config.quarantine_null_features:
+                self._quarantine |= ValidationReason.NULL_FEATURE
+        except Exception as e:
+            raise CustomException(e, sys) from e
+    #----------------------------------------------------------
+    def check_block(self, block: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized checks of one block in schema column order.
+        Returns (row reason codes, per-column invalid counts, per-column null counts).
+        """
+        nulls = np.isnan(block)
+        invalid = np.zeros(block.shape, dtype=bool)
+        for allowed, index in self._groups.items():
+            invalid[:, index] = ~np.isin(block[:, index], allowed) & ~nulls[:, index]
+        #----------------------------------------------------------
+        codes = np.zeros(len(block), dtype=np.uint8)
+        features = ~self._is_target
+        codes[invalid[:, features].any(axis=1)] |= np.uint8(ValidationReason.INVALID_FEATURE)
+        codes[invalid[:, self._is_target].any(axis=1)] |= np.uint8(ValidationReason.INVALID_TARGET)
+        codes[nulls[:, features & self._nullable].any(axis=1)] |= np.uint8(ValidationReason.NULL_FEATURE)
+        codes[nulls[:, ~self._nullable].any(axis=1)] |= np.uint8(ValidationReason.NULL_REQUIRED)
+        return codes, invalid.sum(axis=0), nulls.sum(axis=0)
+    #----------------------------------------------------------
+    @ns_metrics.instrument("data_validation", rows=lambda artifact: artifact.rows)
+    def initiate_data_validation(self, source_file_path) -> DataValidationArtifact:
+        """
+        Validates `source_file_path` (any artifact format) chunk by chunk and
+        writes the validated/invalid files, the valid-row mask and the summary report.
+        Raises if a check fails and `fail_on_error` is set, and always if schema
+        columns are missing (no row can be validated then); the report is still
+        written, but the other outputs are discarded.
+        """
+        try:
+            config = self.validation_config
+            ns_logger.log_info("Validating %s in chunks of %d rows.", source_file_path, config.chunk_size)
+            n_columns = len(self.columns)
+            rows = valid_rows = 0
+            invalid_counts = np.zeros(n_columns, dtype=np.int64)
+            null_counts = np.zeros(n_columns, dtype=np.int64)
+            reason_counts = {reason.name: 0 for reason in ValidationReason}
+            class_counts = {}
+            passed_masks = []
+            extra_columns = missing_columns = None
+            #----------------------------------------------------------
+            valid_path = Path(config.valid_file_name_and_path)
+            invalid_path = Path(config.invalid_file_name_and_path)
+            valid_rows_path = Path(config.valid_rows_file_and_path)
+            for path in (valid_path, invalid_path, valid_rows_path):
+                path.parent.mkdir(parents=True, exist_ok=True)
+            if utils.artifact_format_of(valid_path) not in ("csv", "parquet", "feather"):
+                raise ValueError(f"Validated output must be csv, parquet or feather, not {valid_path.suffix}")
+            with ExitStack() as stack:
+                # Validated rows keep the artifact format; quarantined rows are CSV for inspection
+                valid_sink = utils.FrameSink(stack.enter_context(utils.atomic_path(valid_path)))
+                stack.callback(valid_sink.close)
+                invalid_sink = utils.FrameSink(stack.enter_context(utils.atomic_path(invalid_path)))
+                stack.callback(invalid_sink.close)
+                valid_rows_tmp = stack.enter_context(utils.atomic_path(valid_rows_path))
+                for frame in utils.iter_artifact_frames(source_file_path, config.chunk_size):
+                    #----------------------------------------------------------
+                    # Column set (checked on the first chunk; every chunk shares the header)
+                    #----------------------------------------------------------
+                    if missing_columns is None:
+                        missing_columns = [name for name in self.columns if name not in frame.columns]
+                        extra_columns = [name for name in frame.columns if name not in self.columns]
+                        if missing_columns:
+                            break
+                    #----------------------------------------------------------
+                    block = frame_to_block(frame, self.columns)
+                    codes, column_invalid, column_nulls = self.check_block(block)
+                    rows += len(frame)
+                    invalid_counts += column_invalid
+                    null_counts += column_nulls
+                    for reason in ValidationReason:
+                        reason_counts[reason.name] += int(np.count_nonzero(codes & reason))
+                    quarantined = (codes & self._quarantine) != 0
+                    passed_masks.append(~quarantined)
+                    frame = frame[self.columns + extra_columns]
+                    passed = frame[~quarantined]
+                    valid_rows += len(passed)
+                    # Collapsed rows stand for as many source rows as their count says
+                    weights = None
+                    if config.row_count_column in extra_columns:
+                        weights = passed[config.row_count_column].to_numpy(dtype=np.int64)
+                    labels, inverse = np.unique(block[~quarantined, self._target_index], return_inverse=True)
+                    counts = np.bincount(inverse, weights=weights, minlength=len(labels)).astype(np.int64)
+                    for label, count in zip(labels.tolist(), counts.tolist()):
+                        class_counts[str(int(label))] = class_counts.get(str(int(label)), 0) + count
+                    valid_sink.write(self.schema.cast_frame(passed))
+                    invalid_sink.write(frame[quarantined].assign(**{REASON_COLUMN: codes[quarantined]}))
+                np.save(valid_rows_tmp, np.concatenate(passed_masks) if passed_masks else np.zeros(0, dtype=bool))
+                #----------------------------------------------------------
+                summary = self._summary(
+                    source_file_path, rows, valid_rows, missing_columns or [],
+                    [str(name) for name in extra_columns or []],
+                    invalid_counts, null_counts, reason_counts, class_counts)
+                utils.update_report_section(config.report_file_name_and_path, "validation", summary)
+                artifact = DataValidationArtifact(
+                    valid_file_path=valid_path, invalid_file_path=invalid_path, valid_rows_file_path=valid_rows_path,
+                    report_file_path=Path(config.report_file_name_and_path),
+                    status=summary["status"], rows=rows, valid_rows=valid_rows, invalid_rows=rows - valid_rows)
+                ns_logger.log_info("Validation %s: %d rows, %d valid, %d quarantined. Report: %s",
+                                   artifact.status, rows, valid_rows, rows - valid_rows, artifact.report_file_path)
+                # Raised inside the block, so the temp outputs are discarded rather than renamed into place.
+                # Missing columns always fail: no row was validated, so there is no mask to hand on
+                if missing_columns:
+                    raise ValueError(f"Columns missing from {source_file_path}: {missing_columns}; "
+                                     f"no rows were validated. See {artifact.report_file_path}")
+                if artifact.status == "failed" and config.fail_on_error:
+                    failed = [name for name, check in summary["checks"].items() if not check["passed"]]
+                    raise ValueError(f"Data validation failed checks {failed}; see {artifact.report_file_path}")
+            return artifact
+        except Exception as e:
+            raise CustomException(e, sys) from e
+    #----------------------------------------------------------
+    def _summary(self, source, rows, valid_rows, missing_columns, extra_columns,
+                 invalid_counts, null_counts, reason_counts, class_counts) -> dict:
+        """Compact report: one entry per check plus per-column counts where non-zero."""
+        config = self.validation_config
+        invalid_rows = rows - valid_rows
+        limit = config.max_invalid_fraction
+        def fraction(*reasons) -> float:
+            # Rows can carry several codes; the per-reason counts overlap, so cap at the row count
+            return min(sum(reason_counts[reason.name] for reason in reasons), rows) / rows if rows else 0.0
+        bad_values = fraction(ValidationReason.INVALID_FEATURE, ValidationReason.INVALID_TARGET)
+        null_reasons = [ValidationReason.NULL_REQUIRED]
+        if config.quarantine_null_features:
+            null_reasons.append(ValidationReason.NULL_FEATURE)
+        bad_nulls = fraction(*null_reasons)
+        labelled = sum(class_counts.values())
+        min_share = min(class_counts.values()) / labelled if len(class_counts) > 1 else 0.0
+        checks = {
+            "column_set": {"passed": not missing_columns, "missing": missing_columns, "extra": extra_columns},
+            "allowed_values": {
+                "passed": bad_values <= limit, "invalid_fraction": round(bad_values, 6),
+                "max_invalid_fraction": limit},
+            "nulls": {
+                "passed": bad_nulls <= limit, "quarantined_fraction": round(bad_nulls, 6),
+                "rows_with_null_features": reason_counts[ValidationReason.NULL_FEATURE.name],
+                "rows_with_null_required": reason_counts[ValidationReason.NULL_REQUIRED.name]},
+            "target_balance": {
+                "passed": min_share >= config.min_class_share,
+                "class_counts": class_counts,
+                "min_class_share": round(min_share, 6),
+                "required_min_class_share": config.min_class_share},
+        }
+        return {
+            "source": str(source),
+            "validated_at": datetime.now().isoformat(timespec="seconds"),
+            "status": "passed" if all(check["passed"] for check in checks.values()) else "failed",
+            "rows": rows,
+            "valid_rows": valid_rows,
+            "invalid_rows": invalid_rows,
+            "reason_counts": {name: count for name, count in reason_counts.items() if count},
+            "reason_codes": {reason.name: int(reason) for reason in ValidationReason},
+            "checks": checks,
+            "columns": {
+                name: {"invalid": int(invalid), "null": int(null)}
+                for name, invalid, null in zip(self.columns, invalid_counts, null_counts) if invalid or null},
+        }
@@ -0,0 +1,268 @@
+"""
+Drift Statistics Module
+Every feature takes one of three values, so a feature's distribution per
+class is 3 counts (plus one bin for missing / out-of-schema values). These
+counts are sufficient statistics for PSI, chi-square and Jensen-Shannon drift,
+so they are kept in a small JSON state file instead of rescanning the
+collection:
+  * reference - counts of every row accepted so far (the training snapshot);
+  * pending   - counts of rows pushed since, not yet accepted.
+The incremental push stamps each row with the index of the batch that first
+inserted it (the push sequence), which only increases. Each run reads only
+documents with a sequence above the stored watermark and up to the last batch
+the push manifest records as committed, adds them to `pending`, and compares
+pending against reference. If no feature drifts past the thresholds, pending
+is merged into reference; otherwise it is kept (and keeps growing) until the
+drift clears or is accepted with `accept_pending`. When the check fails on
+drift the state is not saved, so the next run reads the same rows again.
+A run therefore costs O(new rows) reads plus O(features) arithmetic.
+"""
+import sys
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from datetime import datetime
+from typing import List, Optional
+#----------------------------------------------------------
+from networksecurity.components import utils
+from networksecurity.components.logger import ns_logger
+from networksecurity.components.exception import CustomException
+from networksecurity.components.instrumentation import ns_metrics
+from networksecurity.components.schema import DatasetSchema, phishing_schema
+from networksecurity.entity.config_app import DriftConfig, DriftArtifact
+#----------------------------------------------------------
+STATE_VERSION = 2   # 2: watermarks are push sequences, not `_id`s
+_EPSILON = 1e-6     # smoothing for empty bins in PSI / JSD
+#----------------------------------------------------------
+# Vectorized statistics over (features, bins) count arrays
+#----------------------------------------------------------
+def _distributions(counts: np.ndarray) -> np.ndarray:
+    counts = counts.astype(np.float64) + _EPSILON
+    return counts / counts.sum(axis=-1, keepdims=True)
+#----------------------------------------------------------
+def population_stability_index(reference: np.ndarray, current: np.ndarray) -> np.ndarray:
+    """PSI per row of two (features, bins) count arrays."""
+    p, q = _distributions(reference), _distributions(current)
+    return ((q - p) * np.log(q / p)).sum(axis=-1)
+#----------------------------------------------------------
+def jensen_shannon_divergence(reference: np.ndarray, current: np.ndarray) -> np.ndarray:
+    """Jensen-Shannon divergence (base 2, in [0, 1]) per row."""
+    p, q = _distributions(reference), _distributions(current)
+    m = (p + q) / 2
+    return 0.5 * (p * np.log2(p / m)).sum(axis=-1) + 0.5 * (q * np.log2(q / m)).sum(axis=-1)
+#----------------------------------------------------------
+def chi_square(reference: np.ndarray, current: np.ndarray):
+    """Chi-square homogeneity test of reference vs current counts per row: (statistic, p-value)."""
+    from scipy.stats import chi2
+    table = np.stack([reference, current], axis=-2).astype(np.float64)     # (features, 2, bins)
+    column_totals = table.sum(axis=-2, keepdims=True)
+    row_totals = table.sum(axis=-1, keepdims=True)
+    total = table.sum(axis=(-2, -1), keepdims=True)
+    expected = row_totals * column_totals / np.where(total == 0, 1, total)
+    terms = np.where(expected > 0, (table - expected) ** 2 / np.where(expected > 0, expected, 1), 0.0)
+    statistic = terms.sum(axis=(-2, -1))
+    dof = np.maximum((column_totals[..., 0, :] > 0).sum(axis=-1) - 1, 1)
+    return statistic, chi2.sf(statistic, dof)
+#----------------------------------------------------------
+class DriftMonitor:
+    def __init__(self, drift_config: DriftConfig, schema: DatasetSchema = None):
+        try:
+            self.drift_config = drift_config
+            self.schema = schema or phishing_schema()
+            self.features = self.schema.feature_names
+            self.values = list(self.schema.specs[self.features[0]].allowed_values)
+            self.classes = list(self.schema.specs[self.schema.target_column].allowed_values)
+            self.state = self.load_state()
+        except Exception as e:
+            raise CustomException(e, sys) from e
+    #----------------------------------------------------------
+    # State
+    #----------------------------------------------------------
+    def _empty_window(self) -> dict:
+        shape = (len(self.features), len(self.classes), len(self.values) + 1)
+        return {"rows": 0, "watermark": None, "counts": np.zeros(shape, dtype=np.int64)}
+    #----------------------------------------------------------
+    def load_state(self) -> dict:
+        """Reads the state file; a missing or incompatible file starts a new baseline."""
+        stored = utils.load_json(self.drift_config.state_file_and_path)
+        state = {"reference": self._empty_window(), "pending": self._empty_window()}
+        if not stored or stored.get("version") != STATE_VERSION or stored.get("features") != self.features:
+            return state
+        for window in ("reference", "pending"):
+            state[window] = {
+                "rows": stored[window]["rows"],
+                "watermark": stored[window]["watermark"],
+                "counts": np.asarray(stored[window]["counts"], dtype=np.int64),
+            }
+        return state
+    #----------------------------------------------------------
+    def save_state(self) -> None:
+        utils.save_json_atomic(self.drift_config.state_file_and_path, {
+            "version": STATE_VERSION,
+            "features": self.features,
+            "classes": self.classes,
+            "bins": [*self.values, "missing"],
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+            **{window: {"rows": self.state[window]["rows"],
+                        "watermark": self.state[window]["watermark"],
+                        "counts": self.state[window]["counts"].tolist()}
+               for window in ("reference", "pending")},
+        })
+    #----------------------------------------------------------
+    @property
+    def watermark(self) -> Optional[int]:
+        """Push sequence of the last counted batch (pending first, then reference)."""
+        pending = self.state["pending"]["watermark"]
+        return pending if pending is not None else self.state["reference"]["watermark"]
+    #----------------------------------------------------------
+    # Updates
+    #----------------------------------------------------------
+    def count_frame(self, frame: pd.DataFrame) -> np.ndarray:
+        """(features, classes, bins) counts of a frame; rows without a valid label are skipped."""
+        block = frame[self.features].to_numpy(dtype=np.float64, na_value=np.nan)
+        labels = frame[self.schema.target_column].to_numpy(dtype=np.float64, na_value=np.nan)
+        class_index = np.full(len(labels), -1, dtype=np.int64)
+        for c, label in enumerate(self.classes):
+            class_index[labels == label] = c
+        keep = class_index >= 0
+        block, class_index = block[keep], class_index[keep]
+        n_bins = len(self.values) + 1
+        value_index = np.full(block.shape, n_bins - 1, dtype=np.int64)       # missing / other
+        for v, value in enumerate(self.values):
+            value_index[block == value] = v
+        n_features, n_classes = len(self.features), len(self.classes)
+        flat = (np.arange(n_features) * n_classes * n_bins)[None, :] + class_index[:, None] * n_bins + value_index
+        counts = np.bincount(flat.ravel(), minlength=n_features * n_classes * n_bins)
+        return counts.reshape(n_features, n_classes, n_bins)
+    #----------------------------------------------------------
+    def add_frame(self, frame: pd.DataFrame, watermark: Optional[int] = None) -> int:
+        """Adds rows to pending (or to reference while no baseline exists). Returns rows counted."""
+        counts = self.count_frame(frame)
+        rows = int(counts[0].sum())
+        window = self.state["pending"] if self.state["reference"]["rows"] else self.state["reference"]
+        window["counts"] = window["counts"] + counts
+        window["rows"] += rows
+        if watermark is not None:
+            window["watermark"] = watermark
+        return rows
+    #----------------------------------------------------------
+    def committed_sequence(self, collection) -> Optional[int]:
+        """
+        Push sequence of the last committed batch: `last_acked_batch` of the push
+        manifest, or the highest sequence in the collection without a manifest.
+        """
+        field = self.drift_config.push_sequence_field
+        manifest = utils.load_json(self.drift_config.push_manifest_file_and_path)
+        if manifest:
+            committed = manifest.get("last_acked_batch", -1)
+            return committed if committed >= 0 else None
+        last = list(collection.find({field: {"$exists": True}}, {field: 1, "_id": 0}).sort(field, -1).limit(1))
+        return last[0][field] if last else None
+    #----------------------------------------------------------
+    def add_new_documents(self, collection) -> int:
+        """Counts documents with a push sequence above the watermark; returns how many were read."""
+        upper = self.committed_sequence(collection)
+        if upper is None or (self.watermark is not None and upper <= self.watermark):
+            return 0
+        # Bounded by the committed batch, so batches still in flight wait for the next run
+        bounds = {"$lte": upper}
+        if self.watermark is not None:
+            bounds["$gt"] = self.watermark
+        frame = utils.read_collection_columnar(
+            collection, columns=self.schema.names, query={self.drift_config.push_sequence_field: bounds},
+            batch_size=self.drift_config.read_batch_size, dtype=np.float64,
+            storage_mode=self.drift_config.mongo_storage_mode)
+        self.add_frame(frame, watermark=int(upper))
+        return len(frame)
+    #----------------------------------------------------------
+    def accept_pending(self) -> None:
+        """Merges pending counts into the reference (new rows become part of the baseline)."""
+        pending, reference = self.state["pending"], self.state["reference"]
+        if pending["rows"] or pending["watermark"] is not None:
+            reference["counts"] = reference["counts"] + pending["counts"]
+            reference["rows"] += pending["rows"]
+            if pending["watermark"] is not None:
+                reference["watermark"] = pending["watermark"]
+        self.state["pending"] = self._empty_window()
+    #----------------------------------------------------------
+    # Report
+    #----------------------------------------------------------
+    def compare(self) -> dict:
+        """Per-feature PSI / JSD / chi-square of pending vs reference, plus label drift."""
+        config = self.drift_config
+        reference, pending = self.state["reference"]["counts"], self.state["pending"]["counts"]
+        marginal_reference, marginal_pending = reference.sum(axis=1), pending.sum(axis=1)
+        psi = population_stability_index(marginal_reference, marginal_pending)
+        jsd = jensen_shannon_divergence(marginal_reference, marginal_pending)
+        chi2_statistic, chi2_p = chi_square(marginal_reference, marginal_pending)
+        # Class-conditional PSI catches shifts that cancel out in the marginal
+        conditional_psi = population_stability_index(reference, pending).max(axis=1)
+        drifted = (psi > config.psi_threshold) | (jsd > config.jsd_threshold)
+        if config.chi2_alpha > 0:
+            drifted |= chi2_p < config.chi2_alpha
+        label_psi = float(population_stability_index(reference[0].sum(axis=1)[None, :],
+                                                      pending[0].sum(axis=1)[None, :])[0])
+        features = {
+            name: {"psi": round(float(psi[j]), 6), "class_psi_max": round(float(conditional_psi[j]), 6),
+                   "jsd": round(float(jsd[j]), 6), "chi2": round(float(chi2_statistic[j]), 3),
+                   "chi2_p_value": float(chi2_p[j]), "drifted": bool(drifted[j])}
+            for j, name in enumerate(self.features)}
+        return {"features": features, "label_psi": round(label_psi, 6),
+                "drifted_features": [name for j, name in enumerate(self.features) if drifted[j]]}
+    #----------------------------------------------------------
+    @ns_metrics.instrument("drift", rows=lambda artifact: artifact.new_rows)
+    def initiate_drift_check(self, collection) -> DriftArtifact:
+        """
+        Reads new documents, updates the state and writes the `drift` section of
+        the drift report. Raises when too many features drift and `fail_on_drift`
+        is set; the state is then left as it was, so the rows stay unaccepted.
+        """
+        try:
+            config = self.drift_config
+            first_run = not self.state["reference"]["rows"]
+            new_rows = self.add_new_documents(collection)
+            pending_rows = self.state["pending"]["rows"]
+            drifted: List[str] = []
+            comparison = {}
+            if first_run:
+                status = "baseline"
+            elif not pending_rows:
+                status = "up_to_date"
+            elif pending_rows < config.min_rows:
+                status = "insufficient_data"
+            else:
+                comparison = self.compare()
+                drifted = comparison["drifted_features"]
+                status = "drift" if len(drifted) > config.max_drifted_features else "passed"
+            #----------------------------------------------------------
+            report = {
+                "checked_at": datetime.now().isoformat(timespec="seconds"),
+                "status": status,
+                "new_rows": new_rows,
+                "reference_rows": self.state["reference"]["rows"],
+                "pending_rows": pending_rows,
+                "thresholds": {"psi": config.psi_threshold, "jsd": config.jsd_threshold,
+                               "chi2_alpha": config.chi2_alpha, "min_rows": config.min_rows,
+                               "max_drifted_features": config.max_drifted_features},
+                **comparison,
+            }
+            if status == "passed":
+                self.accept_pending()
+            failed = status == "drift" and config.fail_on_drift
+            if not failed:
+                self.save_state()
+            utils.update_report_section(config.report_file_and_path, "drift", report)
+            artifact = DriftArtifact(
+                report_file_path=Path(config.report_file_and_path),
+                state_file_path=Path(config.state_file_and_path),
+                status=status, new_rows=new_rows, reference_rows=self.state["reference"]["rows"],
+                pending_rows=self.state["pending"]["rows"], drifted_features=drifted)
+            ns_logger.log_info("Drift check %s: %d new rows, %d pending, %d drifted features.",
+                               status, new_rows, pending_rows, len(drifted))
+            if failed:
+                raise ValueError(
+                    f"Data drift in {len(drifted)} feature(s) {drifted[:10]}; see {artifact.report_file_path}. "
+                    "Accept the new data with `main.py --accept-drift` once reviewed.")
+            return artifact
+        except Exception as e:
+            raise CustomException(e, sys) from e
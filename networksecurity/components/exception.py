@@ -4,10 +4,17 @@ from networksecurity.components.logger import ns_logger # Safe: logger doesn't i
 class CustomException(Exception):
     def __init__(self, error_message, error_detail: sys):
         super().__init__(error_message)
+        #----------------------------------------------------------
+        # Re-wrapping (utils -> DataIngestion -> main) keeps the innermost
+        # location and does not log the same failure again
+        #----------------------------------------------------------
+        if isinstance(error_message, CustomException):
+            self.error_message = error_message.error_message
+            return
         self.error_message = self.get_detailed_error(error_message, error_detail)
         #----------------------------------------------------------
         # Log the error the moment the exception is created
-        ns_logger.log_error(self.error_message)
+        ns_logger.log_error("%s", self.error_message)
     #----------------------------------------------------------
     def get_detailed_error(self, error, error_detail: sys):
         _, _, exc_tb = error_detail.exc_info()
@@ -0,0 +1,142 @@
+"""
+Hash Split Module
+Deterministic train/validation/test assignment from a stable hash of each row.
+A row's split depends only on its key (by default its feature values), the
+seed and the split sizes - never on which other rows are present - so:
+  * the assignment of existing rows does not change as the collection grows,
+    and a test row never moves into training;
+  * identical feature rows always land in the same split, whatever their
+    labels, so a row cannot leak from training into test under another label;
+  * a dataset can be split one chunk at a time (out-of-core), with the same
+    result as splitting it in one piece.
+The split is not stratified: the label is never part of the key, and class
+proportions per split match the target sizes only in expectation (the
+deviation shrinks with class size). Exact per-class quotas would need a
+global pass and would break stability.
+"""
+import sys
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+#----------------------------------------------------------
+from networksecurity.components.exception import CustomException
+#----------------------------------------------------------
+TRAIN, VAL, TEST = 0, 1, 2
+SPLIT_NAMES = ("train", "val", "test")
+_UNIT = 2.0 ** -53
+#----------------------------------------------------------
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer: spreads seeds/hashes over all 64 bits."""
+    with np.errstate(over="ignore"):
+        values = values.astype(np.uint64, copy=True)
+        values ^= values >> np.uint64(30)
+        values *= np.uint64(0xBF58476D1CE4E5B9)
+        values ^= values >> np.uint64(27)
+        values *= np.uint64(0x94D049BB133111EB)
+        values ^= values >> np.uint64(31)
+    return values
+#----------------------------------------------------------
+class HashSplitter:
+    """
+    Assigns rows to train/val/test by hashing their key into [0, 1).
+    `test_size` is the share of all rows; `val_size` is the share of the
+    remaining rows (same convention as `train_valid_test_split_data`), so
+    0.2 / 0.25 gives 60/20/20. `val_size=0` gives a two-way split.
+    `label_column` is left out of the key and only used for per-class counts.
+    """
+    def __init__(self, test_size: float, val_size: float = 0.0, seed: int = 0,
+                 key_columns: List[str] = None, label_column: str = None):
+        if not 0.0 <= test_size < 1.0 or not 0.0 <= val_size < 1.0:
+            raise ValueError(f"Split sizes must be in [0, 1); got test={test_size}, val={val_size}")
+        self.test_size = test_size
+        self.val_size = val_size
+        self.seed = seed
+        self.key_columns = key_columns
+        self.label_column = label_column
+        self._test_cut = test_size
+        self._val_cut = test_size + (1.0 - test_size) * val_size
+        self._salt = _mix64(np.array([seed & 0xFFFFFFFFFFFFFFFF], dtype=np.uint64))[0]
+    #----------------------------------------------------------
+    def key_frame(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Columns that make up the row key: `key_columns`, else every column but the label."""
+        if self.key_columns is not None:
+            columns = [column for column in self.key_columns if column != self.label_column]
+        else:
+            columns = [column for column in frame.columns if column != self.label_column]
+        return frame[columns]
+    #----------------------------------------------------------
+    def row_hashes(self, frame: pd.DataFrame) -> np.ndarray:
+        """Stable 64-bit hash per row (independent of index, dtype width and process)."""
+        keys = self.key_frame(frame)
+        # Hash values, not storage: int8, int64, nullable and float columns holding the
+        # same numbers must hash alike (a CSV chunk with a gap reads back as float)
+        keys = keys.astype({column: np.float64 for column in keys.columns
+                            if pd.api.types.is_numeric_dtype(keys[column].dtype)})
+        hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy(dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            return _mix64(hashes ^ self._salt)
+    #----------------------------------------------------------
+    def assign(self, frame: pd.DataFrame) -> np.ndarray:
+        """Split code per row: 0 = train, 1 = val, 2 = test."""
+        try:
+            position = (self.row_hashes(frame) >> np.uint64(11)).astype(np.float64) * _UNIT
+            codes = np.full(len(frame), TRAIN, dtype=np.int8)
+            codes[position < self._val_cut] = VAL
+            codes[position < self._test_cut] = TEST
+            return codes
+        except Exception as e:
+            raise CustomException(e, sys) from e
+    #----------------------------------------------------------
+    def split(self, frame: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """(train, val, test) views of `frame`; row order and index labels are kept."""
+        codes = self.assign(frame)
+        return tuple(frame[codes == code] for code in (TRAIN, VAL, TEST))
+    #----------------------------------------------------------
+    def split_stream(self, chunks: Iterable[pd.DataFrame]) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]]:
+        """Splits a stream chunk by chunk; concatenating the outputs equals `split` of the whole."""
+        for chunk in chunks:
+            yield self.split(chunk)
+    #----------------------------------------------------------
+    def split_csv(self, source, destinations: Dict[str, Path], chunksize: int = 100_000,
+                  read_csv=pd.read_csv) -> Dict[str, dict]:
+        """
+        Out-of-core split of a CSV file into `destinations` {"train"|"val"|"test": path}
+        (missing keys are dropped). Peak memory is one chunk. Returns per-split row
+        counts and, with a `label_column`, per-class counts.
+        """
+        try:
+            handles = {}
+            counts = {name: {"rows": 0, "classes": {}} for name in SPLIT_NAMES}
+            try:
+                for chunk in read_csv(source, chunksize=chunksize):
+                    for name, part in zip(SPLIT_NAMES, self.split(chunk)):
+                        self._count(counts[name], part)
+                        if name not in destinations:
+                            continue
+                        if name not in handles:
+                            Path(destinations[name]).parent.mkdir(parents=True, exist_ok=True)
+                            handles[name] = open(destinations[name], "w", encoding="utf-8", newline="")
+                            part.to_csv(handles[name], index=False)
+                        else:
+                            part.to_csv(handles[name], index=False, header=False)
+            finally:
+                for handle in handles.values():
+                    handle.close()
+            return counts
+        except Exception as e:
+            raise CustomException(e, sys) from e
+    #----------------------------------------------------------
+    def _count(self, counts: dict, part: pd.DataFrame) -> None:
+        counts["rows"] += len(part)
+        if self.label_column is not None and self.label_column in part.columns:
+            for label, n in part[self.label_column].value_counts(dropna=False).items():
+                key = str(label)
+                counts["classes"][key] = counts["classes"].get(key, 0) + int(n)
+    #----------------------------------------------------------
+    def summary(self, frame: pd.DataFrame) -> Dict[str, dict]:
+        """Row and per-class counts of each split, for checking realised proportions."""
+        counts = {name: {"rows": 0, "classes": {}} for name in SPLIT_NAMES}
+        for name, part in zip(SPLIT_NAMES, self.split(frame)):
+            self._count(counts[name], part)
+        return counts
@@ -0,0 +1,309 @@
+"""
+Instrumentation Module
+Records wall time, CPU time, peak-RSS growth, rows and bytes for the hot paths
+of push and ingestion, and writes them as a JSON run report so runs can be
+compared. Use `ns_metrics.track(name)` as a context manager or
+`ns_metrics.instrument(name)` as a decorator.
+
+Optional profiling (`start_run(profile_mode=...)`):
+  * "cprofile"    - cProfile of the thread that started the run plus every
+                    worker thread that enters a tracked block, merged into
+                    `<report>.prof` (open with pstats or snakeviz);
+  * "tracemalloc" - Python allocation tracing; each record gets the net traced
+                    bytes of its call and the report lists the top allocation sites.
+"""
+import os
+import sys
+import math
+import time
+import socket
+import threading
+import functools
+from pathlib import Path
+from datetime import datetime
+from contextlib import contextmanager
+from dataclasses import asdict
+from typing import Callable, List, Optional
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+#----------------------------------------------------------
+from networksecurity.entity.config_app import StageMetrics
+#----------------------------------------------------------
+PROFILE_MODES = ("", "cprofile", "tracemalloc")
+#----------------------------------------------------------
+def _peak_rss_bytes() -> int:
+    """High-water mark of the process RSS (0 where `resource` is unavailable)."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+#----------------------------------------------------------
+def _default_rows(result) -> int:
+    """Row count of a frame/array/list result, or of the first item of a tuple result."""
+    if isinstance(result, tuple) and result:
+        result = result[0]
+    if hasattr(result, "shape") and getattr(result, "ndim", 0) >= 1:
+        return int(result.shape[0])
+    if isinstance(result, list):
+        return len(result)
+    return 0
+#----------------------------------------------------------
+class RunInstrumentation:
+    """Thread-safe collector of StageMetrics for one pipeline run."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.records: List[StageMetrics] = []
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.profile_mode = ""
+        self._profiler = None
+        self._thread_profiles = []
+        self._run_start = time.perf_counter()
+        self._run_cpu_start = time.process_time()
+    #----------------------------------------------------------
+    def start_run(self, profile_mode: str = "") -> None:
+        """Clears previous records and starts the optional profiler."""
+        if profile_mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{profile_mode}'; expected one of {PROFILE_MODES}")
+        self._stop_profiler()
+        with self._lock:
+            self.records = []
+            self._thread_profiles = []
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self._run_start = time.perf_counter()
+        self._run_cpu_start = time.process_time()
+        self.profile_mode = profile_mode
+        if profile_mode == "cprofile":
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+            self._local.profiling = True
+        elif profile_mode == "tracemalloc":
+            import tracemalloc
+            tracemalloc.start(10)
+    #----------------------------------------------------------
+    def _stop_profiler(self):
+        """Stops profiling; returns merged pstats.Stats or (tracemalloc snapshot, peak)."""
+        captured = None
+        if self.profile_mode == "cprofile" and self._profiler is not None:
+            import pstats
+            self._profiler.disable()
+            self._local.profiling = False
+            captured = pstats.Stats(self._profiler)
+            with self._lock:
+                for profile in self._thread_profiles:
+                    captured.add(profile)
+                self._thread_profiles = []
+        elif self.profile_mode == "tracemalloc":
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                captured = (tracemalloc.take_snapshot(), tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+        self._profiler = None
+        self.profile_mode = ""
+        return captured
+    #----------------------------------------------------------
+    @contextmanager
+    def track(self, name: str, rows: int = 0, bytes: int = 0):
+        """
+        Measures the enclosed block. The yielded StageMetrics can be updated
+        inside the block (`metrics.rows = len(frame)`) before it is recorded.
+        """
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        metrics = StageMetrics(
+            name=name,
+            parent=stack[-1] if stack else "",
+            thread=threading.current_thread().name,
+            started_at=datetime.now().isoformat(timespec="milliseconds"),
+            rows=rows,
+            bytes=bytes,
+        )
+        tracing = self.profile_mode == "tracemalloc"
+        if tracing:
+            import tracemalloc
+            traced_start = tracemalloc.get_traced_memory()[0]
+        # cProfile only sees the thread it is enabled on: give each worker
+        # thread its own profiler for the outermost tracked block
+        thread_profile = None
+        if self.profile_mode == "cprofile" and not getattr(self._local, "profiling", False):
+            import cProfile
+            thread_profile = cProfile.Profile()
+            self._local.profiling = True
+            thread_profile.enable()
+        rss_start = _peak_rss_bytes()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        stack.append(name)
+        try:
+            yield metrics
+        except BaseException as e:
+            metrics.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            stack.pop()
+            if thread_profile is not None:
+                thread_profile.disable()
+                self._local.profiling = False
+                with self._lock:
+                    self._thread_profiles.append(thread_profile)
+            # process_time is process-wide: concurrent stages share their CPU time
+            metrics.wall_seconds = time.perf_counter() - wall_start
+            metrics.cpu_seconds = time.process_time() - cpu_start
+            metrics.peak_rss_delta_bytes = max(0, _peak_rss_bytes() - rss_start)
+            if tracing and tracemalloc.is_tracing():
+                metrics.traced_bytes_delta = tracemalloc.get_traced_memory()[0] - traced_start
+            if metrics.wall_seconds > 0:
+                metrics.rows_per_second = metrics.rows / metrics.wall_seconds
+            with self._lock:
+                self.records.append(metrics)
+    #----------------------------------------------------------
+    def instrument(self, name: Optional[str] = None,
+                   rows: Optional[Callable] = _default_rows,
+                   bytes: Optional[Callable] = None):
+        """
+        Decorator form of `track`. `rows` and `bytes` are called with the return
+        value to fill in the counts; by default rows are taken from the length
+        of a returned frame, array or list.
+        """
+        def decorator(func):
+            label = name or func.__qualname__
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.track(label) as metrics:
+                    result = func(*args, **kwargs)
+                    if rows is not None:
+                        metrics.rows = int(rows(result) or 0)
+                    if bytes is not None:
+                        metrics.bytes = int(bytes(result) or 0)
+                    return result
+            return wrapper
+        return decorator
+    #----------------------------------------------------------
+    def summary(self) -> dict:
+        """Per-name totals across all records (several records may share a name)."""
+        totals = {}
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            total = totals.setdefault(record.name, {
+                "calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0,
+                "peak_rss_delta_bytes": 0, "rows": 0, "bytes": 0, "errors": 0})
+            total["calls"] += 1
+            total["wall_seconds"] += record.wall_seconds
+            total["cpu_seconds"] += record.cpu_seconds
+            total["peak_rss_delta_bytes"] = max(total["peak_rss_delta_bytes"], record.peak_rss_delta_bytes)
+            total["rows"] += record.rows
+            total["bytes"] += record.bytes
+            total["errors"] += bool(record.error)
+        for total in totals.values():
+            total["rows_per_second"] = total["rows"] / total["wall_seconds"] if total["wall_seconds"] else 0.0
+        return totals
+    #----------------------------------------------------------
+    def write_report(self, report_dir, run_id: str, latest_file_name: str = "run_report_latest.json",
+                     extra: Optional[dict] = None) -> Path:
+        """
+        Stops any profiler and writes `run_report_<run_id>.json` (plus a copy
+        named `latest_file_name`) into `report_dir`. Returns the report path.
+        """
+        # Imported here: utils imports this module for its decorators
+        from networksecurity.components import utils
+        report_dir = Path(report_dir)
+        report_path = report_dir / f"run_report_{run_id}.json"
+        profile_mode = self.profile_mode
+        captured = self._stop_profiler()
+        with self._lock:
+            records = [asdict(record) for record in self.records]
+        report = {
+            "run_id": run_id,
+            "started_at": self.started_at,
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "python": sys.version.split()[0],
+            "wall_seconds": time.perf_counter() - self._run_start,
+            "cpu_seconds": time.process_time() - self._run_cpu_start,
+            "peak_rss_bytes": _peak_rss_bytes(),
+            "profile_mode": profile_mode,
+            "summary": self.summary(),
+            "stages": records,
+        }
+        if extra:
+            report.update(extra)
+        report_dir.mkdir(parents=True, exist_ok=True)
+        if profile_mode == "cprofile" and captured is not None:
+            profile_path = report_path.with_suffix(".prof")
+            captured.dump_stats(str(profile_path))
+            report["profile_file"] = str(profile_path)
+        elif profile_mode == "tracemalloc" and captured is not None:
+            snapshot, traced_peak = captured
+            report["traced_peak_bytes"] = traced_peak
+            report["top_allocations"] = [
+                {"site": str(stat.traceback[0]), "bytes": stat.size, "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:25]
+            ]
+        utils.save_json_atomic(report_path, report)
+        utils.save_json_atomic(report_dir / latest_file_name, report)
+        return report_path
+#----------------------------------------------------------
+class LatencyHistogram:
+    """
+    Fixed log-scale histogram of durations in seconds: buckets grow by 2**(1/4)
+    (about 19%) from `lowest` up to `highest`, so recording is O(1), memory is
+    constant and percentiles are accurate to one bucket. Not thread-safe; record
+    from one thread (e.g. the event loop).
+    """
+    _STEPS_PER_DOUBLING = 4
+    def __init__(self, lowest: float = 1e-5, highest: float = 60.0):
+        self.lowest = lowest
+        n_buckets = int(math.ceil(self._STEPS_PER_DOUBLING * math.log2(highest / lowest))) + 1
+        self.bounds = [lowest * 2 ** (i / self._STEPS_PER_DOUBLING) for i in range(n_buckets)]
+        self.counts = [0] * (n_buckets + 1)      # last bucket: above `highest`
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    #----------------------------------------------------------
+    def record(self, seconds: float) -> None:
+        if seconds <= self.lowest:
+            index = 0
+        else:
+            index = min(len(self.bounds), int(math.ceil(self._STEPS_PER_DOUBLING * math.log2(seconds / self.lowest))))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+    #----------------------------------------------------------
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (0-100), capped at the maximum seen."""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(math.ceil(self.count * q / 100.0)))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+        return self.max
+    #----------------------------------------------------------
+    def snapshot(self) -> dict:
+        """Count, mean, p50/p90/p99/p99.9 and max in milliseconds, plus the non-empty buckets."""
+        ms = lambda seconds: round(seconds * 1000.0, 4)
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.total / self.count) if self.count else 0.0,
+            "p50_ms": ms(self.percentile(50)),
+            "p90_ms": ms(self.percentile(90)),
+            "p99_ms": ms(self.percentile(99)),
+            "p999_ms": ms(self.percentile(99.9)),
+            "max_ms": ms(self.max),
+            "buckets": {f"le_{ms(self.bounds[index]) if index < len(self.bounds) else 'inf'}ms": count
+                        for index, count in enumerate(self.counts) if count},
+        }
+#----------------------------------------------------------
+# CREATE THE INSTANCE FOR USE IN OTHER MODULES
+#----------------------------------------------------------
+ns_metrics = RunInstrumentation()
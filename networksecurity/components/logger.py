@@ -1,13 +1,45 @@
+import json
+import atexit
+import queue
 import logging
+import threading
 from pathlib import Path
-from datetime import datetime
-from logging.handlers import RotatingFileHandler
-
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+#----------------------------------------------------------
+import networksecurity.components.constants as constants
+#----------------------------------------------------------
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line (timestamp, level, thread, message)."""
+    def format(self, record):
+        payload = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "logger": record.name,
+            "level": record.levelname,
+            "thread": record.threadName,
+            "module": record.module,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+#----------------------------------------------------------
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that enqueues the record as-is. The stock handler formats the
+    message on the calling thread; the queue here never leaves the process, so
+    %-args and exc_info can be handed to the listener thread untouched.
+    """
+    def prepare(self, record):
+        return record
+#----------------------------------------------------------
 class NetworkSecurityLogger:
     def __init__(
-        self, log_dir='logs', 
-        log_file='network_security.log', 
-        max_bytes=5*1024*1024, backup_count=3):
+        self, log_dir='logs',
+        log_file='network_security.log',
+        max_bytes=5*1024*1024, backup_count=3,
+        use_queue=None, log_format=None, level=None):
         #----------------------------------------------------------
         # Convert string inputs to Path objects immediately
         #----------------------------------------------------------
@@ -15,12 +47,37 @@ class NetworkSecurityLogger:
         self.log_file = log_file
         self.max_bytes = max_bytes
         self.backup_count = backup_count
+        self.use_queue = use_queue
+        self.log_format = log_format
+        self.level = level
+        self.listener = None
         #----------------------------------------------------------
-        self.logger = logging.getLogger('NetworkSecurityLogger')
-        self.logger.setLevel(logging.INFO)
-        self._setup_logger()
+        # Handlers (log directory, file, listener thread) are created on the
+        # first record, so importing this module has no side effects
+        #----------------------------------------------------------
+        self._logger = None
+        self._setup_lock = threading.Lock()
+    #----------------------------------------------------------
+    @property
+    def logger(self) -> logging.Logger:
+        if self._logger is None:
+            with self._setup_lock:
+                if self._logger is None:
+                    self._setup_logger()
+        return self._logger
     #----------------------------------------------------------
     def _setup_logger(self):
+        logger = logging.getLogger('NetworkSecurityLogger')
+        if self.use_queue is None:
+            self.use_queue = constants.LOG_ASYNC
+        if self.log_format is None:
+            self.log_format = constants.LOG_FORMAT
+        logger.setLevel(self.level if self.level is not None else constants.LOG_LEVEL)
+        #----------------------------------------------------------
+        # Avoid adding multiple handlers if the logger is re-initialized
+        if logger.handlers:
+            self._logger = logger
+            return
         #----------------------------------------------------------
         # Path.mkdir handles directory creation cleanly (exist_ok=True replaces 'if not exists')
         self.log_dir.mkdir(parents=True, exist_ok=True)
@@ -30,28 +87,54 @@ class NetworkSecurityLogger:
         #----------------------------------------------------------
         # RotatingFileHandler accepts Path objects directly in modern Python
         handler = RotatingFileHandler(
-            filename=log_path, 
-            maxBytes=self.max_bytes, 
+            filename=log_path,
+            maxBytes=self.max_bytes,
             backupCount=self.backup_count)
         #----------------------------------------------------------
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        if self.log_format == "json":
+            formatter = JsonLinesFormatter()
+        else:
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         handler.setFormatter(formatter)
         #----------------------------------------------------------
-        # Avoid adding multiple handlers if the logger is re-initialized
-        if not self.logger.handlers:
-            self.logger.addHandler(handler)
+        # Async mode: callers only enqueue the record; a background listener
+        # thread formats it and does the file I/O (and rotation).
+        #----------------------------------------------------------
+        if self.use_queue:
+            log_queue = queue.SimpleQueue()
+            self.listener = QueueListener(log_queue, handler, respect_handler_level=True)
+            self.listener.start()
+            logger.addHandler(_DeferredQueueHandler(log_queue))
+            atexit.register(self.shutdown)
+        else:
+            logger.addHandler(handler)
+        self._logger = logger
+    #----------------------------------------------------------
+    def shutdown(self):
+        """Flushes queued records and stops the listener thread (safe to call twice)."""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
     #----------------------------------------------------------
-    def log_info(self, message):
-        self.logger.info(message)
+    # Messages take lazy %-style arguments: log_info("Read %d rows", n) is only
+    # formatted if the level is enabled, and then on the listener thread.
+    # stacklevel=2 attributes the record to the caller, not this wrapper.
     #----------------------------------------------------------
-    def log_warning(self, message):
-        self.logger.warning(message)
+    def log_info(self, message, *args):
+        self.logger.info(message, *args, stacklevel=2)
     #----------------------------------------------------------
-    def log_error(self, message):
-        self.logger.error(message)
+    def log_warning(self, message, *args):
+        self.logger.warning(message, *args, stacklevel=2)
     #----------------------------------------------------------
-    def log_debug(self, message):
-        self.logger.debug(message)
+    def log_error(self, message, *args):
+        self.logger.error(message, *args, stacklevel=2)
+    #----------------------------------------------------------
+    def log_debug(self, message, *args):
+        self.logger.debug(message, *args, stacklevel=2)
+    #----------------------------------------------------------
+    def is_debug_enabled(self) -> bool:
+        """Guard for debug logging whose arguments are expensive to compute."""
+        return self.logger.isEnabledFor(logging.DEBUG)
 #----------------------------------------------------------
 # CREATE THE INSTANCE FOR USE IN OTHER MODULES
 #----------------------------------------------------------
@@ -64,4 +147,4 @@ ns_logger = NetworkSecurityLogger()
     # ns_logger.log_warning("Potential threat detected.")
     # ns_logger.log_error("Error in network security module.")
     # ns_logger.log_debug("Debugging network security issue.")
-#----------------------------------------------------------
\ No newline at end of file
+#----------------------------------------------------------
@@ -0,0 +1,234 @@
+"""
+Model Search Module
+Successive-halving hyperparameter search over several classifier families,
+run on a process pool.
+  * The training matrix is written once as a float32 .npy, with its rows in
+    shuffled order, and each worker memory-maps it. A rung trained on r rows
+    uses the first r rows of the map as a view. Workers therefore never get a
+    pickled or gathered copy of the data, and the OS page cache holding it is
+    shared by all of them.
+  * Each rung trains the surviving configurations on `halving_factor` times
+    more rows than the previous rung and keeps the best 1/halving_factor.
+    Bad configurations are dropped after seeing only a small sample.
+  * The search stops at a wall-clock deadline. Workers still running are
+    terminated, and the best configuration of the deepest completed rung wins.
+  * Optional sample weights (row counts of collapsed data) are memory-mapped
+    the same way and passed to every fit and score.
+Only NumPy is imported at module level, so spawned workers start quickly;
+scikit-learn is imported by the worker that needs it.
+"""
+import os
+import math
+import time
+import importlib
+import multiprocessing
+import numpy as np
+from typing import Dict, List
+#----------------------------------------------------------
+# family -> (module, class, parameter grid)
+SEARCH_SPACES: Dict[str, tuple] = {
+    "logistic_regression": ("sklearn.linear_model", "LogisticRegression", {
+        "C": [0.01, 0.1, 1.0, 10.0],
+        "max_iter": [1000],
+    }),
+    "random_forest": ("sklearn.ensemble", "RandomForestClassifier", {
+        "n_estimators": [100, 200, 400],
+        "max_depth": [None, 12, 24],
+        "min_samples_leaf": [1, 2, 4],
+        "max_features": ["sqrt", 0.5],
+    }),
+    "extra_trees": ("sklearn.ensemble", "ExtraTreesClassifier", {
+        "n_estimators": [100, 200, 400],
+        "max_depth": [None, 12, 24],
+        "min_samples_leaf": [1, 2, 4],
+        "max_features": ["sqrt", 0.5],
+    }),
+    "hist_gradient_boosting": ("sklearn.ensemble", "HistGradientBoostingClassifier", {
+        "learning_rate": [0.05, 0.1, 0.2],
+        "max_leaf_nodes": [15, 31, 63],
+        "l2_regularization": [0.0, 0.1, 1.0],
+        "max_iter": [100, 200],
+    }),
+}
+#----------------------------------------------------------
+def make_estimator(family: str, params: dict, random_state: int = 0, n_jobs: int = 1):
+    """Unfitted estimator of `family` with `params`, seeded and limited to `n_jobs` threads."""
+    if family not in SEARCH_SPACES:
+        raise ValueError(f"Unknown model family '{family}'; expected one of {list(SEARCH_SPACES)}")
+    module_name, class_name, _ = SEARCH_SPACES[family]
+    estimator = getattr(importlib.import_module(module_name), class_name)(**params)
+    available = estimator.get_params()
+    if "random_state" in available:
+        estimator.set_params(random_state=random_state)
+    if "n_jobs" in available:
+        estimator.set_params(n_jobs=n_jobs)
+    return estimator
+#----------------------------------------------------------
+def sample_candidates(families: List[str], n_candidates: int, seed: int = 0) -> List[dict]:
+    """
+    Up to `n_candidates` distinct configurations, spread round-robin over
+    `families` and sampled from their grids with a fixed seed.
+    """
+    for family in families:
+        if family not in SEARCH_SPACES:
+            raise ValueError(f"Unknown model family '{family}'; expected one of {list(SEARCH_SPACES)}")
+    rng = np.random.default_rng(seed)
+    grid_sizes = {family: math.prod(len(values) for values in SEARCH_SPACES[family][2].values())
+                  for family in families}
+    candidates, seen = [], set()
+    attempts = 0
+    while len(candidates) < n_candidates and len(seen) < sum(grid_sizes.values()) and attempts < 50 * n_candidates:
+        family = families[attempts % len(families)]
+        attempts += 1
+        grid = SEARCH_SPACES[family][2]
+        params = {name: values[rng.integers(len(values))] for name, values in grid.items()}
+        key = (family, tuple(sorted((name, repr(value)) for name, value in params.items())))
+        if key in seen:
+            continue
+        seen.add(key)
+        candidates.append({"id": len(candidates), "family": family, "params": params})
+    return candidates
+#----------------------------------------------------------
+def make_scorer(scoring: str, pos_label: int = 1):
+    """
+    sklearn scorer for `scoring`. The binary label metrics (f1, precision,
+    recall) score `pos_label`, not sklearn's default of 1; other names are
+    looked up with `get_scorer`.
+    """
+    from sklearn import metrics
+    binary_metrics = {"f1": metrics.f1_score, "precision": metrics.precision_score, "recall": metrics.recall_score}
+    if scoring in binary_metrics:
+        return metrics.make_scorer(binary_metrics[scoring], pos_label=pos_label, zero_division=0)
+    return metrics.get_scorer(scoring)
+#----------------------------------------------------------
+# Worker side: memory maps opened once per process by the pool initializer
+#----------------------------------------------------------
+_WORKER: dict = {}
+#----------------------------------------------------------
+def _init_worker(data: dict) -> None:
+    from threadpoolctl import threadpool_limits
+    # Parallelism comes from the pool; one BLAS / OpenMP thread per worker avoids oversubscription
+    _WORKER["limits"] = threadpool_limits(limits=1)
+    x = np.load(data["x_path"], mmap_mode="r")
+    y = np.load(data["y_path"], mmap_mode="r")
+    w = np.load(data["w_path"], mmap_mode="r") if data.get("w_path") else None
+    n_train = data["n_train"]
+    if data.get("x_val_path"):
+        _WORKER["x_val"] = np.load(data["x_val_path"], mmap_mode="r")
+        _WORKER["y_val"] = np.load(data["y_val_path"], mmap_mode="r")
+        _WORKER["w_val"] = np.load(data["w_val_path"], mmap_mode="r") if data.get("w_val_path") else None
+    else:
+        # Hold-out rows are stored after the training rows
+        _WORKER["x_val"], _WORKER["y_val"] = x[n_train:], y[n_train:]
+        _WORKER["w_val"] = w[n_train:] if w is not None else None
+    _WORKER.update(x=x, y=y, w=w, n_train=n_train, random_state=data["random_state"],
+                   scorer=make_scorer(data["scoring"], data.get("pos_label", 1)))
+#----------------------------------------------------------
+def _evaluate(task: dict) -> dict:
+    """Fits one candidate on the first `rows` training rows and scores it on the hold-out set."""
+    result = {**task, "score": None, "fit_seconds": 0.0, "score_seconds": 0.0, "pid": os.getpid(), "error": ""}
+    try:
+        rows = min(task["rows"], _WORKER["n_train"])
+        estimator = make_estimator(task["family"], task["params"], _WORKER["random_state"])
+        start = time.perf_counter()
+        w = _WORKER["w"]
+        estimator.fit(_WORKER["x"][:rows], _WORKER["y"][:rows], sample_weight=w[:rows] if w is not None else None)
+        result["fit_seconds"] = round(time.perf_counter() - start, 4)
+        start = time.perf_counter()
+        result["score"] = float(_WORKER["scorer"](
+            estimator, _WORKER["x_val"], _WORKER["y_val"], sample_weight=_WORKER["w_val"]))
+        result["score_seconds"] = round(time.perf_counter() - start, 4)
+    except Exception as e:
+        # A failing configuration is dropped from the search, not fatal
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+#----------------------------------------------------------
+def _rank_key(result: dict):
+    score = result["score"]
+    return (-(score if score is not None and not math.isnan(score) else -math.inf), result["fit_seconds"])
+#----------------------------------------------------------
+class SuccessiveHalvingSearch:
+    """
+    Runs `candidates` (from `sample_candidates`) through successive halving on a
+    process pool; f1 / precision / recall score `pos_label`. `run` takes the
+    memory-mapped data spec written by the caller: {"x_path", "y_path",
+    "n_train", optional "x_val_path"/"y_val_path" and "w_path"/"w_val_path"
+    sample weights}.
+    """
+    def __init__(self, candidates: List[dict], scoring: str = "f1", halving_factor: int = 3,
+                 min_rows: int = 2000, max_workers: int = 0, time_budget_seconds: float = 900.0,
+                 start_method: str = "spawn", random_state: int = 0, pos_label: int = 1):
+        if halving_factor < 2:
+            raise ValueError(f"halving_factor must be at least 2; got {halving_factor}")
+        if not candidates:
+            raise ValueError("The model search needs at least one candidate")
+        self.candidates = candidates
+        self.scoring = scoring
+        self.halving_factor = halving_factor
+        self.min_rows = max(1, min_rows)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.time_budget_seconds = time_budget_seconds
+        self.start_method = start_method
+        self.random_state = random_state
+        self.pos_label = pos_label
+    #----------------------------------------------------------
+    def run(self, data: dict) -> dict:
+        """
+        Returns {"best", "rungs", "timed_out", "workers", "seconds"}. `best` is the
+        top result of the deepest completed rung with a successful fit (of a rung
+        cut short by the deadline only if none completed), or None.
+        """
+        started = time.perf_counter()
+        deadline = time.monotonic() + self.time_budget_seconds
+        n_train = data["n_train"]
+        workers = max(1, min(self.max_workers, len(self.candidates)))
+        context = multiprocessing.get_context(self.start_method)
+        pool = context.Pool(workers, initializer=_init_worker,
+                            initargs=({**data, "scoring": self.scoring, "random_state": self.random_state,
+                                       "pos_label": self.pos_label},))
+        rungs, survivors, timed_out = [], list(self.candidates), False
+        rows = min(self.min_rows, n_train)
+        try:
+            while survivors:
+                rung_started = time.perf_counter()
+                tasks = [{**candidate, "rung": len(rungs), "rows": rows} for candidate in survivors]
+                results = []
+                iterator = pool.imap_unordered(_evaluate, tasks)
+                try:
+                    for _ in tasks:
+                        results.append(iterator.next(timeout=max(0.0, deadline - time.monotonic())))
+                except multiprocessing.TimeoutError:
+                    timed_out = True
+                results.sort(key=_rank_key)
+                rungs.append({"rung": len(rungs), "rows": rows, "candidates": len(tasks),
+                              "completed": len(results), "seconds": round(time.perf_counter() - rung_started, 3),
+                              "results": results})
+                if timed_out or len(survivors) == 1 or rows >= n_train:
+                    break
+                ranked = [result for result in results if result["score"] is not None]
+                keep = {result["id"] for result in ranked[:max(1, math.ceil(len(survivors) / self.halving_factor))]}
+                survivors = [candidate for candidate in survivors if candidate["id"] in keep]
+                rows = min(n_train, rows * self.halving_factor)
+        finally:
+            if timed_out:
+                pool.terminate()
+            else:
+                pool.close()
+            pool.join()
+        return {"best": self._best(rungs), "rungs": rungs, "timed_out": timed_out, "workers": workers,
+                "seconds": round(time.perf_counter() - started, 3)}
+    #----------------------------------------------------------
+    @staticmethod
+    def _best(rungs: List[dict]):
+        """
+        Top successful result of the deepest completed rung. A rung cut short by
+        the deadline only holds the candidates that finished first, so it is
+        used only when no rung completed.
+        """
+        completed = [rung for rung in rungs if rung["completed"] == rung["candidates"]]
+        partial = [rung for rung in rungs if rung["completed"] != rung["candidates"]]
+        for rung in [*reversed(completed), *reversed(partial)]:
+            successful = [result for result in rung["results"] if result["score"] is not None]
+            if successful:
+                return successful[0]
+        return None
@@ -0,0 +1,208 @@
+"""
+Model Trainer Module
+Trains the classifier on the transformed splits:
+  1. Writes the training matrix (float32, rows shuffled) and labels to .npy
+     files for the search workers to memory-map. Unless the ingestion produced
+     a validation split, the last `validation_fraction` of those rows is held
+     out for scoring.
+  2. Runs the successive-halving search (components/model_search.py) within
+     the wall-clock budget.
+  3. Refits the best configuration on every training row, scores it on the
+     test split, and saves the model with joblib next to a timing report.
+For a collapsed dataset each row carries its count as a sample weight: the
+weights are written next to the matrix and used in every fit and score, so
+the search trains on the unique rows only.
+"""
+import sys
+import time
+import shutil
+import numpy as np
+from pathlib import Path
+from datetime import datetime
+#----------------------------------------------------------
+from networksecurity.components import utils
+from networksecurity.components.logger import ns_logger
+from networksecurity.components.exception import CustomException
+from networksecurity.components.instrumentation import ns_metrics
+from networksecurity.components.schema import phishing_schema
+from networksecurity.components.split_store import SplitDataset
+from networksecurity.components.model_search import SuccessiveHalvingSearch, sample_candidates, make_estimator
+from networksecurity.entity.config_app import DataIngestionConfig, DataTransformationConfig, \
+    ModelTrainerConfig, ModelTrainerArtifact, DataValidationConfig
+#----------------------------------------------------------
+_COPY_ROWS = 100_000     # rows gathered per step when writing the memory-mapped matrix
+#----------------------------------------------------------
+def write_memmap(file_path, values: np.ndarray, order: np.ndarray, dtype) -> Path:
+    """Writes `values[order]` to a .npy file in row chunks, so the gathered copy is never whole in memory."""
+    from numpy.lib.format import open_memmap
+    path = Path(file_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    shape = (len(order),) + values.shape[1:]
+    target = open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+    for start in range(0, len(order), _COPY_ROWS):
+        target[start:start + _COPY_ROWS] = values[order[start:start + _COPY_ROWS]]
+    target.flush()
+    del target
+    return path
+#----------------------------------------------------------
+def test_scores(model, x, y, sample_weight=None, pos_label: int = None) -> dict:
+    """
+    Accuracy, precision, recall and F1 of `pos_label` (default: the schema's
+    positive label, the phishing class -1), plus ROC AUC when available;
+    weighted by `sample_weight` (row counts) if given.
+    """
+    from sklearn.metrics import accuracy_score, precision_recall_fscore_support, roc_auc_score
+    pos_label = phishing_schema().positive_label if pos_label is None else pos_label
+    predicted = model.predict(x)
+    precision, recall, f1, _ = precision_recall_fscore_support(
+        y, predicted, pos_label=pos_label, average="binary", zero_division=0, sample_weight=sample_weight)
+    scores = {"rows": int(len(y)), "accuracy": float(accuracy_score(y, predicted, sample_weight=sample_weight)),
+              "precision": float(precision), "recall": float(recall), "f1": float(f1)}
+    if sample_weight is not None:
+        scores["weighted_rows"] = int(round(float(np.sum(sample_weight))))
+    if hasattr(model, "predict_proba") and len(np.unique(y)) > 1:
+        positive = list(model.classes_).index(pos_label)
+        scores["roc_auc"] = float(roc_auc_score(
+            y == pos_label, model.predict_proba(x)[:, positive], sample_weight=sample_weight))
+    return {name: round(value, 6) if isinstance(value, float) else value for name, value in scores.items()}
+#----------------------------------------------------------
+class ModelTrainer:
+    def __init__(self, trainer_config: ModelTrainerConfig, ingestion_config: DataIngestionConfig,
+                 transformation_config: DataTransformationConfig, validation_config: DataValidationConfig = None):
+        self.trainer_config = trainer_config
+        self.ingestion_config = ingestion_config
+        self.transformation_config = transformation_config
+        # Labels and weights must come from the same validated rows the transform stage wrote
+        self.validation_config = validation_config
+    #----------------------------------------------------------
+    def load_split(self, splits: SplitDataset, split: str, transformed_path):
+        """
+        Transformed feature matrix, label vector and sample weights (None unless
+        the dataset is collapsed) of one split; rows without a label are dropped.
+        """
+        x = utils.read_artifact(transformed_path, as_array=True)
+        y = splits.xy(split)[1]
+        weights = splits.weights(split)
+        labelled = y.notna().to_numpy()
+        y = y.to_numpy(dtype=np.float64, na_value=np.nan)[labelled].astype(np.int8)
+        if not labelled.all():
+            x = x[labelled]
+            weights = weights[labelled] if weights is not None else None
+        return x, y, weights
+    #----------------------------------------------------------
+    def prepare_search_data(self, splits: SplitDataset) -> dict:
+        """Writes the memory-mapped search matrices; returns the data spec for the search."""
+        config = self.trainer_config
+        transformation = self.transformation_config
+        work_dir = Path(config.search_work_dir)
+        x, y, weights = self.load_split(splits, "train", transformation.x_train_transformed_file_and_path)
+        order = np.random.default_rng(config.random_state).permutation(len(y))
+        data = {}
+        if "val" in splits.splits and Path(transformation.x_val_transformed_file_and_path).exists():
+            x_val, y_val, w_val = self.load_split(splits, "val", transformation.x_val_transformed_file_and_path)
+            data["x_val_path"] = str(write_memmap(work_dir / "x_val.npy", x_val, np.arange(len(y_val)), np.float32))
+            data["y_val_path"] = str(write_memmap(work_dir / "y_val.npy", y_val, np.arange(len(y_val)), np.int8))
+            if w_val is not None:
+                data["w_val_path"] = str(write_memmap(work_dir / "w_val.npy", w_val, np.arange(len(y_val)), np.float64))
+            n_train = len(order)
+        else:
+            # Hold-out rows go last, so every rung's training rows are a prefix of the same file
+            n_train = len(order) - max(1, int(round(len(order) * config.validation_fraction)))
+        data["x_path"] = str(write_memmap(work_dir / "x_train.npy", x, order, np.float32))
+        data["y_path"] = str(write_memmap(work_dir / "y_train.npy", y, order, np.int8))
+        data["n_train"] = int(n_train)
+        data["n_rows"] = int(len(order))
+        if weights is not None:
+            data["w_path"] = str(write_memmap(work_dir / "w_train.npy", weights, order, np.float64))
+            data["weighted_rows"] = int(round(float(weights.sum())))
+        return data
+    #----------------------------------------------------------
+    @ns_metrics.instrument("model_trainer", rows=None)
+    def initiate_model_trainer(self) -> ModelTrainerArtifact:
+        try:
+            import joblib
+            config = self.trainer_config
+            valid_rows = self.validation_config.valid_rows_file_and_path if self.validation_config else None
+            splits = SplitDataset.from_artifact(self.ingestion_config, valid_rows)
+            families = [family.strip() for family in config.families.split(",") if family.strip()]
+            candidates = sample_candidates(families, config.candidates, seed=config.random_state)
+            try:
+                started = time.perf_counter()
+                data = self.prepare_search_data(splits)
+                prepare_seconds = time.perf_counter() - started
+                ns_logger.log_info("Model search: %d candidates over %s, %d training rows, budget %.0fs.",
+                                   len(candidates), families, data["n_train"], config.time_budget_seconds)
+                search = SuccessiveHalvingSearch(
+                    candidates, scoring=config.scoring, halving_factor=config.halving_factor,
+                    min_rows=config.min_rows, max_workers=config.max_workers,
+                    time_budget_seconds=config.time_budget_seconds, start_method=config.start_method,
+                    random_state=config.random_state, pos_label=phishing_schema().positive_label)
+                with ns_metrics.track("model_search", rows=data["n_train"]):
+                    outcome = search.run(data)
+                best = outcome["best"]
+                if best is None:
+                    raise RuntimeError("No model configuration finished training within the time budget.")
+                #----------------------------------------------------------
+                # Refit the winner on every training row (hold-out included), using all cores
+                started = time.perf_counter()
+                x_all = np.load(data["x_path"], mmap_mode="r")
+                y_all = np.load(data["y_path"], mmap_mode="r")
+                w_all = np.load(data["w_path"]) if data.get("w_path") else None
+                model = make_estimator(best["family"], best["params"], config.random_state, n_jobs=-1)
+                with ns_metrics.track("model_refit", rows=len(y_all)):
+                    model.fit(x_all, y_all, sample_weight=w_all)
+                refit_seconds = time.perf_counter() - started
+            finally:
+                shutil.rmtree(config.search_work_dir, ignore_errors=True)
+            #----------------------------------------------------------
+            scores = {}
+            if "test" in splits.splits:
+                x_test, y_test, w_test = self.load_split(
+                    splits, "test", self.transformation_config.x_test_transformed_file_and_path)
+                scores = test_scores(model, x_test.astype(np.float32, copy=False), y_test, w_test)
+            preprocessor = joblib.load(self.transformation_config.preprocessor_file_and_path)
+            model_path = Path(config.model_file_and_path)
+            model_path.parent.mkdir(parents=True, exist_ok=True)
+            with utils.atomic_path(model_path) as tmp_path:
+                joblib.dump({
+                    "model": model,
+                    "family": best["family"],
+                    "params": best["params"],
+                    "classes": [int(label) for label in model.classes_],
+                    "positive_label": phishing_schema().positive_label,
+                    "feature_names": [str(name) for name in preprocessor["preprocessor"].get_feature_names_out()],
+                    "preprocessor_fingerprint": preprocessor.get("fingerprint", ""),
+                    "scoring": config.scoring,
+                    "validation_score": best["score"],
+                    "trained_at": datetime.now().isoformat(timespec="seconds"),
+                }, tmp_path)
+            #----------------------------------------------------------
+            evaluated = sum(rung["completed"] for rung in outcome["rungs"])
+            utils.save_report_atomic(config.report_file_and_path, {
+                "trained_at": datetime.now().isoformat(timespec="seconds"),
+                "best": {"family": best["family"], "params": best["params"], "rung": best["rung"],
+                         "rows": best["rows"], f"validation_{config.scoring}": best["score"]},
+                "test": scores,
+                "timing": {"prepare_seconds": round(prepare_seconds, 3), "search_seconds": outcome["seconds"],
+                           "refit_seconds": round(refit_seconds, 3), "workers": outcome["workers"],
+                           "time_budget_seconds": config.time_budget_seconds, "timed_out": outcome["timed_out"]},
+                "search": {"scoring": config.scoring, "halving_factor": config.halving_factor,
+                           "candidates": len(candidates), "evaluations": evaluated,
+                           "training_rows": data["n_train"], "rows": data["n_rows"],
+                           "weighted_rows": data.get("weighted_rows", data["n_rows"])},
+                "rungs": outcome["rungs"],
+            })
+            ns_logger.log_info("Best model %s %s: validation %s %.4f, test %s; saved to %s",
+                               best["family"], best["params"], config.scoring, best["score"], scores, model_path)
+            return ModelTrainerArtifact(
+                model_file_path=model_path,
+                report_file_path=Path(config.report_file_and_path),
+                family=best["family"],
+                params=best["params"],
+                validation_score=best["score"],
+                test_scores=scores,
+                candidates_evaluated=evaluated,
+                timed_out=outcome["timed_out"],
+                search_seconds=outcome["seconds"])
+        except Exception as e:
+            raise CustomException(e, sys) from e
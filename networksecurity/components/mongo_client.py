@@ -0,0 +1,118 @@
+"""
+MongoDB Client Registry
+One pooled MongoClient per (URI, options) for the whole process. Components ask
+the registry for a client instead of constructing their own, so TLS setup and
+server discovery happen once and concurrent stages/workers share one
+connection pool. Clients are closed at interpreter exit, and a pool listener
+keeps per-server connection statistics for the run report.
+"""
+import atexit
+import threading
+from collections import defaultdict
+from typing import Dict, Tuple
+#----------------------------------------------------------
+import pymongo
+from pymongo import monitoring
+#----------------------------------------------------------
+from networksecurity.components.logger import ns_logger
+#----------------------------------------------------------
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Counts connection pool events per server address."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = defaultdict(lambda: {
+            "connections_created": 0, "connections_closed": 0, "open": 0,
+            "checked_out": 0, "max_checked_out": 0, "checkouts": 0,
+            "checkout_failures": 0, "pool_clears": 0})
+    #----------------------------------------------------------
+    def _update(self, event, **deltas):
+        with self._lock:
+            stats = self._stats["%s:%s" % event.address]
+            for key, delta in deltas.items():
+                stats[key] += delta
+            stats["max_checked_out"] = max(stats["max_checked_out"], stats["checked_out"])
+    #----------------------------------------------------------
+    def pool_created(self, event): self._update(event)
+    def pool_cleared(self, event): self._update(event, pool_clears=1)
+    def pool_closed(self, event): self._update(event)
+    def connection_created(self, event): self._update(event, connections_created=1, open=1)
+    def connection_ready(self, event): pass
+    def connection_closed(self, event): self._update(event, connections_closed=1, open=-1)
+    def connection_check_out_started(self, event): pass
+    def connection_check_out_failed(self, event): self._update(event, checkout_failures=1)
+    def connection_checked_out(self, event): self._update(event, checked_out=1, checkouts=1)
+    def connection_checked_in(self, event): self._update(event, checked_out=-1)
+    #----------------------------------------------------------
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {address: dict(stats) for address, stats in self._stats.items()}
+#----------------------------------------------------------
+def _option_key(value):
+    """Hashable, stable stand-in for an option value (e.g. ServerApi objects)."""
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(_option_key(item) for item in value)
+    return repr(vars(value)) if hasattr(value, "__dict__") else repr(value)
+#----------------------------------------------------------
+class MongoClientRegistry:
+    """Thread-safe cache of MongoClients keyed by URI and client options."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple, pymongo.MongoClient] = {}
+        self.pool_listener = PoolStatsListener()
+        atexit.register(self.close_all)
+    #----------------------------------------------------------
+    def get(self, uri: str, **options) -> pymongo.MongoClient:
+        """Returns the shared client for `uri` + `options`, creating it on first use."""
+        key = (uri, tuple(sorted((name, _option_key(value)) for name, value in options.items())))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = pymongo.MongoClient(uri, event_listeners=[self.pool_listener], **options)
+                self._clients[key] = client
+                ns_logger.log_info("MongoDB client created (pool options: %s).",
+                                   {name: value for name, value in options.items() if name != "tlsCAFile"})
+            return client
+    #----------------------------------------------------------
+    def close_all(self) -> None:
+        """Closes every client; later `get` calls create fresh ones."""
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            try:
+                client.close()
+            except Exception as e:
+                ns_logger.log_warning("Error while closing MongoDB client: %s", e)
+    #----------------------------------------------------------
+    def pool_stats(self) -> dict:
+        """Registered client count plus per-server pool counters."""
+        with self._lock:
+            clients = len(self._clients)
+        return {"clients": clients, "servers": self.pool_listener.snapshot()}
+#----------------------------------------------------------
+def client_options(config) -> dict:
+    """pymongo keyword options from the pool/timeout/compression fields of MongoDBAtlasConfig."""
+    import certifi
+    options = {
+        "tlsCAFile": certifi.where(),
+        "maxPoolSize": config.mongo_max_pool_size,
+        "minPoolSize": config.mongo_min_pool_size,
+        "maxIdleTimeMS": config.mongo_max_idle_time_ms,
+        "serverSelectionTimeoutMS": config.mongo_server_selection_timeout_ms,
+        "connectTimeoutMS": config.mongo_connect_timeout_ms,
+        "socketTimeoutMS": config.mongo_socket_timeout_ms,
+        "readPreference": config.mongo_read_preference,
+    }
+    if config.mongo_compressors:
+        # e.g. "zstd,snappy"; needs the zstandard / python-snappy packages
+        options["compressors"] = config.mongo_compressors
+    return {name: value for name, value in options.items() if value is not None}
+#----------------------------------------------------------
+# CREATE THE INSTANCE FOR USE IN OTHER MODULES
+#----------------------------------------------------------
+mongo_registry = MongoClientRegistry()
+#----------------------------------------------------------
+def get_mongo_client(config) -> pymongo.MongoClient:
+    """Shared client for a MongoDBAtlasConfig."""
+    return mongo_registry.get(config.mongo_db_uri, **client_options(config))
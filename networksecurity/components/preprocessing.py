@@ -0,0 +1,259 @@
+"""
+Preprocessing Module
+Builds, fingerprints and caches the fitted feature preprocessor. Both kinds of
+preprocessor fit the same way: median imputation, then standard scaling.
+  * TernaryStandardizer - NumPy in, NumPy out. It is used when every feature
+    is a numeric column holding only -1 / 0 / 1, which is the phishing data.
+    Transforming is one broadcast expression over a float block.
+  * The sklearn ColumnTransformer from utils.create_data_transformation_object
+    is used for anything else (categorical or non-ternary columns). Here it is
+    built with NumPy output rather than pandas output.
+The fitted preprocessor is saved with joblib, together with a fingerprint of
+the training data and the parameters. A later fit with the same fingerprint
+loads the saved preprocessor instead of refitting.
+Collapsed training data (unique rows plus counts) is fitted with the counts as
+sample weights, giving the same statistics as a fit on the expanded rows. The
+ColumnTransformer takes no sample weights (SimpleImputer has none), so it is
+fitted on the distinct rows and its imputer statistics and scaler are then
+recomputed with the weights; the rows are never expanded.
+"""
+import sys
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import List, Tuple
+#----------------------------------------------------------
+from networksecurity.components import utils
+from networksecurity.components.logger import ns_logger
+from networksecurity.components.exception import CustomException
+from networksecurity.components.instrumentation import ns_metrics
+#----------------------------------------------------------
+CACHE_VERSION = 1
+TERNARY_LEVELS = (-1.0, 0.0, 1.0)
+_ZERO_SCALE = 10 * np.finfo(np.float64).eps     # same cut-off as StandardScaler
+#----------------------------------------------------------
+def _float_block(x, columns: List[str] = None) -> np.ndarray:
+    """
+    float64 matrix of `x` (NaN = missing), with DataFrame columns in `columns`
+    order. Always a new array, so callers may modify it in place.
+    """
+    if isinstance(x, pd.DataFrame):
+        if columns is not None:
+            x = x[columns]
+        return x.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+    return np.array(x, dtype=np.float64, copy=True)
+#----------------------------------------------------------
+def _median_from_counts(counts: np.ndarray) -> np.ndarray:
+    """Median per column from (levels, features) counts; the mean of the two middle values when even, 0 if empty."""
+    levels = np.asarray(TERNARY_LEVELS, dtype=np.float64)
+    n = counts.sum(axis=0)
+    cumulative = counts.cumsum(axis=0)
+    lower = levels[(cumulative <= ((n - 1) // 2)[None, :]).sum(axis=0).clip(max=len(levels) - 1)]
+    upper = levels[(cumulative <= (n // 2)[None, :]).sum(axis=0).clip(max=len(levels) - 1)]
+    return np.where(n > 0, (lower + upper) / 2, 0.0)
+#----------------------------------------------------------
+def _weighted_median(values: np.ndarray, weights: np.ndarray) -> float:
+    """Median of `values` repeated by their integer `weights` (NaN skipped), as np.median would give."""
+    present = ~pd.isna(values)
+    values, weights = values[present].astype(np.float64), weights[present]
+    if not len(values):
+        return np.nan
+    order = np.argsort(values, kind="stable")
+    values, cumulative = values[order], np.cumsum(weights[order])
+    n = cumulative[-1]
+    lower = values[np.searchsorted(cumulative, (n - 1) // 2, side="right")]
+    upper = values[np.searchsorted(cumulative, n // 2, side="right")]
+    return (lower + upper) / 2
+#----------------------------------------------------------
+def _weighted_mode(values: np.ndarray, weights: np.ndarray):
+    """Most frequent of `values` by summed weight (NaN skipped); ties go to the smallest, as in SimpleImputer."""
+    totals = pd.Series(weights).groupby(pd.Series(values), dropna=True).sum()
+    if totals.empty:
+        return np.nan
+    return totals[totals == totals.max()].sort_index().index[0]
+#----------------------------------------------------------
+def _refit_weighted(preprocessor, x_train: pd.DataFrame, sample_weight: np.ndarray) -> None:
+    """
+    Recomputes the weight-dependent parts of a ColumnTransformer fitted on the
+    distinct rows: imputer statistics (weighted median / most frequent) and the
+    scaler (StandardScaler takes sample_weight). The one-hot categories do not
+    depend on the weights.
+    """
+    weights = np.asarray(sample_weight, dtype=np.int64)
+    for name, pipeline, columns in preprocessor.transformers_:
+        if name == "remainder" or not hasattr(pipeline, "named_steps") or not len(columns):
+            continue
+        imputer = pipeline.named_steps["imputer"]
+        block = x_train[list(columns)]
+        statistic = _weighted_median if imputer.strategy == "median" else _weighted_mode
+        imputer.statistics_ = np.array(
+            [statistic(block[column].to_numpy(), weights) for column in block.columns],
+            dtype=imputer.statistics_.dtype)
+        if "scaler" in pipeline.named_steps:
+            pipeline.named_steps["scaler"].fit(imputer.transform(block), sample_weight=weights)
+#----------------------------------------------------------
+class TernaryStandardizer:
+    """
+    Median imputation plus standard scaling for features holding -1 / 0 / 1.
+    Its output matches the numeric branch of the sklearn preprocessor (ddof=0
+    scale, near-zero scales replaced by 1), but it skips the ColumnTransformer
+    / Pipeline dispatch and the pandas wrapping, which dominate the cost on
+    narrow int8 data.
+    """
+    def __init__(self, dtype=np.float64):
+        self.dtype = dtype
+    #----------------------------------------------------------
+    def fit(self, x, y=None, sample_weight=None) -> "TernaryStandardizer":
+        """
+        Statistics come from the per-column counts of -1 / 0 / 1, so fitting is
+        three comparisons over the block instead of a sort (median) per column.
+        With `sample_weight` (row counts of collapsed data) the counts are weighted.
+        """
+        self.feature_names_in_ = list(x.columns) if isinstance(x, pd.DataFrame) else None
+        block = _float_block(x)
+        self.n_features_in_ = block.shape[1]
+        if sample_weight is None:
+            n_rows = block.shape[0]
+            counts = np.stack([(block == value).sum(axis=0) for value in TERNARY_LEVELS])    # (3, features)
+            nulls = np.isnan(block).sum(axis=0)
+        else:
+            weights = np.asarray(sample_weight, dtype=np.float64)
+            n_rows = weights.sum()
+            counts = np.stack([weights @ (block == value) for value in TERNARY_LEVELS])
+            nulls = weights @ np.isnan(block)
+        if (counts.sum(axis=0) + nulls != n_rows).any():
+            raise ValueError("TernaryStandardizer expects only -1, 0, 1 or missing values")
+        self.median_ = _median_from_counts(counts)
+        # Missing entries take the median, as SimpleImputer(strategy="median") does
+        missing = n_rows - counts.sum(axis=0)
+        levels = np.asarray(TERNARY_LEVELS)[:, None]
+        total = max(n_rows, 1)
+        self.mean_ = ((levels * counts).sum(axis=0) + missing * self.median_) / total
+        second = ((levels ** 2 * counts).sum(axis=0) + missing * self.median_ ** 2) / total
+        scale = np.sqrt(np.maximum(second - self.mean_ ** 2, 0.0))
+        scale[scale < _ZERO_SCALE] = 1.0
+        self.scale_ = scale
+        return self
+    #----------------------------------------------------------
+    def transform(self, x) -> np.ndarray:
+        block = _float_block(x, self.feature_names_in_)
+        if block.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected {self.n_features_in_} features, got {block.shape[1]}")
+        # In place on the fresh block: one allocation per call, no temporaries
+        missing = np.isnan(block)
+        if missing.any():
+            np.copyto(block, np.broadcast_to(self.median_, block.shape), where=missing)
+        block -= self.mean_
+        block /= self.scale_
+        return block.astype(self.dtype, copy=False)
+    #----------------------------------------------------------
+    def fit_transform(self, x, y=None, sample_weight=None) -> np.ndarray:
+        return self.fit(x, sample_weight=sample_weight).transform(x)
+    #----------------------------------------------------------
+    def get_feature_names_out(self, input_features=None) -> np.ndarray:
+        names = self.feature_names_in_ or [f"x{j}" for j in range(self.n_features_in_)]
+        return np.asarray(names, dtype=object)
+#----------------------------------------------------------
+# Building and fingerprinting
+#----------------------------------------------------------
+def build_preprocessor(x_train: pd.DataFrame, fast_path: bool = True):
+    """Unfitted preprocessor for `x_train`: TernaryStandardizer when possible, else the ColumnTransformer."""
+    numerical_cols, character_cols = utils.list_dataframe_columns_by_type(x_train)
+    if fast_path and utils.is_ternary_numeric(x_train, numerical_cols, character_cols):
+        return TernaryStandardizer()
+    return utils.create_data_transformation_object(numerical_cols, character_cols, output="default")
+#----------------------------------------------------------
+def preprocessor_kind(preprocessor) -> str:
+    return "ternary" if isinstance(preprocessor, TernaryStandardizer) else "column_transformer"
+#----------------------------------------------------------
+def preprocessor_fingerprint(x_train: pd.DataFrame, params: dict, sample_weight: np.ndarray = None) -> str:
+    """
+    SHA-256 of the training features (values, column names and order), the
+    sample weights if any and the parameters. Numeric columns are hashed as one
+    float64 block, so the same data read as int8, nullable Int8 or float gets
+    the same key; any other columns go through pandas' row hashing.
+    """
+    import sklearn
+    numeric = [column for column in x_train.columns if pd.api.types.is_numeric_dtype(x_train[column].dtype)]
+    others = [column for column in x_train.columns if column not in numeric]
+    digest = hashlib.sha256()
+    digest.update(json.dumps({
+        "version": CACHE_VERSION,
+        "sklearn": sklearn.__version__,
+        "numeric_columns": [str(column) for column in numeric],
+        "other_columns": [str(column) for column in others],
+        "rows": len(x_train),
+        "params": params,
+    }, sort_keys=True, default=str).encode())
+    if numeric:
+        block = x_train[numeric].to_numpy(dtype=np.float64, na_value=np.nan)
+        digest.update(np.ascontiguousarray(block).data)
+    if others:
+        digest.update(pd.util.hash_pandas_object(x_train[others], index=False).to_numpy().tobytes())
+    if sample_weight is not None:
+        digest.update(b"sample_weight")
+        digest.update(np.ascontiguousarray(sample_weight, dtype=np.float64).data)
+    return digest.hexdigest()
+#----------------------------------------------------------
+# joblib cache
+#----------------------------------------------------------
+def load_cached_preprocessor(file_path, fingerprint: str):
+    """The preprocessor saved at `file_path` if its fingerprint matches, else None."""
+    path = Path(file_path)
+    if not path.exists():
+        return None
+    import joblib
+    try:
+        payload = joblib.load(path)
+    except Exception as e:
+        # An unreadable cache (older format, partial copy) is refitted, not fatal
+        ns_logger.log_warning("Ignoring unreadable preprocessor cache %s: %s", path, e)
+        return None
+    if not isinstance(payload, dict) or payload.get("fingerprint") != fingerprint:
+        return None
+    return payload.get("preprocessor")
+#----------------------------------------------------------
+def save_preprocessor(file_path, preprocessor, fingerprint: str, **meta) -> None:
+    """Writes the fitted preprocessor and its fingerprint atomically with joblib."""
+    try:
+        import joblib
+        path = Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with utils.atomic_path(path) as tmp_path:
+            joblib.dump({"fingerprint": fingerprint, "preprocessor": preprocessor, **meta}, tmp_path)
+    except Exception as e:
+        raise CustomException(e, sys) from e
+#----------------------------------------------------------
+@ns_metrics.instrument("fit_preprocessor", rows=None)
+def fit_preprocessor(x_train: pd.DataFrame, file_path, use_cache: bool = True,
+                     fast_path: bool = True, sample_weight: np.ndarray = None) -> Tuple[object, dict]:
+    """
+    Returns (fitted preprocessor, info). With `use_cache`, a preprocessor saved
+    at `file_path` for the same training data and parameters is reused;
+    otherwise one is fitted and saved there. `sample_weight` holds the row
+    counts of collapsed training data.
+    """
+    try:
+        fingerprint = preprocessor_fingerprint(x_train, {"fast_path": fast_path}, sample_weight)
+        preprocessor = load_cached_preprocessor(file_path, fingerprint) if use_cache else None
+        cache_hit = preprocessor is not None
+        if cache_hit:
+            ns_logger.log_info("Training data unchanged (fingerprint %s); reusing fitted preprocessor.",
+                               fingerprint[:12])
+        else:
+            preprocessor = build_preprocessor(x_train, fast_path=fast_path)
+            if sample_weight is None:
+                preprocessor.fit(x_train)
+            elif isinstance(preprocessor, TernaryStandardizer):
+                preprocessor.fit(x_train, sample_weight=sample_weight)
+            else:
+                # SimpleImputer takes no sample weights: fit on the distinct rows, then reweight
+                preprocessor.fit(x_train)
+                _refit_weighted(preprocessor, x_train, sample_weight)
+            save_preprocessor(file_path, preprocessor, fingerprint, kind=preprocessor_kind(preprocessor))
+        return preprocessor, {"kind": preprocessor_kind(preprocessor), "cache_hit": cache_hit,
+                              "fingerprint": fingerprint}
+    except Exception as e:
+        raise CustomException(e, sys) from e
@@ -1,19 +1,49 @@
 import os
 import sys
 import pandas as pd
+import io
 import json
-import certifi
-from pymongo import MongoClient
+import time
+import hashlib
+import itertools
+import numpy as np
+from datetime import datetime
+from dataclasses import asdict
+from typing import Iterator, Tuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 #----------------------------------------------------------
 # Local imports
 #----------------------------------------------------------
+from networksecurity.components import utils
+import networksecurity.components.constants as constants
 from networksecurity.components.logger import ns_logger
 from networksecurity.components.exception import CustomException
-from networksecurity.entity.config_app import MongoDBAtlasConfig
+from networksecurity.components.instrumentation import ns_metrics
+from networksecurity.components.mongo_client import get_mongo_client
+from networksecurity.components.schema import phishing_schema
+from networksecurity.components.row_codec import RowCodec, STORAGE_MODES
+from networksecurity.entity.config_app import MongoDBAtlasConfig, PushBatchResult, PushManifest
 #----------------------------------------------------------
-# Initialize Certifi for 2025 TLS standards
+# Helpers
 #----------------------------------------------------------
-ca = certifi.where()
+def _read_csv_typed(source, **kwargs):
+    """pd.read_csv with the schema's read dtypes and missing-value sentinels."""
+    return pd.read_csv(
+        source, index_col=False, dtype=phishing_schema().read_csv_dtypes(),
+        na_values=list(constants.MISSING_VALUE_SENTINELS), keep_default_na=True, **kwargs)
+#----------------------------------------------------------
+def _to_documents(frame: pd.DataFrame) -> list[dict]:
+    """Converts a frame to BSON-ready dicts; missing values become None."""
+    if frame.isna().values.any():
+        frame = frame.astype(object).where(frame.notna(), None)
+    return frame.to_dict(orient="records")
+#----------------------------------------------------------
+def _batch_key(fingerprints: np.ndarray) -> int:
+    """Signed 64-bit key of a block from its row fingerprints (same rows -> same key)."""
+    digest = hashlib.blake2b(np.ascontiguousarray(fingerprints, dtype=np.int64).tobytes(), digest_size=8)
+    return int.from_bytes(digest.digest(), "little", signed=True)
 #----------------------------------------------------------
 # Core Logic
 #----------------------------------------------------------
@@ -25,21 +55,28 @@ class NetworkDataExtractor:
         """
         try:
             self.config = config
-            # Connection pooling optimization: init client once
-            self.client = MongoClient(self.config.mongo_db_uri, tlsCAFile=ca)
+            if config.mongo_storage_mode not in STORAGE_MODES:
+                raise ValueError(
+                    f"Unknown storage mode '{config.mongo_storage_mode}'; expected one of {STORAGE_MODES}")
+            self.codec = RowCodec() if config.mongo_storage_mode != "document" else None
+            # Shared pooled client from the registry (TLS via certifi)
+            self.client = get_mongo_client(self.config)
             ns_logger.log_info("MongoDB Client initialized successfully.")
         except Exception as e:
             raise CustomException(e, sys) from e
     #----------------------------------------------------------
+    @ns_metrics.instrument("push.cv_to_json")
     def cv_to_json(self, file_path: str) -> list[dict]:
         """Converts CSV data to a list of dictionaries (2025 optimized)."""
         try:
-            data = pd.read_csv(file_path, index_col=False)
+            # Cast through the schema: int8 columns, out-of-schema values rejected here
+            data = phishing_schema().cast_frame(_read_csv_typed(file_path))
             # Optimized: Avoid string serialization, use to_dict directly
-            return data.to_dict(orient="records")
+            return _to_documents(data)
         except Exception as e:
             raise CustomException(e, sys) from e
     #----------------------------------------------------------
+    @ns_metrics.instrument("push.push_data_to_mongo", rows=lambda count: count)
     def push_data_to_mongo(self, data: list[dict]) -> int:
         """Pushes data using the settings from the config object."""
         try:
@@ -54,10 +91,355 @@ class NetworkDataExtractor:
             result = collection.insert_many(data, ordered=False)
             count = len(result.inserted_ids)
             
-            ns_logger.log_info(f"Inserted {count} records into {self.config.mongo_db_name}")
+            ns_logger.log_info("Inserted %d records into %s", count, self.config.mongo_db_name)
             return count
         except Exception as e:
             raise CustomException(e, sys) from e
+    #----------------------------------------------------------
+    def iter_csv_batches(
+        self, file_path: str, chunk_size: int = None, batch_size: int = None
+    ) -> Iterator[Tuple[int, pd.DataFrame]]:
+        """
+        Streams the CSV in chunks of `chunk_size` rows and yields
+        (first_row, frame) slices of at most `batch_size` rows.
+        Documents are not built here; that happens per batch in the workers.
+        """
+        chunk_size = chunk_size or self.config.push_chunk_size
+        batch_size = batch_size or self.config.push_batch_size
+        first_row = 0
+        for chunk in _read_csv_typed(file_path, chunksize=chunk_size):
+            chunk = phishing_schema().cast_frame(chunk)
+            for start in range(0, len(chunk), batch_size):
+                batch = chunk.iloc[start:start + batch_size]
+                yield first_row, batch
+                first_row += len(batch)
+    #----------------------------------------------------------
+    def _occurrence_fingerprints(self, lines: list, seen: dict) -> np.ndarray:
+        """
+        Fingerprints rows by their text and by how many times that exact text
+        has already appeared in the file, so repeated identical rows stay
+        distinct documents while re-pushing the same file maps onto the same keys.
+        `seen` carries the per-text occurrence counts across blocks.
+        """
+        keys = np.array([line.rstrip(b"\r\n").decode("utf-8") for line in lines], dtype=object)
+        text_hashes = pd.util.hash_array(keys)
+        unique_hashes, inverse, counts = np.unique(text_hashes, return_inverse=True, return_counts=True)
+        base = np.array([seen.get(h, 0) for h in unique_hashes.tolist()], dtype=np.uint64)
+        within = pd.Series(text_hashes).groupby(text_hashes).cumcount().to_numpy(dtype=np.uint64)
+        for h, b, c in zip(unique_hashes.tolist(), base.tolist(), counts.tolist()):
+            seen[h] = b + c
+        ordinals = base[inverse] + within
+        return pd.util.hash_array(text_hashes ^ pd.util.hash_array(ordinals)).view(np.int64)
+    #----------------------------------------------------------
+    def iter_csv_blocks(
+        self, file_path: str, start_offset: int = 0, batch_size: int = None
+    ) -> Iterator[Tuple[int, int, pd.DataFrame, np.ndarray, str]]:
+        """
+        Reads the CSV line by line from `start_offset` and yields, per block of
+        `batch_size` rows: (start_offset, end_offset, frame, fingerprints, prefix_checksum).
+        `prefix_checksum` is the SHA-256 of the file from byte 0 up to `end_offset`.
+        The committed prefix is only hashed, not parsed, to restore the checksum
+        and the occurrence counts behind the fingerprints; it is skipped
+        `batch_size` lines at a time, so resuming holds one block in memory.
+        Assumes one record per line (no quoted newlines), which holds for this schema.
+        """
+        batch_size = batch_size or self.config.push_batch_size
+        seen = {}
+        with open(file_path, 'rb') as file:
+            header = file.readline()
+            prefix_hash = hashlib.sha256(header)
+            offset = len(header)
+            committed = []
+            while offset < start_offset:
+                # Committed offsets are line ends; the limit only guards a shorter file
+                line = file.readline(start_offset - offset)
+                if not line:
+                    break
+                prefix_hash.update(line)
+                offset += len(line)
+                if line.strip():
+                    committed.append(line)
+                if len(committed) >= batch_size or offset >= start_offset:
+                    self._occurrence_fingerprints(committed, seen)
+                    committed = []
+            if committed:
+                self._occurrence_fingerprints(committed, seen)
+            while True:
+                lines = list(itertools.islice(file, batch_size))
+                if not lines:
+                    break
+                block = b"".join(lines)
+                prefix_hash.update(block)
+                block_start, offset = offset, offset + len(block)
+                rows = [line for line in lines if line.strip()]
+                if not rows:
+                    continue
+                frame = phishing_schema().cast_frame(_read_csv_typed(io.BytesIO(header + b"".join(rows))))
+                fingerprints = self._occurrence_fingerprints(rows, seen)
+                yield block_start, offset, frame, fingerprints, prefix_hash.hexdigest()
+    #----------------------------------------------------------
+    def _documents(self, frame: pd.DataFrame, fingerprints: np.ndarray = None) -> Tuple[list, int]:
+        """
+        (documents, rows per document) of one batch in the configured storage
+        mode. A packed batch document is keyed by a hash of its row fingerprints.
+        """
+        mode = self.config.mongo_storage_mode
+        key = self.config.row_fingerprint_field
+        if mode == "document":
+            return _to_documents(frame if fingerprints is None else frame.assign(**{key: fingerprints})), 1
+        codes = self.codec.pack_frame(frame)
+        if mode == "packed_row":
+            return RowCodec.to_documents(codes, mode, None if fingerprints is None else {key: fingerprints}), 1
+        extra = None if fingerprints is None else {key: _batch_key(fingerprints)}
+        return RowCodec.to_documents(codes, mode, extra), len(frame)
+    #----------------------------------------------------------
+    def _insert_batch(self, collection, batch_index: int, first_row: int,
+                      batch: pd.DataFrame) -> PushBatchResult:
+        """Builds the documents for one batch and inserts them; never raises."""
+        result = PushBatchResult(batch_index=batch_index, first_row=first_row, rows=len(batch))
+        start = time.perf_counter()
+        try:
+            documents, rows_per_document = self._documents(batch)
+            result.inserted = len(collection.insert_many(documents, ordered=False).inserted_ids) * rows_per_document
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+        result.seconds = time.perf_counter() - start
+        return result
+    #----------------------------------------------------------
+    def _upsert_batch(self, collection, batch_index: int, first_row: int,
+                      payload: tuple) -> PushBatchResult:
+        """
+        Upserts one fingerprinted block keyed on the fingerprint field and stamps
+        every row, new or already present, with the push generation; rows it
+        inserts also get the batch index as their push sequence. Never raises.
+        """
+        frame, fingerprints, end_offset, generation = payload
+        result = PushBatchResult(
+            batch_index=batch_index, first_row=first_row, rows=len(frame), end_offset=end_offset)
+        start = time.perf_counter()
+        try:
+            key = self.config.row_fingerprint_field
+            documents, rows_per_document = self._documents(frame, fingerprints)
+            requests = [
+                UpdateOne({key: document[key]},
+                          {"$setOnInsert": {**document, self.config.push_sequence_field: batch_index},
+                           "$set": {self.config.push_generation_field: generation}},
+                          upsert=True)
+                for document in documents
+            ]
+            try:
+                write = collection.bulk_write(requests, ordered=False)
+                result.inserted = write.upserted_count * rows_per_document
+                result.matched = write.matched_count * rows_per_document
+            except BulkWriteError as bwe:
+                # A duplicate key means another writer upserted the same row first
+                details = bwe.details
+                errors = details.get("writeErrors", [])
+                if any(error.get("code") != 11000 for error in errors):
+                    raise
+                result.inserted = details.get("nUpserted", 0) * rows_per_document
+                result.matched = (details.get("nMatched", 0) + len(errors)) * rows_per_document
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+        result.seconds = time.perf_counter() - start
+        return result
+    #----------------------------------------------------------
+    def _run_batches(self, batches, send, on_result=None) -> list[PushBatchResult]:
+        """
+        Sends (batch_index, first_row, payload) items with `send` on a thread pool,
+        keeping at most `push_max_in_flight` batches queued or running.
+        `on_result` is called on the calling thread as each batch finishes.
+        """
+        collection = self.client[self.config.mongo_db_name][self.config.mongo_db_collection_name]
+        max_in_flight = max(self.config.push_max_in_flight, self.config.push_max_workers)
+        results: list[PushBatchResult] = []
+        pending = set()
+        #----------------------------------------------------------
+        def collect(futures):
+            for future in futures:
+                batch_result = future.result()
+                results.append(batch_result)
+                if batch_result.ok:
+                    ns_logger.log_debug(
+                        "Batch %d: %d documents in %.3fs",
+                        batch_result.batch_index, batch_result.inserted, batch_result.seconds)
+                else:
+                    ns_logger.log_error(
+                        "Batch %d (rows %d-%d) failed: %s", batch_result.batch_index, batch_result.first_row,
+                        batch_result.first_row + batch_result.rows - 1, batch_result.error)
+                if on_result is not None:
+                    on_result(batch_result)
+        #----------------------------------------------------------
+        with ThreadPoolExecutor(max_workers=self.config.push_max_workers) as pool:
+            for batch_index, first_row, payload in batches:
+                # Back-pressure: wait for a slot before reading further into the file
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                pending.add(pool.submit(send, collection, batch_index, first_row, payload))
+            done, _ = wait(pending)
+            collect(done)
+        results.sort(key=lambda r: r.batch_index)
+        return results
+    #----------------------------------------------------------
+    def _report(self, mode: str, results: list[PushBatchResult], elapsed: float,
+                raise_on_error: bool) -> None:
+        inserted = sum(r.inserted for r in results)
+        failed = [r for r in results if not r.ok]
+        ns_logger.log_info(
+            "%s push: %d records in %d batches into %s in %.2fs (%.0f rows/s), %d failed batches",
+            mode, inserted, len(results), self.config.mongo_db_name, elapsed,
+            inserted / elapsed if elapsed else 0, len(failed))
+        if failed and raise_on_error:
+            raise RuntimeError(
+                f"{len(failed)} of {len(results)} batches failed; first failed batch "
+                f"{failed[0].batch_index}: {failed[0].error}")
+    #----------------------------------------------------------
+    def push_data_streaming(self, file_path: str, raise_on_error: bool = True) -> list[PushBatchResult]:
+        """
+        Streams the CSV into MongoDB in batches of `push_batch_size` documents,
+        with up to `push_max_in_flight` batches queued on `push_max_workers` threads.
+        Only the current CSV chunk and the in-flight batches are held in memory,
+        so peak memory does not grow with the file size.
+        """
+        try:
+            start = time.perf_counter()
+            batches = (
+                (batch_index, first_row, batch)
+                for batch_index, (first_row, batch) in enumerate(self.iter_csv_batches(file_path))
+            )
+            with ns_metrics.track("push.streaming", bytes=os.path.getsize(file_path)) as metrics:
+                results = self._run_batches(batches, self._insert_batch)
+                metrics.rows = sum(r.rows for r in results)
+            self._report("Streaming", results, time.perf_counter() - start, raise_on_error)
+            return results
+        except Exception as e:
+            raise CustomException(e, sys) from e
+    #----------------------------------------------------------
+    @ns_metrics.instrument("push.file_checksum", rows=None, bytes=lambda result: result[0])
+    def _file_checksum(self, file_path: str) -> Tuple[int, str]:
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+        return os.path.getsize(file_path), digest.hexdigest()
+    #----------------------------------------------------------
+    def _prefix_checksum(self, file_path: str, length: int) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            remaining = length
+            while remaining > 0:
+                block = file.read(min(1 << 20, remaining))
+                if not block:
+                    break
+                digest.update(block)
+                remaining -= len(block)
+        return digest.hexdigest()
+    #----------------------------------------------------------
+    def load_manifest(self) -> PushManifest:
+        payload = utils.load_json(self.config.push_manifest_file_and_path)
+        return PushManifest(**payload) if payload else PushManifest()
+    #----------------------------------------------------------
+    def _save_manifest(self, manifest: PushManifest) -> None:
+        manifest.updated_at = datetime.now().isoformat(timespec="seconds")
+        utils.save_json_atomic(self.config.push_manifest_file_and_path, asdict(manifest))
+    #----------------------------------------------------------
+    def push_data_incremental(self, file_path: str, raise_on_error: bool = True) -> list[PushBatchResult]:
+        """
+        Idempotent, resumable push. Each row is fingerprinted from its text and
+        upserted against a unique index on the fingerprint field, so re-running
+        on the same file adds nothing. Progress is recorded in the push manifest
+        after every contiguously acknowledged batch:
+          * unchanged file that was fully pushed -> nothing is sent;
+          * file whose committed prefix is unchanged (crash mid-push, or rows
+            appended since) -> resume from the committed byte offset;
+          * anything else -> re-scan from the start under a new generation;
+            existing rows only match.
+        Once the file is fully pushed, documents not stamped with the current
+        generation (rows changed or removed from the file) are deleted, so the
+        collection mirrors the file.
+        Batch indexes carry on across scans, so the push sequence of a row only
+        increases with the time it was first pushed; rows with a sequence up to
+        `last_acked_batch` are committed (see drift.py).
+        In "packed_batch" storage the upsert key is the whole batch, so a re-scan
+        only matches batches whose rows and boundaries are unchanged; the others
+        are re-inserted and the old batch documents deleted.
+        """
+        try:
+            start = time.perf_counter()
+            file_size, file_checksum = self._file_checksum(file_path)
+            manifest = self.load_manifest()
+            if manifest.file_checksum == file_checksum and manifest.completed:
+                ns_logger.log_info("%s unchanged since last push; nothing to send.", file_path)
+                return []
+            #----------------------------------------------------------
+            resume = (
+                manifest.committed_offset > 0
+                and manifest.committed_offset <= file_size
+                and self._prefix_checksum(file_path, manifest.committed_offset)
+                    == manifest.committed_prefix_checksum
+            )
+            if not resume:
+                manifest = PushManifest(generation=manifest.generation + 1,
+                                        last_acked_batch=manifest.last_acked_batch)
+            else:
+                ns_logger.log_info(
+                    "Resuming push of %s after batch %d (byte %d, %d rows).", file_path,
+                    manifest.last_acked_batch, manifest.committed_offset, manifest.rows_committed)
+            manifest.file_path = str(file_path)
+            manifest.file_size = file_size
+            manifest.file_checksum = file_checksum
+            manifest.completed = False
+            #----------------------------------------------------------
+            collection = self.client[self.config.mongo_db_name][self.config.mongo_db_collection_name]
+            collection.create_index(self.config.row_fingerprint_field, unique=True)
+            collection.create_index(self.config.push_sequence_field)
+            #----------------------------------------------------------
+            # Batches finish out of order; only advance the manifest over a
+            # contiguous run of acknowledged batches.
+            prefix_checksums = {}
+            acknowledged = {}
+            def batches():
+                batch_index = manifest.last_acked_batch + 1
+                first_row = manifest.rows_committed
+                for _, end_offset, frame, fingerprints, prefix in self.iter_csv_blocks(
+                        file_path, start_offset=manifest.committed_offset):
+                    prefix_checksums[batch_index] = prefix
+                    yield batch_index, first_row, (frame, fingerprints, end_offset, manifest.generation)
+                    batch_index += 1
+                    first_row += len(frame)
+            def on_result(result: PushBatchResult):
+                if not result.ok:
+                    return
+                acknowledged[result.batch_index] = result
+                advanced = False
+                while manifest.last_acked_batch + 1 in acknowledged:
+                    acked = acknowledged.pop(manifest.last_acked_batch + 1)
+                    manifest.last_acked_batch = acked.batch_index
+                    manifest.committed_offset = acked.end_offset
+                    manifest.committed_prefix_checksum = prefix_checksums.pop(acked.batch_index)
+                    manifest.rows_committed += acked.rows
+                    advanced = True
+                if advanced:
+                    self._save_manifest(manifest)
+            #----------------------------------------------------------
+            with ns_metrics.track("push.incremental", bytes=file_size - manifest.committed_offset) as metrics:
+                results = self._run_batches(batches(), self._upsert_batch, on_result)
+                metrics.rows = sum(r.rows for r in results)
+            failed = [r for r in results if not r.ok]
+            manifest.completed = not failed and manifest.committed_offset == file_size
+            if manifest.completed:
+                stale = collection.delete_many({
+                    self.config.row_fingerprint_field: {"$exists": True},
+                    self.config.push_generation_field: {"$ne": manifest.generation}})
+                ns_logger.log_info("Deleted %d documents no longer in %s.", stale.deleted_count, file_path)
+            self._save_manifest(manifest)
+            matched = sum(r.matched for r in results)
+            ns_logger.log_info("%d rows were already present and were not re-inserted.", matched)
+            self._report("Incremental", results, time.perf_counter() - start, raise_on_error)
+            return results
+        except Exception as e:
+            raise CustomException(e, sys) from e
 #----------------------------------------------------------
 # Execution Block
 #----------------------------------------------------------
@@ -0,0 +1,143 @@
+"""
+Row Codec Module
+Packs schema rows into one 64-bit integer, 2 bits per column: 0 = missing,
+1 = -1, 2 = 0, 3 = 1. The 30 ternary features take 60 bits and the label 2
+more. Bit 63 is never set, so a code fits a signed BSON int64. Packing and
+unpacking are whole-array NumPy shifts and masks, one pass per column.
+
+The code identifies a row's values exactly, so it doubles as a cheap row key
+(`hash_codes` spreads it over 64 bits for bucketing).
+
+Mongo storage modes (MONGO_STORAGE_MODE) built on the codec:
+  * "document"     - one document per row with a field per column (default);
+  * "packed_row"   - one small document per row: {"code": int64}, plus the row
+                     fingerprint when pushed incrementally;
+  * "packed_batch" - one document per push batch: {"rows": n, "codes": <n
+                     little-endian uint64 as BSON binary>}.
+"""
+import numpy as np
+from typing import List, Tuple
+#----------------------------------------------------------
+from networksecurity.components.hash_split import _mix64
+from networksecurity.components.schema import DatasetSchema, phishing_schema, TERNARY_VALUES
+#----------------------------------------------------------
+STORAGE_MODES = ("document", "packed_row", "packed_batch")
+CODE_FIELD = "code"
+CODES_FIELD = "codes"
+ROWS_FIELD = "rows"
+BITS_PER_COLUMN = 2
+MAX_COLUMNS = 31                # bit 63 stays clear for signed int64 storage
+_MASK = np.uint64(0b11)
+#----------------------------------------------------------
+def hash_codes(codes: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer of packed codes (hash_split's): uniform 64-bit hashes for bucketing and sampling."""
+    return _mix64(codes)
+#----------------------------------------------------------
+class RowCodec:
+    """Packs / unpacks rows of `schema` (every column ternary or binary) to / from uint64 codes."""
+    def __init__(self, schema: DatasetSchema = None):
+        self.schema = schema or phishing_schema()
+        self.columns: List[str] = self.schema.names
+        if len(self.columns) > MAX_COLUMNS:
+            raise ValueError(f"A packed code holds at most {MAX_COLUMNS} columns; schema has {len(self.columns)}")
+        for spec in self.schema.columns:
+            if not set(spec.allowed_values) <= set(TERNARY_VALUES):
+                raise ValueError(f"Column '{spec.name}' allows {spec.allowed_values}; only -1/0/1 can be packed")
+        self._shifts = [np.uint64(BITS_PER_COLUMN * j) for j in range(len(self.columns))]
+        # Columns whose allowed values or nullability are narrower than what 2 bits can hold
+        self._checked = [j for j, spec in enumerate(self.schema.columns)
+                         if set(spec.allowed_values) != set(TERNARY_VALUES) or not spec.nullable]
+    #----------------------------------------------------------
+    def pack(self, values: np.ndarray, missing: np.ndarray = None) -> np.ndarray:
+        """
+        uint64 codes of a (rows, columns) block in schema column order: an
+        integer block with an optional missing mask, or a float block with NaN.
+        Values are assumed to be schema-valid (cast or checked by the caller).
+        """
+        if values.ndim != 2 or values.shape[1] != len(self.columns):
+            raise ValueError(f"Expected a (rows, {len(self.columns)}) block; got {values.shape}")
+        if missing is None and values.dtype.kind == "f":
+            missing = np.isnan(values)
+        codes = np.zeros(len(values), dtype=np.uint64)
+        for j, shift in enumerate(self._shifts):
+            column = values[:, j]
+            if column.dtype.kind == "f":
+                column = np.where(np.isnan(column), 0, column)
+            field = (column.astype(np.int8) + np.int8(2)).astype(np.uint64)
+            if missing is not None:
+                field[missing[:, j]] = 0
+            codes |= field << shift
+        return codes
+    #----------------------------------------------------------
+    def pack_frame(self, frame) -> np.ndarray:
+        """Codes of a schema-typed frame (int8 / nullable Int8 columns, as from `cast_frame`)."""
+        values = np.empty((len(frame), len(self.columns)), dtype=np.int8)
+        missing = np.zeros((len(frame), len(self.columns)), dtype=bool)
+        for j, name in enumerate(self.columns):
+            column = frame[name]
+            missing[:, j] = column.isna().to_numpy()
+            values[:, j] = column.to_numpy(dtype=np.int8, na_value=0)
+        return self.pack(values, missing)
+    #----------------------------------------------------------
+    def unpack(self, codes: np.ndarray, columns: List[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(int8 values, missing mask) of `codes` for `columns` (default: all, schema order)."""
+        codes = np.asarray(codes).view(np.uint64) if np.asarray(codes).dtype == np.int64 else np.asarray(
+            codes, dtype=np.uint64)
+        positions = range(len(self.columns)) if columns is None else [self.columns.index(c) for c in columns]
+        fields = np.empty((len(codes), len(positions)), dtype=np.int8)
+        for k, j in enumerate(positions):
+            fields[:, k] = (codes >> self._shifts[j]) & _MASK
+        missing = fields == 0
+        fields -= np.int8(2)
+        fields[missing] = 0
+        return fields, missing
+    #----------------------------------------------------------
+    def check(self, values: np.ndarray, missing: np.ndarray, columns: List[str] = None) -> None:
+        """
+        Raises ValueError where decoded values break the schema beyond what 2 bits
+        rule out: e.g. a 0 or a missing value in the binary, required label.
+        """
+        columns = self.columns if columns is None else columns
+        for j in self._checked:
+            name = self.columns[j]
+            if name in columns:
+                k = columns.index(name)
+                block = np.where(missing[:, k], np.nan, values[:, k]).astype(np.float64)
+                self.schema.check_block(block.reshape(-1, 1), [name])
+    #----------------------------------------------------------
+    # Mongo documents
+    #----------------------------------------------------------
+    @staticmethod
+    def to_documents(codes: np.ndarray, storage_mode: str, extra: dict = None) -> List[dict]:
+        """
+        Documents for `codes`: one per row ("packed_row"; `extra` maps field ->
+        per-row array) or one for the whole batch ("packed_batch"; `extra` maps
+        field -> scalar).
+        """
+        from bson.binary import Binary
+        if storage_mode == "packed_row":
+            signed = codes.astype(np.uint64, copy=False).view(np.int64).tolist()
+            if not extra:
+                return [{CODE_FIELD: code} for code in signed]
+            names = list(extra)
+            columns = [np.asarray(extra[name]).tolist() for name in names]
+            return [{**dict(zip(names, row)), CODE_FIELD: code} for code, *row in zip(signed, *columns)]
+        if storage_mode == "packed_batch":
+            payload = np.ascontiguousarray(codes, dtype="<u8").tobytes()
+            return [{**(extra or {}), ROWS_FIELD: int(len(codes)), CODES_FIELD: Binary(payload)}]
+        raise ValueError(f"Unknown packed storage mode '{storage_mode}'; expected packed_row or packed_batch")
+    #----------------------------------------------------------
+    @staticmethod
+    def codes_from_documents(documents: list, storage_mode: str) -> np.ndarray:
+        """uint64 codes held by documents of `storage_mode`, in document order."""
+        if storage_mode == "packed_row":
+            return np.fromiter((document[CODE_FIELD] for document in documents),
+                               dtype=np.int64, count=len(documents)).view(np.uint64)
+        if storage_mode == "packed_batch":
+            parts = [np.frombuffer(document[CODES_FIELD], dtype="<u8") for document in documents]
+            return np.concatenate(parts).astype(np.uint64, copy=False) if parts else np.zeros(0, np.uint64)
+        raise ValueError(f"Unknown packed storage mode '{storage_mode}'; expected packed_row or packed_batch")
+    #----------------------------------------------------------
+    @staticmethod
+    def projection(storage_mode: str) -> dict:
+        return {"_id": 0, CODE_FIELD if storage_mode == "packed_row" else CODES_FIELD: 1}
@@ -0,0 +1,86 @@
+"""
+Row Collapse Module
+Collapses identical (features, label) rows into one row plus a count column.
+The phishing features take only 3^30 values and real traffic repeats the same
+vectors heavily, so a collection is often several times its number of unique rows.
+  * The row key is the packed 64-bit code of RowCodec: one integer per row, so
+    grouping is a single hash pass over a uint64 array (pd.factorize) rather
+    than `drop_duplicates` over 31 columns.
+  * Unique rows keep the order of their first occurrence; the count column
+    holds how many rows each one stands for and becomes the sample weight of
+    the preprocessor fit and of model training.
+  * Splits assigned after collapsing are made of unique rows, so a row and its
+    duplicates can never land on both sides of a split.
+"""
+import sys
+import numpy as np
+import pandas as pd
+#----------------------------------------------------------
+import networksecurity.components.constants as constants
+from networksecurity.components.exception import CustomException
+from networksecurity.components.instrumentation import ns_metrics
+from networksecurity.components.row_codec import RowCodec
+from networksecurity.components.schema import DatasetSchema
+#----------------------------------------------------------
+_COUNT_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+#----------------------------------------------------------
+def count_dtype(max_count: int):
+    """Narrowest signed integer dtype holding `max_count` (signed, so it widens int8 frames least)."""
+    for dtype in _COUNT_DTYPES:
+        if max_count <= np.iinfo(dtype).max:
+            return dtype
+    raise ValueError(f"Row count {max_count} does not fit in int64")
+#----------------------------------------------------------
+def row_weights(frame: pd.DataFrame, count_column: str = None):
+    """The count column of a collapsed frame as float64 sample weights, or None if `frame` is not collapsed."""
+    count_column = count_column or constants.ROW_COUNT_COLUMN
+    if count_column not in frame.columns:
+        return None
+    return frame[count_column].to_numpy(dtype=np.float64)
+#----------------------------------------------------------
+def collapse_stats(frame: pd.DataFrame, count_column: str = None) -> dict:
+    """Rows represented, unique rows and their ratio for a collapsed frame."""
+    weights = row_weights(frame, count_column)
+    unique_rows = len(frame)
+    rows = int(weights.sum()) if weights is not None else unique_rows
+    return {"rows": rows, "unique_rows": unique_rows, "duplicate_rows": rows - unique_rows,
+            "compression_ratio": round(rows / unique_rows, 4) if unique_rows else 1.0}
+#----------------------------------------------------------
+@ns_metrics.instrument("collapse_duplicates", rows=len)
+def collapse_duplicates(frame: pd.DataFrame, schema: DatasetSchema = None,
+                        count_column: str = None) -> pd.DataFrame:
+    """
+    Unique rows of a schema-typed frame (int8 / nullable Int8 columns, as read
+    by the columnar readers) with `count_column` appended. Missing values are
+    part of the key, so rows differing only in which values are missing stay apart.
+    An already collapsed frame is collapsed again with its counts summed.
+    """
+    try:
+        count_column = count_column or constants.ROW_COUNT_COLUMN
+        codec = RowCodec(schema)
+        if len(frame) == 0:
+            return frame[codec.columns].assign(**{count_column: np.zeros(0, dtype=np.int8)})
+        codes = codec.pack_frame(frame)
+        # Labels number the distinct codes in order of first appearance
+        labels, uniques = pd.factorize(codes, sort=False)
+        weights = row_weights(frame, count_column)
+        if weights is None:
+            counts = np.bincount(labels, minlength=len(uniques))
+        else:
+            counts = np.bincount(labels, weights=weights, minlength=len(uniques)).astype(np.int64)
+        # A row is a first occurrence where the running maximum label steps up
+        running = np.maximum.accumulate(labels)
+        first = np.flatnonzero(np.concatenate(([True], running[1:] > running[:-1])))
+        collapsed = frame[codec.columns].iloc[first].reset_index(drop=True)
+        collapsed[count_column] = counts.astype(count_dtype(int(counts.max())))
+        return collapsed
+    except Exception as e:
+        raise CustomException(e, sys) from e
+#----------------------------------------------------------
+def expand_rows(frame: pd.DataFrame, count_column: str = None) -> pd.DataFrame:
+    """Inverse of `collapse_duplicates` (up to row order): each row repeated `count` times, count column dropped."""
+    count_column = count_column or constants.ROW_COUNT_COLUMN
+    if count_column not in frame.columns:
+        return frame
+    repeats = frame[count_column].to_numpy(dtype=np.int64)
+    return frame.drop(columns=[count_column]).iloc[np.repeat(np.arange(len(frame)), repeats)]
@@ -0,0 +1,158 @@
+"""
+Dataset Schema Module
+Declares the columns of the phishing dataset, the values each column may take
+and the dtype it is stored as. Loaders and splitters cast through this schema so
+frames are compact (int8, or nullable Int8 where values are missing) from the
+moment they are read, and out-of-schema values are rejected during the cast.
+"""
+import functools
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+#----------------------------------------------------------
+import networksecurity.components.constants as constants
+#----------------------------------------------------------
+TERNARY_VALUES: Tuple[int, ...] = (-1, 0, 1)
+BINARY_VALUES: Tuple[int, ...] = (-1, 1)
+# `Result` polarity of the phishing dataset: -1 is a phishing site, 1 a legitimate one
+PHISHING_LABEL = -1
+LEGITIMATE_LABEL = 1
+#----------------------------------------------------------
+@dataclass(frozen=True)
+class ColumnSpec:
+#----------------------------------------------------------
+    """A single column: its name, allowed values and storage dtype."""
+    name: str
+    allowed_values: Tuple[int, ...] = TERNARY_VALUES
+    dtype: str = "int8"
+    nullable: bool = True
+
+    @property
+    def nullable_dtype(self) -> str:
+        """Pandas extension dtype used when the column has missing values (e.g. Int8)."""
+        return self.dtype.capitalize()
+#----------------------------------------------------------
+@dataclass(frozen=True)
+class DatasetSchema:
+#----------------------------------------------------------
+    """
+    Ordered collection of column specs plus the target column name, and the
+    positive label: the class that precision / recall / F1 and predicted
+    probabilities refer to.
+    """
+    columns: Tuple[ColumnSpec, ...]
+    target_column: str
+    positive_label: int = 1
+
+    @property
+    def names(self) -> List[str]:
+        return [spec.name for spec in self.columns]
+
+    @property
+    def feature_names(self) -> List[str]:
+        return [spec.name for spec in self.columns if spec.name != self.target_column]
+
+    @property
+    def specs(self) -> Dict[str, ColumnSpec]:
+        return {spec.name: spec for spec in self.columns}
+    #----------------------------------------------------------
+    def require_columns(self, df: pd.DataFrame, include_target: bool = True) -> None:
+        """Raises ValueError if any schema column is absent from `df`."""
+        expected = self.names if include_target else self.feature_names
+        missing = [name for name in expected if name not in df.columns]
+        if missing:
+            raise ValueError(f"Columns missing from data: {missing}")
+    #----------------------------------------------------------
+    def check_block(self, block: np.ndarray, columns: List[str]) -> None:
+        """
+        Validates a decoded float64 block (NaN = missing) column by column.
+        Raises ValueError on the first column holding out-of-schema values.
+        """
+        specs = self.specs
+        for j, name in enumerate(columns):
+            spec = specs.get(name)
+            if spec is not None:
+                _check_values(spec, block[:, j], np.isnan(block[:, j]))
+    #----------------------------------------------------------
+    def cast_series(self, series: pd.Series) -> pd.Series:
+        """Casts one schema column to its storage dtype, rejecting invalid values."""
+        spec = self.specs[series.name]
+        return pd.Series(_cast_values(spec, series), index=series.index, name=series.name)
+    #----------------------------------------------------------
+    def cast_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Casts every schema column present in `df` to its storage dtype.
+        Columns outside the schema are passed through unchanged.
+        """
+        specs = self.specs
+        return pd.DataFrame(
+            {name: _cast_values(specs[name], df[name]) if name in specs else df[name]
+             for name in df.columns},
+            index=df.index)
+    #----------------------------------------------------------
+    def read_csv_dtypes(self) -> Dict[str, str]:
+        """dtype mapping for pd.read_csv; float32 keeps NaN representable until cast."""
+        return {spec.name: "float32" for spec in self.columns}
+#----------------------------------------------------------
+# Casting helpers
+#----------------------------------------------------------
+def _check_values(spec: ColumnSpec, values: np.ndarray, mask: np.ndarray) -> None:
+    valid = np.isin(values, spec.allowed_values) | mask
+    if not valid.all():
+        bad = values[~valid]
+        raise ValueError(
+            f"Column '{spec.name}' has {bad.size} values outside {spec.allowed_values}: "
+            f"{np.unique(bad)[:5].tolist()}")
+    if not spec.nullable and mask.any():
+        raise ValueError(f"Column '{spec.name}' has {int(mask.sum())} missing values but is not nullable.")
+#----------------------------------------------------------
+def _cast_values(spec: ColumnSpec, series: pd.Series):
+    """Returns a NumPy array (no missing values) or a nullable integer array."""
+    dtype = series.dtype
+    if pd.api.types.is_integer_dtype(dtype) and not isinstance(dtype, pd.api.extensions.ExtensionDtype):
+        values = series.to_numpy()
+        mask = np.zeros(len(values), dtype=bool)
+    else:
+        if dtype == object:
+            series = pd.to_numeric(series.replace(list(constants.MISSING_VALUE_SENTINELS), np.nan))
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        mask = np.isnan(values)
+    _check_values(spec, values, mask)
+    if mask.any():
+        return pd.arrays.IntegerArray(np.where(mask, 0, values).astype(spec.dtype), mask)
+    return values.astype(spec.dtype, copy=False)
+#----------------------------------------------------------
+# Phishing dataset schema
+#----------------------------------------------------------
+PHISHING_FEATURE_COLUMNS: Tuple[str, ...] = (
+    "having_IP_Address", "URL_Length", "Shortining_Service", "having_At_Symbol",
+    "double_slash_redirecting", "Prefix_Suffix", "having_Sub_Domain", "SSLfinal_State",
+    "Domain_registeration_length", "Favicon", "port", "HTTPS_token", "Request_URL",
+    "URL_of_Anchor", "Links_in_tags", "SFH", "Submitting_to_email", "Abnormal_URL",
+    "Redirect", "on_mouseover", "RightClick", "popUpWidnow", "Iframe", "age_of_domain",
+    "DNSRecord", "web_traffic", "Page_Rank", "Google_Index", "Links_pointing_to_page",
+    "Statistical_report",
+)
+#----------------------------------------------------------
+@functools.lru_cache(maxsize=None)
+def phishing_schema() -> DatasetSchema:
+    """
+    Features are -1 (phishing) / 0 (suspicious) / 1 (legitimate) and may be missing;
+    the label is binary, -1 (phishing) / 1 (legitimate), and must always be present.
+    The positive label is PHISHING_LABEL, so scores and probabilities are those of
+    the phishing class. Built on first use because the target column name comes
+    from the environment.
+    """
+    return DatasetSchema(
+        columns=tuple(ColumnSpec(name) for name in PHISHING_FEATURE_COLUMNS) + (
+            ColumnSpec(constants.TARGET_COLUMN, allowed_values=BINARY_VALUES, nullable=False),),
+        target_column=constants.TARGET_COLUMN,
+        positive_label=PHISHING_LABEL,
+    )
+#----------------------------------------------------------
+def __getattr__(name: str):
+    # `schema.PHISHING_SCHEMA` keeps working; it resolves on first access
+    if name == "PHISHING_SCHEMA":
+        return phishing_schema()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,331 @@
+"""
+Scoring Service Module
+Local HTTP scoring service for inline (per-URL) scoring, built on asyncio
+streams from the standard library:
+  * The model and preprocessor are loaded once at start-up and warmed with a
+    first predict. The model and BLAS / OpenMP are limited to one thread, since
+    on small batches thread fan-out costs more than it saves.
+  * Requests that arrive within `max_wait_ms` of the first waiting one, up to
+    `max_batch_size` rows, are scored together in one vectorized predict call.
+    The call runs on a dedicated thread, so the event loop keeps accepting
+    requests and forming the next batch meanwhile. The default window is 0:
+    each batch takes whatever queued while the previous predict ran, so
+    batches grow with the load without any request waiting on a timer.
+  * The request queue is bounded. When it is full, requests are rejected at
+    once with 503 and Retry-After instead of queueing into unbounded latency.
+  * GET /metrics reports latency histograms (end to end, queue wait and
+    predict), the batch-size distribution and the response counts.
+
+Latency: open loop at 1000 req/s with the load generator on the same 1-CPU
+host (benchmarks/load_test_scoring.py), a 1 ms window gave a client p99 of
+20-58 ms; the 0 ms default brings it to 9-20 ms (server-side 6-10 ms). The
+single-digit-ms p99 target is not reliably met on such a host: the remaining
+tail is CPU contention between the load generator, the event loop and
+predict, not batching.
+
+Endpoints:
+    POST /score     one JSON object of feature values -> {"prediction", "probability", "reason_code"}
+                    ("probability" is that of the phishing class, -1)
+                    a JSON list of objects            -> {"results": [...]}
+    GET  /health
+    GET  /metrics
+"""
+import sys
+import json
+import time
+import asyncio
+import numpy as np
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+#----------------------------------------------------------
+from networksecurity.components.logger import ns_logger
+from networksecurity.components.exception import CustomException
+from networksecurity.components.instrumentation import LatencyHistogram
+from networksecurity.components.schema import DatasetSchema, phishing_schema
+from networksecurity.components.batch_scoring import ChunkScorer, PREDICTION_COLUMN, PROBABILITY_COLUMN
+from networksecurity.components.data_validation import REASON_COLUMN
+from networksecurity.entity.config_app import OnlineScoringConfig
+#----------------------------------------------------------
+_HEADER_LIMIT = 64 * 1024
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            411: "Length Required", 413: "Payload Too Large", 431: "Request Header Fields Too Large",
+            500: "Internal Server Error", 503: "Service Unavailable"}
+#----------------------------------------------------------
+class Overloaded(Exception):
+    """The request queue is full; the caller should retry later."""
+#----------------------------------------------------------
+def records_to_block(records: list, names: list) -> np.ndarray:
+    """
+    float64 block of JSON feature records in schema column order: absent or null
+    values read as missing (NaN), non-numeric ones as inf, as in `frame_to_block`.
+    """
+    block = np.full((len(records), len(names)), np.nan)
+    for i, record in enumerate(records):
+        for j, name in enumerate(names):
+            value = record.get(name)
+            if value is None:
+                continue
+            try:
+                block[i, j] = float(value)
+            except (TypeError, ValueError):
+                block[i, j] = np.inf
+    return block
+#----------------------------------------------------------
+def _size_bucket(rows: int) -> str:
+    """Power-of-two range label of a batch size: 1, 2-3, 4-7, ..."""
+    low = 1 << (rows.bit_length() - 1)
+    return str(low) if low == 1 else f"{low}-{2 * low - 1}"
+#----------------------------------------------------------
+class MicroBatcher:
+    """
+    Collects the blocks submitted within a short window into one call of
+    `score_fn(block) -> (prediction, probability, codes, invalid)` and hands each
+    caller its slice of the result. Must be started inside the running loop.
+    """
+    def __init__(self, score_fn, max_batch_size: int = 256, max_wait_ms: float = 0.0, queue_size: int = 2048):
+        self.score_fn = score_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.queue_size = max(1, queue_size)
+        self.queue = None
+        self._task = None
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="scoring")
+        self.queue_wait = LatencyHistogram()
+        self.predict = LatencyHistogram()
+        self.batch_rows = Counter()
+        self.rejected = 0
+        self.rows = 0
+        self.batches = 0
+    #----------------------------------------------------------
+    def start(self) -> None:
+        self.queue = asyncio.Queue(self.queue_size)
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="micro-batcher")
+    #----------------------------------------------------------
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._executor.shutdown(wait=True)
+    #----------------------------------------------------------
+    def submit(self, block: np.ndarray) -> asyncio.Future:
+        """Queues `block`; the returned future resolves to its slice of the batch result."""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((block, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise Overloaded(f"{self.queue_size} requests are already waiting") from None
+        return future
+    #----------------------------------------------------------
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            rows = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+            while rows < self.max_batch_size:
+                if self.queue.empty():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self.queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    item = self.queue.get_nowait()
+                batch.append(item)
+                rows += len(item[0])
+            await self._score(batch, rows)
+    #----------------------------------------------------------
+    async def _score(self, batch: list, rows: int) -> None:
+        started = time.perf_counter()
+        for _, _, enqueued in batch:
+            self.queue_wait.record(started - enqueued)
+        block = batch[0][0] if len(batch) == 1 else np.concatenate([item[0] for item in batch])
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._executor, self.score_fn, block)
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.predict.record(time.perf_counter() - started)
+        self.batch_rows[_size_bucket(rows)] += 1
+        self.rows += rows
+        self.batches += 1
+        offset = 0
+        for part, future, _ in batch:
+            # A caller that went away has a cancelled future; its rows were scored anyway
+            if not future.done():
+                future.set_result(tuple(values[offset:offset + len(part)] for values in result))
+            offset += len(part)
+#----------------------------------------------------------
+class ScoringService:
+    """HTTP/1.1 (keep-alive) front end of a MicroBatcher over the saved preprocessor and model."""
+    def __init__(self, serving_config: OnlineScoringConfig, schema: DatasetSchema = None):
+        try:
+            from threadpoolctl import threadpool_limits
+            self.serving_config = serving_config
+            self.schema = schema or phishing_schema()
+            self.scorer = ChunkScorer(serving_config.model_file_and_path,
+                                      serving_config.preprocessor_file_and_path, self.schema)
+            # Batches are small: one thread per predict call keeps latency low and predictable
+            self._thread_limits = threadpool_limits(limits=1)
+            if "n_jobs" in self.scorer.model.get_params():
+                self.scorer.model.set_params(n_jobs=1)
+            started = time.perf_counter()
+            self.scorer.score_block(np.zeros((1, len(self.schema.names))))
+            ns_logger.log_info("Scoring model loaded and warmed up in %.1f ms.",
+                               (time.perf_counter() - started) * 1000.0)
+            self.batcher = MicroBatcher(self.scorer.score_block, serving_config.max_batch_size,
+                                        serving_config.max_wait_ms, serving_config.queue_size)
+            self.latency = LatencyHistogram()
+            self.responses = Counter()
+            self.server = None
+            self.port = serving_config.port
+            self._started_at = time.monotonic()
+        except Exception as e:
+            raise CustomException(e, sys) from e
+    #----------------------------------------------------------
+    async def start(self) -> asyncio.AbstractServer:
+        """Starts the batcher and the listening socket (port 0 picks a free port, see `self.port`)."""
+        self.batcher.start()
+        self.server = await asyncio.start_server(self._handle_connection, self.serving_config.host,
+                                                 self.serving_config.port, limit=_HEADER_LIMIT)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self._started_at = time.monotonic()
+        ns_logger.log_info("Scoring service listening on http://%s:%d (batch <= %d rows, window %.2f ms, queue %d).",
+                           self.serving_config.host, self.port, self.batcher.max_batch_size,
+                           self.batcher.max_wait * 1000.0, self.batcher.queue_size)
+        return self.server
+    #----------------------------------------------------------
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        await self.batcher.stop()
+    #----------------------------------------------------------
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+    #----------------------------------------------------------
+    def metrics(self) -> dict:
+        batcher = self.batcher
+        return {
+            "uptime_seconds": round(time.monotonic() - self._started_at, 3),
+            "responses": {str(status): count for status, count in sorted(self.responses.items())},
+            "rejected": batcher.rejected,
+            "queue_depth": batcher.queue.qsize() if batcher.queue is not None else 0,
+            "queue_size": batcher.queue_size,
+            "rows_scored": batcher.rows,
+            "batches": batcher.batches,
+            "mean_batch_rows": round(batcher.rows / batcher.batches, 2) if batcher.batches else 0.0,
+            "batch_rows": dict(sorted(batcher.batch_rows.items(), key=lambda item: int(item[0].split("-")[0]))),
+            "latency": {"request": self.latency.snapshot(), "queue_wait": batcher.queue_wait.snapshot(),
+                        "predict": batcher.predict.snapshot()},
+        }
+    #----------------------------------------------------------
+    async def score(self, body: bytes):
+        """(status, payload, extra headers) of a POST /score body."""
+        try:
+            payload = json.loads(body)
+        except ValueError as e:
+            return 400, {"error": f"Invalid JSON: {e}"}, {}
+        single = isinstance(payload, dict)
+        records = [payload] if single else payload
+        if not isinstance(records, list) or not records or not all(isinstance(r, dict) for r in records):
+            return 400, {"error": "Expected a JSON object of feature values or a non-empty list of them"}, {}
+        if len(records) > self.batcher.max_batch_size:
+            return 413, {"error": f"At most {self.batcher.max_batch_size} records per request"}, {}
+        try:
+            future = self.batcher.submit(records_to_block(records, self.schema.names))
+        except Overloaded as e:
+            return 503, {"error": f"Overloaded: {e}"}, {"Retry-After": "1"}
+        prediction, probability, codes, invalid = await future
+        results = [{PREDICTION_COLUMN: None if invalid[i] else int(prediction[i]),
+                    PROBABILITY_COLUMN: None if np.isnan(probability[i]) else round(float(probability[i]), 6),
+                    REASON_COLUMN: int(codes[i])} for i in range(len(records))]
+        return 200, results[0] if single else {"results": results}, {}
+    #----------------------------------------------------------
+    async def _route(self, method: str, path: str, body: bytes):
+        if path == "/score":
+            if method != "POST":
+                return 405, {"error": "Use POST"}, {"Allow": "POST"}
+            return await self.score(body)
+        if path in ("/health", "/metrics"):
+            if method != "GET":
+                return 405, {"error": "Use GET"}, {"Allow": "GET"}
+            return 200, {"status": "ok"} if path == "/health" else self.metrics(), {}
+        return 404, {"error": f"Unknown path {path}"}, {}
+    #----------------------------------------------------------
+    def _respond(self, writer, status: int, payload, keep_alive: bool, headers: dict = None) -> None:
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        head = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}", "Content-Type: application/json",
+                f"Content-Length: {len(body)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        head.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        self.responses[status] += 1
+    #----------------------------------------------------------
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    self._respond(writer, 431, {"error": "Request head too large"}, keep_alive=False)
+                    break
+                started = time.perf_counter()
+                request_line, *header_lines = head[:-4].decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = request_line.split(" ", 2)
+                except ValueError:
+                    self._respond(writer, 400, {"error": "Malformed request line"}, keep_alive=False)
+                    break
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" or (version == "HTTP/1.1" and connection != "close")
+                if "transfer-encoding" in headers:
+                    self._respond(writer, 411, {"error": "Send a Content-Length body"}, keep_alive=False)
+                    break
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    self._respond(writer, 400, {"error": "Invalid Content-Length"}, keep_alive=False)
+                    break
+                if length > self.serving_config.max_body_bytes:
+                    self._respond(writer, 413, {"error": "Body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                path = target.split("?", 1)[0]
+                try:
+                    status, payload, extra = await self._route(method, path, body)
+                except Exception as e:
+                    ns_logger.log_error("Scoring request failed: %s", e)
+                    status, payload, extra = 500, {"error": f"{type(e).__name__}: {e}"}, {}
+                self._respond(writer, status, payload, keep_alive, extra)
+                await writer.drain()
+                if path == "/score" and status == 200:
+                    self.latency.record(time.perf_counter() - started)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
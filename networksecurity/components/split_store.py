@@ -0,0 +1,191 @@
+"""
+Split Store Module
+Accessor for ingestion splits. In "index" storage mode the dataset artifact is
+written once and each split is a row-index array in `split_index.npz`; rows are
+gathered on demand. In "copy" mode the accessor reads the physical split files,
+so consumers of DataIngestionArtifact work the same way in either mode.
+For a collapsed dataset (see components/row_collapse.py) the row count column
+is kept out of the features and served by `weights` as sample weights.
+Given the validation stage's valid-row mask, every split is restricted to the
+rows that passed validation; the split index records each row's position in
+the dataset in both modes, so the mask applies to copied splits as well.
+"""
+import sys
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+#----------------------------------------------------------
+import networksecurity.components.constants as constants
+from networksecurity.components import utils
+from networksecurity.components.exception import CustomException
+from networksecurity.components.schema import phishing_schema
+#----------------------------------------------------------
+def _check_mask(valid: np.ndarray, n_rows: Optional[int]) -> None:
+    if n_rows is not None and len(valid) != n_rows:
+        raise ValueError(
+            f"The valid-row mask covers {len(valid)} rows but the dataset has {n_rows}; "
+            "validation ran on a different dataset, re-run it.")
+#----------------------------------------------------------
+class SplitDataset:
+    """
+    Lazily materializes splits from a dataset artifact plus row indices.
+    The dataset is opened once (memory-mapped for .npy) and only the rows of
+    the requested split are gathered.
+    """
+    def __init__(self, dataset_path, indices: Dict[str, np.ndarray],
+                 columns: List[str], feature_columns: List[str], target_column: str,
+                 weight_column: Optional[str] = None, n_rows: Optional[int] = None):
+        self.dataset_path = Path(dataset_path)
+        self.n_rows = n_rows
+        self.indices = indices
+        self.columns = columns
+        self.feature_columns = feature_columns
+        self.target_column = target_column
+        self.weight_column = weight_column
+        self._dataset = None
+    #----------------------------------------------------------
+    @classmethod
+    def load(cls, index_file_path) -> "SplitDataset":
+        """Opens a split index written by utils.save_split_index."""
+        try:
+            with np.load(index_file_path, allow_pickle=False) as archive:
+                meta = json.loads(str(archive["meta"]))
+                indices = {name: archive[f"idx_{name}"] for name in meta["splits"]}
+            return cls(meta["dataset"], indices, meta["columns"],
+                       meta["feature_columns"], meta["target_column"], meta.get("weight_column"), meta["n_rows"])
+        except Exception as e:
+            raise CustomException(e, sys) from e
+    #----------------------------------------------------------
+    @classmethod
+    def from_artifact(cls, artifact, valid_rows_file=None) -> "SplitDataset":
+        """
+        Builds the accessor from a DataIngestionArtifact. Index mode opens the
+        split index; copy mode wraps the physical train/test files. With
+        `valid_rows_file` (see DataValidation) only validated rows are served.
+        """
+        try:
+            if utils.uses_split_index(artifact):
+                splits = cls.load(artifact.split_index_file_and_path)
+            else:
+                splits = _CopiedSplits({
+                    "train": artifact.train_file_name_and_path,
+                    "test": artifact.test_file_name_and_path,
+                }, phishing_schema().target_column,
+                    getattr(artifact, "row_count_column", constants.ROW_COUNT_COLUMN),
+                    artifact.split_index_file_and_path)
+            if valid_rows_file is not None:
+                splits.keep_rows(np.load(valid_rows_file, allow_pickle=False))
+            return splits
+        except Exception as e:
+            raise CustomException(e, sys) from e
+    #----------------------------------------------------------
+    def keep_rows(self, valid: np.ndarray) -> None:
+        """Restricts every split to the dataset rows set in the boolean mask `valid`."""
+        _check_mask(valid, self.n_rows)
+        self.indices = {name: index[valid[index]] for name, index in self.indices.items()}
+    #----------------------------------------------------------
+    @property
+    def splits(self) -> List[str]:
+        return list(self.indices)
+    #----------------------------------------------------------
+    def dataset(self) -> pd.DataFrame:
+        if self._dataset is None:
+            self._dataset = utils.read_artifact(self.dataset_path, schema=phishing_schema())
+        return self._dataset
+    #----------------------------------------------------------
+    def frame(self, split: str) -> pd.DataFrame:
+        """All columns of one split, in the stored row order."""
+        try:
+            return self.dataset().iloc[self.indices[split]]
+        except Exception as e:
+            raise CustomException(e, sys) from e
+    #----------------------------------------------------------
+    def xy(self, split: str) -> Tuple[pd.DataFrame, pd.Series]:
+        """Feature frame and target series of one split."""
+        frame = self.frame(split)
+        return frame[self.feature_columns], frame[self.target_column]
+    #----------------------------------------------------------
+    def weights(self, split: str) -> Optional[np.ndarray]:
+        """float64 sample weights (row counts) of one split, or None when the dataset is not collapsed."""
+        if self.weight_column is None:
+            return None
+        try:
+            if utils.artifact_format_of(self.dataset_path) == "npy":
+                values = utils.read_artifact(self.dataset_path, as_array=True)
+                return values[self.indices[split], self.columns.index(self.weight_column)].astype(np.float64)
+            return self.frame(split)[self.weight_column].to_numpy(dtype=np.float64)
+        except Exception as e:
+            raise CustomException(e, sys) from e
+    #----------------------------------------------------------
+    def arrays(self, split: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Feature matrix and target vector of one split as NumPy arrays."""
+        try:
+            if utils.artifact_format_of(self.dataset_path) == "npy":
+                # Gather straight from the memory map; only the split's rows are read
+                values = utils.read_artifact(self.dataset_path, as_array=True)
+                rows = values[self.indices[split]]
+                feature_positions = [self.columns.index(column) for column in self.feature_columns]
+                return rows[:, feature_positions], rows[:, self.columns.index(self.target_column)]
+            x, y = self.xy(split)
+            return x.to_numpy(), y.to_numpy()
+        except Exception as e:
+            raise CustomException(e, sys) from e
+    #----------------------------------------------------------
+    def materialize(self, split: str, file_path) -> Path:
+        """Writes a physical copy of one split, for consumers that need a file."""
+        utils.write_artifact(self.frame(split), file_path)
+        return Path(file_path)
+#----------------------------------------------------------
+class _CopiedSplits(SplitDataset):
+    """SplitDataset over physically written split files ("copy" storage mode)."""
+    def __init__(self, split_paths: Dict[str, Path], target_column: str, count_column: str = None,
+                 index_file_path=None):
+        self.split_paths = {name: Path(path) for name, path in split_paths.items()}
+        self.target_column = target_column
+        self.count_column = count_column
+        self.index_file_path = index_file_path
+        self._keep = {}
+        self._frames = {}
+    #----------------------------------------------------------
+    @property
+    def splits(self) -> List[str]:
+        return list(self.split_paths)
+    #----------------------------------------------------------
+    def keep_rows(self, valid: np.ndarray) -> None:
+        """Row i of a split file is dataset row `positions[i]` of the split index."""
+        if self.index_file_path is None or not Path(self.index_file_path).exists():
+            raise ValueError(
+                "Copied splits need the split index to apply the valid-row mask; re-run ingestion "
+                "(with --invalidate-cache if it was cached).")
+        positions = SplitDataset.load(self.index_file_path)
+        _check_mask(valid, positions.n_rows)
+        self._keep = {name: valid[index] for name, index in positions.indices.items()}
+        self._frames = {}
+    #----------------------------------------------------------
+    def frame(self, split: str) -> pd.DataFrame:
+        try:
+            if split not in self._frames:
+                frame = utils.read_artifact(self.split_paths[split], schema=phishing_schema())
+                if split in self._keep:
+                    frame = frame[self._keep[split]]
+                self._frames[split] = frame
+            return self._frames[split]
+        except Exception as e:
+            raise CustomException(e, sys) from e
+    #----------------------------------------------------------
+    def xy(self, split: str) -> Tuple[pd.DataFrame, pd.Series]:
+        frame = self.frame(split)
+        dropped = [self.target_column] + ([self.count_column] if self.count_column in frame.columns else [])
+        return frame.drop(columns=dropped), frame[self.target_column]
+    #----------------------------------------------------------
+    def weights(self, split: str) -> Optional[np.ndarray]:
+        frame = self.frame(split)
+        if self.count_column not in frame.columns:
+            return None
+        return frame[self.count_column].to_numpy(dtype=np.float64)
+    #----------------------------------------------------------
+    def arrays(self, split: str) -> Tuple[np.ndarray, np.ndarray]:
+        x, y = self.xy(split)
+        return x.to_numpy(), y.to_numpy()
@@ -0,0 +1,90 @@
+"""
+Stage Cache Module
+Skips data ingestion when the source collection has not changed. The cache key
+is a cheap fingerprint of the collection (document count, max `_id`, collStats
+size) plus every setting that shapes the artifacts (split sizes and method,
+random state, artifact format, split storage, storage mode, duplicate
+collapsing). A hit is only served if every artifact file recorded for that
+run still exists with the recorded size.
+In-place updates that keep count, max `_id` and storage size unchanged are not
+detected; use `invalidate()` or `--force` after such edits.
+"""
+import sys
+import json
+import hashlib
+from pathlib import Path
+from dataclasses import asdict, fields
+#----------------------------------------------------------
+from networksecurity.components import utils
+from networksecurity.components.logger import ns_logger
+from networksecurity.components.exception import CustomException
+from networksecurity.entity.config_app import DataIngestionArtifact
+#----------------------------------------------------------
+class StageCache:
+    def __init__(self, cache_file_path):
+        self.cache_file_path = Path(cache_file_path)
+    #----------------------------------------------------------
+    @staticmethod
+    def source_fingerprint(collection, ingest_config) -> dict:
+        """Builds the fingerprint from collection metadata; no documents are scanned."""
+        try:
+            last = list(collection.find({}, {"_id": 1}).sort("_id", -1).limit(1))
+            try:
+                stats = collection.database.command("collstats", collection.name)
+                storage = {"size": stats.get("size"), "count": stats.get("count")}
+            except Exception:
+                # collStats may be unavailable (permissions, stand-ins); count + max _id still apply
+                storage = {}
+            fingerprint = {
+                "collection": f"{collection.database.name}.{collection.name}",
+                "count": collection.estimated_document_count(),
+                "max_id": str(last[0]["_id"]) if last else None,
+                "storage": storage,
+                "test_size": ingest_config.test_size,
+                "random_state": ingest_config.random_state,
+                "split_method": ingest_config.split_method,
+                "artifact_format": ingest_config.artifact_format,
+                "split_storage": ingest_config.split_storage,
+                "storage_mode": ingest_config.mongo_storage_mode,
+                "collapse_duplicates": ingest_config.collapse_duplicates,
+            }
+            fingerprint["key"] = hashlib.sha256(
+                json.dumps(fingerprint, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+            return fingerprint
+        except Exception as e:
+            raise CustomException(e, sys) from e
+    #----------------------------------------------------------
+    def lookup(self, fingerprint: dict):
+        """Returns the cached DataIngestionArtifact for `fingerprint`, or None."""
+        try:
+            entry = utils.load_json(self.cache_file_path)
+            if not entry or entry.get("fingerprint", {}).get("key") != fingerprint["key"]:
+                return None
+            for record in entry["artifact"].get("write_stats", {}).values():
+                path = Path(record["path"])
+                if not path.exists() or path.stat().st_size != record["bytes"]:
+                    ns_logger.log_info("Stage cache miss: artifact %s is missing or changed.", path)
+                    return None
+            return _artifact_from_json(entry["artifact"])
+        except Exception as e:
+            raise CustomException(e, sys) from e
+    #----------------------------------------------------------
+    def store(self, fingerprint: dict, artifact: DataIngestionArtifact) -> None:
+        utils.save_json_atomic(self.cache_file_path, {
+            "fingerprint": fingerprint,
+            "artifact": {key: str(value) if isinstance(value, Path) else value
+                         for key, value in asdict(artifact).items()},
+        })
+    #----------------------------------------------------------
+    def invalidate(self) -> None:
+        """Drops the cached entry so the next run rebuilds every artifact."""
+        self.cache_file_path.unlink(missing_ok=True)
+        ns_logger.log_info("Stage cache invalidated: %s", self.cache_file_path)
+#----------------------------------------------------------
+def _artifact_from_json(payload: dict) -> DataIngestionArtifact:
+    values = {}
+    for f in fields(DataIngestionArtifact):
+        if f.name in payload:
+            value = payload[f.name]
+            values[f.name] = Path(value) if f.type is Path and value is not None else value
+    return DataIngestionArtifact(**values)
@@ -0,0 +1,269 @@
+"""
+URL Features Module
+Turns batches of raw URL strings into the feature columns of the phishing
+schema, coded -1 (phishing) / 0 (suspicious) / 1 (legitimate):
+  * Lexical columns come from the URL text alone, following the dataset's rules:
+      having_IP_Address         host is an IPv4 (dotted, hex or integer form) or IPv6 literal
+      URL_Length                < 54 characters legitimate, 54-75 suspicious, longer phishing
+      Shortining_Service        host (or a parent domain) is a known URL shortener
+      having_At_Symbol          '@' anywhere in the URL
+      double_slash_redirecting  last '//' after the 7th character
+      Prefix_Suffix             '-' in the host
+      having_Sub_Domain         dots in the host without 'www.' and a ccTLD: 1 legitimate, 2 suspicious, more phishing
+      port                      explicit port other than 80 / 443
+      HTTPS_token               'https' inside the host
+  * Patterns are compiled once and shortener domains are a set lookup.
+  * Host-derived values are memoized per URL authority (bounded, oldest evicted
+    first), and each batch is factorized by authority first. A host that recurs
+    across millions of URLs is parsed once. URL-level columns are computed over
+    the whole batch with NumPy.
+  * Columns that need the network (WHOIS, DNS, page content, traffic and rank
+    services) come from a pluggable `FeatureLookup`, which is called once per new
+    host and memoized with the lexical values. The default lookup leaves them
+    missing, and the preprocessor imputes them as in training. `StaticLookup` is
+    a local stub fed from a dict or a JSON file.
+`iter_extract_blocks` spreads batches over a process pool.
+"""
+import re
+import json
+import operator
+import itertools
+import multiprocessing
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+#----------------------------------------------------------
+from networksecurity.components.schema import PHISHING_FEATURE_COLUMNS
+from networksecurity.entity.config_app import UrlFeatureConfig
+#----------------------------------------------------------
+# Host-derived lexical columns, in the order of the memoized tuples
+HOST_COLUMNS: Tuple[str, ...] = (
+    "having_IP_Address", "Shortining_Service", "Prefix_Suffix", "having_Sub_Domain", "port", "HTTPS_token")
+URL_COLUMNS: Tuple[str, ...] = ("URL_Length", "having_At_Symbol", "double_slash_redirecting")
+LEXICAL_COLUMNS: Tuple[str, ...] = tuple(
+    name for name in PHISHING_FEATURE_COLUMNS if name in HOST_COLUMNS or name in URL_COLUMNS)
+NETWORK_COLUMNS: Tuple[str, ...] = tuple(name for name in PHISHING_FEATURE_COLUMNS if name not in LEXICAL_COLUMNS)
+#----------------------------------------------------------
+URL_LENGTH_LEGITIMATE = 54       # shorter is legitimate
+URL_LENGTH_SUSPICIOUS = 75       # up to this is suspicious, longer is phishing
+DOUBLE_SLASH_MAX_INDEX = 6       # 0-based: '//' of 'https://' sits at 6
+DEFAULT_PORTS = frozenset(("80", "443"))
+#----------------------------------------------------------
+SHORTENER_DOMAINS = frozenset((
+    "bit.ly", "goo.gl", "shorte.st", "go2l.ink", "x.co", "ow.ly", "t.co", "tinyurl.com", "tr.im", "is.gd",
+    "cli.gs", "yfrog.com", "migre.me", "ff.im", "tiny.cc", "url4.eu", "twit.ac", "su.pr", "twurl.nl",
+    "snipurl.com", "short.to", "budurl.com", "ping.fm", "post.ly", "just.as", "bkite.com", "snipr.com",
+    "fic.kr", "loopt.us", "doiop.com", "short.ie", "kl.am", "wp.me", "rubyurl.com", "om.ly", "to.ly",
+    "bit.do", "lnkd.in", "db.tt", "qr.ae", "adf.ly", "bitly.com", "cur.lv", "ity.im", "q.gs", "po.st",
+    "bc.vc", "twitthis.com", "u.to", "j.mp", "buzurl.com", "cutt.us", "u.bb", "yourls.org", "prettylinkpro.com",
+    "scrnch.me", "filoops.info", "vzturl.com", "qr.net", "1url.com", "tweez.me", "v.gd", "link.zip.net",
+    "rb.gy", "cutt.ly", "shorturl.at", "rebrand.ly", "buff.ly", "youtu.be", "tiny.one", "s.id", "t.ly",
+))
+#----------------------------------------------------------
+# Authority of a URL with or without a scheme: "http://user@host:8080/x" -> "user@host:8080"
+_AUTHORITY = re.compile(r"\s*(?:[A-Za-z][A-Za-z0-9+.\-]*://|//)?([^/?#\\\s]*)")
+# IPv4 in the forms browsers accept: 1-4 dot-separated decimal, octal or hex parts
+_IPV4 = re.compile(r"(?:(?:0x[0-9a-f]+|\d+)\.){0,3}(?:0x[0-9a-f]+|\d+)\.?")
+_COUNTRY_TLD = re.compile(r"\.[a-z]{2}$")
+#----------------------------------------------------------
+def host_features(authority: str, shorteners: frozenset = SHORTENER_DOMAINS) -> Tuple[str, Tuple[int, ...]]:
+    """(lower-cased host, values of HOST_COLUMNS) of one URL authority."""
+    host_port = authority.rpartition("@")[2].lower()
+    if host_port.startswith("["):
+        host, _, rest = host_port[1:].partition("]")
+        port = rest[1:] if rest.startswith(":") else ""
+        is_ip = True
+    else:
+        host, _, port = host_port.partition(":")
+        is_ip = _IPV4.fullmatch(host) is not None
+    host = host.rstrip(".")
+    labels = host.split(".")
+    shortener = any(".".join(labels[i:]) in shorteners for i in range(max(0, len(labels) - 3), len(labels) - 1))
+    stripped = host[4:] if host.startswith("www.") else host
+    if not is_ip:
+        stripped = _COUNTRY_TLD.sub("", stripped)
+    dots = stripped.count(".")
+    return host, (
+        -1 if is_ip else 1,
+        -1 if shortener else 1,
+        -1 if "-" in host else 1,
+        1 if dots <= 1 else (0 if dots == 2 else -1),
+        -1 if port and port not in DEFAULT_PORTS else 1,
+        -1 if "https" in host else 1,
+    )
+#----------------------------------------------------------
+class FeatureLookup:
+    """
+    Source of the schema columns that need the network (WHOIS age, DNS records,
+    page content, traffic rank, blacklists...). `lookup` receives the hosts of a
+    batch that are not memoized yet. It returns a (len(hosts), len(columns))
+    array of -1 / 0 / 1, with NaN where a value is unknown. Subclass it for a
+    real resolver; the base class knows nothing, so every column stays missing.
+    Instances are pickled to pool workers, so keep clients lazily created.
+    """
+    columns: Tuple[str, ...] = ()
+    #----------------------------------------------------------
+    def lookup(self, hosts: Sequence[str]) -> np.ndarray:
+        return np.full((len(hosts), len(self.columns)), np.nan)
+#----------------------------------------------------------
+class StaticLookup(FeatureLookup):
+    """
+    Local stub: fixed values per host, e.g. {"example.com": {"DNSRecord": 1}}.
+    An entry also covers its sub-domains. Hosts without an entry get `default`.
+    """
+    def __init__(self, table: Dict[str, Dict[str, int]], default: Dict[str, int] = None):
+        self.table = {host.lower().rstrip("."): values for host, values in table.items()}
+        self.default = dict(default or {})
+        names = set(self.default).union(*self.table.values()) if self.table else set(self.default)
+        unknown = names.difference(NETWORK_COLUMNS)
+        if unknown:
+            raise ValueError(f"Lookup columns {sorted(unknown)} are not network columns of the schema")
+        self.columns = tuple(name for name in NETWORK_COLUMNS if name in names)
+    #----------------------------------------------------------
+    @classmethod
+    def from_file(cls, file_path) -> "StaticLookup":
+        """Reads {"hosts": {host: {column: value}}, "default": {column: value}} from JSON."""
+        payload = json.loads(Path(file_path).read_text())
+        return cls(payload.get("hosts", {}), payload.get("default"))
+    #----------------------------------------------------------
+    def lookup(self, hosts: Sequence[str]) -> np.ndarray:
+        values = np.full((len(hosts), len(self.columns)), np.nan)
+        for i, host in enumerate(hosts):
+            labels = host.split(".")
+            entry = next((self.table[suffix] for suffix in (".".join(labels[j:]) for j in range(len(labels)))
+                          if suffix in self.table), self.default)
+            for j, name in enumerate(self.columns):
+                value = entry.get(name, self.default.get(name))
+                if value is not None:
+                    values[i, j] = value
+        return values
+#----------------------------------------------------------
+class UrlFeatureExtractor:
+    """Extracts the phishing feature columns from batches of raw URLs (see module docstring)."""
+    def __init__(self, lookup: FeatureLookup = None, host_cache_size: int = 200_000,
+                 shorteners: Iterable[str] = SHORTENER_DOMAINS):
+        self.lookup = lookup or FeatureLookup()
+        self.host_cache_size = max(1, host_cache_size)
+        self.shorteners = frozenset(domain.lower() for domain in shorteners)
+        self.features = list(PHISHING_FEATURE_COLUMNS)
+        position = {name: j for j, name in enumerate(self.features)}
+        self._host_index = np.array([position[name] for name in HOST_COLUMNS])
+        self._url_index = [position[name] for name in URL_COLUMNS]
+        self._lookup_index = np.array([position[name] for name in self.lookup.columns], dtype=np.intp)
+        # authority -> (host values (int8), lookup values (float64)); insertion order = age
+        self._cache: Dict[str, tuple] = {}
+        self.hits = 0
+        self.misses = 0
+    #----------------------------------------------------------
+    @classmethod
+    def from_config(cls, config: UrlFeatureConfig) -> "UrlFeatureExtractor":
+        lookup = StaticLookup.from_file(config.lookup_file_path) if config.lookup_file_path else None
+        return cls(lookup, config.host_cache_size)
+    #----------------------------------------------------------
+    def cache_info(self) -> dict:
+        total = self.hits + self.misses
+        return {"hosts": len(self._cache), "hits": self.hits, "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0}
+    #----------------------------------------------------------
+    def _host_tables(self, authorities: np.ndarray):
+        """Host values and lookup values of unique `authorities`, from the memo or computed and memoized."""
+        cache = self._cache
+        entries = [cache.get(authority) for authority in authorities]
+        new = [i for i, entry in enumerate(entries) if entry is None]
+        self.misses += len(new)
+        self.hits += len(entries) - len(new)
+        if new:
+            parsed = [host_features(authorities[i], self.shorteners) for i in new]
+            looked_up = self.lookup.lookup([host for host, _ in parsed])
+            for k, i in enumerate(new):
+                entries[i] = (parsed[k][1], looked_up[k])
+                cache[authorities[i]] = entries[i]
+            overflow = len(cache) - self.host_cache_size
+            if overflow > 0:
+                for authority in list(itertools.islice(cache, overflow)):
+                    del cache[authority]
+        host_values = np.array([entry[0] for entry in entries], dtype=np.int8).reshape(len(entries), len(HOST_COLUMNS))
+        lookup_values = np.array([entry[1] for entry in entries], dtype=np.float64).reshape(
+            len(entries), len(self.lookup.columns))
+        return host_values, lookup_values
+    #----------------------------------------------------------
+    def extract_block(self, urls: Sequence[str], dtype=np.float64) -> np.ndarray:
+        """
+        (len(urls), 30) block in schema feature order: lexical columns filled,
+        network columns from the lookup, NaN where unknown.
+        """
+        urls = [url if isinstance(url, str) else "" for url in urls]
+        n = len(urls)
+        block = np.full((n, len(self.features)), np.nan, dtype=dtype)
+        if not n:
+            return block
+        match = _AUTHORITY.match
+        codes, authorities = pd.factorize(np.array([match(url).group(1) for url in urls], dtype=object))
+        host_values, lookup_values = self._host_tables(np.asarray(authorities, dtype=object))
+        block[:, self._host_index] = host_values[codes]
+        if len(self._lookup_index):
+            block[:, self._lookup_index] = lookup_values[codes]
+        #----------------------------------------------------------
+        # URL-level columns over the whole batch
+        length = np.fromiter(map(len, urls), dtype=np.int64, count=n)
+        has_at = np.fromiter(map(operator.contains, urls, itertools.repeat("@")), dtype=bool, count=n)
+        last_double_slash = np.fromiter(map(str.rfind, urls, itertools.repeat("//")), dtype=np.int64, count=n)
+        length_index, at_index, slash_index = self._url_index
+        block[:, length_index] = np.where(length < URL_LENGTH_LEGITIMATE, 1,
+                                          np.where(length <= URL_LENGTH_SUSPICIOUS, 0, -1))
+        block[:, at_index] = np.where(has_at, -1, 1)
+        block[:, slash_index] = np.where(last_double_slash > DOUBLE_SLASH_MAX_INDEX, -1, 1)
+        return block
+    #----------------------------------------------------------
+    def to_frame(self, block: np.ndarray, index=None) -> pd.DataFrame:
+        """Schema-typed frame of a block: int8 columns, nullable Int8 where values are missing."""
+        columns = {}
+        for j, name in enumerate(self.features):
+            values = block[:, j]
+            missing = np.isnan(values)
+            if missing.any():
+                columns[name] = pd.arrays.IntegerArray(np.where(missing, 0, values).astype(np.int8), missing)
+            else:
+                columns[name] = values.astype(np.int8)
+        return pd.DataFrame(columns, index=index)
+    #----------------------------------------------------------
+    def extract(self, urls: Sequence[str], index=None) -> pd.DataFrame:
+        return self.to_frame(self.extract_block(urls), index=index)
+#----------------------------------------------------------
+# Process-pool workers: one extractor (and host memo) per process
+#----------------------------------------------------------
+_WORKER_EXTRACTOR = None
+#----------------------------------------------------------
+def _init_worker(lookup: FeatureLookup, host_cache_size: int) -> None:
+    global _WORKER_EXTRACTOR
+    _WORKER_EXTRACTOR = UrlFeatureExtractor(lookup, host_cache_size)
+#----------------------------------------------------------
+def _extract_in_worker(urls: List[str]) -> np.ndarray:
+    # float32 halves the result pickled back; -1/0/1/NaN are exact
+    return _WORKER_EXTRACTOR.extract_block(urls, dtype=np.float32)
+#----------------------------------------------------------
+def iter_extract_blocks(batches: Iterable[Sequence[str]], workers: int = 1, lookup: FeatureLookup = None,
+                        host_cache_size: int = 200_000, start_method: str = "spawn") -> Iterator[np.ndarray]:
+    """
+    Feature blocks of `batches` of URLs, in input order. With more than one
+    worker, batches are extracted on a process pool with each worker's own host
+    memo. Keep batches large (tens of thousands of URLs), so per-task pickling
+    stays small next to the work.
+    """
+    if workers <= 1:
+        extractor = UrlFeatureExtractor(lookup, host_cache_size)
+        for batch in batches:
+            yield extractor.extract_block(batch)
+        return
+    context = multiprocessing.get_context(start_method)
+    with context.Pool(workers, initializer=_init_worker, initargs=(lookup, host_cache_size)) as pool:
+        # Bounded read-ahead: a stream of millions of URLs is never queued whole
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.apply_async(_extract_in_worker, (list(batch),)))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
@@ -5,42 +5,379 @@ such as ensuring the existence of directories.
 """
 import os
 import sys
+import json
+import math
+import uuid
+import time
+import operator
+import bson
 import pymongo
+from contextlib import contextmanager
 import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Tuple, List
-from sklearn import set_config
-from sklearn.pipeline import Pipeline
-from sklearn.impute import SimpleImputer
-from sklearn.compose import ColumnTransformer
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, OneHotEncoder
+from typing import Tuple, List, TYPE_CHECKING
+# scikit-learn is imported inside the functions that use it, so the push and
+# read paths do not pay for it at import time
+if TYPE_CHECKING:
+    from sklearn.compose import ColumnTransformer
 #------------------------------------------------------------------
 # Import custom exception and logger
 #------------------------------------------------------------------
 import networksecurity.components.constants as constants
+from networksecurity.components.logger import ns_logger
 from networksecurity.components.exception import CustomException
+from networksecurity.components.instrumentation import ns_metrics
+from networksecurity.components.schema import DatasetSchema, phishing_schema
+from networksecurity.components.row_codec import RowCodec, STORAGE_MODES, ROWS_FIELD
 # import src.myproject.logger as logger
 #--------------------------------------------------------------------
-# Ensure directory exists function
+# Atomic file replacement
 #--------------------------------------------------------------------
-test_sizes = constants.TEST_SIZE
-test_sizes_val = constants.TEST_SIZE_VAL
-random_states = constants.RANDOM_STATE
+@contextmanager
+def atomic_path(file_path):
+    """
+    Yields a temp path next to `file_path` (same suffix, so format dispatch still
+    works) and renames it into place only if the block succeeds. Readers never
+    see a half-written artifact; a failed write leaves the previous file intact.
+    """
+    path = Path(file_path)
+    tmp_path = path.with_name(f".{path.stem}.{uuid.uuid4().hex[:8]}.tmp{path.suffix}")
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+#--------------------------------------------------------------------
+# JSON state files (manifests, caches, reports)
+#--------------------------------------------------------------------
+def save_json_atomic(file_path, payload: dict):
+    """Writes `payload` as JSON to a temp file and renames it over `file_path`."""
+    try:
+        path = Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_path(path) as tmp_path:
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump(payload, file, indent=2, default=str)
+    except Exception as e:
+        raise CustomException(e, sys) from e
+#--------------------------------------------------------------------
+def load_json(file_path, default=None):
+    """Returns the parsed JSON at `file_path`, or `default` if it does not exist."""
+    try:
+        path = Path(file_path)
+        if not path.exists():
+            return default
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except Exception as e:
+        raise CustomException(e, sys) from e
+def save_report_atomic(file_path, payload: dict):
+    """
+    Writes a human-readable report: YAML for .yaml/.yml paths, JSON otherwise.
+    Without PyYAML the YAML file is written as JSON, which YAML parsers also read.
+    """
+    try:
+        path = Path(file_path)
+        try:
+            import yaml
+        except ImportError:
+            yaml = None
+        if path.suffix not in (".yaml", ".yml") or yaml is None:
+            save_json_atomic(path, payload)
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_path(path) as tmp_path:
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                yaml.safe_dump(json.loads(json.dumps(payload, default=str)), file, sort_keys=False)
+    except Exception as e:
+        raise CustomException(e, sys) from e
+def update_report_section(file_path, section: str, payload: dict):
+    """
+    Replaces one top-level section of a report written by `save_report_atomic`,
+    keeping the others, so several stages can share one report file.
+    """
+    try:
+        path = Path(file_path)
+        report = {}
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as file:
+                try:
+                    import yaml
+                    report = yaml.safe_load(file) or {}
+                except ImportError:
+                    report = json.load(file)
+        report[section] = payload
+        save_report_atomic(path, report)
+    except Exception as e:
+        raise CustomException(e, sys) from e
+#--------------------------------------------------------------------
+# Artifact writers / readers (csv, parquet, feather, npy)
+#--------------------------------------------------------------------
+_SUFFIX_FORMATS = {suffix: fmt for fmt, suffix in constants.ARTIFACT_FORMAT_SUFFIXES.items()}
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+#--------------------------------------------------------------------
+def artifact_format_of(file_path) -> str:
+    """Returns the artifact format implied by the file suffix."""
+    suffix = Path(file_path).suffix
+    if suffix not in _SUFFIX_FORMATS:
+        raise ValueError(f"Unsupported artifact suffix '{suffix}' for {file_path}")
+    return _SUFFIX_FORMATS[suffix]
+#--------------------------------------------------------------------
+def _npy_sidecar(file_path) -> Path:
+    path = Path(file_path)
+    return path.with_name(f"{path.stem}.meta.json")
+#--------------------------------------------------------------------
+def _npy_mask_path(file_path) -> Path:
+    path = Path(file_path)
+    return path.with_name(f"{path.stem}.mask.npy")
+#--------------------------------------------------------------------
+def _require_pyarrow(fmt: str):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError(f"The '{fmt}' artifact format requires pyarrow (pip install pyarrow).") from e
+#--------------------------------------------------------------------
+def write_artifact(data, file_path, compression: str = None) -> None:
+    """Writes `data` via _write_artifact, recording rows, bytes and time in the run metrics."""
+    if compression is None:
+        compression = constants.ARTIFACT_COMPRESSION
+    with ns_metrics.track(f"write_artifact:{Path(file_path).name}", rows=len(data)) as metrics:
+        _write_artifact(data, file_path, compression)
+        metrics.bytes = Path(file_path).stat().st_size
+#--------------------------------------------------------------------
+def _write_artifact(data, file_path, compression: str) -> None:
+    """
+    Writes a DataFrame or Series in the format implied by the file suffix.
+    .npy artifacts hold the raw values (one dtype for the whole frame), with
+    column names in a `<stem>.meta.json` sidecar and, when values are missing,
+    a boolean `<stem>.mask.npy`, so readers can memory-map them without parsing.
+    """
+    try:
+        fmt = artifact_format_of(file_path)
+        if fmt == "csv":
+            with atomic_path(file_path) as tmp_path:
+                data.to_csv(tmp_path, index=False, header=True)
+            return
+        frame = data.to_frame() if isinstance(data, pd.Series) else data
+        if fmt in ("parquet", "feather"):
+            _require_pyarrow(fmt)
+            with atomic_path(file_path) as tmp_path:
+                if fmt == "parquet":
+                    frame.to_parquet(tmp_path, index=False, compression=compression)
+                else:
+                    frame.reset_index(drop=True).to_feather(tmp_path, compression=compression)
+            return
+        #----------------------------------------------------------
+        # npy: homogeneous values + sidecars
+        mask = frame.isna().to_numpy()
+        numpy_dtypes = [getattr(dtype, "numpy_dtype", dtype) for dtype in frame.dtypes]
+        dtype = np.result_type(*numpy_dtypes)
+        values = frame.to_numpy(dtype=dtype, na_value=0) if mask.any() else frame.to_numpy(dtype=dtype)
+        if isinstance(data, pd.Series):
+            values, mask = values.ravel(), mask.ravel()
+        # Sidecars first, data file last: the .npy only appears once its metadata is in place
+        if mask.any():
+            with atomic_path(_npy_mask_path(file_path)) as tmp_path:
+                np.save(tmp_path, mask, allow_pickle=False)
+        else:
+            _npy_mask_path(file_path).unlink(missing_ok=True)
+        save_json_atomic(_npy_sidecar(file_path), {
+            "columns": [str(column) for column in frame.columns],
+            "series": isinstance(data, pd.Series),
+            "dtype": dtype.name,
+            "has_mask": bool(mask.any()),
+        })
+        with atomic_path(file_path) as tmp_path:
+            np.save(tmp_path, values, allow_pickle=False)
+    except Exception as e:
+        raise CustomException(e, sys) from e
+#--------------------------------------------------------------------
+def _with_missing(values: np.ndarray, mask: np.ndarray):
+    """Re-attaches a missing mask: nullable integers for int data, NaN otherwise."""
+    if np.issubdtype(values.dtype, np.integer):
+        return pd.arrays.IntegerArray(values, mask)
+    return np.where(mask, np.nan, values)
+#--------------------------------------------------------------------
+def read_artifact(file_path, as_array: bool = False, mmap: bool = True,
+                  schema: DatasetSchema = None):
+    """
+    Reads an artifact written by `write_artifact`.
+    * as_array=True returns the values as a NumPy array; for .npy this is a
+      read-only np.memmap when `mmap` is set, so nothing is copied or parsed
+      (missing entries hold 0 there; the mask is in `<stem>.mask.npy`).
+    * Otherwise returns a DataFrame (or a Series for single-column .npy series).
+    * `schema` casts CSV input to the schema dtypes; binary formats keep their dtypes.
+    """
+    try:
+        fmt = artifact_format_of(file_path)
+        if fmt == "npy":
+            values = np.load(file_path, mmap_mode="r" if mmap else None, allow_pickle=False)
+            if as_array:
+                return values
+            meta = load_json(_npy_sidecar(file_path), default={})
+            columns = meta.get("columns")
+            mask = np.load(_npy_mask_path(file_path), allow_pickle=False) if meta.get("has_mask") else None
+            if meta.get("series"):
+                name = columns[0] if columns else None
+                if mask is None:
+                    return pd.Series(values, name=name, copy=False)
+                return pd.Series(_with_missing(np.array(values), mask), name=name)
+            if mask is None:
+                return pd.DataFrame(values, columns=columns, copy=False)
+            return pd.DataFrame({
+                column: _with_missing(np.array(values[:, j]), mask[:, j]) if mask[:, j].any() else values[:, j]
+                for j, column in enumerate(columns)})
+        #----------------------------------------------------------
+        if fmt == "csv":
+            kwargs = {}
+            if schema is not None:
+                kwargs = {"dtype": schema.read_csv_dtypes(),
+                          "na_values": list(constants.MISSING_VALUE_SENTINELS)}
+            frame = pd.read_csv(file_path, **kwargs)
+            if schema is not None:
+                frame = schema.cast_frame(frame)
+        else:
+            _require_pyarrow(fmt)
+            frame = pd.read_parquet(file_path) if fmt == "parquet" else pd.read_feather(file_path)
+        return frame.to_numpy() if as_array else frame
+    except Exception as e:
+        raise CustomException(e, sys) from e
+def iter_artifact_frames(file_path, chunksize: int = 100_000):
+    """
+    Yields an artifact as DataFrames of at most `chunksize` rows, without loading
+    it whole: CSV via the chunked parser, parquet by record batch, feather through
+    a memory-mapped Arrow file and .npy through np.memmap. Values are not cast,
+    so out-of-schema entries reach the caller as they are stored.
+    """
+    try:
+        fmt = artifact_format_of(file_path)
+        if fmt == "csv":
+            yield from pd.read_csv(file_path, chunksize=chunksize,
+                                   na_values=list(constants.MISSING_VALUE_SENTINELS))
+            return
+        if fmt == "npy":
+            values = np.load(file_path, mmap_mode="r", allow_pickle=False)
+            meta = load_json(_npy_sidecar(file_path), default={})
+            mask = np.load(_npy_mask_path(file_path), mmap_mode="r") if meta.get("has_mask") else None
+            values = values.reshape(len(values), -1)
+            columns = meta.get("columns") or list(range(values.shape[1]))
+            for start in range(0, len(values), chunksize):
+                block = np.array(values[start:start + chunksize])
+                if mask is not None:
+                    block_mask = np.array(mask[start:start + chunksize]).reshape(block.shape)
+                    block = np.where(block_mask, np.nan, block)
+                yield pd.DataFrame(block, columns=columns, index=pd.RangeIndex(start, start + len(block)))
+            return
+        _require_pyarrow(fmt)
+        import pyarrow.parquet as pq
+        import pyarrow.ipc as ipc
+        import pyarrow as pa
+        if fmt == "parquet":
+            batches = pq.ParquetFile(file_path).iter_batches(batch_size=chunksize)
+        else:
+            reader = ipc.open_file(pa.memory_map(str(file_path), "r"))
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        start = 0
+        for batch in batches:
+            for offset in range(0, batch.num_rows, chunksize):
+                frame = batch.slice(offset, chunksize).to_pandas()
+                frame.index = pd.RangeIndex(start, start + len(frame))
+                start += len(frame)
+                yield frame
+    except Exception as e:
+        raise CustomException(e, sys) from e
+#--------------------------------------------------------------------
+class FrameSink:
+    """
+    Appends DataFrames to one output file: CSV and NDJSON (.ndjson / .jsonl)
+    through pandas, parquet and feather through pyarrow's streaming writers
+    (one row group / record batch per chunk), so a whole output never has to
+    be held in memory.
+    """
+    def __init__(self, file_path):
+        self.file_path = Path(file_path)
+        self.fmt = "ndjson" if self.file_path.suffix in NDJSON_SUFFIXES else artifact_format_of(file_path)
+        if self.fmt == "npy":
+            raise ValueError(f".npy outputs cannot be appended to; use csv, ndjson, parquet or feather: {file_path}")
+        self._file = None
+        self._writer = None
+        self._schema = None
+    #----------------------------------------------------------
+    def write(self, frame: pd.DataFrame) -> None:
+        if self.fmt in ("csv", "ndjson"):
+            first = self._file is None
+            if first:
+                self._file = open(self.file_path, "w", encoding="utf-8", newline="")
+            if self.fmt == "csv":
+                frame.to_csv(self._file, index=False, header=first)
+            elif len(frame):
+                frame.to_json(self._file, orient="records", lines=True)   # newline-terminated
+            return
+        import pyarrow as pa
+        if self._writer is None:
+            self._schema = pa.Schema.from_pandas(frame, preserve_index=False)
+            compression = constants.ARTIFACT_COMPRESSION
+            if self.fmt == "parquet":
+                import pyarrow.parquet as pq
+                self._writer = pq.ParquetWriter(str(self.file_path), self._schema, compression=compression)
+            else:
+                self._writer = pa.ipc.new_file(
+                    str(self.file_path), self._schema,
+                    options=pa.ipc.IpcWriteOptions(compression=compression))
+        table = pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False)
+        self._writer.write_table(table)
+    #----------------------------------------------------------
+    def close(self) -> None:
+        if self._file is None and self._writer is None and not self.file_path.exists():
+            self.file_path.touch()   # empty source: still leave a (empty) file to rename
+        if self._file is not None:
+            self._file.close()
+        if self._writer is not None:
+            self._writer.close()
+        self._file = self._writer = None
 #--------------------------------------------------------------------
-def ensure_directory_exists(directory_path):
-    """Checks if a directory exists, and creates it if necessary."""
-    path = Path(directory_path)
-    if not path.exists():
-        # Creates the directory and any necessary parent directories
-        path.mkdir(parents=True, exist_ok=True)
-        print(f"Created directory: {directory_path}")
-    else:
-        print(f"Directory already exists: {directory_path}")
+# Index-based split storage
+#--------------------------------------------------------------------
+def uses_split_index(ingest_config) -> bool:
+    """True when splits are stored as row indices into the single dataset artifact."""
+    storage = getattr(ingest_config, "split_storage", "copy")
+    if storage not in ("copy", "index"):
+        raise ValueError(f"Unknown split storage '{storage}'; expected 'copy' or 'index'")
+    return storage == "index"
+#--------------------------------------------------------------------
+def save_split_index(ingest_config, n_rows: int, columns: List[str], **splits) -> None:
+    """
+    Writes row-index arrays for each split (e.g. train=..., test=...) to
+    `split_index_file_and_path`, together with the dataset path, its row count
+    and the X/y column selection, instead of copying the rows themselves.
+    Indices are row positions in `feature_file_name_and_path`. The row count
+    column of a collapsed dataset is recorded as the weight column, not a feature.
+    """
+    try:
+        index_dtype = np.int32 if n_rows < np.iinfo(np.int32).max else np.int64
+        target = ingest_config.target_column
+        count_column = getattr(ingest_config, "row_count_column", constants.ROW_COUNT_COLUMN)
+        meta = {
+            "dataset": str(ingest_config.feature_file_name_and_path),
+            "n_rows": int(n_rows),
+            "columns": [str(column) for column in columns],
+            "feature_columns": [str(column) for column in columns if column not in (target, count_column)],
+            "target_column": target,
+            "weight_column": count_column if count_column in columns else None,
+            "splits": sorted(splits),
+        }
+        arrays = {f"idx_{name}": np.asarray(index, dtype=index_dtype) for name, index in splits.items()}
+        path = Path(ingest_config.split_index_file_and_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_path(path) as tmp_path:
+            np.savez(tmp_path, meta=np.array(json.dumps(meta)), **arrays)
+    except Exception as e:
+        raise CustomException(e, sys) from e
 #--------------------------------------------------------------------
 # Function to Read data from file
 #--------------------------------------------------------------------
+@ns_metrics.instrument("ingest_data_from_file")
 def ingest_data_from_file(raw_data: str):
     """
     Function to ingest data from a given file path.
@@ -48,83 +385,386 @@ def ingest_data_from_file(raw_data: str):
     """
     try:
         with open(raw_data, 'r', encoding='utf-8') as file:
-            df = pd.read_csv(file)
+            df = pd.read_csv(
+                file, dtype=phishing_schema().read_csv_dtypes(),
+                na_values=list(constants.MISSING_VALUE_SENTINELS))
             # logger.app_logger.info("Data ingested successfully from %s", raw_data)
-            return df
+            return phishing_schema().cast_frame(df)
     except Exception as e:
         raise CustomException(e, sys) from e
 #--------------------------------------------------------------------
-def ingest_data_from_mongo(mongo_uri: str, db_name: str, collection_name: str) -> pd.DataFrame:
+# Columnar cursor reader
+#--------------------------------------------------------------------
+_MISSING = frozenset(constants.MISSING_VALUE_SENTINELS)
+#--------------------------------------------------------------------
+def _decode_value(value) -> float:
+    """Decodes a single document value, mapping missing-value sentinels to NaN."""
+    if value is None:
+        return math.nan
+    if isinstance(value, str):
+        value = value.strip()
+        if value in _MISSING:
+            return math.nan
+    return float(value)
+#--------------------------------------------------------------------
+def _decode_batch(documents: list, columns: list) -> np.ndarray:
+    """
+    Decodes a batch of documents into a (rows, columns) float64 block.
+    The fast path pulls every field with one itemgetter and lets NumPy convert;
+    batches with missing fields or sentinel strings fall back to per-value decoding.
+    """
+    getter = operator.itemgetter(*columns)
+    try:
+        block = np.array([getter(document) for document in documents], dtype=np.float64)
+        if block.ndim == 1:
+            block = block.reshape(-1, len(columns))
+        return block
+    except (KeyError, ValueError, TypeError):
+        block = np.empty((len(documents), len(columns)), dtype=np.float64)
+        for i, document in enumerate(documents):
+            block[i] = [_decode_value(document.get(column)) for column in columns]
+        return block
+#--------------------------------------------------------------------
+def _read_cursor_into_buffers(
+    cursor, columns: List[str], batch_size: int, expected: int,
+    dtype=np.int64, schema: DatasetSchema = None,
+    storage_mode: str = "document") -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Drains `cursor` into preallocated (values, missing) buffers, decoding one
+    batch at a time. The buffers grow if the cursor yields more than `expected`.
+    Packed documents (see row_codec) are unpacked with array shifts instead of
+    being decoded field by field.
+    """
+    values = np.zeros((expected, len(columns)), dtype=dtype)
+    missing = np.zeros((expected, len(columns)), dtype=bool)
+    filled = 0
+    codec = None if storage_mode == "document" else RowCodec(schema)
+    #----------------------------------------------------------
+    def decode(documents):
+        if codec is None:
+            block = _decode_batch(documents, columns)
+            if schema is not None:
+                schema.check_block(block, columns)
+            block_missing = np.isnan(block)
+            if np.issubdtype(values.dtype, np.integer):
+                block[block_missing] = 0
+                if not np.array_equal(block, np.round(block)):
+                    raise ValueError("Non-integral values found while decoding to an integer dtype.")
+            return block, block_missing
+        block, block_missing = codec.unpack(codec.codes_from_documents(documents, storage_mode), columns)
+        codec.check(block, block_missing, columns)
+        return block, block_missing
+    #----------------------------------------------------------
+    def flush(documents):
+        nonlocal values, missing, filled
+        block, block_missing = decode(documents)
+        end = filled + len(block)
+        if end > len(values):
+            # More documents than counted (concurrent inserts): grow the buffers
+            grow = max(end, int(len(values) * 1.25) + 1)
+            values = np.concatenate([values, np.zeros((grow - len(values), len(columns)), dtype=dtype)])
+            missing = np.concatenate([missing, np.zeros((grow - len(missing), len(columns)), dtype=bool)])
+        values[filled:end] = block
+        missing[filled:end] = block_missing
+        filled = end
+    #----------------------------------------------------------
+    documents = []
+    for document in cursor:
+        documents.append(document)
+        if len(documents) >= batch_size:
+            flush(documents)
+            documents = []
+    if documents:
+        flush(documents)
+    return values[:filled], missing[:filled]
+#--------------------------------------------------------------------
+def _buffers_to_frame(values: np.ndarray, missing: np.ndarray, columns: List[str]) -> pd.DataFrame:
+    """Builds the frame: plain `dtype` columns, nullable integer columns where values are missing."""
+    missing_columns = missing.any(axis=0)
+    if not missing_columns.any() or not np.issubdtype(values.dtype, np.integer):
+        if missing_columns.any():
+            values[missing] = np.nan
+        return pd.DataFrame(values, columns=columns, copy=False)
+    return pd.DataFrame({
+        column: pd.arrays.IntegerArray(
+            np.ascontiguousarray(values[:, j]), np.ascontiguousarray(missing[:, j]))
+        if missing_columns[j] else values[:, j]
+        for j, column in enumerate(columns)
+    })
+#--------------------------------------------------------------------
+def _resolve_columns(collection, query: dict, columns: List[str], schema: DatasetSchema,
+                     storage_mode: str = "document"):
+    """Columns to read: explicit, from the schema, or from the first document (None if empty)."""
+    if columns is None and schema is not None:
+        columns = schema.names
+    if columns is None and storage_mode != "document":
+        # Packed codes carry no field names: the columns are those of the codec that decodes them
+        columns = RowCodec(schema).columns
+    if columns is None:
+        first = collection.find_one(query, projection={
+            "_id": 0, constants.ROW_FINGERPRINT_FIELD: 0,
+            constants.PUSH_GENERATION_FIELD: 0, constants.PUSH_SEQUENCE_FIELD: 0})
+        if first is None:
+            return None
+        columns = list(first.keys())
+    return columns
+#--------------------------------------------------------------------
+def _storage_mode(storage_mode: str = None) -> str:
+    storage_mode = storage_mode or constants.MONGO_STORAGE_MODE
+    if storage_mode not in STORAGE_MODES:
+        raise ValueError(f"Unknown storage mode '{storage_mode}'; expected one of {STORAGE_MODES}")
+    return storage_mode
+#--------------------------------------------------------------------
+def _read_projection(columns: List[str], storage_mode: str) -> dict:
+    if storage_mode == "document":
+        return {"_id": 0, **{column: 1 for column in columns}}
+    return RowCodec.projection(storage_mode)
+#--------------------------------------------------------------------
+def _expected_rows(collection, query: dict, storage_mode: str) -> int:
+    """Rows to preallocate for: documents, or the summed row counts of packed batch documents."""
+    if storage_mode == "packed_batch":
+        pipeline = ([{"$match": query}] if query else []) + [
+            {"$group": {"_id": None, "rows": {"$sum": f"${ROWS_FIELD}"}}}]
+        totals = list(collection.aggregate(pipeline))
+        return int(totals[0]["rows"]) if totals else 0
+    return collection.count_documents(query) if query else collection.estimated_document_count()
+#--------------------------------------------------------------------
+@ns_metrics.instrument("read_collection_columnar")
+def read_collection_columnar(
+    collection, columns: List[str] = None, batch_size: int = None,
+    query: dict = None, dtype=np.int64, schema: DatasetSchema = None,
+    storage_mode: str = None) -> pd.DataFrame:
     """
-    Ingests data from a MongoDB collection into a Pandas DataFrame.
+    Streams a collection into preallocated, typed column buffers.
+    * Documents are read in `_id` order, so the result is deterministic and
+      identical to `read_collection_partitioned`.
+    * `_id` and the row fingerprint are excluded by the projection, never fetched.
+    * Missing-value sentinels are decoded to a mask while filling the buffers,
+      so no full-frame `replace` pass is needed.
+    * Columns without missing values come back as `dtype`; columns with missing
+      values come back as the matching pandas nullable integer type.
+    * With a `schema`, its columns are read and every batch is checked against
+      the allowed values before it is cast, so bad documents fail the read.
+    * `storage_mode` (default MONGO_STORAGE_MODE) selects the document layout:
+      field-per-column documents or packed codes (see row_codec).
+    Peak memory is the final buffers plus one decoded batch.
     """
     try:
-        # Establish connection to MongoDB
-        client = pymongo.MongoClient(mongo_uri)
-        db = client[db_name]
-        collection = db[collection_name]
-        
-        # Fetch data from the collection
-        data = list(collection.find())
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(data)
-        
-        # logger.app_logger.info(f"Data ingested successfully from MongoDB collection: {collection_name}")
-        return df
+        query = query or {}
+        batch_size = batch_size or constants.MONGO_READ_BATCH_SIZE
+        storage_mode = _storage_mode(storage_mode)
+        columns = _resolve_columns(collection, query, columns, schema, storage_mode)
+        if columns is None:
+            return pd.DataFrame()
+        projection = _read_projection(columns, storage_mode)
+        expected = _expected_rows(collection, query, storage_mode)
+        #----------------------------------------------------------
+        cursor = collection.find(query, projection=projection, batch_size=batch_size).sort("_id", 1)
+        values, missing = _read_cursor_into_buffers(
+            cursor, columns, batch_size, expected, dtype, schema, storage_mode)
+        return _buffers_to_frame(values, missing, columns)
     except Exception as e:
         raise CustomException(e, sys) from e
 #--------------------------------------------------------------------
-def read_collection_from_mongo(
-    mongo_config, training_config, ingest_config,
-    mongo_client: pymongo.MongoClient,db_name: str,collection_name: str) -> pd.DataFrame:
-    """Reads data from a MongoDB collection into a Pandas DataFrame."""
+# Partitioned (parallel) reader
+#--------------------------------------------------------------------
+def _id_partition_bounds(collection, query: dict, partitions: int, samples_per_partition: int = 32) -> list:
+    """
+    Splits the `_id` space into `partitions` contiguous ranges from a random
+    sample of `_id`s (quantiles of the sorted sample). Returns a list of
+    (lower, upper) pairs, lower inclusive and upper exclusive, where None
+    means unbounded; the ranges are disjoint and cover every document.
+    """
+    pipeline = ([{"$match": query}] if query else []) + [
+        {"$sample": {"size": partitions * samples_per_partition}},
+        {"$project": {"_id": 1}}]
+    sample = sorted({document["_id"] for document in collection.aggregate(pipeline)})
+    step = len(sample) / partitions
+    cuts = sorted({sample[int(step * i)] for i in range(1, partitions) if int(step * i) < len(sample)})
+    edges = [None, *cuts, None]
+    return list(zip(edges[:-1], edges[1:]))
+#--------------------------------------------------------------------
+def _range_query(query: dict, lower, upper) -> dict:
+    """`query` restricted to lower <= _id < upper (None = unbounded)."""
+    id_range = {}
+    if lower is not None:
+        id_range["$gte"] = lower
+    if upper is not None:
+        id_range["$lt"] = upper
+    if not id_range:
+        return query
+    return {"$and": [query, {"_id": id_range}]} if query else {"_id": id_range}
+#--------------------------------------------------------------------
+# Raised while a cursor fetches or decodes a batch: a dropped connection, a
+# killed cursor, or a torn reply that fails BSON decoding
+_RETRYABLE_READ_ERRORS = (pymongo.errors.PyMongoError, bson.errors.BSONError, OSError)
+#--------------------------------------------------------------------
+@ns_metrics.instrument("read_collection_partitioned")
+def read_collection_partitioned(
+    collection, partitions: int = None, max_workers: int = None, retries: int = None,
+    columns: List[str] = None, batch_size: int = None, query: dict = None,
+    dtype=np.int64, schema: DatasetSchema = None, storage_mode: str = None) -> pd.DataFrame:
+    """
+    Parallel form of `read_collection_columnar`: the collection is split into
+    `_id` ranges, each range is read on its own worker (and pooled connection)
+    into its own buffers, and the buffers are concatenated in range order.
+    Both readers return rows in `_id` order, so the frames are identical
+    whatever the number of partitions or the sampled range cuts.
+    A range that fails with a driver, network or BSON decoding error (raised
+    while the cursor fetches and decodes a batch) is re-read from scratch up
+    to `retries` times without touching the other ranges; schema violations
+    are not transient and fail at once. Defaults come from constants.
+    """
     try:
-        ensure_directory_exists(mongo_config.file_path)
-        ensure_directory_exists(training_config.artifact_dir)
-        ensure_directory_exists(ingest_config.feature_store_dir)
-        ensure_directory_exists(ingest_config.ingested_dir)
-        ensure_directory_exists(ingest_config.x_file_name_and_path.parent)
-        ensure_directory_exists(ingest_config.y_file_name_and_path.parent)
-        #----------------------------------------------------------
-        # Ingest data from MongoDB
-        #----------------------------------------------------------
-        collection = mongo_client[db_name][collection_name]
-        collection_df = pd.DataFrame(list(collection.find()))
-        #----------------------------------------------------------
-        #In 2026, when working with data ingested from MongoDB, 
-        # it is a best practice to use a conditional check before dropping the _id column. 
-        # This prevents pipeline from crashing if the column is already missing 
-        # (e.g., if it was filtered out during the MongoDB query or dropped in a previous step).
-        #----------------------------------------------------------
-        collection_df.drop(columns=["_id"], axis=1, errors="ignore", inplace=True)
-        # Replace multiple variants of "missing" in one go
-        collection_df.replace(["na", "NA", "", "nan"], np.nan, inplace=True)
-        #----------------------------------------------------------
-        # Derive features (X) and target variable (y)
+        from concurrent.futures import ThreadPoolExecutor
+        query = query or {}
+        batch_size = batch_size or constants.MONGO_READ_BATCH_SIZE
+        partitions = partitions or constants.MONGO_READ_PARTITIONS
+        max_workers = max_workers or constants.MONGO_READ_WORKERS or partitions
+        retries = constants.MONGO_READ_PARTITION_RETRIES if retries is None else retries
+        storage_mode = _storage_mode(storage_mode)
+        columns = _resolve_columns(collection, query, columns, schema, storage_mode)
+        if columns is None:
+            return pd.DataFrame()
+        projection = _read_projection(columns, storage_mode)
+        bounds = _id_partition_bounds(collection, query, partitions)
+        expected = _expected_rows(collection, query, storage_mode)
+        expected_per_range = expected // len(bounds) + 1
         #----------------------------------------------------------
-        x = collection_df.drop(columns=[ingest_config.target_column], axis=1)
-        y = collection_df[ingest_config.target_column]
+        def read_range(index: int):
+            lower, upper = bounds[index]
+            for attempt in range(retries + 1):
+                try:
+                    with ns_metrics.track(f"read_partition:{index}") as metrics:
+                        cursor = collection.find(
+                            _range_query(query, lower, upper), projection=dict(projection),
+                            batch_size=batch_size).sort("_id", 1)
+                        buffers = _read_cursor_into_buffers(
+                            cursor, columns, batch_size, expected_per_range, dtype, schema, storage_mode)
+                        metrics.rows = len(buffers[0])
+                        return buffers
+                except _RETRYABLE_READ_ERRORS as e:
+                    if attempt == retries:
+                        raise
+                    ns_logger.log_warning(
+                        "Partition %d/%d read failed (attempt %d/%d): %s; retrying.",
+                        index + 1, len(bounds), attempt + 1, retries + 1, e)
+                    time.sleep(min(2 ** attempt * 0.5, 10))
         #----------------------------------------------------------
-        # Save the ingested data to a CSV file for record-keeping
-        #----------------------------------------------------------
-        collection_df.to_csv(ingest_config.feature_file_name_and_path, index=False, header=True)
-        x.to_csv(ingest_config.x_file_name_and_path, index=False, header=True)
-        y.to_csv(ingest_config.y_file_name_and_path, index=False, header=True)
-        
-        print(f"Features and target variable separated. Features shape: {x.shape}, Target shape: {y.shape}")
-        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(bounds)),
+                                thread_name_prefix="mongo-read") as pool:
+            parts = list(pool.map(read_range, range(len(bounds))))
+        values = np.concatenate([part[0] for part in parts])
+        missing = np.concatenate([part[1] for part in parts])
+        return _buffers_to_frame(values, missing, columns)
+    except Exception as e:
+        raise CustomException(e, sys) from e
+#--------------------------------------------------------------------
+@contextmanager
+def _artifact_writer(writer):
+    """Yields the caller's writer, or a private one drained and shut down on exit."""
+    if writer is not None:
+        yield writer
+        return
+    from networksecurity.components.artifact_writer import ArtifactWriter
+    with ArtifactWriter() as owned:
+        yield owned
+#--------------------------------------------------------------------
+@ns_metrics.instrument("read_collection_from_mongo")
+def read_collection_from_mongo(
+    mongo_config, training_config, ingest_config,
+    mongo_client: pymongo.MongoClient,db_name: str,collection_name: str,
+    writer=None) -> pd.DataFrame:
+    """
+    Reads data from a MongoDB collection into a Pandas DataFrame.
+    Artifact writes are queued on `writer` (an ArtifactWriter) and run in the
+    background; without one, a private writer is used and drained before returning.
+    """
+    try:
+        with _artifact_writer(writer) as writer:
+            #----------------------------------------------------------
+            # Ingest data from MongoDB
+            #----------------------------------------------------------
+            collection = mongo_client[db_name][collection_name]
+            #----------------------------------------------------------
+            # Stream the cursor(s) into typed column buffers; `_id` and the row
+            # fingerprint are projected out and missing values decoded on the way in.
+            # With more than one partition, `_id` ranges are read in parallel.
+            #----------------------------------------------------------
+            if ingest_config.mongo_read_partitions > 1:
+                collection_df = read_collection_partitioned(
+                    collection, partitions=ingest_config.mongo_read_partitions,
+                    max_workers=ingest_config.mongo_read_workers,
+                    retries=ingest_config.mongo_read_partition_retries,
+                    batch_size=ingest_config.mongo_read_batch_size,
+                    dtype=np.int8, schema=phishing_schema(), storage_mode=ingest_config.mongo_storage_mode)
+            else:
+                collection_df = read_collection_columnar(
+                    collection, batch_size=ingest_config.mongo_read_batch_size,
+                    dtype=np.int8, schema=phishing_schema(), storage_mode=ingest_config.mongo_storage_mode)
+            #----------------------------------------------------------
+            # Optionally keep one row per distinct (features, label) with its count;
+            # the count column is the sample weight of every later stage
+            #----------------------------------------------------------
+            count_column = getattr(ingest_config, "row_count_column", constants.ROW_COUNT_COLUMN)
+            if getattr(ingest_config, "collapse_duplicates", False):
+                from networksecurity.components.row_collapse import collapse_duplicates
+                collection_df = collapse_duplicates(collection_df, phishing_schema(), count_column)
+            #----------------------------------------------------------
+            # Derive features (X) and target variable (y)
+            #----------------------------------------------------------
+            x = collection_df.drop(columns=[ingest_config.target_column, count_column], axis=1, errors="ignore")
+            y = collection_df[ingest_config.target_column]
+            #----------------------------------------------------------
+            # Save the ingested data for record-keeping. In index storage mode the
+            # dataset is written once; X/y are column selections recorded in the split index.
+            #----------------------------------------------------------
+            writer.write("raw_data", collection_df, ingest_config.feature_file_name_and_path)
+            if not uses_split_index(ingest_config):
+                writer.write("x", x, ingest_config.x_file_name_and_path)
+                writer.write("y", y, ingest_config.y_file_name_and_path)
         return collection_df,x,y
     except Exception as e:
         raise CustomException(e, sys) from e
 #--------------------------------------------------------------------
 # Train-Test Split Function
 #--------------------------------------------------------------------
+def _hash_splitter(test_size, random_state, test_size_val=0.0, key_columns=None):
+    """HashSplitter keyed on the features only; the target column is counted, not hashed."""
+    from networksecurity.components.hash_split import HashSplitter
+    return HashSplitter(test_size, test_size_val, seed=random_state,
+                        key_columns=key_columns, label_column=constants.TARGET_COLUMN)
+#--------------------------------------------------------------------
+def _split_method(method: str = None) -> str:
+    method = method or constants.SPLIT_METHOD
+    if method not in constants.SPLIT_METHODS:
+        raise ValueError(f"Unknown split method '{method}'; expected one of {constants.SPLIT_METHODS}")
+    return method
+#--------------------------------------------------------------------
+@ns_metrics.instrument("train_test_split_data", rows=lambda splits: sum(len(s) for s in splits))
 def train_test_split_data(
-    df, test_size=constants.TEST_SIZE, random_state=constants.RANDOM_STATE) -> \
+    df, test_size=None, random_state=None,
+    schema: DatasetSchema = None, method: str = None) -> \
         Tuple[pd.DataFrame, pd.DataFrame]:
-    """Splits the data into training and testing sets."""
+    """
+    Splits the data into training and testing sets (defaults from constants).
+    method="random" (the default) uses scikit-learn's shuffled train_test_split;
+    "hash" assigns rows from a stable hash of their features (see
+    hash_split.py), so assignments survive collection growth.
+    """
     try:
+        test_size = constants.TEST_SIZE if test_size is None else test_size
+        random_state = constants.RANDOM_STATE if random_state is None else random_state
+        method = _split_method(method)
+        schema = schema or phishing_schema()
+        df = schema.cast_frame(df)
+        if method == "hash":
+            # The count of a collapsed frame is not part of the row key
+            key_columns = [column for column in df.columns
+                           if column not in (constants.TARGET_COLUMN, constants.ROW_COUNT_COLUMN)]
+            train_set, _, test_set = _hash_splitter(test_size, random_state, key_columns=key_columns).split(df)
+            return train_set, test_set
+        from sklearn.model_selection import train_test_split
         train_set,test_set = train_test_split(
             df, test_size=test_size, random_state=random_state
         )
@@ -134,27 +774,51 @@ def train_test_split_data(
 #--------------------------------------------------------------------
 # Save Train-Test Data
 
+@ns_metrics.instrument("save_train_test_data", rows=None)
 def save_train_test_data(
-    ingest_config,train_data,test_data):
-    """Saves the train and test data to specified file paths."""
+    ingest_config,train_data,test_data, schema: DatasetSchema = None, writer=None):
+    """Saves the train and test data to specified file paths (queued on `writer` if given)."""
     try:
-        # Ensure the ingested directory exists
-        ensure_directory_exists(ingest_config.ingested_dir)
-        # Save the training data
-        train_data.to_csv(ingest_config.train_file_name_and_path, index=False, header=True)
-        # Save the testing data
-        test_data.to_csv(ingest_config.test_file_name_and_path, index=False, header=True)
+        schema = schema or phishing_schema()
+        with _artifact_writer(writer) as writer:
+            # Row labels are positions in the dataset artifact written at read time. Copy
+            # mode keeps the index too, so the valid-row mask applies to the copied rows.
+            writer.call(
+                "split_index", ingest_config.split_index_file_and_path, save_split_index,
+                ingest_config, len(train_data) + len(test_data), list(train_data.columns),
+                train=train_data.index.to_numpy(), test=test_data.index.to_numpy())
+            if not uses_split_index(ingest_config):
+                # Save the training and testing data
+                writer.write("train", schema.cast_frame(train_data), ingest_config.train_file_name_and_path)
+                writer.write("test", schema.cast_frame(test_data), ingest_config.test_file_name_and_path)
     except Exception as e:
         raise CustomException(e, sys) from e
 #--------------------------------------------------------------------
+@ns_metrics.instrument("train_valid_test_split_data", rows=lambda splits: sum(len(x) for x, _ in splits))
 def train_valid_test_split_data(
-    x, y, test_size=test_sizes, random_state=random_states, 
-    test_size_val=test_sizes_val) -> \
+    x, y, test_size=None, random_state=None,
+    test_size_val=None, schema: DatasetSchema = None, method: str = None) -> \
         Tuple[Tuple[pd.DataFrame, pd.Series], 
               Tuple[pd.DataFrame, pd.Series], 
               Tuple[pd.DataFrame, pd.Series]]:
-    """Splits the data into training and testing sets."""
+    """Splits the data into training, validation and test sets (defaults from constants)."""
     try:
+        test_size = constants.TEST_SIZE if test_size is None else test_size
+        random_state = constants.RANDOM_STATE if random_state is None else random_state
+        test_size_val = constants.TEST_SIZE_VAL if test_size_val is None else test_size_val
+        method = _split_method(method)
+        schema = schema or phishing_schema()
+        x = schema.cast_frame(x)
+        y = schema.cast_series(y) if y.name in schema.specs else y
+        #--------------------------------------------------
+        # Hash split: one pass assigns every row to train/val/test; no copies
+        # of the intermediate 'Train-Full' set
+        #--------------------------------------------------
+        if method == "hash":
+            splitter = _hash_splitter(test_size, random_state, test_size_val)
+            codes = splitter.assign(x.assign(**{constants.TARGET_COLUMN: y.to_numpy()}))
+            return tuple((x[codes == code], y[codes == code]) for code in range(3))
+        from sklearn.model_selection import train_test_split
         #--------------------------------------------------
         # 1. First Split: Isolate the final 'Test' set (e.g., 20% of total data)
         # Use 'stratify' to ensure class proportions are kept across splits
@@ -175,26 +839,34 @@ def train_valid_test_split_data(
         return (x_train, y_train), (x_val, y_val), (x_test, y_test)
     except Exception as e:
         raise CustomException(e, sys) from e
+#--------------------------------------------------------------------
+@ns_metrics.instrument("save_split_data_to_feature_store", rows=None)
 def save_split_data_to_feature_store(
-    ingest_config,collection_df,x,y,x_train,y_train,x_val,y_val,x_test,y_test):
-    """Saves the split data to the feature store."""
+    ingest_config,collection_df,x,y,x_train,y_train,x_val,y_val,x_test,y_test, writer=None):
+    """Saves the split data to the feature store (queued on `writer` if given)."""
     try:
-        # Ensure the feature store directory exists
-        ensure_directory_exists(ingest_config.feature_store_dir)
-        # Save the full collection data
-        collection_df.to_csv(ingest_config.feature_file_name_and_path, index=False, header=True)
-        # Save the features and target variable
-        x.to_csv(ingest_config.x_file_name_and_path, index=False, header=True)
-        y.to_csv(ingest_config.y_file_name_and_path, index=False, header=True)
-        # Save the training set
-        x_train.to_csv(ingest_config.x_train_file_and_path, index=False, header=True)
-        y_train.to_csv(ingest_config.y_train_file_and_path, index=False, header=True)
-        # Save the validation set
-        x_val.to_csv(ingest_config.x_val_file_and_path, index=False, header=True)
-        y_val.to_csv(ingest_config.y_val_file_and_path, index=False, header=True)
-        # Save the test set
-        x_test.to_csv(ingest_config.x_test_file_and_path, index=False, header=True)
-        y_test.to_csv(ingest_config.y_test_file_and_path, index=False, header=True)
+        with _artifact_writer(writer) as writer:
+            # Save the full collection data
+            writer.write("raw_data", collection_df, ingest_config.feature_file_name_and_path)
+            if uses_split_index(ingest_config):
+                # Rows are referenced by position in the dataset artifact, not copied
+                writer.call(
+                    "split_index", ingest_config.split_index_file_and_path, save_split_index,
+                    ingest_config, len(collection_df), list(collection_df.columns),
+                    train=x_train.index.to_numpy(), val=x_val.index.to_numpy(), test=x_test.index.to_numpy())
+            else:
+                # Save the features and target variable
+                writer.write("x", x, ingest_config.x_file_name_and_path)
+                writer.write("y", y, ingest_config.y_file_name_and_path)
+                # Save the training set
+                writer.write("x_train", x_train, ingest_config.x_train_file_and_path)
+                writer.write("y_train", y_train, ingest_config.y_train_file_and_path)
+                # Save the validation set
+                writer.write("x_val", x_val, ingest_config.x_val_file_and_path)
+                writer.write("y_val", y_val, ingest_config.y_val_file_and_path)
+                # Save the test set
+                writer.write("x_test", x_test, ingest_config.x_test_file_and_path)
+                writer.write("y_test", y_test, ingest_config.y_test_file_and_path)
     except Exception as e:
         raise CustomException(e, sys) from e
 #--------------------------------------------------------------------
@@ -218,19 +890,34 @@ def list_dataframe_columns_by_type(df: pd.DataFrame):
     
     return numerical_cols, character_cols
 #--------------------------------------------------------------------
+def is_ternary_numeric(df: pd.DataFrame, numerical_cols: List[str], character_cols: List[str]) -> bool:
+    """
+    True when every feature is numeric and holds only -1 / 0 / 1 (or missing),
+    i.e. the frame can take the NumPy preprocessing fast path.
+    """
+    if character_cols or not numerical_cols:
+        return False
+    block = df[numerical_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    return bool(((block == -1) | (block == 0) | (block == 1) | np.isnan(block)).all())
+#--------------------------------------------------------------------
 # Perform Data Transformation Pipelines
 #--------------------------------------------------------------------
-def create_data_transformation_object(numerical_features, categorical_features) -> ColumnTransformer:
+def create_data_transformation_object(numerical_features, categorical_features,
+                                      output: str = "pandas") -> "ColumnTransformer":
     """
     Creates and returns data transformation pipelines for numerical and categorical features.
+    `output` is passed to `set_output` on this object only ("pandas" or "default"
+    for NumPy arrays); the global sklearn config is left untouched.
     """
     try:
+        from sklearn.pipeline import Pipeline
+        from sklearn.impute import SimpleImputer
+        from sklearn.compose import ColumnTransformer
+        from sklearn.preprocessing import StandardScaler, OneHotEncoder
         # logger.app_logger.info("Creating Numerical and Categorical data transformation pipelines...")
         #----------------------------------------------------------------
         # Define transformers for numerical and categorical features
         #----------------------------------------------------------------
-        set_config(transform_output="pandas") # Ensures output is a DataFrame
-        #----------------------------------------------------------------
         numerical_transformer = Pipeline(steps=[
             ('imputer', SimpleImputer(strategy='median')),
             ('scaler', StandardScaler())
@@ -238,7 +925,7 @@ def create_data_transformation_object(numerical_features, categorical_features)
         #----------------------------------------------------------------
         categorical_transformer = Pipeline(steps=[
             ('imputer', SimpleImputer(strategy='most_frequent')),
-            # Standard: Set sparse_output=False to enable Pandas DataFrame output
+            # Standard: Set sparse_output=False to enable Pandas DataFrame / dense output
             ('onehot', OneHotEncoder(handle_unknown='ignore', sparse_output=False))
         ])
         #----------------------------------------------------------------
@@ -250,9 +937,9 @@ def create_data_transformation_object(numerical_features, categorical_features)
             transformers=[
                 ('cat', categorical_transformer, categorical_features),
                 ('num', numerical_transformer, numerical_features)
-            ],sparse_threshold=0 # Ensures output is a DataFrame
+            ],sparse_threshold=0 # Ensures dense output (DataFrame or array)
         )
-        preprocessor.set_output(transform="pandas") # Ensures output is a DataFrame
+        preprocessor.set_output(transform=output) # Applies to the nested pipelines too
         #----------------------------------------------------------------
         # logger.app_logger.info("Data transformation pipelines created successfully.")
         #----------------------------------------------------------------
@@ -1,17 +1,17 @@
 from dataclasses import dataclass
 from pathlib import Path
-import networksecurity.components.constants as constants
+from networksecurity.entity.config_app import lazy_constant
 
 @dataclass
 class DataIngestionArtifact:
     """Configuration object to store artifact paths."""
-    train_file_path: Path = constants.DATA_INGESTION_INGESTED_DIR
-    train_file_name_and_path: Path = constants.TRAIN_FILE_NAME_AND_PATH
-    test_file_path: Path = constants.DATA_INGESTION_INGESTED_DIR
-    test_file_name_and_path: Path = constants.TEST_FILE_NAME_AND_PATH
-    raw_data_file_path: Path = constants.DATA_INGESTION_FEATURE_STORE_DIR
-    raw_data_file_name_and_path: Path = constants.FEATURE_FILE_NAME_AND_PATH
-    x_file_path: Path = constants.DATA_INGESTION_FEATURE_STORE_DIR
-    x_file_name_and_path: Path = constants.X_FILE_AND_PATH
-    y_file_path: Path = constants.DATA_INGESTION_FEATURE_STORE_DIR
-    y_file_name_and_path: Path = constants.Y_FILE_AND_PATH
\ No newline at end of file
+    train_file_path: Path = lazy_constant("DATA_INGESTION_INGESTED_DIR")
+    train_file_name_and_path: Path = lazy_constant("TRAIN_FILE_NAME_AND_PATH")
+    test_file_path: Path = lazy_constant("DATA_INGESTION_INGESTED_DIR")
+    test_file_name_and_path: Path = lazy_constant("TEST_FILE_NAME_AND_PATH")
+    raw_data_file_path: Path = lazy_constant("DATA_INGESTION_FEATURE_STORE_DIR")
+    raw_data_file_name_and_path: Path = lazy_constant("FEATURE_FILE_NAME_AND_PATH")
+    x_file_path: Path = lazy_constant("DATA_INGESTION_FEATURE_STORE_DIR")
+    x_file_name_and_path: Path = lazy_constant("X_FILE_AND_PATH")
+    y_file_path: Path = lazy_constant("DATA_INGESTION_FEATURE_STORE_DIR")
+    y_file_name_and_path: Path = lazy_constant("Y_FILE_AND_PATH")
\ No newline at end of file
@@ -1,109 +1,435 @@
 from pathlib import Path
 from datetime import datetime
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
+from typing import Optional
 import networksecurity.components.constants as constants
+from networksecurity.components.logger import ns_logger
+
+#----------------------------------------------------------
+def lazy_constant(name: str):
+    """
+    Dataclass field whose default is read from `constants` when an instance is
+    created, not when the class is defined, so importing this module does not
+    resolve the environment.
+    """
+    return field(default_factory=lambda: getattr(constants, name))
+
+#----------------------------------------------------------
+def _apply_artifact_format(config) -> None:
+    """Rewrites the suffix of every *_file / *_file_name(_and_path) field to match `artifact_format`."""
+    if config.artifact_format not in constants.ARTIFACT_FORMAT_SUFFIXES:
+        raise ValueError(
+            f"Unknown artifact format '{config.artifact_format}'; "
+            f"expected one of {list(constants.ARTIFACT_FORMAT_SUFFIXES)}")
+    suffix = constants.ARTIFACT_FORMAT_SUFFIXES[config.artifact_format]
+    for f in fields(config):
+        if not f.name.endswith(("_file", "_file_name", "_file_and_path", "_file_name_and_path")):
+            continue
+        value = getattr(config, f.name)
+        if isinstance(value, (str, Path)) and Path(value).suffix == ".csv":
+            renamed = Path(value).with_suffix(suffix)
+            setattr(config, f.name, renamed if isinstance(value, Path) else str(renamed))
 
 #----------------------------------------------------------
 @dataclass
 class MongoDBAtlasConfig:
 #----------------------------------------------------------
     """Configuration object to store ingestion metadata."""
-    mongo_db_uri: str = constants.MONGO_DB_URI
-    mongo_db_name: str = constants.MONGO_DB
-    mongo_db_collection_name: str = constants.MONGO_DB_COLLECTION
-    file_path: str = constants.NETWORK_DATA_FILE_AND_PATH
+    mongo_db_uri: str = lazy_constant("MONGO_DB_URI")
+    mongo_db_name: str = lazy_constant("MONGO_DB")
+    mongo_db_collection_name: str = lazy_constant("MONGO_DB_COLLECTION")
+    file_path: str = lazy_constant("NETWORK_DATA_FILE_AND_PATH")
+    push_chunk_size: int = lazy_constant("PUSH_CHUNK_SIZE")
+    push_batch_size: int = lazy_constant("PUSH_BATCH_SIZE")
+    push_max_workers: int = lazy_constant("PUSH_MAX_WORKERS")
+    push_max_in_flight: int = lazy_constant("PUSH_MAX_IN_FLIGHT")
+    push_manifest_file_and_path: Path = lazy_constant("PUSH_MANIFEST_FILE_NAME_AND_PATH")
+    mongo_storage_mode: str = lazy_constant("MONGO_STORAGE_MODE")
+    row_fingerprint_field: str = constants.ROW_FINGERPRINT_FIELD
+    push_generation_field: str = constants.PUSH_GENERATION_FIELD
+    push_sequence_field: str = constants.PUSH_SEQUENCE_FIELD
+    #----------------------------------------------------------
+    # Client pool settings (see components/mongo_client.py); None = pymongo default
+    mongo_max_pool_size: int = lazy_constant("MONGO_MAX_POOL_SIZE")
+    mongo_min_pool_size: int = lazy_constant("MONGO_MIN_POOL_SIZE")
+    mongo_max_idle_time_ms: Optional[int] = lazy_constant("MONGO_MAX_IDLE_TIME_MS")
+    mongo_server_selection_timeout_ms: int = lazy_constant("MONGO_SERVER_SELECTION_TIMEOUT_MS")
+    mongo_connect_timeout_ms: int = lazy_constant("MONGO_CONNECT_TIMEOUT_MS")
+    mongo_socket_timeout_ms: Optional[int] = lazy_constant("MONGO_SOCKET_TIMEOUT_MS")
+    mongo_compressors: str = lazy_constant("MONGO_COMPRESSORS")
+    mongo_read_preference: str = lazy_constant("MONGO_READ_PREFERENCE")
 
     def __post_init__(self):
         """2026 Standard: Use post_init for logging/initialization logic."""
-        print(f"MongoDBAtlasConfig initialized for DB: {self.mongo_db_name}")
+        ns_logger.log_debug("MongoDBAtlasConfig initialized for DB: %s", self.mongo_db_name)
 
 #----------------------------------------------------------
 @dataclass
 class DataIngestionConfig:
 #----------------------------------------------------------
     """Configuration object for data ingestion."""
-    feature_store_dir: Path = constants.DATA_INGESTION_FEATURE_STORE_DIR
-    feature_file_name_and_path: Path = constants.FEATURE_FILE_NAME_AND_PATH
-    ingested_dir: Path = constants.DATA_INGESTION_INGESTED_DIR
-    target_column: str = constants.TARGET_COLUMN
+    feature_store_dir: Path = lazy_constant("DATA_INGESTION_FEATURE_STORE_DIR")
+    feature_file_name_and_path: Path = lazy_constant("FEATURE_FILE_NAME_AND_PATH")
+    ingested_dir: Path = lazy_constant("DATA_INGESTION_INGESTED_DIR")
+    target_column: str = lazy_constant("TARGET_COLUMN")
+    mongo_read_batch_size: int = lazy_constant("MONGO_READ_BATCH_SIZE")
+    mongo_read_partitions: int = lazy_constant("MONGO_READ_PARTITIONS")
+    mongo_read_workers: int = lazy_constant("MONGO_READ_WORKERS")
+    mongo_read_partition_retries: int = lazy_constant("MONGO_READ_PARTITION_RETRIES")
+    mongo_storage_mode: str = lazy_constant("MONGO_STORAGE_MODE")
     
-    train_file_path: Path = constants.DATA_INGESTION_INGESTED_DIR
+    train_file_path: Path = lazy_constant("DATA_INGESTION_INGESTED_DIR")
     train_file_name: Path = constants.TRAIN_FILE_NAME
-    test_file_path: Path = constants.DATA_INGESTION_INGESTED_DIR
-    train_file_name_and_path: Path = constants.TRAIN_FILE_NAME_AND_PATH
+    test_file_path: Path = lazy_constant("DATA_INGESTION_INGESTED_DIR")
+    train_file_name_and_path: Path = lazy_constant("TRAIN_FILE_NAME_AND_PATH")
     test_file_name: Path = constants.TEST_FILE_NAME
-    test_file_name_and_path: Path = constants.TEST_FILE_NAME_AND_PATH
+    test_file_name_and_path: Path = lazy_constant("TEST_FILE_NAME_AND_PATH")
     
-    raw_data_file_path: Path = constants.DATA_INGESTION_FEATURE_STORE_DIR
-    raw_data_file_name_and_path: Path = constants.FEATURE_FILE_NAME_AND_PATH
+    raw_data_file_path: Path = lazy_constant("DATA_INGESTION_FEATURE_STORE_DIR")
+    raw_data_file_name_and_path: Path = lazy_constant("FEATURE_FILE_NAME_AND_PATH")
     
-    x_file_path: Path = constants.DATA_INGESTION_FEATURE_STORE_DIR
+    x_file_path: Path = lazy_constant("DATA_INGESTION_FEATURE_STORE_DIR")
     x_file_name: Path = constants.X_FILE
-    x_file_name_and_path: Path = constants.X_FILE_AND_PATH
-    y_file_path: Path = constants.DATA_INGESTION_FEATURE_STORE_DIR
+    x_file_name_and_path: Path = lazy_constant("X_FILE_AND_PATH")
+    y_file_path: Path = lazy_constant("DATA_INGESTION_FEATURE_STORE_DIR")
     y_file_name: Path = constants.Y_FILE
-    y_file_name_and_path: Path = constants.Y_FILE_AND_PATH
+    y_file_name_and_path: Path = lazy_constant("Y_FILE_AND_PATH")
     
     x_train_file: str = constants.X_TRAIN_FILE
-    x_train_file_and_path: Path = constants.X_TRAIN_FILE_AND_PATH
+    x_train_file_and_path: Path = lazy_constant("X_TRAIN_FILE_AND_PATH")
     y_train_file: str = constants.Y_TRAIN_FILE
-    y_train_file_and_path: Path = constants.Y_TRAIN_FILE_AND_PATH
+    y_train_file_and_path: Path = lazy_constant("Y_TRAIN_FILE_AND_PATH")
     
     x_val_file: str = constants.X_VAL_FILE
-    x_val_file_and_path: Path = constants.X_VAL_FILE_AND_PATH
+    x_val_file_and_path: Path = lazy_constant("X_VAL_FILE_AND_PATH")
     y_val_file: str = constants.Y_VAL_FILE
-    y_val_file_and_path: Path = constants.Y_VAL_FILE_AND_PATH
+    y_val_file_and_path: Path = lazy_constant("Y_VAL_FILE_AND_PATH")
     
     x_test_file: str = constants.X_TEST_FILE
-    x_test_file_and_path: Path = constants.X_TEST_FILE_AND_PATH
+    x_test_file_and_path: Path = lazy_constant("X_TEST_FILE_AND_PATH")
     y_test_file: str = constants.Y_TEST_FILE
-    y_test_file_and_path: Path = constants.Y_TEST_FILE_AND_PATH
+    y_test_file_and_path: Path = lazy_constant("Y_TEST_FILE_AND_PATH")
     
     x_train_transformed_file: str = constants.X_TRAIN_TRANSFORMED_FILE
-    x_train_transformed_file_and_path: Path = constants.X_TRAIN_TRANSFORMED_FILE_AND_PATH
+    x_train_transformed_file_and_path: Path = lazy_constant("X_TRAIN_TRANSFORMED_FILE_AND_PATH")
     x_val_transformed_file: str = constants.X_VAL_TRANSFORMED_FILE
-    x_val_transformed_file_and_path: Path = constants.X_VAL_TRANSFORMED_FILE_AND_PATH
+    x_val_transformed_file_and_path: Path = lazy_constant("X_VAL_TRANSFORMED_FILE_AND_PATH")
     x_test_transformed_file: str = constants.X_TEST_TRANSFORMED_FILE
-    x_test_transformed_file_and_path: Path = constants.X_TEST_TRANSFORMED_FILE_AND_PATH
+    x_test_transformed_file_and_path: Path = lazy_constant("X_TEST_TRANSFORMED_FILE_AND_PATH")
     
-    train_test_split_ratio: float = constants.DATA_INGESTION_TRAIN_TEST_SPLIT_RATION
-    test_size: float = constants.TEST_SIZE
-    test_size_val: float = constants.TEST_SIZE_VAL
-    random_state: int = constants.RANDOM_STATE
+    train_test_split_ratio: float = lazy_constant("DATA_INGESTION_TRAIN_TEST_SPLIT_RATION")
+    test_size: float = lazy_constant("TEST_SIZE")
+    test_size_val: float = lazy_constant("TEST_SIZE_VAL")
+    random_state: int = lazy_constant("RANDOM_STATE")
+    split_method: str = lazy_constant("SPLIT_METHOD")
+    artifact_format: str = lazy_constant("ARTIFACT_FORMAT")
+    split_storage: str = lazy_constant("SPLIT_STORAGE")
+    split_index_file_and_path: Path = lazy_constant("SPLIT_INDEX_FILE_AND_PATH")
+    use_stage_cache: bool = lazy_constant("USE_STAGE_CACHE")
+    stage_cache_file_and_path: Path = lazy_constant("DATA_INGESTION_STAGE_CACHE_FILE_AND_PATH")
+    collapse_duplicates: bool = lazy_constant("COLLAPSE_DUPLICATES")
+    row_count_column: str = constants.ROW_COUNT_COLUMN
+
+    def __post_init__(self):
+        _apply_artifact_format(self)
 #----------------------------------------------------------
 @dataclass
 class DataIngestionArtifact:
 #----------------------------------------------------------
     """Configuration object to store artifact paths."""
-    train_file_path: Path = constants.DATA_INGESTION_INGESTED_DIR
-    train_file_name_and_path: Path = constants.TRAIN_FILE_NAME_AND_PATH
-    test_file_path: Path = constants.DATA_INGESTION_INGESTED_DIR
-    test_file_name_and_path: Path = constants.TEST_FILE_NAME_AND_PATH
-    raw_data_file_path: Path = constants.DATA_INGESTION_FEATURE_STORE_DIR
-    raw_data_file_name_and_path: Path = constants.FEATURE_FILE_NAME_AND_PATH
-    x_file_path: Path = constants.DATA_INGESTION_FEATURE_STORE_DIR
-    x_file_name_and_path: Path = constants.X_FILE_AND_PATH
-    y_file_path: Path = constants.DATA_INGESTION_FEATURE_STORE_DIR
-    y_file_name_and_path: Path = constants.Y_FILE_AND_PATH
+    train_file_path: Path = lazy_constant("DATA_INGESTION_INGESTED_DIR")
+    train_file_name_and_path: Path = lazy_constant("TRAIN_FILE_NAME_AND_PATH")
+    test_file_path: Path = lazy_constant("DATA_INGESTION_INGESTED_DIR")
+    test_file_name_and_path: Path = lazy_constant("TEST_FILE_NAME_AND_PATH")
+    raw_data_file_path: Path = lazy_constant("DATA_INGESTION_FEATURE_STORE_DIR")
+    raw_data_file_name_and_path: Path = lazy_constant("FEATURE_FILE_NAME_AND_PATH")
+    x_file_path: Path = lazy_constant("DATA_INGESTION_FEATURE_STORE_DIR")
+    x_file_name_and_path: Path = lazy_constant("X_FILE_AND_PATH")
+    y_file_path: Path = lazy_constant("DATA_INGESTION_FEATURE_STORE_DIR")
+    y_file_name_and_path: Path = lazy_constant("Y_FILE_AND_PATH")
+    artifact_format: str = lazy_constant("ARTIFACT_FORMAT")
+    split_storage: str = lazy_constant("SPLIT_STORAGE")
+    split_index_file_and_path: Path = lazy_constant("SPLIT_INDEX_FILE_AND_PATH")
+    write_stats: dict = field(default_factory=dict)
+    collapse_stats: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        _apply_artifact_format(self)
+#----------------------------------------------------------
+@dataclass
+class ArtifactWriteStats:
+#----------------------------------------------------------
+    """Size and timing of one artifact written by the ArtifactWriter."""
+    name: str
+    path: str
+    bytes: int = 0
+    seconds: float = 0.0
+#----------------------------------------------------------
+@dataclass
+class PushBatchResult:
+#----------------------------------------------------------
+    """Outcome of a single insert batch sent by the streaming push."""
+    batch_index: int
+    first_row: int
+    rows: int
+    inserted: int = 0
+    matched: int = 0
+    end_offset: int = 0
+    seconds: float = 0.0
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+#----------------------------------------------------------
+@dataclass
+class PushManifest:
+#----------------------------------------------------------
+    """
+    Progress of the incremental push for one source file.
+    `committed_offset` is the byte offset just past the last acknowledged batch;
+    `committed_prefix_checksum` is the SHA-256 of the file up to that offset.
+    `generation` numbers the full scans of the file; every row a scan sends is
+    stamped with it, so rows left with an older generation are stale.
+    `last_acked_batch` numbers batches across scans, so it only increases; a
+    row is stamped with the number of the batch that first inserted it.
+    """
+    file_path: str = ""
+    file_size: int = 0
+    file_checksum: str = ""
+    committed_offset: int = 0
+    committed_prefix_checksum: str = ""
+    last_acked_batch: int = -1
+    rows_committed: int = 0
+    completed: bool = False
+    generation: int = 0
+    updated_at: str = ""
+#----------------------------------------------------------
+@dataclass
+class StageResult:
+#----------------------------------------------------------
+    """
+    Outcome of one pipeline stage: ran, skipped (up to date), failed or blocked.
+    A failed stage keeps the exception it raised, so the runner can re-raise it.
+    """
+    name: str
+    status: str
+    seconds: float = 0.0
+    error: str = ""
+    output: object = None
+    exception: Optional[BaseException] = None
+#----------------------------------------------------------
+@dataclass
+class StageMetrics:
+#----------------------------------------------------------
+    """Resource usage of one instrumented call, as written to the run report."""
+    name: str
+    parent: str = ""
+    thread: str = ""
+    started_at: str = ""
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_delta_bytes: int = 0
+    traced_bytes_delta: int = 0
+    rows: int = 0
+    bytes: int = 0
+    rows_per_second: float = 0.0
+    error: str = ""
 #----------------------------------------------------------
 @dataclass
 class TrainingPipelineConfig:
 #----------------------------------------------------------
     """Configuration object for the training pipeline."""
-    artifact_dir: Path = constants.ARTIFACT_DIR
+    artifact_dir: Path = lazy_constant("ARTIFACT_DIR")
     pipeline_name: str = constants.PIPELINE_NAME
-    timestamp: str = datetime.now().strftime("%Y%m%d%H%M%S")
+    timestamp: str = field(default_factory=lambda: datetime.now().strftime("%Y%m%d%H%M%S"))
+    max_workers: int = lazy_constant("PIPELINE_MAX_WORKERS")
+    run_report_dir: Path = lazy_constant("RUN_REPORT_DIR")
+    profile_mode: str = lazy_constant("RUN_PROFILE_MODE")
 
 #----------------------------------------------------------
 @dataclass
 class DataValidationConfig:
 #----------------------------------------------------------
     """Configuration object for data validation."""
-    data_validation_dir: Path = constants.DATA_VALIDATION_DIR
-    data_validation_valid_dir: Path = constants.DATA_VALIDATION_VALID_DIR
-    data_validation_invalid_dir: Path = constants.DATA_VALIDATION_INVALID_DIR
-    data_validation_drift_report_dir: Path = constants.DATA_VALIDATION_DRIFT_REPORT_DIR
+    data_validation_dir: Path = lazy_constant("DATA_VALIDATION_DIR")
+    data_validation_valid_dir: Path = lazy_constant("DATA_VALIDATION_VALID_DIR")
+    data_validation_invalid_dir: Path = lazy_constant("DATA_VALIDATION_INVALID_DIR")
+    data_validation_drift_report_dir: Path = lazy_constant("DATA_VALIDATION_DRIFT_REPORT_DIR")
     data_validation_drift_report_file_name: str = constants.DATA_VALIDATION_DRIFT_REPORT_FILE_NAME
+    valid_file_name_and_path: Path = lazy_constant("DATA_VALIDATION_VALID_FILE_AND_PATH")
+    invalid_file_name_and_path: Path = lazy_constant("DATA_VALIDATION_INVALID_FILE_AND_PATH")
+    valid_rows_file_and_path: Path = lazy_constant("DATA_VALIDATION_VALID_ROWS_FILE_AND_PATH")
+    report_file_name_and_path: Path = lazy_constant("DATA_VALIDATION_REPORT_FILE_AND_PATH")
+    chunk_size: int = lazy_constant("DATA_VALIDATION_CHUNK_SIZE")
+    max_invalid_fraction: float = lazy_constant("DATA_VALIDATION_MAX_INVALID_FRACTION")
+    min_class_share: float = lazy_constant("DATA_VALIDATION_MIN_CLASS_SHARE")
+    quarantine_null_features: bool = lazy_constant("DATA_VALIDATION_QUARANTINE_NULLS")
+    fail_on_error: bool = lazy_constant("DATA_VALIDATION_FAIL_ON_ERROR")
+    artifact_format: str = lazy_constant("ARTIFACT_FORMAT")
+    row_count_column: str = constants.ROW_COUNT_COLUMN
+
+    def __post_init__(self):
+        # The validated file is streamed chunk by chunk; .npy cannot be appended, so it stays CSV
+        if self.artifact_format != "npy":
+            valid = Path(self.valid_file_name_and_path)
+            self.valid_file_name_and_path = valid.with_suffix(
+                constants.ARTIFACT_FORMAT_SUFFIXES[self.artifact_format])
+
+#----------------------------------------------------------
+@dataclass
+class DriftConfig:
+#----------------------------------------------------------
+    """State file and thresholds for the incremental drift statistics."""
+    state_file_and_path: Path = lazy_constant("DRIFT_STATE_FILE_AND_PATH")
+    report_file_and_path: Path = lazy_constant("DATA_VALIDATION_REPORT_FILE_AND_PATH")
+    psi_threshold: float = lazy_constant("DRIFT_PSI_THRESHOLD")
+    jsd_threshold: float = lazy_constant("DRIFT_JSD_THRESHOLD")
+    chi2_alpha: float = lazy_constant("DRIFT_CHI2_ALPHA")
+    min_rows: int = lazy_constant("DRIFT_MIN_ROWS")
+    max_drifted_features: int = lazy_constant("DRIFT_MAX_DRIFTED_FEATURES")
+    fail_on_drift: bool = lazy_constant("DRIFT_FAIL_ON_DRIFT")
+    read_batch_size: int = lazy_constant("MONGO_READ_BATCH_SIZE")
+    mongo_storage_mode: str = lazy_constant("MONGO_STORAGE_MODE")
+    push_manifest_file_and_path: Path = lazy_constant("PUSH_MANIFEST_FILE_NAME_AND_PATH")
+    push_sequence_field: str = constants.PUSH_SEQUENCE_FIELD
+#----------------------------------------------------------
+@dataclass
+class DriftArtifact:
+#----------------------------------------------------------
+    """Outcome of one drift update: rows added, features over threshold and status."""
+    report_file_path: Path = lazy_constant("DATA_VALIDATION_REPORT_FILE_AND_PATH")
+    state_file_path: Path = lazy_constant("DRIFT_STATE_FILE_AND_PATH")
+    status: str = ""
+    new_rows: int = 0
+    reference_rows: int = 0
+    pending_rows: int = 0
+    drifted_features: list = field(default_factory=list)
+#----------------------------------------------------------
+@dataclass
+class DataValidationArtifact:
+#----------------------------------------------------------
+    """Outcome of a validation run: output paths, row counts and overall status."""
+    valid_file_path: Path = lazy_constant("DATA_VALIDATION_VALID_FILE_AND_PATH")
+    invalid_file_path: Path = lazy_constant("DATA_VALIDATION_INVALID_FILE_AND_PATH")
+    valid_rows_file_path: Path = lazy_constant("DATA_VALIDATION_VALID_ROWS_FILE_AND_PATH")
+    report_file_path: Path = lazy_constant("DATA_VALIDATION_REPORT_FILE_AND_PATH")
+    status: str = ""
+    rows: int = 0
+    valid_rows: int = 0
+    invalid_rows: int = 0
+
+#----------------------------------------------------------
+@dataclass
+class DataTransformationConfig:
+#----------------------------------------------------------
+    """Configuration object for fitting the preprocessor and writing transformed splits."""
+    data_transformation_dir: Path = lazy_constant("DATA_TRANSFORMATION_DIR")
+    preprocessor_file_and_path: Path = lazy_constant("PREPROCESSOR_FILE_AND_PATH")
+    x_train_transformed_file_and_path: Path = lazy_constant("X_TRAIN_TRANSFORMED_FILE_AND_PATH")
+    x_val_transformed_file_and_path: Path = lazy_constant("X_VAL_TRANSFORMED_FILE_AND_PATH")
+    x_test_transformed_file_and_path: Path = lazy_constant("X_TEST_TRANSFORMED_FILE_AND_PATH")
+    use_preprocessor_cache: bool = lazy_constant("PREPROCESSOR_CACHE")
+    fast_path: bool = lazy_constant("PREPROCESSOR_FAST_PATH")
+    artifact_format: str = lazy_constant("ARTIFACT_FORMAT")
+
+    def __post_init__(self):
+        _apply_artifact_format(self)
+#----------------------------------------------------------
+@dataclass
+class DataTransformationArtifact:
+#----------------------------------------------------------
+    """Fitted preprocessor, transformed split files and whether the cached fit was reused."""
+    preprocessor_file_path: Path = lazy_constant("PREPROCESSOR_FILE_AND_PATH")
+    transformed_file_paths: dict = field(default_factory=dict)
+    preprocessor_kind: str = ""
+    cache_hit: bool = False
+    fingerprint: str = ""
+    rows: int = 0
+
+#----------------------------------------------------------
+@dataclass
+class ModelTrainerConfig:
+#----------------------------------------------------------
+    """Hyperparameter search settings and output paths for model training."""
+    model_trainer_dir: Path = lazy_constant("MODEL_TRAINER_DIR")
+    model_file_and_path: Path = lazy_constant("MODEL_FILE_AND_PATH")
+    report_file_and_path: Path = lazy_constant("MODEL_REPORT_FILE_AND_PATH")
+    search_work_dir: Path = lazy_constant("MODEL_SEARCH_WORK_DIR")
+    families: str = lazy_constant("MODEL_SEARCH_FAMILIES")
+    candidates: int = lazy_constant("MODEL_SEARCH_CANDIDATES")
+    max_workers: int = lazy_constant("MODEL_SEARCH_WORKERS")
+    time_budget_seconds: float = lazy_constant("MODEL_SEARCH_TIME_BUDGET_SECONDS")
+    halving_factor: int = lazy_constant("MODEL_SEARCH_HALVING_FACTOR")
+    min_rows: int = lazy_constant("MODEL_SEARCH_MIN_ROWS")
+    validation_fraction: float = lazy_constant("MODEL_SEARCH_VALIDATION_FRACTION")
+    scoring: str = lazy_constant("MODEL_SEARCH_SCORING")
+    start_method: str = lazy_constant("MODEL_SEARCH_START_METHOD")
+    random_state: int = lazy_constant("RANDOM_STATE")
+#----------------------------------------------------------
+@dataclass
+class ModelTrainerArtifact:
+#----------------------------------------------------------
+    """Best model found by the search, its scores and where it and the timing report were written."""
+    model_file_path: Path = lazy_constant("MODEL_FILE_AND_PATH")
+    report_file_path: Path = lazy_constant("MODEL_REPORT_FILE_AND_PATH")
+    family: str = ""
+    params: dict = field(default_factory=dict)
+    validation_score: float = 0.0
+    test_scores: dict = field(default_factory=dict)
+    candidates_evaluated: int = 0
+    timed_out: bool = False
+    search_seconds: float = 0.0
+
+#----------------------------------------------------------
+@dataclass
+class BatchScoringConfig:
+#----------------------------------------------------------
+    """Saved model / preprocessor to score with, and the chunking and memory limits for batch scoring."""
+    model_file_and_path: Path = lazy_constant("MODEL_FILE_AND_PATH")
+    preprocessor_file_and_path: Path = lazy_constant("PREPROCESSOR_FILE_AND_PATH")
+    chunk_size: int = lazy_constant("SCORING_CHUNK_SIZE")
+    max_workers: int = lazy_constant("SCORING_WORKERS")
+    memory_budget_mb: int = lazy_constant("SCORING_MEMORY_BUDGET_MB")
+    start_method: str = lazy_constant("MODEL_SEARCH_START_METHOD")
+    id_columns: list = field(default_factory=list)
+#----------------------------------------------------------
+@dataclass
+class BatchScoringArtifact:
+#----------------------------------------------------------
+    """Outcome of one batch scoring run: output path, row counts and throughput."""
+    input_file_path: Path = None
+    output_file_path: Path = None
+    rows: int = 0
+    invalid_rows: int = 0
+    chunks: int = 0
+    chunk_size: int = 0
+    workers: int = 1
+    seconds: float = 0.0
+    rows_per_second: float = 0.0
+#----------------------------------------------------------
+@dataclass
+class OnlineScoringConfig:
+#----------------------------------------------------------
+    """Saved model / preprocessor to serve, the listen address, and the micro-batching and queue limits."""
+    model_file_and_path: Path = lazy_constant("MODEL_FILE_AND_PATH")
+    preprocessor_file_and_path: Path = lazy_constant("PREPROCESSOR_FILE_AND_PATH")
+    host: str = lazy_constant("SERVING_HOST")
+    port: int = lazy_constant("SERVING_PORT")
+    max_batch_size: int = lazy_constant("SERVING_MAX_BATCH_SIZE")
+    max_wait_ms: float = lazy_constant("SERVING_MAX_WAIT_MS")
+    queue_size: int = lazy_constant("SERVING_QUEUE_SIZE")
+    max_body_bytes: int = lazy_constant("SERVING_MAX_BODY_BYTES")
+#----------------------------------------------------------
+@dataclass
+class UrlFeatureConfig:
+#----------------------------------------------------------
+    """Batching, pool size, host memo size and optional static lookup file for URL feature extraction."""
+    batch_size: int = lazy_constant("URL_FEATURE_BATCH_SIZE")
+    max_workers: int = lazy_constant("URL_FEATURE_WORKERS")
+    host_cache_size: int = lazy_constant("URL_FEATURE_HOST_CACHE_SIZE")
+    lookup_file_path: str = lazy_constant("URL_FEATURE_LOOKUP_FILE")
+    start_method: str = lazy_constant("MODEL_SEARCH_START_METHOD")
 
 #----------------------------------------------------------
 @dataclass(frozen=True)
@@ -118,6 +444,9 @@ class MasterPipelineConfig:
     ingestion_artifact: DataIngestionArtifact = field(default_factory=DataIngestionArtifact)
     training_pipeline: TrainingPipelineConfig = field(default_factory=TrainingPipelineConfig)
     validation: DataValidationConfig = field(default_factory=DataValidationConfig)
+    drift: DriftConfig = field(default_factory=DriftConfig)
+    transformation: DataTransformationConfig = field(default_factory=DataTransformationConfig)
+    trainer: ModelTrainerConfig = field(default_factory=ModelTrainerConfig)
     
 #----------------------------------------------------------
 # Example usage (for testing purposes)
@@ -0,0 +1,18 @@
+from enum import IntFlag
+
+#----------------------------------------------------------
+class ValidationReason(IntFlag):
+#----------------------------------------------------------
+    """
+    Per-row reason codes written to the `reason_code` column of quarantined rows.
+    Codes are OR-ed together, so one integer records every check a row failed.
+    """
+    INVALID_FEATURE = 1     # a feature value outside the schema's allowed values
+    NULL_FEATURE = 2        # a nullable feature is missing (quarantined only if configured)
+    NULL_REQUIRED = 4       # a non-nullable column (e.g. the target) is missing
+    INVALID_TARGET = 8      # the target value is outside the schema's allowed values
+
+    @classmethod
+    def describe(cls, code: int) -> str:
+        """'INVALID_FEATURE|NULL_REQUIRED' style name for a combined code."""
+        return "|".join(reason.name for reason in cls if code & reason) or "OK"
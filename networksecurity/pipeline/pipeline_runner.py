@@ -0,0 +1,260 @@
+"""
+Pipeline Runner Module
+Runs the pipeline as a dependency graph of stages. Each stage declares the
+artifacts it reads and writes; a stage depends on every stage that produces one
+of its inputs (plus any explicit `depends_on`). Independent stages run at the
+same time on a worker pool, and a stage whose outputs are all newer than its
+inputs is skipped unless it is forced.
+"""
+import sys
+import time
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+#----------------------------------------------------------
+from networksecurity.components import utils
+from networksecurity.components.logger import ns_logger
+from networksecurity.components.exception import CustomException
+from networksecurity.components.instrumentation import ns_metrics
+from networksecurity.entity.config_app import MasterPipelineConfig, StageResult
+#----------------------------------------------------------
+@dataclass
+class Stage:
+#----------------------------------------------------------
+    """A unit of work with declared input and output artifacts."""
+    name: str
+    run: Callable[[], object]
+    inputs: List[Path] = field(default_factory=list)
+    outputs: List[Path] = field(default_factory=list)
+    depends_on: List[str] = field(default_factory=list)
+#----------------------------------------------------------
+class PipelineRunner:
+    def __init__(self, stages: List[Stage], max_workers: int = 4):
+        self.stages: Dict[str, Stage] = {}
+        self.max_workers = max_workers
+        for stage in stages:
+            self.register(stage)
+    #----------------------------------------------------------
+    def register(self, stage: Stage) -> None:
+        if stage.name in self.stages:
+            raise ValueError(f"Stage '{stage.name}' is already registered.")
+        self.stages[stage.name] = stage
+    #----------------------------------------------------------
+    @classmethod
+    def from_config(cls, master_config: MasterPipelineConfig, force: bool = False) -> "PipelineRunner":
+        """
+        Builds the standard stage graph from the master configuration.
+        `force` is passed to stages with their own caches (e.g. ingestion).
+        """
+        # Imported here so building the graph does not pull in every component
+        from networksecurity.components.push_data import NetworkDataExtractor
+        from networksecurity.components.data_ingestion import DataIngestion
+        from networksecurity.components.data_validation import DataValidation
+        from networksecurity.components.drift import DriftMonitor
+        from networksecurity.components.data_transformation import DataTransformation
+        from networksecurity.components.model_trainer import ModelTrainer
+        from networksecurity.components.mongo_client import get_mongo_client
+        mongodb = master_config.mongodb
+        ingestion = master_config.ingestion
+        validation = master_config.validation
+        drift = master_config.drift
+        transformation = master_config.transformation
+        trainer = master_config.trainer
+        #----------------------------------------------------------
+        def push():
+            extractor = NetworkDataExtractor(config=mongodb)
+            return extractor.push_data_incremental(mongodb.file_path)
+        def ingest():
+            data_ingestion = DataIngestion(
+                mongodb_config=mongodb,
+                ingestion_config=ingestion,
+                train_config=master_config.training_pipeline,
+                ingestion_artifact_config=master_config.ingestion_artifact
+            )
+            return data_ingestion.initiate_data_ingestion(force=force)
+        def validate():
+            data_validation = DataValidation(validation_config=validation)
+            return data_validation.initiate_data_validation(ingestion.feature_file_name_and_path)
+        def drift_check():
+            collection = get_mongo_client(mongodb)[mongodb.mongo_db_name][mongodb.mongo_db_collection_name]
+            return DriftMonitor(drift_config=drift).initiate_drift_check(collection)
+        def transform():
+            data_transformation = DataTransformation(
+                transformation_config=transformation, ingestion_config=ingestion, validation_config=validation)
+            return data_transformation.initiate_data_transformation()
+        def train():
+            model_trainer = ModelTrainer(
+                trainer_config=trainer, ingestion_config=ingestion, transformation_config=transformation,
+                validation_config=validation)
+            return model_trainer.initiate_model_trainer()
+        #----------------------------------------------------------
+        # The split index is written in both storage modes; it maps split rows to the valid-row mask
+        ingest_outputs = [ingestion.feature_file_name_and_path, ingestion.split_index_file_and_path]
+        if not utils.uses_split_index(ingestion):
+            ingest_outputs += [ingestion.train_file_name_and_path, ingestion.test_file_name_and_path]
+        valid_rows = Path(validation.valid_rows_file_and_path)
+        stages = [
+            Stage("push", push,
+                  inputs=[Path(mongodb.file_path)],
+                  outputs=[Path(mongodb.push_manifest_file_and_path)]),
+            Stage("ingest", ingest,
+                  inputs=[Path(mongodb.push_manifest_file_and_path)],
+                  outputs=[Path(path) for path in ingest_outputs]),
+            Stage("validate", validate,
+                  inputs=[Path(ingestion.feature_file_name_and_path)],
+                  outputs=[Path(validation.valid_file_name_and_path),
+                           Path(validation.invalid_file_name_and_path),
+                           valid_rows,
+                           Path(validation.report_file_name_and_path)]),
+            # Reads only documents pushed since the last run; after validate, as both write the report
+            Stage("drift", drift_check,
+                  inputs=[Path(mongodb.push_manifest_file_and_path)],
+                  outputs=[Path(drift.state_file_and_path)],
+                  depends_on=["validate"]),
+            # Transform and train read the splits through the valid-row mask, so they
+            # depend on validate; both are blocked when validation or the drift check fails
+            Stage("transform", transform,
+                  inputs=[Path(path) for path in ingest_outputs] + [valid_rows],
+                  outputs=[Path(transformation.preprocessor_file_and_path),
+                           Path(transformation.x_train_transformed_file_and_path),
+                           Path(transformation.x_test_transformed_file_and_path)],
+                  depends_on=["drift"]),
+            Stage("train", train,
+                  inputs=[Path(transformation.preprocessor_file_and_path),
+                          Path(transformation.x_train_transformed_file_and_path),
+                          Path(transformation.x_test_transformed_file_and_path),
+                          valid_rows],
+                  outputs=[Path(trainer.model_file_and_path), Path(trainer.report_file_and_path)],
+                  depends_on=["drift"]),
+        ]
+        return cls(stages, max_workers=master_config.training_pipeline.max_workers)
+    #----------------------------------------------------------
+    def dependencies(self) -> Dict[str, Set[str]]:
+        """Upstream stage names for each stage, from shared artifacts and depends_on."""
+        producers = {}
+        for stage in self.stages.values():
+            for output in stage.outputs:
+                producers[Path(output)] = stage.name
+        graph = {}
+        for stage in self.stages.values():
+            upstream = {producers[Path(path)] for path in stage.inputs if Path(path) in producers}
+            upstream.update(stage.depends_on)
+            upstream.discard(stage.name)
+            unknown = upstream - set(self.stages)
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages {sorted(unknown)}")
+            graph[stage.name] = upstream
+        self._check_acyclic(graph)
+        return graph
+    #----------------------------------------------------------
+    @staticmethod
+    def _check_acyclic(graph: Dict[str, Set[str]]) -> None:
+        remaining = {name: set(upstream) for name, upstream in graph.items()}
+        while remaining:
+            ready = [name for name, upstream in remaining.items() if not upstream]
+            if not ready:
+                raise ValueError(f"Pipeline has a dependency cycle among {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for upstream in remaining.values():
+                upstream.difference_update(ready)
+    #----------------------------------------------------------
+    def downstream_of(self, name: str) -> Set[str]:
+        """`name` and every stage that (transitively) depends on it."""
+        graph = self.dependencies()
+        selected = {name}
+        changed = True
+        while changed:
+            changed = False
+            for stage, upstream in graph.items():
+                if stage not in selected and upstream & selected:
+                    selected.add(stage)
+                    changed = True
+        return selected
+    #----------------------------------------------------------
+    @staticmethod
+    def is_up_to_date(stage: Stage) -> bool:
+        """True if every output exists and is newer than every existing input."""
+        if not stage.outputs:
+            return False
+        outputs = [Path(path) for path in stage.outputs]
+        if not all(path.exists() for path in outputs):
+            return False
+        inputs = [Path(path) for path in stage.inputs if Path(path).exists()]
+        if not inputs:
+            return True
+        return min(path.stat().st_mtime for path in outputs) >= max(path.stat().st_mtime for path in inputs)
+    #----------------------------------------------------------
+    def _execute(self, stage: Stage) -> StageResult:
+        start = time.perf_counter()
+        try:
+            with ns_metrics.track(f"stage:{stage.name}"):
+                output = stage.run()
+            return StageResult(stage.name, "ran", time.perf_counter() - start, output=output)
+        except Exception as e:
+            # Components raise CustomException, which has logged the error; anything else is wrapped (and logged) here
+            error = e if isinstance(e, CustomException) else CustomException(e, sys)
+            return StageResult(stage.name, "failed", time.perf_counter() - start, error=str(e), exception=error)
+    #----------------------------------------------------------
+    def run(self, only: Optional[str] = None, from_stage: Optional[str] = None,
+            force: bool = False) -> Dict[str, StageResult]:
+        """
+        Runs the graph. `only` runs a single stage; `from_stage` runs that stage
+        and everything downstream of it. Stages picked by either option, or all
+        stages when `force` is set, run even if their outputs are up to date.
+        If a stage failed, its exception is raised once every runnable stage is done.
+        """
+        try:
+            graph = self.dependencies()
+            for name in (only, from_stage):
+                if name is not None and name not in self.stages:
+                    raise ValueError(f"Unknown stage '{name}'; stages are {sorted(self.stages)}")
+            if only is not None:
+                selected = {only}
+            elif from_stage is not None:
+                selected = self.downstream_of(from_stage)
+            else:
+                selected = set(self.stages)
+            forced = set(selected) if (force or only or from_stage) else set()
+            #----------------------------------------------------------
+            pending = {name: graph[name] & selected for name in selected}
+            results: Dict[str, StageResult] = {}
+            running = {}
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage") as pool:
+                while pending or running:
+                    # Start every stage whose upstream stages have all finished
+                    for name in sorted(name for name, upstream in pending.items() if not upstream):
+                        del pending[name]
+                        stage = self.stages[name]
+                        if any(results[up].status in ("failed", "blocked") for up in graph[name] & selected):
+                            results[name] = StageResult(name, "blocked")
+                        elif name not in forced and self.is_up_to_date(stage):
+                            results[name] = StageResult(name, "skipped")
+                        else:
+                            ns_logger.log_info("Stage '%s' started.", name)
+                            running[pool.submit(self._execute, stage)] = name
+                            continue
+                        ns_logger.log_info("Stage '%s' %s.", name, results[name].status)
+                        for upstream in pending.values():
+                            upstream.discard(name)
+                    if not running:
+                        continue
+                    done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        results[name] = future.result()
+                        if results[name].status == "failed":
+                            ns_logger.log_info("Stage '%s' failed after %.2fs.", name, results[name].seconds)
+                        else:
+                            ns_logger.log_info("Stage '%s' ran in %.2fs.", name, results[name].seconds)
+                        for upstream in pending.values():
+                            upstream.discard(name)
+            #----------------------------------------------------------
+            failed = [result for result in results.values() if result.status == "failed"]
+            if failed:
+                # The stage's own exception, already logged once; re-wrapping below does not log it again
+                raise failed[0].exception
+            return results
+        except Exception as e:
+            raise CustomException(e, sys) from e
@@ -0,0 +1,43 @@
+import sys
+import json
+import argparse
+from dataclasses import asdict
+import networksecurity.components.exception as ns_exception
+from networksecurity.entity.config_app import BatchScoringConfig
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Score CSV / NDJSON feature files with the saved preprocessor and model")
+    parser.add_argument("input", help="Input file (.csv or .ndjson/.jsonl, optionally compressed, e.g. .csv.gz).")
+    parser.add_argument("output", help="Output file (.csv, .ndjson/.jsonl, .parquet or .feather).")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Scoring processes; 1 scores in-process (default: SCORING_WORKERS).")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="Upper bound on rows per chunk (default: SCORING_CHUNK_SIZE).")
+    parser.add_argument("--memory-budget-mb", type=int, default=None,
+                        help="Memory for all chunks in flight; caps the chunk size (default: SCORING_MEMORY_BUDGET_MB).")
+    parser.add_argument("--id-column", action="append", default=[],
+                        help="Input column copied to the output next to each prediction (repeatable).")
+    parser.add_argument("--model", default=None, help="Model file (default: the trained model artifact).")
+    parser.add_argument("--preprocessor", default=None, help="Preprocessor file (default: the transform artifact).")
+    return parser.parse_args(argv)
+
+def main(input_file: str, output_file: str, workers: int = None, chunk_size: int = None,
+         memory_budget_mb: int = None, id_columns=(), model: str = None, preprocessor: str = None):
+    try:
+        from networksecurity.components.batch_scoring import BatchScorer
+        overrides = {"max_workers": workers, "chunk_size": chunk_size, "memory_budget_mb": memory_budget_mb,
+                     "model_file_and_path": model, "preprocessor_file_and_path": preprocessor}
+        config = BatchScoringConfig(id_columns=list(id_columns),
+                                    **{name: value for name, value in overrides.items() if value is not None})
+        artifact = BatchScorer(scoring_config=config).score_file(input_file, output_file)
+        print(json.dumps(asdict(artifact), default=str, indent=2))
+        return artifact
+    except Exception as e:
+        raise ns_exception.CustomException(e, sys) from e
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(args.input, args.output, workers=args.workers, chunk_size=args.chunk_size,
+         memory_budget_mb=args.memory_budget_mb, id_columns=args.id_column,
+         model=args.model, preprocessor=args.preprocessor)
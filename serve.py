@@ -0,0 +1,41 @@
+import sys
+import asyncio
+import argparse
+from networksecurity.components.logger import ns_logger
+import networksecurity.components.exception as ns_exception
+from networksecurity.entity.config_app import OnlineScoringConfig
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Serve the saved preprocessor and model over local HTTP with micro-batched scoring")
+    parser.add_argument("--host", default=None, help="Listen address (default: SERVING_HOST).")
+    parser.add_argument("--port", type=int, default=None, help="Listen port; 0 picks a free one (default: SERVING_PORT).")
+    parser.add_argument("--max-batch-size", type=int, default=None,
+                        help="Rows per predict call (default: SERVING_MAX_BATCH_SIZE).")
+    parser.add_argument("--max-wait-ms", type=float, default=None,
+                        help="How long the first waiting request waits for others (default: SERVING_MAX_WAIT_MS).")
+    parser.add_argument("--queue-size", type=int, default=None,
+                        help="Waiting requests before new ones get 503 (default: SERVING_QUEUE_SIZE).")
+    parser.add_argument("--model", default=None, help="Model file (default: the trained model artifact).")
+    parser.add_argument("--preprocessor", default=None, help="Preprocessor file (default: the transform artifact).")
+    return parser.parse_args(argv)
+
+def main(host: str = None, port: int = None, max_batch_size: int = None, max_wait_ms: float = None,
+         queue_size: int = None, model: str = None, preprocessor: str = None):
+    try:
+        from networksecurity.components.scoring_service import ScoringService
+        overrides = {"host": host, "port": port, "max_batch_size": max_batch_size, "max_wait_ms": max_wait_ms,
+                     "queue_size": queue_size, "model_file_and_path": model,
+                     "preprocessor_file_and_path": preprocessor}
+        config = OnlineScoringConfig(**{name: value for name, value in overrides.items() if value is not None})
+        service = ScoringService(serving_config=config)
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        ns_logger.log_info("Scoring service stopped.")
+    except Exception as e:
+        raise ns_exception.CustomException(e, sys) from e
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(host=args.host, port=args.port, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms,
+         queue_size=args.queue_size, model=args.model, preprocessor=args.preprocessor)
@@ -0,0 +1,70 @@
+"""
+Shared fixtures. The constants module reads its settings from the environment
+(.env in a deployment); the required ones get test defaults here, before any
+test touches a constant. Every test writes under its own tmp_path, and the
+log file goes to a session temp directory instead of ./logs.
+"""
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+#----------------------------------------------------------
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+#----------------------------------------------------------
+TEST_ENVIRONMENT = {
+    "LOAD-DATA-FILE-TO-MONGO": "phisingData.csv",
+    "MONGO-DB": "network_security_test",
+    "MONGO-DB-COLLECTION": "phishing",
+    "MONGO-DB-URI": "mongodb://localhost:27017",
+    "TRAIN-TEST-SPLIT-RATION": "0.2",
+    "TEST_SIZE": "0.2",
+    "TEST_SIZE_VAL": "0.25",
+    "RANDOM_STATE": "42",
+    "LOG_FILE_MAX_BYTES": "10485760",
+    "LOG_FILE_BACKUP_COUNT": "5",
+    "LOG_ASYNC": "false",
+}
+for name, value in TEST_ENVIRONMENT.items():
+    os.environ.setdefault(name, value)
+#----------------------------------------------------------
+REFERENCE_CSV = ROOT_DIR / "network_data" / "phisingData.csv"
+#----------------------------------------------------------
+@pytest.fixture(autouse=True, scope="session")
+def _log_to_temp_dir(tmp_path_factory):
+    from networksecurity.components.logger import ns_logger
+    ns_logger.log_dir = tmp_path_factory.mktemp("logs")
+    yield
+#----------------------------------------------------------
+@pytest.fixture(scope="session")
+def csv_lines() -> list:
+    """Header plus the first 600 rows of the reference CSV, as raw byte lines."""
+    return REFERENCE_CSV.read_bytes().splitlines(keepends=True)[:601]
+#----------------------------------------------------------
+@pytest.fixture
+def phishing_frame() -> pd.DataFrame:
+    """Schema-typed frame of 2000 synthetic rows, a quarter of them duplicates, 1% of values missing."""
+    from benchmarks.synthetic_phishing import synthetic_frame
+    return synthetic_frame(2000, duplicate_rate=0.25, missing_rate=0.01, seed=7)
+#----------------------------------------------------------
+@pytest.fixture
+def mongo_client():
+    mongomock = pytest.importorskip("mongomock")
+    return mongomock.MongoClient()
+#----------------------------------------------------------
+@pytest.fixture
+def scoring_model(phishing_frame, tmp_path):
+    """(model path, preprocessor path) of a logistic regression fitted on `phishing_frame`, saved as train does."""
+    import joblib
+    from sklearn.linear_model import LogisticRegression
+    import networksecurity.components.constants as constants
+    from networksecurity.components.preprocessing import fit_preprocessor
+    x = phishing_frame.drop(columns=[constants.TARGET_COLUMN])
+    y = phishing_frame[constants.TARGET_COLUMN].to_numpy(dtype=np.int8)
+    preprocessor_path, model_path = tmp_path / "preprocessor.joblib", tmp_path / "model.joblib"
+    preprocessor, info = fit_preprocessor(x, preprocessor_path, use_cache=False)
+    model = LogisticRegression(max_iter=1000).fit(preprocessor.transform(x), y)
+    joblib.dump({"model": model, "preprocessor_fingerprint": info["fingerprint"]}, model_path)
+    return model_path, preprocessor_path
@@ -0,0 +1,78 @@
+import pandas as pd
+import pytest
+from dataclasses import asdict
+from types import SimpleNamespace
+#----------------------------------------------------------
+from networksecurity.components import utils
+from networksecurity.components.artifact_writer import ArtifactWriter
+from networksecurity.components.exception import CustomException
+from networksecurity.components.push_data import _to_documents
+from networksecurity.components.stage_cache import StageCache
+from networksecurity.entity.config_app import DataIngestionArtifact
+#----------------------------------------------------------
+def test_writes_land_atomically_with_stats(phishing_frame, tmp_path):
+    paths = {"train": tmp_path / "a" / "train.csv", "test": tmp_path / "b" / "test.parquet"}
+    with ArtifactWriter(max_workers=2) as writer:
+        writer.write("train", phishing_frame.iloc[:1500], paths["train"])
+        writer.write("test", phishing_frame.iloc[1500:], paths["test"])
+        with pytest.raises(ValueError, match="already queued"):
+            writer.write("train", phishing_frame, paths["train"])
+    assert set(writer.stats) == {"train", "test"}
+    for name, path in paths.items():
+        assert writer.stats[name].bytes == path.stat().st_size > 0
+        assert [item.name for item in path.parent.iterdir()] == [path.name]
+    pd.testing.assert_frame_equal(utils.read_artifact(paths["test"]), phishing_frame.iloc[1500:].reset_index(drop=True),
+                                  check_dtype=False, check_index_type=False)
+#----------------------------------------------------------
+def test_failed_write_raises_on_exit_and_leaves_no_file(phishing_frame, tmp_path):
+    def fail(path):
+        with utils.atomic_path(path) as tmp:
+            tmp.write_text("partial")
+            raise OSError("disk full")
+    with pytest.raises(CustomException, match="1 artifact write"):
+        with ArtifactWriter() as writer:
+            writer.write("good", phishing_frame, tmp_path / "good.csv")
+            writer.call("bad", tmp_path / "bad.csv", fail, tmp_path / "bad.csv")
+    assert sorted(item.name for item in tmp_path.iterdir()) == ["good.csv"]
+#----------------------------------------------------------
+# Stage cache
+#----------------------------------------------------------
+@pytest.fixture
+def cache_env(phishing_frame, mongo_client, tmp_path):
+    collection = mongo_client["db"]["rows"]
+    collection.insert_many(_to_documents(phishing_frame.iloc[:1000]))
+    ingest_config = SimpleNamespace(
+        test_size=0.2, random_state=42, split_method="random", artifact_format="csv",
+        split_storage="files", mongo_storage_mode="document", collapse_duplicates=False)
+    path = tmp_path / "train.csv"
+    with ArtifactWriter() as writer:
+        writer.write("train", phishing_frame.iloc[:800], path)
+    artifact = DataIngestionArtifact(
+        train_file_name_and_path=path, write_stats={name: asdict(record) for name, record in writer.stats.items()})
+    return collection, ingest_config, artifact, StageCache(tmp_path / "cache.json")
+#----------------------------------------------------------
+def test_stage_cache_hits_for_an_unchanged_source(cache_env):
+    collection, ingest_config, artifact, cache = cache_env
+    fingerprint = StageCache.source_fingerprint(collection, ingest_config)
+    assert cache.lookup(fingerprint) is None
+    cache.store(fingerprint, artifact)
+    hit = cache.lookup(StageCache.source_fingerprint(collection, ingest_config))
+    assert hit.train_file_name_and_path == artifact.train_file_name_and_path
+    assert hit.write_stats == artifact.write_stats
+    cache.invalidate()
+    assert cache.lookup(fingerprint) is None
+#----------------------------------------------------------
+def test_stage_cache_misses_on_new_rows_settings_or_changed_files(cache_env, phishing_frame):
+    collection, ingest_config, artifact, cache = cache_env
+    fingerprint = StageCache.source_fingerprint(collection, ingest_config)
+    cache.store(fingerprint, artifact)
+    ingest_config.split_method = "hash"
+    assert StageCache.source_fingerprint(collection, ingest_config)["key"] != fingerprint["key"]
+    ingest_config.split_method = "random"
+    #----------------------------------------------------------
+    collection.insert_many(_to_documents(phishing_frame.iloc[1000:1010]))
+    assert cache.lookup(StageCache.source_fingerprint(collection, ingest_config)) is None
+    # An artifact changed since it was written is not served either
+    with open(artifact.train_file_name_and_path, "a") as handle:
+        handle.write("1,1\n")
+    assert cache.lookup(fingerprint) is None
@@ -0,0 +1,106 @@
+import os
+import yaml
+import numpy as np
+import pandas as pd
+import pytest
+from types import SimpleNamespace
+#----------------------------------------------------------
+import networksecurity.components.constants as constants
+from networksecurity.components import utils
+from networksecurity.components.data_validation import DataValidation
+from networksecurity.components.exception import CustomException
+from networksecurity.components.row_collapse import collapse_duplicates
+from networksecurity.components.split_store import SplitDataset
+from networksecurity.entity.config_app import DataValidationConfig
+#----------------------------------------------------------
+@pytest.fixture
+def validation_config(tmp_path):
+    def make(**overrides):
+        settings = dict(
+            valid_file_name_and_path=tmp_path / "valid" / "validated.csv",
+            invalid_file_name_and_path=tmp_path / "invalid" / "invalid.csv",
+            valid_rows_file_and_path=tmp_path / "valid" / "valid_rows.npy",
+            report_file_name_and_path=tmp_path / "report.yaml",
+            artifact_format="csv", chunk_size=700, max_invalid_fraction=0.1, min_class_share=0.1,
+            quarantine_null_features=False, fail_on_error=True)
+        settings.update(overrides)
+        return DataValidationConfig(**settings)
+    return make
+#----------------------------------------------------------
+def _with_bad_rows(frame: pd.DataFrame, rows) -> pd.DataFrame:
+    """`frame` with an out-of-schema feature value in `rows` (object column, as read from a raw CSV)."""
+    frame = frame.copy()
+    column = frame.columns[0]
+    frame[column] = frame[column].astype(object)
+    frame.loc[rows, column] = 5
+    return frame
+#----------------------------------------------------------
+def _write(frame: pd.DataFrame, path):
+    utils.write_artifact(frame, path)
+    return path
+#----------------------------------------------------------
+def _report(config) -> dict:
+    return yaml.safe_load(open(config.report_file_name_and_path))["validation"]
+#----------------------------------------------------------
+def test_validation_quarantines_bad_rows_and_saves_mask(phishing_frame, validation_config, tmp_path):
+    source = _write(_with_bad_rows(phishing_frame, [3, 1500]), tmp_path / "dataset.csv")
+    config = validation_config()
+    artifact = DataValidation(config).initiate_data_validation(source)
+    assert artifact.status == "passed"
+    assert (artifact.rows, artifact.valid_rows, artifact.invalid_rows) == (2000, 1998, 2)
+    mask = np.load(artifact.valid_rows_file_path)
+    assert mask.shape == (2000,) and not mask[3] and not mask[1500] and mask.sum() == 1998
+    assert len(utils.read_artifact(artifact.valid_file_path)) == 1998
+    assert len(pd.read_csv(artifact.invalid_file_path)) == 2
+#----------------------------------------------------------
+def test_failed_validation_keeps_previous_outputs(phishing_frame, validation_config, tmp_path):
+    source = _write(phishing_frame, tmp_path / "dataset.csv")
+    artifact = DataValidation(validation_config()).initiate_data_validation(source)
+    outputs = [artifact.valid_file_path, artifact.invalid_file_path, artifact.valid_rows_file_path]
+    for path in outputs:
+        os.utime(path, (1_000_000, 1_000_000))
+    #----------------------------------------------------------
+    # One class share below the threshold fails the run
+    config = validation_config(min_class_share=0.49)
+    with pytest.raises(CustomException, match="target_balance"):
+        DataValidation(config).initiate_data_validation(source)
+    assert _report(config)["status"] == "failed"
+    assert [os.path.getmtime(path) for path in outputs] == [1_000_000] * 3
+    leftovers = [path.name for path in (tmp_path / "valid").iterdir() if path not in outputs]
+    assert leftovers == []
+#----------------------------------------------------------
+def test_missing_column_fails_even_without_fail_on_error(phishing_frame, validation_config, tmp_path):
+    source = _write(phishing_frame.drop(columns=["Favicon"]), tmp_path / "dataset.csv")
+    config = validation_config(fail_on_error=False)
+    with pytest.raises(CustomException, match="Columns missing"):
+        DataValidation(config).initiate_data_validation(source)
+    assert _report(config)["checks"]["column_set"]["missing"] == ["Favicon"]
+    # No mask or validated file is left for the transform and train stages to pick up
+    assert list((tmp_path / "valid").iterdir()) == []
+#----------------------------------------------------------
+def test_class_counts_are_weighted_by_row_count(phishing_frame, validation_config, tmp_path):
+    collapsed = collapse_duplicates(phishing_frame)
+    assert len(collapsed) < len(phishing_frame)
+    source = _write(collapsed, tmp_path / "collapsed.csv")
+    config = validation_config()
+    DataValidation(config).initiate_data_validation(source)
+    class_counts = _report(config)["checks"]["target_balance"]["class_counts"]
+    expected = phishing_frame[constants.TARGET_COLUMN].value_counts()
+    assert class_counts == {str(label): int(count) for label, count in expected.items()}
+#----------------------------------------------------------
+def test_splits_serve_only_validated_rows(phishing_frame, validation_config, tmp_path):
+    dataset = _write(_with_bad_rows(phishing_frame, [0, 10, 1999]), tmp_path / "dataset.csv")
+    ingest_config = SimpleNamespace(
+        target_column=constants.TARGET_COLUMN, feature_file_name_and_path=dataset,
+        split_index_file_and_path=tmp_path / "split_index.npz")
+    train, test = np.arange(0, 1600), np.arange(1600, 2000)
+    utils.save_split_index(ingest_config, 2000, list(phishing_frame.columns), train=train, test=test)
+    artifact = DataValidation(validation_config()).initiate_data_validation(dataset)
+    #----------------------------------------------------------
+    splits = SplitDataset.load(ingest_config.split_index_file_and_path)
+    splits.keep_rows(np.load(artifact.valid_rows_file_path))
+    assert list(splits.indices["train"][:2]) == [1, 2] and 10 not in splits.indices["train"]
+    assert len(splits.indices["train"]) == 1598 and len(splits.indices["test"]) == 399
+    # A mask for another dataset is refused rather than misapplied
+    with pytest.raises(ValueError, match="valid-row mask"):
+        splits.keep_rows(np.ones(10, dtype=bool))
@@ -0,0 +1,99 @@
+import json
+import numpy as np
+import pytest
+#----------------------------------------------------------
+from networksecurity.components.drift import DriftMonitor, population_stability_index
+from networksecurity.components.exception import CustomException
+from networksecurity.components.push_data import _to_documents
+from networksecurity.entity.config_app import DriftConfig
+#----------------------------------------------------------
+@pytest.fixture
+def drift_env(tmp_path, mongo_client):
+    """(collection, push(frame), make_monitor(**overrides)) with a fake push manifest in tmp_path."""
+    collection = mongo_client["db"]["rows"]
+    manifest_path = tmp_path / "push_manifest.json"
+    batches = []
+
+    def push(frame, commit=True):
+        """Inserts `frame` as the next push batch; `commit=False` leaves it unacknowledged."""
+        sequence = len(batches)
+        batches.append(sequence)
+        collection.insert_many([{**document, "push_seq": sequence} for document in _to_documents(frame)])
+        if commit:
+            manifest_path.write_text(json.dumps({"last_acked_batch": sequence}))
+
+    def make_monitor(**overrides):
+        settings = dict(
+            state_file_and_path=tmp_path / "drift_state.json", report_file_and_path=tmp_path / "report.yaml",
+            push_manifest_file_and_path=manifest_path, psi_threshold=0.1, jsd_threshold=0.05, chi2_alpha=0.0,
+            min_rows=100, max_drifted_features=0, fail_on_drift=True, read_batch_size=500,
+            mongo_storage_mode="document")
+        settings.update(overrides)
+        return DriftMonitor(DriftConfig(**settings))
+    return collection, push, make_monitor
+#----------------------------------------------------------
+def _shifted(frame, features):
+    """`frame` with every value of `features` set to 1."""
+    return frame.assign(**{name: np.int8(1) for name in features})
+#----------------------------------------------------------
+def test_baseline_then_passing_batch_is_accepted(phishing_frame, drift_env):
+    collection, push, make_monitor = drift_env
+    push(phishing_frame.iloc[:1000])
+    artifact = make_monitor().initiate_drift_check(collection)
+    assert (artifact.status, artifact.new_rows, artifact.reference_rows) == ("baseline", 1000, 1000)
+    #----------------------------------------------------------
+    push(phishing_frame.iloc[1000:])
+    artifact = make_monitor().initiate_drift_check(collection)
+    assert (artifact.status, artifact.new_rows, artifact.pending_rows) == ("passed", 1000, 0)
+    assert artifact.reference_rows == 2000
+    assert make_monitor().initiate_drift_check(collection).status == "up_to_date"
+#----------------------------------------------------------
+def test_uncommitted_batches_wait_for_the_next_run(phishing_frame, drift_env):
+    collection, push, make_monitor = drift_env
+    push(phishing_frame.iloc[:800])
+    push(phishing_frame.iloc[800:1200], commit=False)
+    assert make_monitor().initiate_drift_check(collection).new_rows == 800
+    # The manifest now acknowledges the batch (and a later one)
+    push(phishing_frame.iloc[1200:1500])
+    assert make_monitor().initiate_drift_check(collection).new_rows == 700
+#----------------------------------------------------------
+def test_failed_check_leaves_state_unchanged_until_accepted(phishing_frame, drift_env):
+    collection, push, make_monitor = drift_env
+    push(phishing_frame.iloc[:1000])
+    monitor = make_monitor()
+    monitor.initiate_drift_check(collection)
+    state_file = monitor.drift_config.state_file_and_path
+    saved = state_file.read_bytes()
+    #----------------------------------------------------------
+    push(_shifted(phishing_frame.iloc[1000:], monitor.features[:5]))
+    for _ in range(2):
+        with pytest.raises(CustomException, match="Data drift"):
+            make_monitor().initiate_drift_check(collection)
+        assert state_file.read_bytes() == saved
+    #----------------------------------------------------------
+    # Accepting (main.py --accept-drift) counts the held-back rows into the reference
+    monitor = make_monitor()
+    assert monitor.add_new_documents(collection) == 1000
+    monitor.accept_pending()
+    monitor.save_state()
+    artifact = make_monitor().initiate_drift_check(collection)
+    assert (artifact.status, artifact.reference_rows) == ("up_to_date", 2000)
+#----------------------------------------------------------
+def test_drift_without_fail_keeps_rows_pending(phishing_frame, drift_env):
+    collection, push, make_monitor = drift_env
+    push(phishing_frame.iloc[:1000])
+    make_monitor(fail_on_drift=False).initiate_drift_check(collection)
+    push(_shifted(phishing_frame.iloc[1000:1500], ["having_IP_Address"]))
+    artifact = make_monitor(fail_on_drift=False).initiate_drift_check(collection)
+    assert artifact.status == "drift" and artifact.drifted_features == ["having_IP_Address"]
+    assert (artifact.pending_rows, artifact.reference_rows) == (500, 1000)
+    # Pending rows are saved, so the next run adds to them rather than re-reading
+    push(phishing_frame.iloc[1500:1600])
+    artifact = make_monitor(fail_on_drift=False).initiate_drift_check(collection)
+    assert (artifact.new_rows, artifact.pending_rows) == (100, 600)
+#----------------------------------------------------------
+def test_psi_is_zero_for_identical_and_grows_with_shift():
+    reference = np.array([[100, 50, 50, 0]])
+    assert population_stability_index(reference, reference)[0] == pytest.approx(0.0, abs=1e-9)
+    mild, strong = np.array([[90, 55, 55, 0]]), np.array([[10, 20, 170, 0]])
+    assert 0 < population_stability_index(reference, mild)[0] < population_stability_index(reference, strong)[0]
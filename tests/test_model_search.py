@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from sklearn.base import BaseEstimator, ClassifierMixin
+#----------------------------------------------------------
+from networksecurity.components.model_search import SuccessiveHalvingSearch, make_scorer, sample_candidates
+from networksecurity.components.model_trainer import test_scores as model_test_scores
+from networksecurity.components.schema import phishing_schema, PHISHING_LABEL
+#----------------------------------------------------------
+@pytest.fixture
+def search_data(tmp_path):
+    """Memory-mapped data spec of 600 rows with labels -1 / 1 (the last 150 are the hold-out)."""
+    rng = np.random.default_rng(3)
+    x = rng.choice([-1.0, 0.0, 1.0], size=(600, 6)).astype(np.float32)
+    y = np.where(x[:, 0] + x[:, 1] + rng.normal(0, 0.5, 600) > 0, 1, -1).astype(np.int8)
+    np.save(tmp_path / "x.npy", x)
+    np.save(tmp_path / "y.npy", y)
+    return {"x_path": str(tmp_path / "x.npy"), "y_path": str(tmp_path / "y.npy"), "n_train": 450}
+#----------------------------------------------------------
+def _search(candidates, **overrides):
+    settings = dict(scoring="f1", halving_factor=2, min_rows=100, max_workers=2,
+                    time_budget_seconds=120.0, start_method="fork", pos_label=PHISHING_LABEL)
+    settings.update(overrides)
+    return SuccessiveHalvingSearch(candidates, **settings)
+#----------------------------------------------------------
+def test_search_halves_to_a_winner(search_data):
+    candidates = sample_candidates(["logistic_regression", "extra_trees"], 4, seed=0)
+    outcome = _search(candidates).run(search_data)
+    assert not outcome["timed_out"]
+    assert [rung["candidates"] for rung in outcome["rungs"]] == [4, 2, 1]
+    assert [rung["rows"] for rung in outcome["rungs"]] == [100, 200, 400]
+    assert all(rung["completed"] == rung["candidates"] for rung in outcome["rungs"])
+    assert outcome["best"]["rung"] == 2 and outcome["best"]["score"] > 0.5
+#----------------------------------------------------------
+def test_search_out_of_time_returns_no_model(search_data):
+    candidates = sample_candidates(["logistic_regression"], 2, seed=0)
+    outcome = _search(candidates, time_budget_seconds=0.0).run(search_data)
+    assert outcome["timed_out"] and outcome["best"] is None
+#----------------------------------------------------------
+def _result(candidate_id, score):
+    return {"id": candidate_id, "score": score, "fit_seconds": 0.1}
+#----------------------------------------------------------
+def test_best_comes_from_the_deepest_completed_rung():
+    rungs = [
+        {"rung": 0, "candidates": 3, "completed": 3, "results": [_result(1, 0.9), _result(0, 0.8), _result(2, 0.5)]},
+        # Cut short by the deadline: only the fastest candidate finished
+        {"rung": 1, "candidates": 2, "completed": 1, "results": [_result(0, 0.7)]},
+    ]
+    assert SuccessiveHalvingSearch._best(rungs)["id"] == 1
+    # A partial rung is used only when no rung completed
+    assert SuccessiveHalvingSearch._best(rungs[1:])["id"] == 0
+    assert SuccessiveHalvingSearch._best([{**rungs[0], "results": [_result(0, None)]}]) is None
+#----------------------------------------------------------
+# Scores refer to the phishing class (-1), not sklearn's default label 1
+#----------------------------------------------------------
+class _Fixed(ClassifierMixin, BaseEstimator):
+    """Returns fixed predictions, as if fitted."""
+    def __init__(self, predicted=()):
+        self.predicted = predicted
+        self.classes_ = np.array([-1, 1])
+
+    def predict(self, x):
+        return np.asarray(self.predicted)
+
+    def predict_proba(self, x):
+        predicted = np.asarray(self.predicted)
+        return np.column_stack([predicted == -1, predicted == 1]).astype(float)
+#----------------------------------------------------------
+def test_scores_refer_to_the_phishing_class():
+    assert phishing_schema().positive_label == PHISHING_LABEL == -1
+    y = np.array([-1, -1, -1, 1, 1, 1, 1, 1])
+    model = _Fixed([-1, 1, 1, 1, 1, 1, 1, 1])   # finds one of three phishing sites
+    scores = model_test_scores(model, np.zeros((8, 1)), y)
+    assert scores["recall"] == pytest.approx(1 / 3) and scores["precision"] == 1.0
+    assert scores["roc_auc"] == pytest.approx(2 / 3)
+    assert make_scorer("recall", PHISHING_LABEL)(model, np.zeros((8, 1)), y) == pytest.approx(1 / 3)
+    assert make_scorer("recall", 1)(model, np.zeros((8, 1)), y) == 1.0
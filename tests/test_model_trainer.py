@@ -0,0 +1,63 @@
+import yaml
+import joblib
+import numpy as np
+import pytest
+from types import SimpleNamespace
+#----------------------------------------------------------
+import networksecurity.components.constants as constants
+from networksecurity.components import utils
+from networksecurity.components.data_transformation import DataTransformation
+from networksecurity.components.exception import CustomException
+from networksecurity.components.model_trainer import ModelTrainer
+from networksecurity.components.row_collapse import collapse_duplicates
+from networksecurity.components.schema import PHISHING_LABEL
+from networksecurity.entity.config_app import DataTransformationConfig, ModelTrainerConfig
+#----------------------------------------------------------
+@pytest.fixture
+def trainer_env(phishing_frame, tmp_path):
+    """make_trainer(**overrides) over a collapsed, index-split and transformed copy of `phishing_frame`."""
+    dataset = collapse_duplicates(phishing_frame)
+    path = tmp_path / "dataset.csv"
+    utils.write_artifact(dataset, path)
+    ingest_config = SimpleNamespace(
+        target_column=constants.TARGET_COLUMN, feature_file_name_and_path=path, split_storage="index",
+        split_index_file_and_path=tmp_path / "split_index.npz", row_count_column=constants.ROW_COUNT_COLUMN)
+    order = np.random.default_rng(0).permutation(len(dataset))
+    cut = int(len(order) * 0.8)
+    utils.save_split_index(ingest_config, len(dataset), list(dataset.columns), train=order[:cut], test=order[cut:])
+    transformation_config = DataTransformationConfig(
+        data_transformation_dir=tmp_path, preprocessor_file_and_path=tmp_path / "preprocessor.joblib",
+        x_train_transformed_file_and_path=tmp_path / "x_train_transformed.csv",
+        x_val_transformed_file_and_path=tmp_path / "x_val_transformed.csv",
+        x_test_transformed_file_and_path=tmp_path / "x_test_transformed.csv",
+        use_preprocessor_cache=False, fast_path=True, artifact_format="csv")
+    DataTransformation(transformation_config, ingest_config).initiate_data_transformation()
+
+    def make_trainer(**overrides):
+        settings = dict(
+            model_trainer_dir=tmp_path / "model", model_file_and_path=tmp_path / "model" / "model.joblib",
+            report_file_and_path=tmp_path / "model" / "report.yaml", search_work_dir=tmp_path / "model" / "search",
+            families="logistic_regression,extra_trees", candidates=4, max_workers=2, time_budget_seconds=120.0,
+            halving_factor=2, min_rows=200, validation_fraction=0.2, scoring="f1", start_method="fork",
+            random_state=0)
+        settings.update(overrides)
+        return ModelTrainer(ModelTrainerConfig(**settings), ingest_config, transformation_config)
+    return make_trainer
+#----------------------------------------------------------
+def test_trainer_saves_the_best_model_and_report(trainer_env, phishing_frame):
+    artifact = trainer_env().initiate_model_trainer()
+    assert not artifact.timed_out and artifact.family in ("logistic_regression", "extra_trees")
+    assert artifact.test_scores["f1"] > 0.5 and artifact.test_scores["roc_auc"] > 0.5
+    payload = joblib.load(artifact.model_file_path)
+    assert payload["positive_label"] == PHISHING_LABEL and payload["classes"] == [-1, 1]
+    report = yaml.safe_load(open(artifact.report_file_path))
+    # Collapsed rows are weighted by their counts, so weighted rows add up to the source rows
+    assert report["search"]["weighted_rows"] + report["test"]["weighted_rows"] == len(phishing_frame)
+    assert all(rung["completed"] == rung["candidates"] for rung in report["rungs"])
+    assert not (artifact.model_file_path.parent / "search").exists()
+#----------------------------------------------------------
+def test_trainer_fails_when_nothing_finishes_in_time(trainer_env):
+    trainer = trainer_env(time_budget_seconds=0.0)
+    with pytest.raises(CustomException, match="No model configuration finished"):
+        trainer.initiate_model_trainer()
+    assert not trainer.trainer_config.model_file_and_path.exists()
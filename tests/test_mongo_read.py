@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+#----------------------------------------------------------
+from networksecurity.components import utils
+from networksecurity.components.push_data import _to_documents
+from networksecurity.components.row_codec import RowCodec
+#----------------------------------------------------------
+@pytest.fixture
+def shuffled_collection(phishing_frame, mongo_client):
+    """Collection whose natural (insertion) order differs from its `_id` order; returns (collection, frame in _id order)."""
+    collection = mongo_client["db"]["rows"]
+    ids = np.random.default_rng(11).permutation(len(phishing_frame))
+    collection.insert_many([{"_id": int(row_id), **document}
+                            for row_id, document in zip(ids, _to_documents(phishing_frame))])
+    in_id_order = phishing_frame.iloc[np.argsort(ids)].reset_index(drop=True)
+    return collection, in_id_order
+#----------------------------------------------------------
+def _codes(frame: pd.DataFrame) -> np.ndarray:
+    return RowCodec().pack_frame(frame)
+#----------------------------------------------------------
+def test_columnar_read_is_in_id_order(shuffled_collection):
+    collection, expected = shuffled_collection
+    frame = utils.read_collection_columnar(collection, batch_size=300)
+    assert list(frame.columns) == list(expected.columns)
+    np.testing.assert_array_equal(_codes(frame), _codes(expected))
+#----------------------------------------------------------
+@pytest.mark.parametrize("partitions", [1, 3, 7])
+def test_partitioned_read_equals_single_cursor_read(shuffled_collection, partitions):
+    collection, _ = shuffled_collection
+    single = utils.read_collection_columnar(collection, batch_size=300)
+    for _ in range(3):
+        # Range cuts come from $sample, so every read partitions differently
+        partitioned = utils.read_collection_partitioned(
+            collection, partitions=partitions, max_workers=3, batch_size=300)
+        pd.testing.assert_frame_equal(partitioned, single)
+#----------------------------------------------------------
+def test_partitioned_read_retries_a_failed_range(shuffled_collection, monkeypatch):
+    import pymongo
+    collection, expected = shuffled_collection
+    read = utils._read_cursor_into_buffers
+    failures = []
+
+    def flaky(cursor, *args):
+        if not failures:
+            failures.append(1)
+            raise pymongo.errors.AutoReconnect("simulated")
+        return read(cursor, *args)
+    monkeypatch.setattr(utils, "_read_cursor_into_buffers", flaky)
+    monkeypatch.setattr(utils.time, "sleep", lambda seconds: None)
+    frame = utils.read_collection_partitioned(collection, partitions=4, max_workers=1, retries=1)
+    assert failures == [1]
+    np.testing.assert_array_equal(_codes(frame), _codes(expected))
@@ -0,0 +1,69 @@
+import os
+import pytest
+#----------------------------------------------------------
+from networksecurity.components.exception import CustomException
+from networksecurity.entity.config_app import MasterPipelineConfig
+from networksecurity.pipeline.pipeline_runner import PipelineRunner, Stage
+#----------------------------------------------------------
+def _writer(path, calls, name):
+    def run():
+        calls.append(name)
+        path.write_text(name)
+        return name
+    return run
+#----------------------------------------------------------
+def test_standard_graph_gates_transform_and_train():
+    graph = PipelineRunner.from_config(MasterPipelineConfig()).dependencies()
+    assert graph["ingest"] == {"push"}
+    assert graph["drift"] >= {"push", "validate"}
+    for name in ("transform", "train"):
+        assert {"validate", "drift"} <= graph[name]
+    assert "transform" in graph["train"]
+#----------------------------------------------------------
+def test_failed_stage_blocks_downstream_and_raises_its_error(tmp_path):
+    calls = []
+    source, checked, model, other = (tmp_path / name for name in ("source", "checked", "model", "other"))
+    source.write_text("rows")
+
+    def validate():
+        calls.append("validate")
+        raise ValueError("class balance check failed")
+    runner = PipelineRunner([
+        Stage("validate", validate, inputs=[source], outputs=[checked]),
+        Stage("train", _writer(model, calls, "train"), inputs=[checked], outputs=[model]),
+        Stage("report", _writer(other, calls, "report"), inputs=[source], outputs=[other]),
+    ], max_workers=1)
+    with pytest.raises(CustomException, match="class balance check failed"):
+        runner.run()
+    assert sorted(calls) == ["report", "validate"]
+    assert not model.exists()
+#----------------------------------------------------------
+def test_up_to_date_stages_are_skipped(tmp_path):
+    calls = []
+    source, output = tmp_path / "source", tmp_path / "output"
+    source.write_text("rows")
+    runner = PipelineRunner([Stage("step", _writer(output, calls, "step"), inputs=[source], outputs=[output])])
+    assert runner.run()["step"].status == "ran"
+    assert runner.run()["step"].status == "skipped"
+    os.utime(source, (output.stat().st_mtime + 10,) * 2)
+    assert runner.run()["step"].status == "ran"
+    assert runner.run(force=True)["step"].status == "ran"
+    assert calls == ["step"] * 3
+#----------------------------------------------------------
+def test_depends_on_orders_and_blocks(tmp_path):
+    calls = []
+
+    def drift():
+        calls.append("drift")
+        raise RuntimeError("drift in 3 features")
+    runner = PipelineRunner([
+        Stage("drift", drift, outputs=[tmp_path / "state"]),
+        Stage("train", _writer(tmp_path / "model", calls, "train"), outputs=[tmp_path / "model"],
+              depends_on=["drift"]),
+    ])
+    with pytest.raises(CustomException):
+        runner.run()
+    assert calls == ["drift"]
+    with pytest.raises(ValueError):
+        PipelineRunner([Stage("a", lambda: None, depends_on=["b"]), Stage("b", lambda: None, depends_on=["a"])]
+                       ).dependencies()
@@ -0,0 +1,123 @@
+import pytest
+#----------------------------------------------------------
+from networksecurity.components import push_data
+from networksecurity.components.push_data import NetworkDataExtractor
+from networksecurity.components.exception import CustomException
+from networksecurity.entity.config_app import MongoDBAtlasConfig, PushBatchResult
+#----------------------------------------------------------
+BATCH_SIZE = 50
+#----------------------------------------------------------
+@pytest.fixture
+def push_env(tmp_path, mongo_client, monkeypatch, csv_lines):
+    """(write_csv, make_extractor, collection) over a mongomock client and a temp CSV / manifest."""
+    monkeypatch.setattr(push_data, "get_mongo_client", lambda config: mongo_client)
+    csv_path = tmp_path / "data.csv"
+
+    def write_csv(lines):
+        csv_path.write_bytes(b"".join(lines))
+        return csv_path
+
+    def make_extractor(storage_mode="document"):
+        config = MongoDBAtlasConfig(
+            file_path=str(csv_path), push_manifest_file_and_path=tmp_path / "push_manifest.json",
+            push_batch_size=BATCH_SIZE, mongo_storage_mode=storage_mode)
+        return NetworkDataExtractor(config)
+
+    config = MongoDBAtlasConfig()
+    collection = mongo_client[config.mongo_db_name][config.mongo_db_collection_name]
+    return write_csv, make_extractor, collection
+#----------------------------------------------------------
+def _sequences(collection) -> dict:
+    """{row fingerprint: push sequence} of every document."""
+    return {document["row_fingerprint"]: document["push_seq"]
+            for document in collection.find({}, {"row_fingerprint": 1, "push_seq": 1})}
+#----------------------------------------------------------
+@pytest.mark.parametrize("storage_mode", ["document", "packed_row"])
+def test_push_is_idempotent(push_env, csv_lines, storage_mode):
+    write_csv, make_extractor, collection = push_env
+    csv_path = write_csv(csv_lines[:301])
+    extractor = make_extractor(storage_mode)
+    results = extractor.push_data_incremental(str(csv_path))
+    assert sum(result.inserted for result in results) == 300
+    assert collection.count_documents({}) == 300
+    manifest = extractor.load_manifest()
+    assert manifest.completed and manifest.rows_committed == 300
+    # Unchanged file: nothing is sent
+    assert extractor.push_data_incremental(str(csv_path)) == []
+    # Forgotten manifest: the file is re-scanned but every row only matches
+    extractor.config.push_manifest_file_and_path.unlink()
+    results = extractor.push_data_incremental(str(csv_path))
+    assert sum(result.inserted for result in results) == 0
+    assert sum(result.matched for result in results) == 300
+    assert collection.count_documents({}) == 300
+#----------------------------------------------------------
+def test_resume_after_failed_batch(push_env, csv_lines, monkeypatch):
+    write_csv, make_extractor, collection = push_env
+    csv_path = write_csv(csv_lines[:301])
+    extractor = make_extractor()
+    upsert = NetworkDataExtractor._upsert_batch
+    failures = []
+
+    def flaky_upsert(self, collection, batch_index, first_row, payload):
+        if batch_index == 2 and not failures:
+            failures.append(batch_index)
+            return PushBatchResult(batch_index=batch_index, first_row=first_row, rows=len(payload[0]),
+                                   error="AutoReconnect: simulated")
+        return upsert(self, collection, batch_index, first_row, payload)
+    monkeypatch.setattr(NetworkDataExtractor, "_upsert_batch", flaky_upsert)
+    #----------------------------------------------------------
+    with pytest.raises(CustomException):
+        extractor.push_data_incremental(str(csv_path))
+    manifest = extractor.load_manifest()
+    assert not manifest.completed
+    assert manifest.last_acked_batch == 1 and manifest.rows_committed == 2 * BATCH_SIZE
+    #----------------------------------------------------------
+    results = extractor.push_data_incremental(str(csv_path))
+    # Resumed at the failed batch: the committed prefix is not sent again
+    assert min(result.batch_index for result in results) == 2
+    assert sum(result.rows for result in results) == 300 - 2 * BATCH_SIZE
+    assert collection.count_documents({}) == 300
+    assert extractor.load_manifest().completed
+#----------------------------------------------------------
+def test_appended_rows_get_higher_push_sequence(push_env, csv_lines):
+    write_csv, make_extractor, collection = push_env
+    extractor = make_extractor()
+    extractor.push_data_incremental(str(write_csv(csv_lines[:201])))
+    before = _sequences(collection)
+    #----------------------------------------------------------
+    results = extractor.push_data_incremental(str(write_csv(csv_lines[:301])))
+    assert sum(result.rows for result in results) == 100
+    after = _sequences(collection)
+    assert len(after) == 300
+    assert all(after[key] == value for key, value in before.items())
+    added = [value for key, value in after.items() if key not in before]
+    assert min(added) > max(before.values())
+#----------------------------------------------------------
+@pytest.mark.parametrize("storage_mode", ["document", "packed_row"])
+def test_changed_row_replaces_its_stale_document(push_env, csv_lines, storage_mode):
+    write_csv, make_extractor, collection = push_env
+    extractor = make_extractor(storage_mode)
+    lines = list(csv_lines[:301])
+    extractor.push_data_incremental(str(write_csv(lines)))
+    before = _sequences(collection)
+    generation = extractor.load_manifest().generation
+    #----------------------------------------------------------
+    # Flip the label of one row in the committed prefix: the file is re-scanned
+    fields = lines[10].rstrip(b"\r\n").split(b",")
+    fields[-1] = b"1" if fields[-1] == b"-1" else b"-1"
+    lines[10] = b",".join(fields) + b"\n"
+    extractor.push_data_incremental(str(write_csv(lines)))
+    manifest = extractor.load_manifest()
+    assert manifest.generation == generation + 1 and manifest.completed
+    after = _sequences(collection)
+    assert len(after) == 300
+    removed, added = set(before) - set(after), set(after) - set(before)
+    assert len(removed) == 1 and len(added) == 1
+    # The replacement is a new row for drift; unchanged rows keep their sequence
+    assert after[added.pop()] > max(before.values())
+    assert collection.count_documents({"push_generation": {"$ne": manifest.generation}}) == 0
+#----------------------------------------------------------
+def test_push_rejects_unknown_storage_mode(push_env):
+    _, make_extractor, _ = push_env
+    with pytest.raises(CustomException):
+        make_extractor("columnar")
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+#----------------------------------------------------------
+from networksecurity.components import utils
+from networksecurity.components.push_data import _to_documents
+from networksecurity.components.row_codec import RowCodec, hash_codes
+from networksecurity.components.schema import ColumnSpec, DatasetSchema, phishing_schema
+#----------------------------------------------------------
+def _frames_equal(left: pd.DataFrame, right: pd.DataFrame) -> None:
+    assert list(left.columns) == list(right.columns)
+    for name in left.columns:
+        np.testing.assert_array_equal(left[name].isna().to_numpy(), right[name].isna().to_numpy())
+        np.testing.assert_array_equal(left[name].to_numpy(dtype=np.float64, na_value=0),
+                                      right[name].to_numpy(dtype=np.float64, na_value=0))
+#----------------------------------------------------------
+def test_pack_unpack_round_trip(phishing_frame):
+    codec = RowCodec()
+    codes = codec.pack_frame(phishing_frame)
+    assert codes.dtype == np.uint64 and len(codes) == len(phishing_frame)
+    # Bit 63 stays clear, so every code fits a signed BSON int64
+    assert int(codes.max()) < 2 ** 63
+    values, missing = codec.unpack(codes)
+    for j, name in enumerate(codec.columns):
+        column = phishing_frame[name]
+        np.testing.assert_array_equal(missing[:, j], column.isna().to_numpy())
+        np.testing.assert_array_equal(values[:, j], column.to_numpy(dtype=np.int8, na_value=0))
+#----------------------------------------------------------
+def test_pack_frame_matches_pack_of_float_block(phishing_frame):
+    codec = RowCodec()
+    block = phishing_frame[codec.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    np.testing.assert_array_equal(codec.pack_frame(phishing_frame), codec.pack(block))
+#----------------------------------------------------------
+def test_pack_frame_accepts_plain_and_nullable_columns():
+    codec = RowCodec()
+    plain = pd.DataFrame({name: np.array([-1, 0, 1], dtype=np.int8) for name in codec.columns})
+    nullable = plain.astype("Int8")
+    nullable.iloc[1, 0] = pd.NA
+    plain_codes, nullable_codes = codec.pack_frame(plain), codec.pack_frame(nullable)
+    np.testing.assert_array_equal(plain_codes[[0, 2]], nullable_codes[[0, 2]])
+    assert plain_codes[1] != nullable_codes[1]
+    _, missing = codec.unpack(nullable_codes, [codec.columns[0]])
+    np.testing.assert_array_equal(missing[:, 0], [False, True, False])
+#----------------------------------------------------------
+def test_unpack_selected_columns():
+    codec = RowCodec()
+    block = np.tile(np.array([-1, 0, 1], dtype=np.int8), (5, 11))[:, :len(codec.columns)]
+    columns = [codec.columns[4], codec.columns[0]]
+    values, missing = codec.unpack(codec.pack(block), columns)
+    np.testing.assert_array_equal(values, block[:, [4, 0]])
+    assert not missing.any()
+#----------------------------------------------------------
+@pytest.mark.parametrize("storage_mode", ["packed_row", "packed_batch"])
+def test_document_round_trip(phishing_frame, storage_mode):
+    codec = RowCodec()
+    codes = codec.pack_frame(phishing_frame)
+    documents = RowCodec.to_documents(codes, storage_mode)
+    assert len(documents) == (len(codes) if storage_mode == "packed_row" else 1)
+    np.testing.assert_array_equal(RowCodec.codes_from_documents(documents, storage_mode), codes)
+#----------------------------------------------------------
+@pytest.mark.parametrize("storage_mode", ["document", "packed_row", "packed_batch"])
+def test_collection_round_trip(phishing_frame, mongo_client, storage_mode):
+    """Rows written in any storage mode read back identically through the columnar reader."""
+    collection = mongo_client["db"]["rows"]
+    codec = RowCodec()
+    if storage_mode == "document":
+        collection.insert_many(_to_documents(phishing_frame))
+    else:
+        for start in range(0, len(phishing_frame), 500):
+            codes = codec.pack_frame(phishing_frame.iloc[start:start + 500])
+            collection.insert_many(RowCodec.to_documents(codes, storage_mode))
+    frame = utils.read_collection_columnar(
+        collection, dtype=np.int8, schema=phishing_schema(), storage_mode=storage_mode, batch_size=300)
+    _frames_equal(frame, phishing_frame)
+#----------------------------------------------------------
+def test_codes_identify_rows_and_hash_spreads_them():
+    codec = RowCodec()
+    rng = np.random.default_rng(0)
+    block = rng.integers(-1, 2, size=(1000, len(codec.columns))).astype(np.int8)
+    block[:, -1] = np.where(block[:, -1] == 0, 1, block[:, -1])
+    codes = codec.pack(block)
+    assert len(np.unique(codes)) == len(np.unique(block, axis=0))
+    hashes = hash_codes(codes)
+    assert len(np.unique(hashes)) == len(np.unique(codes))
+    # Top bits of the hash split the rows into roughly even buckets
+    buckets = np.bincount((hashes >> np.uint64(62)).astype(np.int64), minlength=4)
+    assert buckets.min() > 150
+#----------------------------------------------------------
+def test_codec_rejects_wide_or_non_ternary_schema():
+    with pytest.raises(ValueError):
+        RowCodec(DatasetSchema(tuple(ColumnSpec(f"c{j}") for j in range(32)), target_column="c0"))
+    with pytest.raises(ValueError):
+        RowCodec(DatasetSchema((ColumnSpec("a", (0, 1, 2)), ColumnSpec("y", (-1, 1))), target_column="y"))
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+#----------------------------------------------------------
+import networksecurity.components.constants as constants
+from networksecurity.components import preprocessing
+from networksecurity.components.row_codec import RowCodec
+from networksecurity.components.row_collapse import collapse_duplicates, collapse_stats, expand_rows, row_weights
+#----------------------------------------------------------
+COUNT = constants.ROW_COUNT_COLUMN
+#----------------------------------------------------------
+def _sorted_codes(frame: pd.DataFrame) -> np.ndarray:
+    return np.sort(RowCodec().pack_frame(frame))
+#----------------------------------------------------------
+def test_collapse_keeps_one_row_per_distinct_row(phishing_frame):
+    collapsed = collapse_duplicates(phishing_frame)
+    codes = RowCodec().pack_frame(collapsed)
+    assert len(np.unique(codes)) == len(collapsed) == len(np.unique(RowCodec().pack_frame(phishing_frame)))
+    assert collapsed[COUNT].sum() == len(phishing_frame)
+    assert collapse_stats(collapsed) == {
+        "rows": len(phishing_frame), "unique_rows": len(collapsed),
+        "duplicate_rows": len(phishing_frame) - len(collapsed),
+        "compression_ratio": round(len(phishing_frame) / len(collapsed), 4)}
+#----------------------------------------------------------
+def test_expand_inverts_collapse(phishing_frame):
+    expanded = expand_rows(collapse_duplicates(phishing_frame))
+    assert list(expanded.columns) == list(phishing_frame.columns)
+    np.testing.assert_array_equal(_sorted_codes(expanded), _sorted_codes(phishing_frame))
+#----------------------------------------------------------
+def test_missing_values_are_part_of_the_key():
+    columns = RowCodec().columns
+    frame = pd.DataFrame({name: pd.array([1, 1, 1], dtype="Int8") for name in columns})
+    frame.iloc[2, 0] = pd.NA
+    collapsed = collapse_duplicates(frame)
+    assert len(collapsed) == 2
+    assert sorted(collapsed[COUNT].tolist()) == [1, 2]
+#----------------------------------------------------------
+def test_collapsing_twice_sums_counts(phishing_frame):
+    halves = [collapse_duplicates(phishing_frame.iloc[:1000]), collapse_duplicates(phishing_frame.iloc[1000:])]
+    merged = collapse_duplicates(pd.concat(halves, ignore_index=True))
+    direct = collapse_duplicates(phishing_frame)
+    assert len(merged) == len(direct)
+    assert merged[COUNT].sum() == len(phishing_frame)
+    by_code = dict(zip(RowCodec().pack_frame(direct).tolist(), direct[COUNT].tolist()))
+    assert dict(zip(RowCodec().pack_frame(merged).tolist(), merged[COUNT].tolist())) == by_code
+#----------------------------------------------------------
+def test_row_weights():
+    assert row_weights(pd.DataFrame({"a": [1, 2]})) is None
+    np.testing.assert_array_equal(row_weights(pd.DataFrame({"a": [1, 2], COUNT: [3, 1]})), [3.0, 1.0])
+#----------------------------------------------------------
+# Weighted preprocessing equals preprocessing of the expanded rows
+#----------------------------------------------------------
+@pytest.mark.parametrize("fast_path", [True, False])
+def test_weighted_fit_matches_expanded_fit(phishing_frame, tmp_path, fast_path):
+    collapsed = collapse_duplicates(phishing_frame)
+    x = collapsed.drop(columns=[constants.TARGET_COLUMN, COUNT])
+    weights = collapsed[COUNT].to_numpy()
+    weighted, info = preprocessing.fit_preprocessor(
+        x, tmp_path / "weighted.joblib", use_cache=False, fast_path=fast_path, sample_weight=weights)
+    assert info["kind"] == ("ternary" if fast_path else "column_transformer")
+    expanded_x = x.iloc[np.repeat(np.arange(len(x)), weights)]
+    expanded, _ = preprocessing.fit_preprocessor(
+        expanded_x, tmp_path / "expanded.joblib", use_cache=False, fast_path=fast_path)
+    np.testing.assert_allclose(weighted.transform(x), expanded.transform(x), rtol=1e-9, atol=1e-12)
+#----------------------------------------------------------
+def test_weighted_column_transformer_with_categorical_column(tmp_path):
+    rng = np.random.default_rng(5)
+    rows = 200
+    x = pd.DataFrame({
+        "score": rng.choice([-3.0, 0.5, 2.0, 7.0, np.nan], rows),
+        "kind": rng.choice(np.array(["a", "b", "c", None], dtype=object), rows)})
+    weights = rng.integers(1, 9, rows)
+    weighted, info = preprocessing.fit_preprocessor(x, tmp_path / "w.joblib", use_cache=False, sample_weight=weights)
+    assert info["kind"] == "column_transformer"
+    expanded, _ = preprocessing.fit_preprocessor(
+        x.iloc[np.repeat(np.arange(rows), weights)], tmp_path / "e.joblib", use_cache=False)
+    np.testing.assert_allclose(weighted.transform(x), expanded.transform(x), rtol=1e-9, atol=1e-12)
+#----------------------------------------------------------
+def test_weighted_median_matches_numpy_median():
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        values = rng.choice([-1.0, 0.0, 1.0, 4.0, np.nan], 15)
+        weights = rng.integers(1, 4, 15)
+        expanded = np.repeat(values, weights)
+        expected = np.median(expanded[~np.isnan(expanded)]) if (~np.isnan(expanded)).any() else np.nan
+        np.testing.assert_equal(preprocessing._weighted_median(values, weights), expected)
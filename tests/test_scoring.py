@@ -0,0 +1,178 @@
+import json
+import asyncio
+import numpy as np
+import pandas as pd
+import pytest
+#----------------------------------------------------------
+import networksecurity.components.constants as constants
+from networksecurity.components.batch_scoring import BatchScorer, ChunkScorer, PREDICTION_COLUMN, \
+    PROBABILITY_COLUMN, ROW_COLUMN
+from networksecurity.components.data_validation import REASON_COLUMN
+from networksecurity.components.schema import PHISHING_LABEL
+from networksecurity.components.scoring_service import MicroBatcher, Overloaded, ScoringService
+from networksecurity.entity.config_app import BatchScoringConfig, OnlineScoringConfig
+from networksecurity.entity.data_validation import ValidationReason
+#----------------------------------------------------------
+BAD_ROWS = [5, 1234]
+#----------------------------------------------------------
+@pytest.fixture
+def scoring_input(phishing_frame, tmp_path):
+    """CSV of `phishing_frame` with an id column, out-of-schema values in BAD_ROWS and no target column."""
+    frame = phishing_frame.drop(columns=[constants.TARGET_COLUMN]).astype(object)
+    frame.loc[BAD_ROWS, "Favicon"] = 7
+    frame.insert(0, "url_id", [f"u{i}" for i in range(len(frame))])
+    path = tmp_path / "input.csv"
+    frame.to_csv(path, index=False)
+    return path
+#----------------------------------------------------------
+def _expected_probability(scoring_model, phishing_frame) -> np.ndarray:
+    """Phishing-class probability of every row, from the saved model and preprocessor directly."""
+    import joblib
+    model = joblib.load(scoring_model[0])["model"]
+    preprocessor = joblib.load(scoring_model[1])["preprocessor"]
+    proba = model.predict_proba(preprocessor.transform(phishing_frame.drop(columns=[constants.TARGET_COLUMN])))
+    return proba[:, list(model.classes_).index(PHISHING_LABEL)]
+#----------------------------------------------------------
+# Batch scoring
+#----------------------------------------------------------
+def test_chunk_scorer_flags_bad_rows_and_scores_the_rest(scoring_model, phishing_frame):
+    scorer = ChunkScorer(*scoring_model)
+    scored = scorer.score(phishing_frame.iloc[:100])
+    assert list(scored.columns) == [ROW_COLUMN, PREDICTION_COLUMN, PROBABILITY_COLUMN, REASON_COLUMN]
+    expected = _expected_probability(scoring_model, phishing_frame)[:100]
+    np.testing.assert_allclose(scored[PROBABILITY_COLUMN], expected, rtol=1e-5)
+    np.testing.assert_array_equal(scored[PREDICTION_COLUMN], np.where(expected > 0.5, -1, 1))
+    #----------------------------------------------------------
+    block = np.zeros((2, len(scorer.schema.names)))
+    block[1, 0] = 7
+    prediction, probability, codes, invalid = scorer.score_block(block)
+    assert list(invalid) == [False, True] and np.isnan(probability[1])
+    assert codes[1] & ValidationReason.INVALID_FEATURE
+#----------------------------------------------------------
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_scoring_round_trip(scoring_model, scoring_input, phishing_frame, tmp_path, workers):
+    config = BatchScoringConfig(
+        model_file_and_path=scoring_model[0], preprocessor_file_and_path=scoring_model[1], chunk_size=1000,
+        max_workers=workers, memory_budget_mb=64, start_method="fork", id_columns=["url_id"])
+    output = tmp_path / f"scored_{workers}.csv"
+    artifact = BatchScorer(config).score_file(scoring_input, output)
+    assert (artifact.rows, artifact.invalid_rows, artifact.chunks) == (2000, len(BAD_ROWS), 2)
+    #----------------------------------------------------------
+    scored = pd.read_csv(output)
+    assert list(scored["url_id"]) == [f"u{i}" for i in range(2000)]
+    assert list(scored[ROW_COLUMN]) == list(range(2000))
+    bad = scored.index.isin(BAD_ROWS)
+    assert scored.loc[bad, PREDICTION_COLUMN].isna().all() and scored.loc[bad, PROBABILITY_COLUMN].isna().all()
+    assert (scored.loc[bad, REASON_COLUMN].to_numpy() & int(ValidationReason.INVALID_FEATURE)).all()
+    expected = _expected_probability(scoring_model, phishing_frame)
+    np.testing.assert_allclose(scored.loc[~bad, PROBABILITY_COLUMN], expected[~bad], rtol=1e-5)
+    assert not list(tmp_path.glob("*.tmp*"))
+#----------------------------------------------------------
+# Micro-batching
+#----------------------------------------------------------
+def _echo_scores(block: np.ndarray):
+    """Score function returning each row's first value, so callers can check they got their own rows."""
+    rows = len(block)
+    return block[:, 0].copy(), block[:, 1].copy(), np.zeros(rows, dtype=np.uint8), np.zeros(rows, dtype=bool)
+#----------------------------------------------------------
+def test_micro_batcher_batches_concurrent_requests():
+    calls = []
+
+    def score(block):
+        calls.append(len(block))
+        return _echo_scores(block)
+
+    async def run():
+        batcher = MicroBatcher(score, max_batch_size=64, max_wait_ms=20.0)
+        batcher.start()
+        try:
+            blocks = [np.full((1 + i % 3, 2), float(i)) for i in range(40)]
+            results = await asyncio.gather(*(batcher.submit(block) for block in blocks))
+        finally:
+            await batcher.stop()
+        for block, (prediction, probability, codes, invalid) in zip(blocks, results):
+            np.testing.assert_array_equal(prediction, block[:, 0])
+            assert len(codes) == len(invalid) == len(block)
+        return batcher
+    batcher = asyncio.run(run())
+    assert sum(calls) == batcher.rows == sum(1 + i % 3 for i in range(40))
+    assert batcher.batches == len(calls) < 40
+    assert max(calls) <= 64 + 2
+#----------------------------------------------------------
+def test_micro_batcher_rejects_when_full_and_propagates_errors():
+    def fail(block):
+        raise RuntimeError("model exploded")
+
+    async def run():
+        batcher = MicroBatcher(fail, queue_size=1)
+        batcher.queue = asyncio.Queue(1)     # not started: nothing drains the queue
+        batcher.submit(np.zeros((1, 2)))
+        with pytest.raises(Overloaded):
+            batcher.submit(np.zeros((1, 2)))
+        assert batcher.rejected == 1
+        #----------------------------------------------------------
+        batcher = MicroBatcher(fail)
+        batcher.start()
+        try:
+            with pytest.raises(RuntimeError, match="model exploded"):
+                await batcher.submit(np.zeros((1, 2)))
+        finally:
+            await batcher.stop()
+    asyncio.run(run())
+#----------------------------------------------------------
+# HTTP service
+#----------------------------------------------------------
+async def _request(port: int, method: str, path: str, payload=None, keep_alive_requests: int = 1):
+    """Sends the same request `keep_alive_requests` times on one connection; returns [(status, body)]."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    responses = []
+    try:
+        for _ in range(keep_alive_requests):
+            writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+                         + body)
+            await writer.drain()
+            head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+            length = int(next(line.split(":")[1] for line in head.split("\r\n")
+                              if line.lower().startswith("content-length")))
+            responses.append((int(head.split(" ")[1]), json.loads(await reader.readexactly(length))))
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return responses
+#----------------------------------------------------------
+def test_scoring_service_serves_http_requests(scoring_model, phishing_frame):
+    features = phishing_frame.drop(columns=[constants.TARGET_COLUMN])
+    records = [{name: None if pd.isna(value) else int(value) for name, value in row.items()}
+               for row in features.iloc[:20].to_dict("records")]
+    expected = _expected_probability(scoring_model, phishing_frame)[:20]
+    service = ScoringService(OnlineScoringConfig(
+        model_file_and_path=scoring_model[0], preprocessor_file_and_path=scoring_model[1], host="127.0.0.1",
+        port=0, max_batch_size=16, max_wait_ms=1.0, queue_size=64, max_body_bytes=1 << 20))
+
+    async def run():
+        await service.start()
+        try:
+            singles = await asyncio.gather(*(_request(service.port, "POST", "/score", record)
+                                             for record in records[:10]))
+            many = await _request(service.port, "POST", "/score", records[10:20], keep_alive_requests=2)
+            too_many = await _request(service.port, "POST", "/score", records + records)
+            bad_value = await _request(service.port, "POST", "/score", {**records[0], "Favicon": "x"})
+            errors = [await _request(service.port, "GET", "/score"), await _request(service.port, "GET", "/nope")]
+            metrics = await _request(service.port, "GET", "/metrics")
+        finally:
+            await service.close()
+        return singles, many, too_many, bad_value, errors, metrics
+    singles, many, too_many, bad_value, errors, metrics = asyncio.run(run())
+    #----------------------------------------------------------
+    for (status, body), probability in zip((response[0] for response in singles), expected[:10]):
+        assert status == 200 and body[PROBABILITY_COLUMN] == pytest.approx(probability, abs=1e-6)
+        assert body[PREDICTION_COLUMN] == (-1 if probability > 0.5 else 1)
+    assert [status for status, _ in many] == [200, 200] and many[0][1] == many[1][1]
+    assert [result[PROBABILITY_COLUMN] for result in many[0][1]["results"]] == \
+        pytest.approx(list(expected[10:20]), abs=1e-6)
+    assert too_many[0][0] == 413
+    status, body = bad_value[0]
+    assert status == 200 and body[PREDICTION_COLUMN] is None and body[REASON_COLUMN] & ValidationReason.INVALID_FEATURE
+    assert [response[0][0] for response in errors] == [405, 404]
+    assert metrics[0][1]["rows_scored"] == 10 + 20 + 1
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+#----------------------------------------------------------
+import networksecurity.components.constants as constants
+from networksecurity.components import utils
+from networksecurity.components.exception import CustomException
+from networksecurity.components.hash_split import HashSplitter
+#----------------------------------------------------------
+def _row_keys(frame: pd.DataFrame, columns) -> set:
+    block = frame[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    return set(map(bytes, np.where(np.isnan(block), -9.0, block)))
+#----------------------------------------------------------
+def test_default_split_method_is_random():
+    assert utils._split_method() == "random" == constants.SPLIT_METHOD
+#----------------------------------------------------------
+def test_unknown_split_method_raises(phishing_frame):
+    with pytest.raises(CustomException, match="Unknown split method"):
+        utils.train_test_split_data(phishing_frame, method="stratified")
+#----------------------------------------------------------
+@pytest.mark.parametrize("method", constants.SPLIT_METHODS)
+def test_train_test_split_partitions_rows(phishing_frame, method):
+    train, test = utils.train_test_split_data(phishing_frame, test_size=0.2, random_state=1, method=method)
+    assert len(train) + len(test) == len(phishing_frame)
+    assert not set(train.index) & set(test.index)
+    assert abs(len(test) / len(phishing_frame) - 0.2) < 0.05
+#----------------------------------------------------------
+def test_random_split_depends_on_seed_only(phishing_frame):
+    first, _ = utils.train_test_split_data(phishing_frame, test_size=0.2, random_state=1, method="random")
+    again, _ = utils.train_test_split_data(phishing_frame, test_size=0.2, random_state=1, method="random")
+    other, _ = utils.train_test_split_data(phishing_frame, test_size=0.2, random_state=2, method="random")
+    assert list(first.index) == list(again.index)
+    assert list(first.index) != list(other.index)
+#----------------------------------------------------------
+def test_hash_split_keeps_identical_features_together(phishing_frame):
+    features = [column for column in phishing_frame.columns if column != constants.TARGET_COLUMN]
+    # The same feature rows under the opposite label must land in the same split
+    flipped = phishing_frame.assign(**{constants.TARGET_COLUMN: -phishing_frame[constants.TARGET_COLUMN]})
+    frame = pd.concat([phishing_frame, flipped], ignore_index=True)
+    train, test = utils.train_test_split_data(frame, test_size=0.2, random_state=1, method="hash")
+    assert not _row_keys(train, features) & _row_keys(test, features)
+#----------------------------------------------------------
+def test_hash_split_is_stable_as_data_grows(phishing_frame):
+    splitter = HashSplitter(0.2, 0.25, seed=3, label_column=constants.TARGET_COLUMN)
+    codes = splitter.assign(phishing_frame)
+    grown = pd.concat([phishing_frame.iloc[::-1], phishing_frame.iloc[:500]], ignore_index=True)
+    np.testing.assert_array_equal(splitter.assign(grown)[:len(phishing_frame)], codes[::-1])
+    # Chunked assignment equals assignment of the whole frame
+    chunked = np.concatenate([splitter.assign(phishing_frame.iloc[start:start + 300])
+                              for start in range(0, len(phishing_frame), 300)])
+    np.testing.assert_array_equal(chunked, codes)
+    # Three-way shares are near 60/20/20
+    shares = np.bincount(codes, minlength=3) / len(codes)
+    np.testing.assert_allclose(shares, [0.6, 0.2, 0.2], atol=0.05)
+#----------------------------------------------------------
+def test_hash_key_ignores_label_and_row_count(phishing_frame):
+    splitter = HashSplitter(0.2, seed=0, label_column=constants.TARGET_COLUMN)
+    relabelled = phishing_frame.assign(**{constants.TARGET_COLUMN: 1})
+    np.testing.assert_array_equal(splitter.assign(phishing_frame), splitter.assign(relabelled))
+    # A collapsed frame splits its rows as the expanded rows would be split
+    collapsed = phishing_frame.assign(**{constants.ROW_COUNT_COLUMN: np.int8(3)})
+    train, test = utils.train_test_split_data(collapsed, test_size=0.2, random_state=0, method="hash")
+    expected_train, _ = utils.train_test_split_data(phishing_frame, test_size=0.2, random_state=0, method="hash")
+    assert list(train.index) == list(expected_train.index)
+#----------------------------------------------------------
+@pytest.mark.parametrize("method", constants.SPLIT_METHODS)
+def test_train_valid_test_split(phishing_frame, method):
+    x = phishing_frame.drop(columns=[constants.TARGET_COLUMN])
+    y = phishing_frame[constants.TARGET_COLUMN]
+    (x_train, y_train), (x_val, y_val), (x_test, y_test) = utils.train_valid_test_split_data(
+        x, y, test_size=0.2, test_size_val=0.25, random_state=0, method=method)
+    assert len(x_train) + len(x_val) + len(x_test) == len(x)
+    for features, labels in ((x_train, y_train), (x_val, y_val), (x_test, y_test)):
+        assert list(features.index) == list(labels.index)
+    indexes = [set(x_train.index), set(x_val.index), set(x_test.index)]
+    assert not (indexes[0] & indexes[1] or indexes[0] & indexes[2] or indexes[1] & indexes[2])
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+#----------------------------------------------------------
+from networksecurity.components.url_features import NETWORK_COLUMNS, StaticLookup, UrlFeatureExtractor, \
+    iter_extract_blocks
+#----------------------------------------------------------
+def _features(urls, extractor=None) -> list:
+    """One {column: value} dict per URL, NaN for unknown values."""
+    extractor = extractor or UrlFeatureExtractor()
+    block = extractor.extract_block(urls)
+    return [dict(zip(extractor.features, row)) for row in block]
+#----------------------------------------------------------
+@pytest.mark.parametrize("url, column, expected", [
+    ("http://192.168.10.5/login", "having_IP_Address", -1),
+    ("http://0xC0A80A05/login", "having_IP_Address", -1),
+    ("http://[2001:db8::1]/", "having_IP_Address", -1),
+    ("https://www.example.com/login", "having_IP_Address", 1),
+    ("https://bit.ly/3xYz", "Shortining_Service", -1),
+    ("http://go.bit.ly/3xYz", "Shortining_Service", -1),
+    ("https://bitly.example.com/", "Shortining_Service", 1),
+    ("http://example.com/redirect//http://evil.example", "double_slash_redirecting", -1),
+    ("https://example.com/a/b", "double_slash_redirecting", 1),
+    ("example.com//x", "double_slash_redirecting", -1),
+    ("http://www.example.co.uk/", "having_Sub_Domain", 1),
+    ("http://mail.example.co.uk/", "having_Sub_Domain", 0),
+    ("http://a.b.example.com/", "having_Sub_Domain", -1),
+    ("http://user@example.com/", "having_At_Symbol", -1),
+    ("http://secure-login.example.com/", "Prefix_Suffix", -1),
+    ("http://example.com:8080/", "port", -1),
+    ("https://example.com:443/", "port", 1),
+    ("http://https-example.com/", "HTTPS_token", -1),
+    ("http://example.com/", "URL_Length", 1),
+    ("http://example.com/" + "a" * 40, "URL_Length", 0),
+    ("http://example.com/" + "a" * 60, "URL_Length", -1),
+])
+def test_lexical_features_of_known_urls(url, column, expected):
+    assert _features([url])[0][column] == expected
+#----------------------------------------------------------
+def test_network_columns_are_missing_without_a_lookup():
+    row = _features(["https://www.example.com/"])[0]
+    assert all(np.isnan(row[name]) for name in NETWORK_COLUMNS)
+    frame = UrlFeatureExtractor().extract(["https://www.example.com/"])
+    assert frame["URL_Length"].dtype == np.int8 and frame["DNSRecord"].isna().all()
+#----------------------------------------------------------
+def test_static_lookup_covers_sub_domains_and_default():
+    lookup = StaticLookup({"example.com": {"DNSRecord": 1, "age_of_domain": -1}}, default={"DNSRecord": -1})
+    rows = _features(["https://shop.example.com/", "https://other.org/"], UrlFeatureExtractor(lookup))
+    assert (rows[0]["DNSRecord"], rows[0]["age_of_domain"]) == (1, -1)
+    assert rows[1]["DNSRecord"] == -1 and np.isnan(rows[1]["age_of_domain"])
+    with pytest.raises(ValueError, match="not network columns"):
+        StaticLookup({"example.com": {"URL_Length": 1}})
+#----------------------------------------------------------
+def test_hosts_are_parsed_once_and_the_memo_is_bounded():
+    extractor = UrlFeatureExtractor(host_cache_size=2)
+    urls = [f"https://example.com/page{i}" for i in range(50)] + ["http://1.2.3.4/", "https://a.org/"]
+    extractor.extract_block(urls)
+    assert (extractor.misses, extractor.hits) == (3, 0)
+    extractor.extract_block(["https://a.org/x", "http://1.2.3.4/y"])
+    assert extractor.cache_info()["hosts"] == 2 and extractor.hits == 2
+    extractor.extract_block(["https://example.com/again"])
+    assert extractor.misses == 4
+#----------------------------------------------------------
+def test_pool_extraction_matches_in_process_extraction():
+    rng = np.random.default_rng(0)
+    hosts = ["example.com", "bit.ly", "10.0.0.1", "a-b.example.co.uk", "x.y.z.example.org"]
+    batches = [[f"http://{hosts[i]}/{'p' * rng.integers(0, 80)}" for i in rng.integers(0, len(hosts), 300)]
+               for _ in range(5)]
+    expected = list(iter_extract_blocks(batches))
+    pooled = list(iter_extract_blocks(batches, workers=2, start_method="fork"))
+    assert len(pooled) == len(expected)
+    for block, reference in zip(pooled, expected):
+        np.testing.assert_array_equal(block, reference.astype(np.float32))